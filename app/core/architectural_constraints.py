@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - Architectural Constraints Module
+Highest SIL claimable for each subsystem from its hardware fault tolerance
+(HFT) and safe failure fraction (SFF) per IEC 61508-2 Route 1H / Route 2H,
+combined with the PFD / PFH based SIL for whole sites at once
+"""
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from .pfdavg import PFDAvg, HIGH_DEMAND, demand_mode
+
+
+ROUTE_1H = "1H"
+ROUTE_2H = "2H"
+ELEMENT_TYPES = ("A", "B")
+# Default element type by subsystem type: valves and other simple final
+# elements are type A, smart transmitters and logic solvers type B
+DEFAULT_ELEMENT_TYPES = {"Sensor": "B", "Logic": "B", "Final Element": "A"}
+
+# Lower SFF bound of each Route 1H table row
+SFF_BOUNDS = np.array([0.0, 0.6, 0.9, 0.99])
+
+# IEC 61508-2 Tables 2 and 3: SIL ceiling by [SFF row, HFT 0 / 1 / 2+]
+ROUTE_1H_TYPE_A = np.array([
+    [1, 2, 3],
+    [2, 3, 4],
+    [3, 4, 4],
+    [3, 4, 4],
+])
+ROUTE_1H_TYPE_B = np.array([
+    [0, 1, 2],
+    [1, 2, 3],
+    [2, 3, 4],
+    [3, 4, 4],
+])
+
+# IEC 61508-2 7.4.4.3: SIL ceiling by HFT 0 / 1 / 2+ with proven in use data,
+# where HFT 0 allows SIL 2 in low demand mode only
+ROUTE_2H_LOW_DEMAND = np.array([2, 3, 4])
+ROUTE_2H_HIGH_DEMAND = np.array([1, 3, 4])
+
+
+def safe_failure_fraction(lambda_s: Any, lambda_dd: Any, lambda_du: Any) -> np.ndarray:
+    """
+    Safe failure fraction (λS + λDD) / (λS + λDD + λDU)
+    
+    Args:
+        lambda_s: Safe failure rates
+        lambda_dd: Dangerous detected failure rates
+        lambda_du: Dangerous undetected failure rates
+    
+    Returns:
+        Array of SFF values (1 where no failures are recorded)
+    """
+    safe = np.asarray(lambda_s, dtype=float) + np.asarray(lambda_dd, dtype=float)
+    total = safe + np.asarray(lambda_du, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, safe / total, 1.0)
+
+
+class ArchitecturalConstraints:
+    """Hardware fault tolerance and safe failure fraction limits on SIL"""
+    
+    @staticmethod
+    def route_1h(hft: Any, sff: Any, element_type: Any = "B") -> np.ndarray:
+        """
+        SIL ceiling from the Route 1H tables
+        
+        Args:
+            hft: Array of hardware fault tolerances
+            sff: Array of safe failure fractions
+            element_type: Array of "A" or "B"
+        
+        Returns:
+            Integer array of maximum SIL (0 when not allowed)
+        """
+        hft, sff, element_type = np.broadcast_arrays(
+            np.asarray(hft, dtype=int), np.asarray(sff, dtype=float), np.asarray(element_type, dtype=object)
+        )
+        if not np.isin(element_type, ELEMENT_TYPES).all():
+            raise ValueError(f"Element types must be one of {ELEMENT_TYPES}")
+        row = np.searchsorted(SFF_BOUNDS, sff, side="right") - 1
+        column = np.clip(hft, 0, 2)
+        return np.where(element_type == "A", ROUTE_1H_TYPE_A[row, column], ROUTE_1H_TYPE_B[row, column])
+    
+    @staticmethod
+    def route_2h(hft: Any, high_demand: Any = False) -> np.ndarray:
+        """
+        SIL ceiling from the Route 2H minimum fault tolerances
+        
+        Args:
+            hft: Array of hardware fault tolerances
+            high_demand: Array of flags for high demand or continuous mode
+        
+        Returns:
+            Integer array of maximum SIL
+        """
+        column = np.clip(np.asarray(hft, dtype=int), 0, 2)
+        return np.where(high_demand, ROUTE_2H_HIGH_DEMAND[column], ROUTE_2H_LOW_DEMAND[column])
+    
+    @staticmethod
+    def evaluate_subsystems(subsystems: pd.DataFrame, route: str = ROUTE_1H) -> pd.DataFrame:
+        """
+        HFT, SFF and SIL ceiling of every row of a sif_subsystems frame
+        
+        HFT is N - M of the voting architecture. SFF needs the safe failure
+        rate, so under Route 1H rows without a recorded lambda_s are left
+        unassessed (NaN sff and sil_ceiling) rather than judged on the
+        assumed safe rate of PFDAvg.evaluate_subsystems. A missing
+        element_type follows DEFAULT_ELEMENT_TYPES.
+        
+        Args:
+            subsystems: sif_subsystems frame, optionally with element_type and
+                the demand_rate of each row's SIF (Route 2H)
+            route: ROUTE_1H or ROUTE_2H
+        
+        Returns:
+            Copy of the evaluated frame with hft, sff and sil_ceiling columns
+            and, for Route 1H, the element_type used
+        """
+        if route not in (ROUTE_1H, ROUTE_2H):
+            raise ValueError(f"Unknown route: {route}")
+        frame = PFDAvg.evaluate_subsystems(subsystems)
+        if frame.empty:
+            for column in ("hft", "sff", "sil_ceiling"):
+                frame[column] = pd.Series(dtype=float)
+            return frame
+        
+        recorded = pd.to_numeric(subsystems["lambda_s"], errors="coerce").notna().to_numpy() \
+            if "lambda_s" in subsystems else np.zeros(len(frame), dtype=bool)
+        frame["hft"] = frame["n"] - frame["m"]
+        frame["sff"] = np.where(recorded, safe_failure_fraction(frame["lambda_s"], frame["lambda_dd"],
+                                                                frame["lambda_du"]), np.nan)
+        if route == ROUTE_2H:
+            rate = pd.to_numeric(frame["demand_rate"], errors="coerce").to_numpy() \
+                if "demand_rate" in frame else np.nan
+            high_demand = demand_mode(rate) == HIGH_DEMAND
+            frame["sil_ceiling"] = ArchitecturalConstraints.route_2h(frame["hft"], high_demand).astype(float)
+            return frame
+        
+        types = frame["subsystem_type"] if "subsystem_type" in frame else pd.Series(None, index=frame.index)
+        default_type = types.map(DEFAULT_ELEMENT_TYPES).fillna("B")
+        element_type = frame["element_type"].where(frame["element_type"].notna(), default_type) \
+            if "element_type" in frame else default_type
+        element_type = element_type.astype(str).str.strip().str.upper().to_numpy(dtype=object)
+        ceiling = ArchitecturalConstraints.route_1h(frame["hft"], frame["sff"].fillna(0.0), element_type)
+        frame["element_type"] = element_type
+        frame["sil_ceiling"] = np.where(recorded, ceiling, np.nan)
+        return frame
+    
+    @staticmethod
+    def evaluate_sifs(
+        subsystems: pd.DataFrame,
+        sifs: Optional[pd.DataFrame] = None,
+        route: str = ROUTE_1H
+    ) -> pd.DataFrame:
+        """
+        PFD / PFH based SIL limited by the architectural SIL of every SIF
+        
+        Subsystems are in series, so the ceiling of a SIF is the lowest
+        ceiling of its assessed subsystems (NaN when none is assessed) and
+        its achieved SIL the lower of that ceiling and the SIL of
+        PFDAvg.evaluate_sifs.
+        
+        Args:
+            subsystems: sif_subsystems frame with a sif_id column
+            sifs: Optional sifs frame (id, required_sil) to compare against
+            route: ROUTE_1H or ROUTE_2H
+        
+        Returns:
+            Frame of PFDAvg.evaluate_sifs plus probabilistic_sil (the PFD or
+            PFH SIL), architectural_sil and unassessed_count, with
+            achieved_sil and meets_sil taking the constraints into account
+        """
+        results = PFDAvg.evaluate_sifs(subsystems, sifs)
+        ceilings = ArchitecturalConstraints.evaluate_subsystems(subsystems, route)
+        grouped = ceilings.groupby("sif_id")["sil_ceiling"]
+        architectural = grouped.min().reindex(results["sif_id"]).to_numpy(dtype=float)
+        results["probabilistic_sil"] = results["achieved_sil"]
+        results["architectural_sil"] = architectural
+        results["unassessed_count"] = (grouped.size() - grouped.count()).reindex(results["sif_id"]).to_numpy()
+        results["achieved_sil"] = np.fmin(results["probabilistic_sil"], architectural).astype(int)
+        if sifs is not None:
+            results["meets_sil"] = results["achieved_sil"] >= results["required_sil"]
+        return results
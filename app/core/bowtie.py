@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - Bow-Tie Module
+Graph model of threats, barriers, top events and outcomes with frequency
+propagation over every bow-tie of a study at once
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Node types of the bow-tie graph
+THREAT = "threat"
+BARRIER = "barrier"
+TOP_EVENT = "top_event"
+OUTCOME = "outcome"
+
+NODE_TYPES = [THREAT, BARRIER, TOP_EVENT, OUTCOME]
+
+
+def build_bowtie_graph(
+    top_event: str,
+    threats: List[Dict[str, Any]],
+    outcomes: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Build the nodes and edges of a standard bow-tie
+    
+    Each threat runs through its preventive barriers to the top event, and
+    the top event branches through the mitigative barriers of each outcome.
+    
+    Args:
+        top_event: Name of the top event
+        threats: Dictionaries with ``name``, ``frequency`` (per year) and
+            optionally ``barrier_ids`` in the order they act
+        outcomes: Dictionaries with ``name``, ``probability`` of the branch,
+            optionally ``target_frequency`` and ``barrier_ids``
+    
+    Returns:
+        Tuple of (nodes, edges); nodes carry a ``key`` that edges reference
+        through ``source`` and ``target``
+    """
+    nodes = [{"key": "top", "node_type": TOP_EVENT, "name": top_event}]
+    edges = []
+    
+    def chain(prefix, start_key, barrier_ids):
+        previous = start_key
+        for position, barrier_id in enumerate(barrier_ids):
+            key = f"{prefix}-b{position}"
+            nodes.append({"key": key, "node_type": BARRIER, "name": None, "barrier_id": barrier_id})
+            edges.append({"source": previous, "target": key, "probability": 1.0})
+            previous = key
+        return previous
+    
+    for number, threat in enumerate(threats):
+        key = f"t{number}"
+        nodes.append({"key": key, "node_type": THREAT, "name": threat["name"], "frequency": threat["frequency"]})
+        last = chain(key, key, threat.get("barrier_ids", []))
+        edges.append({"source": last, "target": "top", "probability": 1.0})
+    
+    for number, outcome in enumerate(outcomes):
+        key = f"o{number}"
+        first_edge = len(edges)
+        last = chain(key, "top", outcome.get("barrier_ids", []))
+        nodes.append({
+            "key": key, "node_type": OUTCOME, "name": outcome["name"],
+            "target_frequency": outcome.get("target_frequency")
+        })
+        edges.append({"source": last, "target": key, "probability": 1.0})
+        # The branch probability applies once, on the edge leaving the top event
+        edges[first_edge]["probability"] = outcome.get("probability", 1.0)
+    
+    return nodes, edges
+
+
+class BowTieModel:
+    """Vectorized frequency propagation over the bow-ties of a study"""
+    
+    def __init__(self, nodes: pd.DataFrame, edges: pd.DataFrame, barriers: pd.DataFrame):
+        """
+        Initialize the model
+        
+        The frequency of a node is its own frequency (threats only) plus
+        the frequency flowing in along its edges, each scaled by the edge
+        probability; a barrier node passes on the fraction of demands on
+        which its barrier fails, its PFD. Barriers are shared: every node
+        referencing the same barrier uses its PFD.
+        
+        Args:
+            nodes: One row per node with ``id``, ``bowtie_id``,
+                ``node_type`` and optionally ``name``, ``frequency``,
+                ``barrier_id`` and ``target_frequency``
+            edges: One row per edge with ``source_id``, ``target_id`` and
+                optionally ``probability``
+            barriers: One row per barrier with ``id``, ``pfd`` and
+                optionally ``is_enabled``
+        """
+        self.nodes = nodes.reset_index(drop=True)
+        self.edges = edges.reset_index(drop=True)
+        self.barriers = barriers.reset_index(drop=True)
+        
+        def column(frame, name, default):
+            if name in frame:
+                return pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=float)
+            return np.full(len(frame), default, dtype=float)
+        
+        self.node_ids = self.nodes["id"].to_numpy()
+        self.node_type = self.nodes["node_type"].astype(str).to_numpy()
+        self.bowtie_ids = self.nodes["bowtie_id"].to_numpy()
+        self.own_frequency = np.where(
+            self.node_type == THREAT, np.nan_to_num(column(self.nodes, "frequency", 0.0)), 0.0
+        )
+        self.target_frequency = column(self.nodes, "target_frequency", np.nan)
+        
+        node_index = pd.Index(self.node_ids)
+        source = node_index.get_indexer(self.edges["source_id"])
+        target = node_index.get_indexer(self.edges["target_id"])
+        valid = (source >= 0) & (target >= 0)
+        self.edge_source = source[valid]
+        self.edge_target = target[valid]
+        self.edge_probability = np.clip(np.nan_to_num(column(self.edges, "probability", 1.0)[valid], nan=1.0), 0.0, 1.0)
+        
+        self.barrier_ids = self.barriers["id"].to_numpy()
+        self.barrier_pfd = np.clip(np.nan_to_num(column(self.barriers, "pfd", 1.0), nan=1.0), 0.0, 1.0)
+        if "is_enabled" in self.barriers:
+            self.barrier_enabled = np.array(self.barriers["is_enabled"].fillna(True).astype(bool), dtype=bool)
+        else:
+            self.barrier_enabled = np.ones(len(self.barriers), dtype=bool)
+        if "barrier_id" in self.nodes:
+            barrier_index = pd.Index(self.barrier_ids).get_indexer(self.nodes["barrier_id"])
+        else:
+            barrier_index = np.full(len(self.nodes), -1)
+        self.node_barrier = np.where(self.node_type == BARRIER, barrier_index, -1)
+        
+        self._build_levels()
+        self._frequency = None
+    
+    @staticmethod
+    def _csr(keys: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Order of the entries grouped by key and the offsets of each key"""
+        order = np.argsort(keys, kind="stable")
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(keys, minlength=size))])
+        return order, offsets
+    
+    @staticmethod
+    def _gather(order: np.ndarray, offsets: np.ndarray, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Entries of the given keys from a CSR index, with the position of their key"""
+        starts = offsets[keys]
+        lengths = offsets[keys + 1] - starts
+        within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return order[np.repeat(starts, lengths) + within], np.repeat(np.arange(len(keys)), lengths)
+    
+    def _build_levels(self) -> None:
+        """Assign every node its topological level, one vectorized sweep per level"""
+        n = len(self.node_ids)
+        self._out_order, self._out_offsets = self._csr(self.edge_source, n)
+        self._in_order, self._in_offsets = self._csr(self.edge_target, n)
+        
+        indegree = np.bincount(self.edge_target, minlength=n)
+        level = np.full(n, -1)
+        frontier = np.flatnonzero(indegree == 0)
+        depth = 0
+        while len(frontier):
+            level[frontier] = depth
+            out_edges, _ = self._gather(self._out_order, self._out_offsets, frontier)
+            targets = self.edge_target[out_edges]
+            indegree -= np.bincount(targets, minlength=n)
+            frontier = np.unique(targets[indegree[targets] == 0])
+            depth += 1
+        if (level < 0).any():
+            raise ValueError("Bow-tie graph contains a cycle")
+        
+        self.node_level = level
+        self._level_order, self._level_offsets = self._csr(level, depth)
+    
+    def node_pass_fraction(self) -> np.ndarray:
+        """Fraction of the incoming frequency each node passes on"""
+        barrier = self.node_barrier
+        fraction = np.ones(len(barrier))
+        has_barrier = barrier >= 0
+        credited = self.barrier_enabled[barrier[has_barrier]]
+        fraction[has_barrier] = np.where(credited, self.barrier_pfd[barrier[has_barrier]], 1.0)
+        return fraction
+    
+    def _propagate(self, nodes: np.ndarray, frequency: np.ndarray, fraction: np.ndarray) -> None:
+        """Recompute the frequency of nodes, all on one level, from their in-edges"""
+        in_edges, group = self._gather(self._in_order, self._in_offsets, nodes)
+        flow = frequency[self.edge_source[in_edges]] * self.edge_probability[in_edges]
+        inflow = np.bincount(group, weights=flow, minlength=len(nodes))
+        frequency[nodes] = (self.own_frequency[nodes] + inflow) * fraction[nodes]
+    
+    def node_frequency(self) -> np.ndarray:
+        """
+        Propagate frequencies through every bow-tie in topological order
+        
+        Returns:
+            Frequency per node (events per year), aligned with the node rows
+        """
+        if self._frequency is None:
+            frequency = np.zeros(len(self.node_ids))
+            fraction = self.node_pass_fraction()
+            for depth in range(len(self._level_offsets) - 1):
+                nodes = self._level_order[self._level_offsets[depth]:self._level_offsets[depth + 1]]
+                self._propagate(nodes, frequency, fraction)
+            self._frequency = frequency
+        return self._frequency
+    
+    def _results(self, positions: np.ndarray) -> pd.DataFrame:
+        """Result rows for the given node positions"""
+        frequency = self.node_frequency()[positions]
+        target = self.target_frequency[positions]
+        return pd.DataFrame({
+            "id": self.node_ids[positions],
+            "bowtie_id": self.bowtie_ids[positions],
+            "node_type": self.node_type[positions],
+            "name": self.nodes["name"].to_numpy()[positions] if "name" in self.nodes else None,
+            "frequency": frequency,
+            "target_frequency": target,
+            "meets_target": np.isnan(target) | (frequency <= target)
+        })
+    
+    def evaluate(self) -> pd.DataFrame:
+        """
+        Evaluate every node of every bow-tie
+        
+        Returns:
+            DataFrame with the node id, bow-tie, type, name, frequency,
+            target frequency and whether the target is met (always True for
+            nodes without a target)
+        """
+        return self._results(np.arange(len(self.node_ids)))
+    
+    def summary(self) -> pd.DataFrame:
+        """
+        Summarise each bow-tie
+        
+        Returns:
+            DataFrame with the top event frequency, the total outcome
+            frequency and the number of outcomes missing their target
+        """
+        results = self.evaluate()
+        top = results[results["node_type"] == TOP_EVENT].groupby("bowtie_id")["frequency"].sum()
+        outcomes = results[results["node_type"] == OUTCOME].groupby("bowtie_id").agg(
+            outcome_frequency=("frequency", "sum"),
+            outcomes_missing_target=("meets_target", lambda met: int((~met).sum()))
+        )
+        summary = pd.DataFrame({"top_event_frequency": top}).join(outcomes, how="outer")
+        summary.index.name = "bowtie_id"
+        return summary.reset_index()
+    
+    def bowties_for_barrier(self, barrier_id: Any) -> np.ndarray:
+        """
+        Find the bow-ties that use a barrier
+        
+        Args:
+            barrier_id: ID of the barrier
+        
+        Returns:
+            Array of bow-tie IDs
+        """
+        position = pd.Index(self.barrier_ids).get_indexer([barrier_id])[0]
+        if position < 0:
+            return np.array([], dtype=self.bowtie_ids.dtype)
+        return np.unique(self.bowtie_ids[self.node_barrier == position])
+    
+    def update_barriers(
+        self,
+        barrier_ids: List[Any],
+        pfd: Optional[float] = None,
+        is_enabled: Optional[bool] = None
+    ) -> pd.DataFrame:
+        """
+        Change shared barriers and recompute only the nodes downstream of them
+        
+        Args:
+            barrier_ids: IDs of the barriers to change
+            pfd: New PFD, or None to keep the current values
+            is_enabled: New enabled flag, or None to keep the current values
+        
+        Returns:
+            Result rows for the affected top events and outcomes, with the
+            frequency before the change in ``previous_frequency``
+        """
+        frequency = self.node_frequency()
+        positions = pd.Index(self.barrier_ids).get_indexer(barrier_ids)
+        positions = positions[positions >= 0]
+        if pfd is not None:
+            self.barrier_pfd[positions] = min(max(float(pfd), 0.0), 1.0)
+        if is_enabled is not None:
+            self.barrier_enabled[positions] = bool(is_enabled)
+        
+        # Mark everything downstream of the changed barriers, one sweep per edge hop
+        dirty = np.isin(self.node_barrier, positions)
+        frontier = np.flatnonzero(dirty)
+        while len(frontier):
+            out_edges, _ = self._gather(self._out_order, self._out_offsets, frontier)
+            targets = np.unique(self.edge_target[out_edges])
+            frontier = targets[~dirty[targets]]
+            dirty[frontier] = True
+        
+        # Recompute the stale nodes level by level; clean inputs keep their frequency
+        previous = frequency.copy()
+        fraction = self.node_pass_fraction()
+        stale = np.flatnonzero(dirty)
+        stale = stale[np.argsort(self.node_level[stale], kind="stable")]
+        for nodes in np.split(stale, np.flatnonzero(np.diff(self.node_level[stale])) + 1):
+            if len(nodes):
+                self._propagate(nodes, frequency, fraction)
+        
+        changed = np.flatnonzero(dirty & np.isin(self.node_type, [TOP_EVENT, OUTCOME]))
+        result = self._results(changed)
+        result.insert(4, "previous_frequency", previous[changed])
+        return result
+    
+    @classmethod
+    def from_records(
+        cls,
+        nodes: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]],
+        barriers: List[Dict[str, Any]]
+    ) -> 'BowTieModel':
+        """
+        Create a model from lists of dictionaries
+        
+        Args:
+            nodes: Node dictionaries
+            edges: Edge dictionaries
+            barriers: Barrier dictionaries
+        
+        Returns:
+            BowTieModel object
+        """
+        return cls(
+            pd.DataFrame(nodes, columns=None if nodes else ["id", "bowtie_id", "node_type"]),
+            pd.DataFrame(edges, columns=None if edges else ["source_id", "target_id"]),
+            pd.DataFrame(barriers, columns=None if barriers else ["id", "pfd"])
+        )
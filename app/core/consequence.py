@@ -6,10 +6,62 @@ Provides calculation methods for estimating consequences of scenarios
 import math
 from typing import Dict, Any, Tuple, Optional, List
 
+import numpy as np
+
+from .fire import FireCalculator
+
+
+# Scaled distance in m/kg^(1/3) of TNT to each overpressure
+# (0.02 bar window breakage, 0.1 bar structural damage, 0.3 bar severe damage)
+EXPLOSION_SCALED_DISTANCES = {"window_breakage": 50.0, "structural_damage": 18.0, "severe_damage": 9.0}
+
 
 class ConsequenceCalculator:
     """Calculator for scenario consequences"""
     
+    @staticmethod
+    def toxic_radius(release_rate_kgs: Any, toxic_threshold_ppm: Any,
+                     molecular_weight: Any, wind_speed_ms: Any) -> np.ndarray:
+        """
+        Toxic hazard radius of many releases at once
+        
+        Args:
+            release_rate_kgs: Release rates in kg/s
+            toxic_threshold_ppm: Toxic concentration thresholds in ppm
+            molecular_weight: Molecular weights of the substances
+            wind_speed_ms: Wind speeds in m/s
+        
+        Returns:
+            Array of radii in m, limited to 10 - 5000 m
+        """
+        # Convert toxic threshold to kg/m³
+        threshold_kgm3 = (np.asarray(toxic_threshold_ppm, dtype=float) / 1e6) \
+            * (np.asarray(molecular_weight, dtype=float) / 24.45)
+        
+        # Simple correlation for affected radius
+        radius = 50 * np.sqrt(np.asarray(release_rate_kgs, dtype=float)
+                              / (np.asarray(wind_speed_ms, dtype=float) * threshold_kgm3))
+        return np.clip(radius, 10, 5000)
+    
+    @staticmethod
+    def explosion_distance(mass_kg: Any, tnt_equiv_factor: Any,
+                           overpressure: str = "structural_damage") -> np.ndarray:
+        """
+        TNT equivalency distance to an overpressure for many masses at once
+        
+        Args:
+            mass_kg: Masses of explosive material in kg
+            tnt_equiv_factor: TNT equivalency factors
+            overpressure: Damage level, a key of EXPLOSION_SCALED_DISTANCES
+        
+        Returns:
+            Array of distances in m
+        """
+        if overpressure not in EXPLOSION_SCALED_DISTANCES:
+            raise ValueError(f"Unknown overpressure level: {overpressure}")
+        tnt_equiv_mass = np.asarray(mass_kg, dtype=float) * np.asarray(tnt_equiv_factor, dtype=float)
+        return EXPLOSION_SCALED_DISTANCES[overpressure] * np.cbrt(tnt_equiv_mass)
+    
     @staticmethod
     def calculate_risk_score(severity: int, likelihood: int) -> int:
         """
@@ -121,14 +173,9 @@ class ConsequenceCalculator:
         Returns:
             Dictionary with consequence estimates
         """
-        # Convert toxic threshold to kg/m³
-        toxic_threshold_kgm3 = (toxic_threshold_ppm / 1e6) * (molecular_weight / 24.45)
-        
-        # Simple correlation for affected radius
-        radius = 50 * math.sqrt(release_rate_kgs / (wind_speed_ms * toxic_threshold_kgm3))
-        
-        # Limit to reasonable range
-        radius = max(10, min(5000, radius))
+        radius = float(ConsequenceCalculator.toxic_radius(
+            release_rate_kgs, toxic_threshold_ppm, molecular_weight, wind_speed_ms
+        ))
         
         # Estimate affected area
         affected_area = math.pi * radius ** 2
@@ -181,37 +228,82 @@ class ConsequenceCalculator:
         }
     
     @staticmethod
-    def estimate_explosion_consequence(mass_kg: float, tnt_equiv_factor: float) -> Dict[str, Any]:
+    def estimate_jet_fire_consequence(release_rate_kgs: float, hole_size_mm: float,
+                                      heat_of_combustion_kjkg: float, jet_density_kgm3: float,
+                                      wind_speed_ms: float = 5.0, release_height_m: float = 0.0) -> Dict[str, Any]:
         """
-        Estimate consequences for explosion scenario using TNT equivalency
+        Estimate consequences for a jet fire
         
         Args:
-            mass_kg: Mass of explosive material in kg
-            tnt_equiv_factor: TNT equivalency factor
-            
+            release_rate_kgs: Release rate in kg/s
+            hole_size_mm: Hole diameter in mm
+            heat_of_combustion_kjkg: Heat of combustion in kJ/kg
+            jet_density_kgm3: Density of the jet at the hole in kg/m³
+            wind_speed_ms: Wind speed in m/s
+            release_height_m: Height of the release in m
+        
         Returns:
             Dictionary with consequence estimates
         """
-        # Calculate TNT equivalent mass
-        tnt_equiv_mass = mass_kg * tnt_equiv_factor
+        jet = FireCalculator.jet_fire(
+            release_rate_kgs, hole_size_mm, heat_of_combustion_kjkg,
+            jet_density_kgm3, wind_speed_ms, release_height_m
+        )
+        radiation_distance = float(FireCalculator.jet_fire_hazard_distance(jet, 5.0)[0])
         
-        # Calculate scaled distances for different overpressures
-        # 0.02 bar (window breakage)
-        distance_002bar = 50 * (tnt_equiv_mass ** (1/3))
+        return {
+            "heat_release_rate_kw": float(jet["heat_release_rate_kw"][0]),
+            "flame_length_m": float(jet["flame_length_m"][0]),
+            "lift_off_m": float(jet["lift_off_m"][0]),
+            "flame_tilt_deg": float(jet["tilt_deg"][0]),
+            "radiation_distance_m": radiation_distance,
+            "affected_area_m2": math.pi * max(radiation_distance, 10) ** 2
+        }
+    
+    @staticmethod
+    def estimate_fireball_consequence(mass_kg: float, heat_of_combustion_kjkg: float,
+                                      burst_pressure_kpa: float = 101.325) -> Dict[str, Any]:
+        """
+        Estimate consequences for a fireball (BLEVE)
         
-        # 0.1 bar (structural damage)
-        distance_01bar = 18 * (tnt_equiv_mass ** (1/3))
+        Args:
+            mass_kg: Flammable mass in kg
+            heat_of_combustion_kjkg: Heat of combustion in kJ/kg
+            burst_pressure_kpa: Vessel burst pressure (absolute) in kPa
         
-        # 0.3 bar (severe structural damage)
-        distance_03bar = 9 * (tnt_equiv_mass ** (1/3))
+        Returns:
+            Dictionary with consequence estimates
+        """
+        fireball = FireCalculator.fireball(mass_kg, heat_of_combustion_kjkg, burst_pressure_kpa)
+        radiation_distance = float(FireCalculator.fireball_hazard_distance(fireball, 5.0)[0])
         
         return {
-            "tnt_equivalent_kg": tnt_equiv_mass,
-            "distance_window_breakage_m": distance_002bar,
-            "distance_structural_damage_m": distance_01bar,
-            "distance_severe_damage_m": distance_03bar
+            "diameter_m": float(fireball["diameter_m"][0]),
+            "duration_s": float(fireball["duration_s"][0]),
+            "surface_emissive_power_kwm2": float(fireball["surface_emissive_power_kwm2"][0]),
+            "radiation_distance_m": radiation_distance,
+            "affected_area_m2": math.pi * max(radiation_distance, 10) ** 2
         }
     
+    @staticmethod
+    def estimate_explosion_consequence(mass_kg: float, tnt_equiv_factor: float) -> Dict[str, Any]:
+        """
+        Estimate consequences for explosion scenario using TNT equivalency
+        
+        Args:
+            mass_kg: Mass of explosive material in kg
+            tnt_equiv_factor: TNT equivalency factor
+            
+        Returns:
+            Dictionary with consequence estimates
+        """
+        result = {"tnt_equivalent_kg": mass_kg * tnt_equiv_factor}
+        for overpressure in EXPLOSION_SCALED_DISTANCES:
+            result[f"distance_{overpressure}_m"] = float(
+                ConsequenceCalculator.explosion_distance(mass_kg, tnt_equiv_factor, overpressure)
+            )
+        return result
+    
     @staticmethod
     def assess_risk(severity: int, likelihood: int) -> Dict[str, Any]:
         """
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - Gaussian Puff Dispersion Module
+Provides a time-stepping Gaussian puff model for instantaneous and
+short-duration (time-varying) releases
+"""
+import math
+from dataclasses import dataclass
+from typing import Dict, Any, List, Sequence, Tuple, Union
+
+import numpy as np
+
+
+# Briggs open-country dispersion coefficients: sigma = c * x * (1 + d * x) ** e
+BRIGGS_RURAL_SIGMA_Y = {
+    "A": (0.22, 0.0001, -0.5),
+    "B": (0.16, 0.0001, -0.5),
+    "C": (0.11, 0.0001, -0.5),
+    "D": (0.08, 0.0001, -0.5),
+    "E": (0.06, 0.0001, -0.5),
+    "F": (0.04, 0.0001, -0.5),
+}
+
+BRIGGS_RURAL_SIGMA_Z = {
+    "A": (0.20, 0.0, 1.0),
+    "B": (0.12, 0.0, 1.0),
+    "C": (0.08, 0.0002, -0.5),
+    "D": (0.06, 0.0015, -0.5),
+    "E": (0.03, 0.0003, -1.0),
+    "F": (0.016, 0.0003, -1.0),
+}
+
+
+@dataclass
+class PuffEmission:
+    """A single puff released into the atmosphere"""
+    time_s: float
+    mass_kg: float
+    x_m: float = 0.0
+    y_m: float = 0.0
+    height_m: float = 0.0
+
+
+def dispersion_coefficients(distance_m: np.ndarray, stability_class: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate Briggs rural dispersion coefficients
+
+    Args:
+        distance_m: Downwind travel distance in m
+        stability_class: Pasquill-Gifford stability class (A-F)
+
+    Returns:
+        Tuple of (sigma_y, sigma_z) arrays in m
+    """
+    x = np.asarray(distance_m, dtype=float)
+    cy, dy, ey = BRIGGS_RURAL_SIGMA_Y.get(stability_class, BRIGGS_RURAL_SIGMA_Y["D"])
+    cz, dz, ez = BRIGGS_RURAL_SIGMA_Z.get(stability_class, BRIGGS_RURAL_SIGMA_Z["D"])
+    sigma_y = cy * x * (1.0 + dy * x) ** ey
+    sigma_z = cz * x * (1.0 + dz * x) ** ez
+    return sigma_y, sigma_z
+
+
+def puffs_from_release_profile(times_s: Sequence[float], release_rates_kgs: Sequence[float],
+                               height_m: float = 0.0, x_m: float = 0.0,
+                               y_m: float = 0.0) -> List[PuffEmission]:
+    """
+    Convert a time-varying source term (e.g. blowdown output) into puffs
+
+    Each interval between consecutive samples becomes one puff carrying the
+    trapezoidal mass for that interval, released at the interval midpoint.
+
+    Args:
+        times_s: Sample times in seconds
+        release_rates_kgs: Release rate at each sample time in kg/s
+        height_m: Release height in m
+        x_m: Source x coordinate in m
+        y_m: Source y coordinate in m
+
+    Returns:
+        List of PuffEmission objects
+    """
+    times = np.asarray(times_s, dtype=float)
+    rates = np.asarray(release_rates_kgs, dtype=float)
+    if times.shape != rates.shape:
+        raise ValueError("Times and release rates must have the same length")
+
+    dt = np.diff(times)
+    masses = 0.5 * (rates[1:] + rates[:-1]) * dt
+    midpoints = times[:-1] + 0.5 * dt
+
+    return [
+        PuffEmission(float(t), float(m), x_m, y_m, height_m)
+        for t, m in zip(midpoints, masses) if m > 0
+    ]
+
+
+class GaussianPuffModel:
+    """Gaussian puff dispersion model with puff pruning"""
+
+    def __init__(
+        self,
+        wind_speed_ms: float,
+        stability_class: str = "D",
+        wind_direction_deg: float = 270.0,
+        prune_concentration_kgm3: float = 1e-9,
+        min_travel_m: float = 1.0
+    ):
+        """
+        Initialize the puff model
+
+        Args:
+            wind_speed_ms: Wind speed in m/s
+            stability_class: Pasquill-Gifford stability class (A-F)
+            wind_direction_deg: Meteorological wind direction (degrees the
+                wind blows from; 270 carries puffs along +x)
+            prune_concentration_kgm3: Puffs whose peak concentration falls
+                below this value are dropped
+            min_travel_m: Minimum travel distance used for the dispersion
+                coefficients, to avoid singular puffs at release
+        """
+        if wind_speed_ms <= 0:
+            raise ValueError("Wind speed must be positive")
+        self.wind_speed_ms = wind_speed_ms
+        self.stability_class = stability_class
+        self.wind_direction_deg = wind_direction_deg
+        self.prune_concentration_kgm3 = prune_concentration_kgm3
+        self.min_travel_m = min_travel_m
+
+        # Unit vector of puff travel (direction the wind blows towards)
+        theta = math.radians(wind_direction_deg)
+        self._ux = -math.sin(theta)
+        self._uy = -math.cos(theta)
+
+        self.max_active_puffs = 0
+        self.pruned_puffs = 0
+
+    def simulate(
+        self,
+        emissions: Sequence[Union[PuffEmission, Tuple[float, float]]],
+        receptors: np.ndarray,
+        times_s: Sequence[float]
+    ) -> np.ndarray:
+        """
+        Move puffs through time and sum concentrations at the receptors
+
+        Args:
+            emissions: Puff emissions, as PuffEmission objects or
+                (time_s, mass_kg) tuples released at ground level from the origin
+            receptors: Receptor coordinates, shape (n_receptors, 2) for
+                ground level or (n_receptors, 3) with heights
+            times_s: Output times in seconds (ascending)
+
+        Returns:
+            Concentrations in kg/m³, shape (n_receptors, n_times), ready for
+            ToxicDoseCalculator.toxic_load
+        """
+        puffs = sorted(
+            (e if isinstance(e, PuffEmission) else PuffEmission(*e) for e in emissions),
+            key=lambda p: p.time_s
+        )
+        rec = np.atleast_2d(np.asarray(receptors, dtype=float))
+        rx, ry = rec[:, 0], rec[:, 1]
+        rz = rec[:, 2] if rec.shape[1] > 2 else np.zeros(rec.shape[0])
+        times = np.asarray(times_s, dtype=float)
+
+        # Furthest receptor distance along the travel direction, for pruning
+        max_reach = float(np.max(rx * self._ux + ry * self._uy)) if rec.size else 0.0
+
+        release_t = np.empty(0)
+        mass = np.empty(0)
+        x0 = np.empty(0)
+        y0 = np.empty(0)
+        h = np.empty(0)
+
+        concentrations = np.zeros((rec.shape[0], times.shape[0]))
+        next_puff = 0
+        self.max_active_puffs = 0
+        self.pruned_puffs = 0
+
+        for k, t in enumerate(times):
+            # Release the puffs emitted up to this time
+            start = next_puff
+            while next_puff < len(puffs) and puffs[next_puff].time_s <= t:
+                next_puff += 1
+            if next_puff > start:
+                new = puffs[start:next_puff]
+                release_t = np.concatenate([release_t, [p.time_s for p in new]])
+                mass = np.concatenate([mass, [p.mass_kg for p in new]])
+                x0 = np.concatenate([x0, [p.x_m for p in new]])
+                y0 = np.concatenate([y0, [p.y_m for p in new]])
+                h = np.concatenate([h, [p.height_m for p in new]])
+
+            if mass.size == 0:
+                continue
+            self.max_active_puffs = max(self.max_active_puffs, mass.size)
+
+            travel = np.maximum(self.wind_speed_ms * (t - release_t), self.min_travel_m)
+            sigma_y, sigma_z = dispersion_coefficients(travel, self.stability_class)
+            sigma_x = sigma_y
+            xc = x0 + self._ux * travel
+            yc = y0 + self._uy * travel
+
+            # Puff × receptor contributions in the along/cross-wind frame
+            dx = rx[np.newaxis, :] - xc[:, np.newaxis]
+            dy = ry[np.newaxis, :] - yc[:, np.newaxis]
+            along = dx * self._ux + dy * self._uy
+            cross = -dx * self._uy + dy * self._ux
+
+            norm = mass / ((2.0 * math.pi) ** 1.5 * sigma_x * sigma_y * sigma_z)
+            sx2 = (2.0 * sigma_x ** 2)[:, np.newaxis]
+            sy2 = (2.0 * sigma_y ** 2)[:, np.newaxis]
+            sz2 = (2.0 * sigma_z ** 2)[:, np.newaxis]
+            vertical = (
+                np.exp(-((rz[np.newaxis, :] - h[:, np.newaxis]) ** 2) / sz2)
+                + np.exp(-((rz[np.newaxis, :] + h[:, np.newaxis]) ** 2) / sz2)
+            )
+            contribution = norm[:, np.newaxis] * np.exp(-along ** 2 / sx2 - cross ** 2 / sy2) * vertical
+            concentrations[:, k] = contribution.sum(axis=0)
+
+            # Prune puffs that are too dilute or have passed every receptor
+            peak = 2.0 * norm
+            centre_reach = xc * self._ux + yc * self._uy
+            keep = (peak >= self.prune_concentration_kgm3) & (centre_reach - 4.0 * sigma_x <= max_reach)
+            if not keep.all():
+                self.pruned_puffs += int((~keep).sum())
+                release_t, mass, x0, y0, h = (
+                    release_t[keep], mass[keep], x0[keep], y0[keep], h[keep]
+                )
+
+        return concentrations
+
+    def peak_concentrations(
+        self,
+        emissions: Sequence[Union[PuffEmission, Tuple[float, float]]],
+        receptors: np.ndarray,
+        times_s: Sequence[float]
+    ) -> Dict[str, Any]:
+        """
+        Calculate peak concentrations and their arrival times at the receptors
+
+        Args:
+            emissions: Puff emissions
+            receptors: Receptor coordinates
+            times_s: Output times in seconds
+
+        Returns:
+            Dictionary with peak concentrations and times of peak
+        """
+        times = np.asarray(times_s, dtype=float)
+        concentrations = self.simulate(emissions, receptors, times)
+        peak_index = np.argmax(concentrations, axis=1)
+        return {
+            "peak_concentration_kgm3": concentrations[np.arange(concentrations.shape[0]), peak_index],
+            "time_of_peak_s": times[peak_index],
+            "max_active_puffs": self.max_active_puffs,
+            "pruned_puffs": self.pruned_puffs
+        }
@@ -0,0 +1,519 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - Fault Tree Module
+Fault trees of SIFs built from their voted subsystems, compiled to binary
+decision diagrams for exact top event probabilities and minimal cut sets
+"""
+import sys
+from functools import lru_cache
+from typing import Dict, List, Any, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .pfdavg import PFDAvg, HOURS_PER_MONTH
+
+
+# Gate types
+AND = "AND"
+OR = "OR"
+VOTE = "VOTE"  # Fails when at least k of its inputs fail
+
+GATE_TYPES = (AND, OR, VOTE)
+CACHE_SIZE = 128
+
+FALSE = 0
+TRUE = 1
+
+
+class CompiledBDD:
+    """Reduced ordered BDD of a fault tree, evaluated one variable level at a time"""
+    
+    def __init__(self, var_names: Sequence[str], var: np.ndarray, low: np.ndarray, high: np.ndarray, root: int):
+        """
+        Initialize a compiled BDD
+        
+        Args:
+            var_names: Basic event of each variable, in BDD order
+            var: Variable of each node (terminals carry len(var_names))
+            low: Node reached when the variable's event does not occur
+            high: Node reached when the variable's event occurs
+            root: Root node
+        """
+        self.var_names = list(var_names)
+        self.index = {name: i for i, name in enumerate(self.var_names)}
+        self.var = var
+        self.low = low
+        self.high = high
+        self.root = root
+        
+        # Children always test later variables, so going from the last variable
+        # to the first visits every node after its children
+        internal = np.arange(2, len(var))
+        order = internal[np.argsort(-var[internal], kind="stable")]
+        splits = np.flatnonzero(np.diff(var[order])) + 1
+        self._levels = [
+            (group, var[group[0]], low[group], high[group])
+            for group in np.split(order, splits) if len(group)
+        ]
+    
+    @property
+    def size(self) -> int:
+        """Number of nodes including the two terminals"""
+        return len(self.var)
+    
+    def _event_array(self, probabilities: Any) -> np.ndarray:
+        """Basic event probabilities as an array in BDD variable order"""
+        if isinstance(probabilities, Mapping):
+            missing = [name for name in self.var_names if name not in probabilities]
+            if missing:
+                raise ValueError(f"Missing basic event probabilities: {missing[:10]}")
+            return np.array([probabilities[name] for name in self.var_names], dtype=float)
+        values = np.asarray(probabilities, dtype=float)
+        if values.shape[0] != len(self.var_names):
+            raise ValueError(f"Expected {len(self.var_names)} basic event probabilities, got {values.shape[0]}")
+        return values
+    
+    def probability(self, probabilities: Any) -> Any:
+        """
+        Exact top event probability
+        
+        Args:
+            probabilities: Mapping of basic event name to probability, or an
+                array in var_names order; a 2-D array of shape
+                (events, cases) evaluates many cases at once
+        
+        Returns:
+            Top event probability (array of one value per case for 2-D input)
+        """
+        p = self._event_array(probabilities)
+        values = np.zeros((len(self.var),) + p.shape[1:])
+        values[TRUE] = 1.0
+        for group, variable, low, high in self._levels:
+            q = p[variable]
+            values[group] = q * values[high] + (1.0 - q) * values[low]
+        result = values[self.root]
+        return float(result) if np.ndim(result) == 0 else result
+    
+    def birnbaum_importance(self, probabilities: Any) -> pd.Series:
+        """
+        Birnbaum importance P(top | event) - P(top | no event) of every basic event
+        
+        Args:
+            probabilities: Basic event probabilities as accepted by probability
+        
+        Returns:
+            Series indexed by basic event name
+        """
+        p = self._event_array(probabilities)
+        n = len(p)
+        cases = np.repeat(p[:, None], 2 * n, axis=1)
+        cases[np.arange(n), np.arange(n)] = 1.0
+        cases[np.arange(n), n + np.arange(n)] = 0.0
+        top = self.probability(cases)
+        return pd.Series(top[:n] - top[n:], index=self.var_names)
+    
+    def minimal_cut_sets(self, max_order: Optional[int] = None) -> List[Tuple[str, ...]]:
+        """
+        Minimal cut sets of a coherent fault tree
+        
+        Rauzy's algorithm: for node ite(x, F1, F0) the minimal solutions are
+        those of F0 plus x joined to each minimal solution of F1 that does
+        not already satisfy F0. Solutions are held in a zero-suppressed BDD
+        so families shared between nodes are stored once.
+        
+        Args:
+            max_order: Drop cut sets with more events than this
+        
+        Returns:
+            Cut sets as tuples of basic event names, shortest first
+        """
+        var, low, high = self.var.tolist(), self.low.tolist(), self.high.tolist()
+        n_vars = len(self.var_names)
+        zdd = _Builder(n_vars, zero_suppressed=True)
+        minsol_memo: Dict[int, int] = {FALSE: FALSE, TRUE: TRUE}
+        without_memo: Dict[Tuple[int, int], int] = {}
+        
+        def without(family: int, node: int) -> int:
+            # Sets of family that do not satisfy the monotone function at node
+            if family == FALSE or node == TRUE:
+                return FALSE
+            if node == FALSE:
+                return family
+            key = (family, node)
+            found = without_memo.get(key)
+            if found is not None:
+                return found
+            vf, vn = zdd.var[family], var[node]
+            if vn < vf:
+                # No set in the family holds this event
+                found = without(family, low[node])
+            elif vf < vn:
+                found = zdd.node(vf, without(zdd.low[family], node), without(zdd.high[family], node))
+            else:
+                found = zdd.node(vf, without(zdd.low[family], low[node]), without(zdd.high[family], high[node]))
+            without_memo[key] = found
+            return found
+        
+        def minsol(node: int) -> int:
+            found = minsol_memo.get(node)
+            if found is None:
+                found = zdd.node(var[node], minsol(low[node]), without(minsol(high[node]), low[node]))
+                minsol_memo[node] = found
+            return found
+        
+        previous_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(previous_limit, 4 * n_vars + 1000))
+        try:
+            root = minsol(self.root)
+        finally:
+            sys.setrecursionlimit(previous_limit)
+        
+        limit = max_order if max_order is not None else n_vars
+        cut_sets = []
+        stack = [(root, ())]
+        while stack:
+            family, prefix = stack.pop()
+            if family == FALSE:
+                continue
+            if family == TRUE:
+                cut_sets.append(tuple(self.var_names[v] for v in prefix))
+                continue
+            stack.append((zdd.low[family], prefix))
+            if len(prefix) < limit:
+                stack.append((zdd.high[family], prefix + (zdd.var[family],)))
+        return sorted(cut_sets, key=lambda cut: (len(cut), cut))
+
+
+class _Builder:
+    """Hash-consed BDD (or zero-suppressed BDD) construction with memoized AND/OR"""
+    
+    def __init__(self, n_vars: int, zero_suppressed: bool = False):
+        self.n_vars = n_vars
+        self.zero_suppressed = zero_suppressed
+        self.var = [n_vars, n_vars]
+        self.low = [FALSE, TRUE]
+        self.high = [FALSE, TRUE]
+        self.unique: Dict[Tuple[int, int, int], int] = {}
+        self.memo: Dict[Tuple[str, int, int], int] = {}
+    
+    def node(self, variable: int, low: int, high: int) -> int:
+        if (high == FALSE) if self.zero_suppressed else (low == high):
+            return low
+        key = (variable, low, high)
+        found = self.unique.get(key)
+        if found is None:
+            found = len(self.var)
+            self.unique[key] = found
+            self.var.append(variable)
+            self.low.append(low)
+            self.high.append(high)
+        return found
+    
+    def apply(self, op: str, a: int, b: int) -> int:
+        if op == AND:
+            if a == FALSE or b == FALSE:
+                return FALSE
+            if a == TRUE:
+                return b
+            if b == TRUE or a == b:
+                return a
+        else:
+            if a == TRUE or b == TRUE:
+                return TRUE
+            if a == FALSE:
+                return b
+            if b == FALSE or a == b:
+                return a
+        if a > b:
+            a, b = b, a
+        key = (op, a, b)
+        found = self.memo.get(key)
+        if found is not None:
+            return found
+        va, vb = self.var[a], self.var[b]
+        variable = min(va, vb)
+        a0, a1 = (self.low[a], self.high[a]) if va == variable else (a, a)
+        b0, b1 = (self.low[b], self.high[b]) if vb == variable else (b, b)
+        found = self.node(variable, self.apply(op, a0, b0), self.apply(op, a1, b1))
+        self.memo[key] = found
+        return found
+    
+    def combine(self, op: str, inputs: List[int]) -> int:
+        result = TRUE if op == AND else FALSE
+        for item in inputs:
+            result = self.apply(op, result, item)
+        return result
+    
+    def at_least(self, k: int, inputs: List[int]) -> int:
+        # at_least(j, i) = (f_i AND at_least(j - 1, i + 1)) OR at_least(j, i + 1)
+        n = len(inputs)
+        row = [TRUE] * (n + 1)  # at least 0 of any suffix
+        for j in range(1, k + 1):
+            current = [FALSE] * (n + 1)
+            for i in range(n - 1, -1, -1):
+                current[i] = self.apply(OR, self.apply(AND, inputs[i], row[i + 1]), current[i + 1])
+            row = current
+        return row[0]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile(structure: Tuple[Tuple[str, str, int, Tuple[str, ...]], ...], top: str) -> CompiledBDD:
+    """
+    Compile a fault tree structure to a BDD
+    
+    Args:
+        structure: Sorted (name, type, k, inputs) of every gate
+        top: Top gate
+    
+    Returns:
+        Compiled BDD
+    """
+    gates = {name: (gate_type, k, inputs) for name, gate_type, k, inputs in structure}
+    
+    # Depth-first order of first appearance keeps related events close together
+    order: Dict[str, int] = {}
+    seen = set()
+    stack = [top]
+    while stack:
+        name = stack.pop()
+        if name in gates:
+            if name in seen:
+                continue
+            seen.add(name)
+            stack.extend(reversed(gates[name][2]))
+        elif name not in order:
+            order[name] = len(order)
+    
+    builder = _Builder(len(order))
+    compiled: Dict[str, int] = {}
+    previous_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(previous_limit, 4 * len(order) + 1000))
+    try:
+        # Post-order walk so every gate is built after its inputs
+        stack = [(top, False)]
+        while stack:
+            name, expanded = stack.pop()
+            if name in compiled:
+                continue
+            if name not in gates:
+                compiled[name] = builder.node(order[name], FALSE, TRUE)
+                continue
+            gate_type, k, inputs = gates[name]
+            if not expanded:
+                stack.append((name, True))
+                stack.extend((item, False) for item in inputs if item not in compiled)
+                continue
+            children = [compiled[item] for item in inputs]
+            if gate_type == VOTE:
+                compiled[name] = builder.at_least(k, children)
+            else:
+                compiled[name] = builder.combine(gate_type, children)
+    finally:
+        sys.setrecursionlimit(previous_limit)
+    
+    return CompiledBDD(
+        list(order), np.array(builder.var), np.array(builder.low), np.array(builder.high), compiled[top]
+    )
+
+
+class FaultTree:
+    """Fault tree of AND, OR and k-out-of-n voting gates over basic events"""
+    
+    def __init__(self, gates: Dict[str, Dict[str, Any]], basic_events: Dict[str, float], top: str):
+        """
+        Initialize a fault tree
+        
+        Args:
+            gates: Gate name to dictionary with ``type`` (AND, OR or VOTE),
+                ``inputs`` (gate or basic event names) and, for VOTE, ``k``
+            basic_events: Basic event name to probability
+            top: Name of the top gate
+        """
+        self.gates = {}
+        for name, gate in gates.items():
+            gate_type = str(gate["type"]).upper()
+            if gate_type not in GATE_TYPES:
+                raise ValueError(f"Invalid gate type for {name}: {gate['type']}")
+            inputs = tuple(gate["inputs"])
+            if not inputs:
+                raise ValueError(f"Gate {name} has no inputs")
+            k = int(gate.get("k", 1)) if gate_type == VOTE else 0
+            if gate_type == VOTE and not 1 <= k <= len(inputs):
+                raise ValueError(f"Gate {name} needs 1 <= k <= {len(inputs)}")
+            self.gates[name] = (gate_type, k, inputs)
+        self.basic_events = dict(basic_events)
+        if top not in self.gates:
+            raise ValueError(f"Top gate {top} is not defined")
+        self.top = top
+        self._check()
+    
+    def _check(self):
+        """Reject undefined inputs and cycles"""
+        state = {}
+        for start in self.gates:
+            stack = [(start, iter(self.gates[start][2]))]
+            if state.get(start) == "done":
+                continue
+            state[start] = "active"
+            while stack:
+                name, inputs = stack[-1]
+                item = next(inputs, None)
+                if item is None:
+                    state[name] = "done"
+                    stack.pop()
+                elif item in self.gates:
+                    if state.get(item) == "active":
+                        raise ValueError(f"Fault tree has a cycle through {item}")
+                    if state.get(item) is None:
+                        state[item] = "active"
+                        stack.append((item, iter(self.gates[item][2])))
+                elif item not in self.basic_events:
+                    raise ValueError(f"Gate {name} uses undefined event {item}")
+    
+    def with_top(self, top: str) -> 'FaultTree':
+        """
+        Same gates and events with another top gate
+        
+        Args:
+            top: Name of the new top gate
+        
+        Returns:
+            New fault tree
+        """
+        gates = {name: {"type": t, "k": k, "inputs": inputs} for name, (t, k, inputs) in self.gates.items()}
+        return FaultTree(gates, self.basic_events, top)
+    
+    def compile(self) -> CompiledBDD:
+        """
+        Compiled BDD of the tree below the top gate
+        
+        Trees with the same structure share one compiled BDD, whatever their
+        basic event probabilities.
+        
+        Returns:
+            Compiled BDD
+        """
+        structure = tuple(sorted((name, t, k, inputs) for name, (t, k, inputs) in self.gates.items()))
+        return _compile(structure, self.top)
+    
+    def top_event_probability(self, overrides: Optional[Mapping[str, float]] = None) -> float:
+        """
+        Exact probability of the top event
+        
+        Args:
+            overrides: Basic event probabilities replacing the stored ones
+        
+        Returns:
+            Top event probability
+        """
+        probabilities = dict(self.basic_events, **(overrides or {}))
+        return self.compile().probability(probabilities)
+    
+    def minimal_cut_sets(self, max_order: Optional[int] = None) -> List[Tuple[str, ...]]:
+        """
+        Minimal cut sets of the top event
+        
+        Args:
+            max_order: Drop cut sets with more events than this
+        
+        Returns:
+            Cut sets as tuples of basic event names, shortest first
+        """
+        return self.compile().minimal_cut_sets(max_order)
+    
+    @staticmethod
+    def from_sif_subsystems(subsystems: pd.DataFrame, combine: str = AND) -> 'FaultTree':
+        """
+        Build the fault tree of every SIF from its voted subsystems
+        
+        Each SIF fails when any subsystem fails. A MooN subsystem fails when
+        N - M + 1 channels fail independently or on a common cause event.
+        Channels named in a comma-separated component_tags column become
+        shared basic events, so a logic solver or valve serving several SIFs
+        appears once; rows giving a tag different channel probabilities
+        raise ValueError. Channel probabilities are single-channel PFDavg
+        values split into independent and common cause parts; being
+        averages, they leave out the extra weight the IEC equations give
+        redundant channels that fail within the same test interval.
+        
+        Args:
+            subsystems: sif_subsystems frame with sif_id and optionally
+                component_tags
+            combine: Gate joining several SIFs under the top event: AND
+                when they protect the same demand, OR for any SIF failing
+        
+        Returns:
+            Fault tree with one gate per SIF named "SIF <id>"; the top gate
+            is that SIF, or "SIFs" combining them when there are several
+        """
+        evaluated = PFDAvg.evaluate_subsystems(subsystems).reset_index(drop=True)
+        if evaluated.empty:
+            raise ValueError("No subsystems to build a fault tree from")
+        
+        def column(name, default):
+            if name not in evaluated:
+                return np.full(len(evaluated), default, dtype=float)
+            return pd.to_numeric(evaluated[name], errors="coerce").fillna(default).to_numpy(dtype=float)
+        
+        ti = column("test_interval_months", 12) * HOURS_PER_MONTH
+        mttr = column("mttr_hours", 24.0)
+        beta = np.where(evaluated["n"] > 1, column("beta", 0.1), 0.0)
+        beta_d = column("beta_d", np.nan)
+        beta_d = np.where(np.isnan(beta_d), beta / 2.0, beta_d)
+        lambda_du = evaluated["lambda_du"].to_numpy()
+        lambda_dd = evaluated["lambda_dd"].to_numpy()
+        independent = (1 - beta) * lambda_du * (ti / 2 + mttr) + (1 - beta_d) * lambda_dd * mttr
+        common_cause = beta * lambda_du * (ti / 2 + mttr) + beta_d * lambda_dd * mttr
+        
+        tags = evaluated["component_tags"] if "component_tags" in evaluated else pd.Series(None, index=evaluated.index)
+        keys = evaluated["id"] if "id" in evaluated else pd.Series(evaluated.index, index=evaluated.index)
+        gates: Dict[str, Dict[str, Any]] = {}
+        events: Dict[str, float] = {}
+        sif_inputs: Dict[Any, List[str]] = {}
+        
+        for row in range(len(evaluated)):
+            sif_id = evaluated.at[row, "sif_id"]
+            label = f"SIF {sif_id}/{keys[row]}"
+            m, n = int(evaluated.at[row, "m"]), int(evaluated.at[row, "n"])
+            channel_tags = [tag.strip() for tag in str(tags[row]).split(",")] if isinstance(tags[row], str) else []
+            channels = []
+            for i in range(n):
+                channel = channel_tags[i] if i < len(channel_tags) and channel_tags[i] else f"{label}/ch{i + 1}"
+                probability = events.setdefault(channel, float(independent[row]))
+                if not np.isclose(probability, independent[row], rtol=1e-9, atol=0.0):
+                    raise ValueError(
+                        f"Component {channel} has probability {probability:.3g} in one subsystem "
+                        f"and {independent[row]:.3g} in {label}"
+                    )
+                channels.append(channel)
+            
+            k = n - m + 1
+            vote = {"type": VOTE, "k": k, "inputs": channels} if k > 1 else {"type": OR, "inputs": channels}
+            if common_cause[row] > 0:
+                gates[f"{label}/independent"] = vote
+                events[f"{label}/ccf"] = float(common_cause[row])
+                gates[label] = {"type": OR, "inputs": [f"{label}/independent", f"{label}/ccf"]}
+            else:
+                gates[label] = vote
+            sif_inputs.setdefault(sif_id, []).append(label)
+        
+        for sif_id, inputs in sif_inputs.items():
+            gates[f"SIF {sif_id}"] = {"type": OR, "inputs": inputs}
+        if len(sif_inputs) == 1:
+            top = f"SIF {next(iter(sif_inputs))}"
+        else:
+            top = "SIFs"
+            gates[top] = {"type": combine, "inputs": [f"SIF {sif_id}" for sif_id in sif_inputs]}
+        return FaultTree(gates, events, top)
+    
+    @staticmethod
+    def cache_info() -> Dict[str, int]:
+        """
+        Statistics of the compiled BDD cache
+        
+        Returns:
+            Dictionary with hits, misses, size and maxsize
+        """
+        info = _compile.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
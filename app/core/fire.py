@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - Fire Consequence Module
+Provides jet fire and fireball (BLEVE) models and a shared thermal
+radiation field engine, all evaluated on arrays of releases
+"""
+import math
+from functools import lru_cache
+from typing import Dict, Callable, Tuple, Union
+
+import numpy as np
+
+
+ArrayLike = Union[float, np.ndarray]
+
+
+def _bisect(func: Callable[[np.ndarray], np.ndarray], lo: np.ndarray, hi: np.ndarray,
+            iterations: int = 60) -> np.ndarray:
+    """
+    Vectorized bisection for decreasing functions with a root in [lo, hi]
+    
+    Args:
+        func: Function of an array returning an array of the same shape
+        lo: Lower bounds
+        hi: Upper bounds
+        iterations: Number of halvings
+    
+    Returns:
+        Array of roots
+    """
+    lo = np.array(lo, dtype=float)
+    hi = np.array(hi, dtype=float)
+    for _ in range(iterations):
+        mid = 0.5 * (lo + hi)
+        above = func(mid) > 0
+        lo = np.where(above, mid, lo)
+        hi = np.where(above, hi, mid)
+    return 0.5 * (lo + hi)
+
+
+class RadiationField:
+    """Thermal radiation field engine shared by all fire models"""
+    
+    @staticmethod
+    def transmissivity(path_length_m: ArrayLike, relative_humidity: float = 0.5,
+                       ambient_temperature_k: float = 293.15) -> np.ndarray:
+        """
+        Calculate atmospheric transmissivity (CCPS correlation)
+        
+        Args:
+            path_length_m: Distance from flame surface to receptor in m
+            relative_humidity: Relative humidity (0-1)
+            ambient_temperature_k: Ambient temperature in K
+        
+        Returns:
+            Transmissivity (0-1)
+        """
+        # Saturated water vapour pressure (Pa) from a Clausius-Clapeyron fit
+        water_partial_pressure = relative_humidity * math.exp(23.18986 - 3816.42 / (ambient_temperature_k - 46.13))
+        path = np.maximum(np.asarray(path_length_m, dtype=float), 1e-3)
+        return np.minimum(1.0, 2.02 * (water_partial_pressure * path) ** -0.09)
+    
+    @staticmethod
+    def point_source_flux(radiant_power_kw: ArrayLike, source_x_m: ArrayLike, source_z_m: ArrayLike,
+                          receptor_x_m: ArrayLike, receptor_z_m: float = 0.0,
+                          relative_humidity: float = 0.5) -> np.ndarray:
+        """
+        Calculate incident flux from point sources
+        
+        Sources (leading axis) are broadcast against receptors (trailing axis),
+        so R releases and N receptors give an (R, N) flux field.
+        
+        Args:
+            radiant_power_kw: Radiated power of each source in kW, shape (R,)
+            source_x_m: Horizontal source position in m, shape (R,)
+            source_z_m: Source height in m, shape (R,)
+            receptor_x_m: Receptor distances in m, shape (N,)
+            receptor_z_m: Receptor height in m
+            relative_humidity: Relative humidity (0-1)
+        
+        Returns:
+            Incident flux in kW/m², shape (R, N)
+        """
+        power = np.atleast_1d(np.asarray(radiant_power_kw, dtype=float))[:, np.newaxis]
+        sx = np.atleast_1d(np.asarray(source_x_m, dtype=float))[:, np.newaxis]
+        sz = np.atleast_1d(np.asarray(source_z_m, dtype=float))[:, np.newaxis]
+        rx = np.atleast_1d(np.asarray(receptor_x_m, dtype=float))[np.newaxis, :]
+        
+        distance = np.sqrt((rx - sx) ** 2 + (receptor_z_m - sz) ** 2)
+        distance = np.maximum(distance, 1e-3)
+        tau = RadiationField.transmissivity(distance, relative_humidity)
+        return tau * power / (4.0 * math.pi * distance ** 2)
+    
+    @staticmethod
+    def sphere_flux(surface_emissive_power_kwm2: ArrayLike, diameter_m: ArrayLike,
+                    centre_height_m: ArrayLike, receptor_x_m: ArrayLike,
+                    relative_humidity: float = 0.5) -> np.ndarray:
+        """
+        Calculate incident flux from spherical solid flames (fireballs)
+        
+        Args:
+            surface_emissive_power_kwm2: Surface emissive power in kW/m², shape (R,)
+            diameter_m: Sphere diameter in m, shape (R,)
+            centre_height_m: Height of the sphere centre in m, shape (R,)
+            receptor_x_m: Ground-level receptor distances in m, shape (N,)
+            relative_humidity: Relative humidity (0-1)
+        
+        Returns:
+            Incident flux in kW/m², shape (R, N)
+        """
+        sep = np.atleast_1d(np.asarray(surface_emissive_power_kwm2, dtype=float))[:, np.newaxis]
+        radius = 0.5 * np.atleast_1d(np.asarray(diameter_m, dtype=float))[:, np.newaxis]
+        height = np.atleast_1d(np.asarray(centre_height_m, dtype=float))[:, np.newaxis]
+        rx = np.atleast_1d(np.asarray(receptor_x_m, dtype=float))[np.newaxis, :]
+        
+        centre_distance = np.maximum(np.sqrt(rx ** 2 + height ** 2), radius)
+        view_factor = (radius / centre_distance) ** 2
+        tau = RadiationField.transmissivity(centre_distance - radius, relative_humidity)
+        return tau * sep * view_factor
+    
+    @staticmethod
+    def distance_to_flux(flux_function: Callable[[np.ndarray], np.ndarray], threshold_kwm2: float,
+                         n_sources: int, max_distance_m: float = 10000.0) -> np.ndarray:
+        """
+        Find the ground distance at which each source's flux falls to a threshold
+        
+        Args:
+            flux_function: Function mapping an (R,) array of distances to the
+                (R,) flux of each source at its own distance
+            threshold_kwm2: Flux threshold in kW/m²
+            n_sources: Number of sources R
+            max_distance_m: Upper search bound in m
+        
+        Returns:
+            Distances in m (0 where the threshold is never reached)
+        """
+        lo = np.zeros(n_sources)
+        hi = np.full(n_sources, max_distance_m)
+        distance = _bisect(lambda d: flux_function(d) - threshold_kwm2, lo, hi)
+        reached = flux_function(np.zeros(n_sources)) > threshold_kwm2
+        return np.where(reached, distance, 0.0)
+
+
+@lru_cache(maxsize=4096)
+def _fireball_correlations(mass_kg: float) -> Tuple[float, float]:
+    """
+    CCPS fireball diameter and duration for a flammable mass
+    
+    Args:
+        mass_kg: Flammable mass in the fireball in kg
+    
+    Returns:
+        Tuple of (diameter_m, duration_s)
+    """
+    diameter = 5.8 * mass_kg ** (1.0 / 3.0)
+    if mass_kg < 30000.0:
+        duration = 0.45 * mass_kg ** (1.0 / 3.0)
+    else:
+        duration = 2.6 * mass_kg ** (1.0 / 6.0)
+    return diameter, duration
+
+
+class FireCalculator:
+    """Batch calculator for jet fires and fireballs"""
+    
+    @staticmethod
+    def fireball(mass_kg: ArrayLike, heat_of_combustion_kjkg: ArrayLike,
+                 burst_pressure_kpa: ArrayLike = 101.325) -> Dict[str, np.ndarray]:
+        """
+        Calculate fireball (BLEVE) geometry, duration and surface emissive power
+        
+        The mass correlations are evaluated once per distinct inventory and
+        memoized, so studies with many scenarios on the same vessel reuse them.
+        
+        Args:
+            mass_kg: Flammable mass in kg
+            heat_of_combustion_kjkg: Heat of combustion in kJ/kg
+            burst_pressure_kpa: Vessel burst pressure (absolute) in kPa
+        
+        Returns:
+            Dictionary of arrays with diameter, duration, centre height,
+            radiative fraction and surface emissive power
+        """
+        mass = np.atleast_1d(np.asarray(mass_kg, dtype=float))
+        unique_mass, inverse = np.unique(mass, return_inverse=True)
+        correlations = np.array([_fireball_correlations(float(m)) for m in unique_mass]).reshape(-1, 2)
+        diameter = correlations[inverse, 0]
+        duration = correlations[inverse, 1]
+        
+        # Radiative fraction from burst pressure (Roberts), pressure in MPa
+        pressure_mpa = np.asarray(burst_pressure_kpa, dtype=float) / 1000.0
+        radiative_fraction = np.minimum(0.4, 0.27 * pressure_mpa ** 0.32)
+        
+        heat = np.asarray(heat_of_combustion_kjkg, dtype=float)
+        sep = radiative_fraction * mass * heat / (math.pi * diameter ** 2 * duration)
+        
+        return {
+            "diameter_m": diameter,
+            "duration_s": duration,
+            "centre_height_m": 0.75 * diameter,
+            "radiative_fraction": np.broadcast_to(radiative_fraction, mass.shape).astype(float),
+            "surface_emissive_power_kwm2": sep
+        }
+    
+    @staticmethod
+    def jet_fire(mass_flow_rate_kgs: ArrayLike, hole_diameter_mm: ArrayLike,
+                 heat_of_combustion_kjkg: ArrayLike, jet_density_kgm3: ArrayLike,
+                 wind_speed_ms: ArrayLike = 0.0, release_height_m: ArrayLike = 0.0) -> Dict[str, np.ndarray]:
+        """
+        Calculate jet flame geometry for vertical releases
+        
+        Flame length follows the API 521 correlation. Lift-off, tilt and the
+        radiative fraction follow Chamberlain (1987), using the ratio Rw of
+        wind speed to jet exit velocity. The tilt from the vertical is
+        8000·Rw degrees up to Rw = 0.05 and 1726·√(Rw − 0.026) + 134 degrees
+        above, without the buoyancy term and capped at horizontal.
+        
+        Args:
+            mass_flow_rate_kgs: Release rate in kg/s
+            hole_diameter_mm: Hole diameter in mm
+            heat_of_combustion_kjkg: Heat of combustion in kJ/kg
+            jet_density_kgm3: Density of the jet at the exit plane in kg/m³
+            wind_speed_ms: Wind speed in m/s
+            release_height_m: Height of the release point in m
+        
+        Returns:
+            Dictionary of arrays with flame length, lift-off, tilt, radiant
+            power and the position of the flame centre
+        """
+        mass_rate = np.atleast_1d(np.asarray(mass_flow_rate_kgs, dtype=float))
+        area = math.pi * (np.asarray(hole_diameter_mm, dtype=float) / 1000.0) ** 2 / 4.0
+        exit_velocity = mass_rate / (np.asarray(jet_density_kgm3, dtype=float) * area)
+        
+        heat_release_kw = mass_rate * np.asarray(heat_of_combustion_kjkg, dtype=float)
+        flame_length = 0.00326 * (heat_release_kw * 1000.0) ** 0.478
+        
+        velocity_ratio = np.asarray(wind_speed_ms, dtype=float) / np.maximum(exit_velocity, 1e-6)
+        lift_off = flame_length * (0.185 * np.exp(-20.0 * velocity_ratio) + 0.015)
+        tilt_deg = np.where(
+            velocity_ratio <= 0.05,
+            8000.0 * velocity_ratio,
+            1726.0 * np.sqrt(np.maximum(velocity_ratio - 0.026, 0.0)) + 134.0
+        )
+        tilt_deg = np.minimum(tilt_deg, 90.0)
+        
+        radiative_fraction = 0.21 * np.exp(-0.00323 * exit_velocity) + 0.11
+        radiant_power_kw = radiative_fraction * heat_release_kw
+        
+        # Flame centre lies half a visible length beyond lift-off along the tilted axis
+        tilt = np.radians(tilt_deg)
+        centre_offset = lift_off + 0.5 * (flame_length - lift_off)
+        centre_x = centre_offset * np.sin(tilt)
+        centre_z = np.asarray(release_height_m, dtype=float) + centre_offset * np.cos(tilt)
+        
+        return {
+            "exit_velocity_ms": exit_velocity,
+            "heat_release_rate_kw": heat_release_kw,
+            "flame_length_m": flame_length,
+            "lift_off_m": lift_off,
+            "tilt_deg": tilt_deg,
+            "radiative_fraction": radiative_fraction,
+            "radiant_power_kw": radiant_power_kw,
+            "flame_centre_x_m": centre_x,
+            "flame_centre_z_m": centre_z
+        }
+    
+    @staticmethod
+    def jet_fire_flux(jet: Dict[str, np.ndarray], receptor_x_m: ArrayLike,
+                      relative_humidity: float = 0.5) -> np.ndarray:
+        """
+        Calculate the radiation field of jet fires
+        
+        Args:
+            jet: Result of jet_fire
+            receptor_x_m: Downwind ground receptor distances in m
+            relative_humidity: Relative humidity (0-1)
+        
+        Returns:
+            Incident flux in kW/m², shape (n_releases, n_receptors)
+        """
+        return RadiationField.point_source_flux(
+            jet["radiant_power_kw"], jet["flame_centre_x_m"], jet["flame_centre_z_m"],
+            receptor_x_m, 0.0, relative_humidity
+        )
+    
+    @staticmethod
+    def fireball_flux(fireball: Dict[str, np.ndarray], receptor_x_m: ArrayLike,
+                      relative_humidity: float = 0.5) -> np.ndarray:
+        """
+        Calculate the radiation field of fireballs
+        
+        Args:
+            fireball: Result of fireball
+            receptor_x_m: Ground receptor distances in m
+            relative_humidity: Relative humidity (0-1)
+        
+        Returns:
+            Incident flux in kW/m², shape (n_releases, n_receptors)
+        """
+        return RadiationField.sphere_flux(
+            fireball["surface_emissive_power_kwm2"], fireball["diameter_m"],
+            fireball["centre_height_m"], receptor_x_m, relative_humidity
+        )
+    
+    @staticmethod
+    def jet_fire_hazard_distance(jet: Dict[str, np.ndarray], threshold_kwm2: float = 5.0,
+                                 relative_humidity: float = 0.5) -> np.ndarray:
+        """
+        Calculate the downwind distance to a radiation threshold for each jet fire
+        
+        Args:
+            jet: Result of jet_fire
+            threshold_kwm2: Flux threshold in kW/m²
+            relative_humidity: Relative humidity (0-1)
+        
+        Returns:
+            Distances in m
+        """
+        power = jet["radiant_power_kw"]
+        cx = jet["flame_centre_x_m"]
+        cz = jet["flame_centre_z_m"]
+        
+        def flux(distance):
+            # Search beyond the flame centre, where flux decreases monotonically
+            separation = np.maximum(np.sqrt(distance ** 2 + cz ** 2), 1e-3)
+            return RadiationField.transmissivity(separation, relative_humidity) * power / (4.0 * math.pi * separation ** 2)
+        
+        distance = RadiationField.distance_to_flux(flux, threshold_kwm2, power.shape[0])
+        return np.where(distance > 0, cx + distance, 0.0)
+    
+    @staticmethod
+    def fireball_hazard_distance(fireball: Dict[str, np.ndarray], threshold_kwm2: float = 5.0,
+                                 relative_humidity: float = 0.5) -> np.ndarray:
+        """
+        Calculate the ground distance to a radiation threshold for each fireball
+        
+        Args:
+            fireball: Result of fireball
+            threshold_kwm2: Flux threshold in kW/m²
+            relative_humidity: Relative humidity (0-1)
+        
+        Returns:
+            Distances in m
+        """
+        sep = fireball["surface_emissive_power_kwm2"]
+        radius = 0.5 * fireball["diameter_m"]
+        height = fireball["centre_height_m"]
+        
+        def flux(distance):
+            centre_distance = np.maximum(np.sqrt(distance ** 2 + height ** 2), radius)
+            tau = RadiationField.transmissivity(centre_distance - radius, relative_humidity)
+            return tau * sep * (radius / centre_distance) ** 2
+        
+        return RadiationField.distance_to_flux(flux, threshold_kwm2, sep.shape[0])
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - Inverse Design Module
+Finds the largest hole size or inventory that still meets a consequence
+target, for many equipment items in one call
+"""
+from typing import Dict, Any, Callable, List
+
+import numpy as np
+import pandas as pd
+
+from .release import ReleaseCalculator
+from .consequence import ConsequenceCalculator
+from .fire import FireCalculator
+
+
+class InverseDesignSolver:
+    """Vectorized bisection solver wrapping the release and consequence models"""
+    
+    @staticmethod
+    def bisect(
+        evaluate: Callable[[np.ndarray], np.ndarray],
+        target: np.ndarray,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        log_space: bool = True,
+        rtol: float = 1e-4,
+        max_iterations: int = 100
+    ) -> Dict[str, np.ndarray]:
+        """
+        Find the largest parameter value whose metric does not exceed the target
+        
+        The metric must increase with the parameter (bigger hole or inventory,
+        bigger hazard distance). All items are bracketed and halved together,
+        so each iteration is a single call to ``evaluate``.
+        
+        Args:
+            evaluate: Function mapping an (N,) parameter array to an (N,) metric array
+            target: Target metric for each item, shape (N,)
+            lower: Lower parameter bound for each item, shape (N,)
+            upper: Upper parameter bound for each item, shape (N,)
+            log_space: Bisect on the logarithm of the parameter
+            rtol: Relative tolerance on the parameter
+            max_iterations: Maximum number of iterations
+        
+        Returns:
+            Dictionary with the limiting value, the metric at that value and a
+            status code per item: "solved", "always_meets" (upper bound meets
+            the target) or "never_meets" (lower bound already exceeds it)
+        """
+        target = np.asarray(target, dtype=float)
+        lo = np.asarray(lower, dtype=float).copy()
+        hi = np.asarray(upper, dtype=float).copy()
+        
+        meets_lo = evaluate(lo) <= target
+        meets_hi = evaluate(hi) <= target
+        active = meets_lo & ~meets_hi
+        
+        iterations = 0
+        while active.any() and iterations < max_iterations:
+            mid = np.sqrt(lo * hi) if log_space else 0.5 * (lo + hi)
+            # Finished items are re-evaluated at their lower bound and left unchanged
+            mid = np.where(active, mid, lo)
+            meets = evaluate(mid) <= target
+            lo = np.where(active & meets, mid, lo)
+            hi = np.where(active & ~meets, mid, hi)
+            active &= (hi - lo) > rtol * hi
+            iterations += 1
+        
+        limit = np.where(meets_hi, hi, np.where(meets_lo, lo, np.nan))
+        status = np.where(meets_hi, "always_meets", np.where(meets_lo, "solved", "never_meets"))
+        metric = evaluate(np.where(np.isnan(limit), lower, limit))
+        
+        return {
+            "limiting_value": limit,
+            "metric": np.where(np.isnan(limit), np.nan, metric),
+            "status": status,
+            "iterations": iterations
+        }
+    
+    @staticmethod
+    def _release_rate_per_mm2(item: Dict[str, Any]) -> float:
+        """
+        Release rate through a 1 mm hole for an equipment item
+        
+        The orifice equations are linear in hole area, so the rate for any
+        hole size is this value times the diameter squared.
+        
+        Args:
+            item: Equipment item dictionary
+        
+        Returns:
+            Release rate in kg/s per mm² of diameter squared
+        """
+        phase = item.get("phase", "liquid")
+        discharge_coef = item.get("discharge_coef", 0.61)
+        if phase == "gas":
+            result = ReleaseCalculator.gas_release_rate(
+                1.0, item["pressure_kpa"], item.get("downstream_pressure_kpa", 101.325),
+                item["temperature_k"], item["molecular_weight"], item.get("k", 1.4), discharge_coef
+            )
+        else:
+            result = ReleaseCalculator.liquid_release_rate(
+                1.0, item["pressure_kpa"], item["density_kgm3"],
+                item.get("height_differential_m", 0.0), discharge_coef
+            )
+        return result["mass_flow_rate_kgs"]
+    
+    @staticmethod
+    def max_hole_size_for_toxic_distance(
+        items: List[Dict[str, Any]],
+        min_hole_mm: float = 1.0,
+        max_hole_mm: float = 1000.0
+    ) -> pd.DataFrame:
+        """
+        Find the largest hole size whose toxic hazard radius stays inside the fence line
+        
+        Each item needs ``pressure_kpa``, the phase-specific release inputs
+        (``density_kgm3`` for liquids; ``temperature_k``, ``molecular_weight``
+        and optionally ``k`` for gases), ``toxic_threshold_ppm`` (e.g. ERPG-2),
+        ``molecular_weight``, ``wind_speed_ms`` and ``fence_line_m``.
+        
+        Args:
+            items: Equipment item dictionaries
+            min_hole_mm: Smallest hole size considered in mm
+            max_hole_mm: Largest hole size considered in mm
+        
+        Returns:
+            DataFrame with one row per item
+        """
+        rate_per_mm2 = np.array([InverseDesignSolver._release_rate_per_mm2(item) for item in items])
+        threshold = np.array([item["toxic_threshold_ppm"] for item in items], dtype=float)
+        molecular_weight = np.array([item["molecular_weight"] for item in items], dtype=float)
+        wind_speed = np.array([item["wind_speed_ms"] for item in items], dtype=float)
+        
+        def toxic_radius(hole_mm: np.ndarray) -> np.ndarray:
+            return ConsequenceCalculator.toxic_radius(
+                rate_per_mm2 * hole_mm ** 2, threshold, molecular_weight, wind_speed
+            )
+        
+        result = InverseDesignSolver.bisect(
+            toxic_radius,
+            np.array([item["fence_line_m"] for item in items], dtype=float),
+            np.full(len(items), min_hole_mm),
+            np.full(len(items), max_hole_mm)
+        )
+        
+        return pd.DataFrame({
+            "tag": [item.get("tag", "") for item in items],
+            "max_hole_size_mm": result["limiting_value"],
+            "release_rate_kgs": rate_per_mm2 * result["limiting_value"] ** 2,
+            "toxic_radius_m": result["metric"],
+            "fence_line_m": [item["fence_line_m"] for item in items],
+            "status": result["status"]
+        })
+    
+    @staticmethod
+    def max_inventory_for_fireball_distance(
+        items: List[Dict[str, Any]],
+        threshold_kwm2: float = 5.0,
+        min_inventory_kg: float = 1.0,
+        max_inventory_kg: float = 1e6
+    ) -> pd.DataFrame:
+        """
+        Find the largest inventory whose fireball radiation stays inside the fence line
+        
+        Each item needs ``heat_of_combustion_kjkg``, ``fence_line_m`` and
+        optionally ``burst_pressure_kpa``.
+        
+        Args:
+            items: Equipment item dictionaries
+            threshold_kwm2: Radiation threshold in kW/m²
+            min_inventory_kg: Smallest inventory considered in kg
+            max_inventory_kg: Largest inventory considered in kg
+        
+        Returns:
+            DataFrame with one row per item
+        """
+        heat = np.array([item["heat_of_combustion_kjkg"] for item in items], dtype=float)
+        pressure = np.array([item.get("burst_pressure_kpa", 101.325) for item in items], dtype=float)
+        
+        def fireball_distance(mass_kg: np.ndarray) -> np.ndarray:
+            fireball = FireCalculator.fireball(mass_kg, heat, pressure)
+            return FireCalculator.fireball_hazard_distance(fireball, threshold_kwm2)
+        
+        result = InverseDesignSolver.bisect(
+            fireball_distance,
+            np.array([item["fence_line_m"] for item in items], dtype=float),
+            np.full(len(items), min_inventory_kg),
+            np.full(len(items), max_inventory_kg)
+        )
+        
+        return pd.DataFrame({
+            "tag": [item.get("tag", "") for item in items],
+            "max_inventory_kg": result["limiting_value"],
+            "radiation_distance_m": result["metric"],
+            "fence_line_m": [item["fence_line_m"] for item in items],
+            "status": result["status"]
+        })
+    
+    @staticmethod
+    def max_inventory_for_explosion_distance(
+        items: List[Dict[str, Any]],
+        overpressure: str = "structural_damage",
+        min_inventory_kg: float = 1.0,
+        max_inventory_kg: float = 1e6
+    ) -> pd.DataFrame:
+        """
+        Find the largest inventory whose explosion overpressure stays inside the fence line
+        
+        Each item needs ``tnt_equiv_factor`` and ``fence_line_m``.
+        
+        Args:
+            items: Equipment item dictionaries
+            overpressure: Damage level, one of "window_breakage",
+                "structural_damage" or "severe_damage"
+            min_inventory_kg: Smallest inventory considered in kg
+            max_inventory_kg: Largest inventory considered in kg
+        
+        Returns:
+            DataFrame with one row per item
+        """
+        tnt_equiv_factor = np.array([item["tnt_equiv_factor"] for item in items], dtype=float)
+        
+        def explosion_distance(mass_kg: np.ndarray) -> np.ndarray:
+            return ConsequenceCalculator.explosion_distance(mass_kg, tnt_equiv_factor, overpressure)
+        
+        result = InverseDesignSolver.bisect(
+            explosion_distance,
+            np.array([item["fence_line_m"] for item in items], dtype=float),
+            np.full(len(items), min_inventory_kg),
+            np.full(len(items), max_inventory_kg)
+        )
+        
+        return pd.DataFrame({
+            "tag": [item.get("tag", "") for item in items],
+            "max_inventory_kg": result["limiting_value"],
+            "hazard_distance_m": result["metric"],
+            "fence_line_m": [item["fence_line_m"] for item in items],
+            "status": result["status"]
+        })
@@ -6,6 +6,7 @@ Provides classes and methods for defining and calculating IPL credits
 from enum import Enum
 from typing import Dict, List, Any, Optional, Union, Tuple
 import math
+import itertools
 
 
 class IPLType(Enum):
@@ -38,9 +39,27 @@ class SIL(Enum):
     SIL_4 = 4
 
 
+# Value lookups so string coercion in constructors is a dictionary hit
+_IPL_TYPES = {t.value: t for t in IPLType}
+_IPL_CATEGORIES = {c.value: c for c in IPLCategory}
+_SILS = {s.value: s for s in SIL}
+
+# Process-wide change stamps: every edit of an IPL, IPL list or modifier dict
+# takes the next value, so the newest stamp among a scenario's inputs grows
+# whenever any of them changes. New objects start at 0 and scenarios drop
+# their cache when a container is replaced.
+_versions = itertools.count(1)
+
+
 class IPL:
     """Independent Protection Layer Class"""
     
+    __slots__ = (
+        "id", "name", "description", "ipl_type", "category", "_pfd", "_is_enabled",
+        "sil", "audit_frequency_months", "lifecycle_status", "validation_date",
+        "notes", "scenario_id", "equipment_tag", "sensor_tag", "_version"
+    )
+    
     def __init__(
         self,
         id: Optional[int] = None,
@@ -55,7 +74,9 @@ class IPL:
         lifecycle_status: str = "Active",
         validation_date: Optional[str] = None,
         notes: str = "",
-        scenario_id: Optional[int] = None
+        scenario_id: Optional[int] = None,
+        equipment_tag: str = "",
+        sensor_tag: str = ""
     ):
         """
         Initialize an Independent Protection Layer
@@ -74,47 +95,43 @@ class IPL:
             validation_date: Date of last validation
             notes: Additional notes
             scenario_id: ID of the associated scenario
+            equipment_tag: Tag of the final element or device the IPL relies on
+            sensor_tag: Tag of the sensor the IPL relies on
         """
+        # Change stamp of the PFD and enabled state, see _versions
+        self._version = 0
+        
         self.id = id
         self.name = name
         self.description = description
         
         # Handle string or enum for type
         if isinstance(ipl_type, str):
-            try:
-                self.ipl_type = IPLType(ipl_type)
-            except ValueError:
-                self.ipl_type = IPLType.OTHER
+            self.ipl_type = _IPL_TYPES.get(ipl_type, IPLType.OTHER)
         else:
             self.ipl_type = ipl_type
         
         # Handle string or enum for category
         if isinstance(category, str):
-            try:
-                self.category = IPLCategory(category)
-            except ValueError:
-                self.category = IPLCategory.PREVENTION
+            self.category = _IPL_CATEGORIES.get(category, IPLCategory.PREVENTION)
         else:
             self.category = category
         
         # Validate PFD is between 0 and 1
         if pfd < 0:
-            self.pfd = 0.0
+            self._pfd = 0.0
         elif pfd > 1:
-            self.pfd = 1.0
+            self._pfd = 1.0
         else:
-            self.pfd = pfd
+            self._pfd = pfd
         
-        self.is_enabled = is_enabled
+        self._is_enabled = is_enabled
         
         # Handle SIL assignment
         if sil is None:
             self.sil = None
         elif isinstance(sil, int):
-            try:
-                self.sil = SIL(sil)
-            except ValueError:
-                self.sil = None
+            self.sil = _SILS.get(sil)
         else:
             self.sil = sil
         
@@ -123,6 +140,28 @@ class IPL:
         self.validation_date = validation_date
         self.notes = notes
         self.scenario_id = scenario_id
+        self.equipment_tag = equipment_tag
+        self.sensor_tag = sensor_tag
+    
+    @property
+    def pfd(self) -> float:
+        """Probability of Failure on Demand"""
+        return self._pfd
+    
+    @pfd.setter
+    def pfd(self, value: float):
+        self._pfd = value
+        self._version = next(_versions)
+    
+    @property
+    def is_enabled(self) -> bool:
+        """Whether this IPL is credited in calculations"""
+        return self._is_enabled
+    
+    @is_enabled.setter
+    def is_enabled(self, value: bool):
+        self._is_enabled = value
+        self._version = next(_versions)
     
     @property
     def rrF(self) -> float:
@@ -197,15 +236,17 @@ class IPL:
             "description": self.description,
             "ipl_type": self.ipl_type.value if self.ipl_type else None,
             "category": self.category.value if self.category else None,
-            "pfd": self.pfd,
-            "rrF": self.rrF,
-            "is_enabled": self.is_enabled,
+            "pfd": self._pfd,
+            "rrF": 1.0 / self._pfd if self._pfd > 0 else float('inf'),
+            "is_enabled": self._is_enabled,
             "sil": self.sil.value if self.sil else None,
             "audit_frequency_months": self.audit_frequency_months,
             "lifecycle_status": self.lifecycle_status,
             "validation_date": self.validation_date,
             "notes": self.notes,
-            "scenario_id": self.scenario_id
+            "scenario_id": self.scenario_id,
+            "equipment_tag": self.equipment_tag,
+            "sensor_tag": self.sensor_tag
         }
     
     @classmethod
@@ -258,7 +299,9 @@ class IPL:
             lifecycle_status=data.get('lifecycle_status', 'Active'),
             validation_date=data.get('validation_date'),
             notes=data.get('notes', ''),
-            scenario_id=data.get('scenario_id')
+            scenario_id=data.get('scenario_id'),
+            equipment_tag=data.get('equipment_tag') or '',
+            sensor_tag=data.get('sensor_tag') or ''
         )
 
 
@@ -384,9 +427,56 @@ class LOPACalculator:
         return (required_sil, required_pfd)
 
 
+def _versioned(base: type, name: str):
+    """Wrap a container mutator so it stamps the container with a new version"""
+    method = getattr(base, name)
+    
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self.version = next(_versions)
+        return result
+    
+    wrapper.__name__ = name
+    return wrapper
+
+
+class _IPLList(list):
+    """List of IPLs stamped with a new version on every change"""
+    
+    __slots__ = ("version",)
+    
+    def __reduce__(self):
+        # Copies and pickles are plain lists; the scenario rewraps them
+        return (list, (list(self),))
+
+
+class _ModifierDict(dict):
+    """Conditional modifiers stamped with a new version on every change"""
+    
+    __slots__ = ("version",)
+    
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+              "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(_IPLList, _name, _versioned(list, _name))
+for _name in ("__setitem__", "__delitem__", "clear", "pop", "popitem", "setdefault", "update", "__ior__"):
+    setattr(_ModifierDict, _name, _versioned(dict, _name))
+
+
 class LOPAScenario:
     """Layer of Protection Analysis Scenario"""
     
+    __slots__ = (
+        "id", "scenario_id", "description", "node_id", "consequence_description",
+        "consequence_category", "consequence_severity", "initiating_event",
+        "_initiating_event_frequency", "initiating_event_basis", "_ipls",
+        "_conditional_modifiers", "target_mitigated_frequency", "notes",
+        "initiating_event_tag", "_mitigated_frequency", "_cached_version"
+    )
+    
     def __init__(
         self,
         id: Optional[int] = None,
@@ -402,7 +492,8 @@ class LOPAScenario:
         ipls: List[IPL] = None,
         conditional_modifiers: Dict[str, float] = None,
         target_mitigated_frequency: float = 1e-5,
-        notes: str = ""
+        notes: str = "",
+        initiating_event_tag: str = ""
     ):
         """
         Initialize a LOPA Scenario
@@ -422,7 +513,12 @@ class LOPAScenario:
             conditional_modifiers: Dictionary of conditional modifiers {name: value}
             target_mitigated_frequency: Target frequency after mitigations (events/year)
             notes: Additional notes
+            initiating_event_tag: Tag of the equipment whose failure initiates the event
         """
+        # Cached mitigated frequency and the input version it was computed under
+        self._mitigated_frequency = None
+        self._cached_version = -1
+        
         self.id = id
         self.scenario_id = scenario_id
         self.description = description
@@ -431,34 +527,117 @@ class LOPAScenario:
         self.consequence_category = consequence_category
         self.consequence_severity = consequence_severity
         self.initiating_event = initiating_event
-        self.initiating_event_frequency = initiating_event_frequency
+        self._initiating_event_frequency = initiating_event_frequency
         self.initiating_event_basis = initiating_event_basis
-        self.ipls = ipls or []
-        self.conditional_modifiers = conditional_modifiers or {}
+        # Plain copies until first handed out, see the ipls and
+        # conditional_modifiers properties
+        self._ipls = list(ipls) if ipls else []
+        self._conditional_modifiers = dict(conditional_modifiers) if conditional_modifiers else {}
         self.target_mitigated_frequency = target_mitigated_frequency
         self.notes = notes
+        self.initiating_event_tag = initiating_event_tag
+    
+    @property
+    def initiating_event_frequency(self) -> float:
+        """Frequency of the initiating event (events/year)"""
+        return self._initiating_event_frequency
+    
+    @initiating_event_frequency.setter
+    def initiating_event_frequency(self, value: float):
+        self._initiating_event_frequency = value
+        self._invalidate()
+    
+    @property
+    def ipls(self) -> List[IPL]:
+        """IPLs credited against this scenario"""
+        ipls = self._ipls
+        if ipls.__class__ is not _IPLList:
+            # Only a list that has been handed out can change behind our back
+            ipls = self._ipls = _IPLList(ipls)
+            ipls.version = 0
+        return ipls
+    
+    @ipls.setter
+    def ipls(self, value: List[IPL]):
+        self._ipls = list(value)
+        self._invalidate()
+    
+    @property
+    def conditional_modifiers(self) -> Dict[str, float]:
+        """Conditional modifiers {name: value}"""
+        modifiers = self._conditional_modifiers
+        if modifiers.__class__ is not _ModifierDict:
+            modifiers = self._conditional_modifiers = _ModifierDict(modifiers)
+            modifiers.version = 0
+        return modifiers
+    
+    @conditional_modifiers.setter
+    def conditional_modifiers(self, value: Dict[str, float]):
+        self._conditional_modifiers = dict(value)
+        self._invalidate()
+    
+    def _input_version(self) -> int:
+        """Newest change stamp of the IPL list, the modifiers and the IPLs"""
+        ipls, modifiers = self._ipls, self._conditional_modifiers
+        version = ipls.version if ipls.__class__ is _IPLList else 0
+        if modifiers.__class__ is _ModifierDict and modifiers.version > version:
+            version = modifiers.version
+        for ipl in ipls:
+            stamp = getattr(ipl, "_version", 0)
+            if stamp > version:
+                version = stamp
+        return version
+    
+    def _invalidate(self):
+        """Drop cached results"""
+        self._mitigated_frequency = None
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        state = {
+            slot: getattr(self, slot) for slot in LOPAScenario.__slots__
+            if not slot.startswith("_")
+        }
+        state["initiating_event_frequency"] = self._initiating_event_frequency
+        state["ipls"] = list(self._ipls)
+        state["conditional_modifiers"] = dict(self._conditional_modifiers)
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        self._mitigated_frequency = None
+        self._cached_version = -1
+        for name, value in state.items():
+            setattr(self, name, value)
     
     @property
     def mitigated_frequency(self) -> float:
         """
         Calculate the mitigated event frequency
         
+        The result is cached until the initiating frequency, the IPL list,
+        an IPL's PFD or enabled state, or the conditional modifiers change.
+        
         Returns:
             Mitigated event frequency (events/year)
         """
+        version = self._input_version()
+        if self._mitigated_frequency is not None and version == self._cached_version:
+            return self._mitigated_frequency
+        
         # Calculate and round to avoid floating point precision issues
         result = LOPACalculator.calculate_mitigated_frequency(
-            self.initiating_event_frequency,
-            self.ipls,
-            list(self.conditional_modifiers.values())
+            self._initiating_event_frequency,
+            self._ipls,
+            list(self._conditional_modifiers.values())
         )
         
         # For test cases that expect exact values like 0.0001 or 0.00001
         if abs(result - 1e-4) < 1e-10:
-            return 1e-4
+            result = 1e-4
         elif abs(result - 1e-5) < 1e-10:
-            return 1e-5
-            
+            result = 1e-5
+        
+        self._mitigated_frequency = result
+        self._cached_version = version
         return result
     
     @property
@@ -469,9 +648,13 @@ class LOPAScenario:
         Returns:
             Risk reduction factor
         """
+        return self._risk_reduction_factor(self.mitigated_frequency)
+    
+    def _risk_reduction_factor(self, mitigated: float) -> float:
+        """Risk reduction factor for an already computed mitigated frequency"""
         result = LOPACalculator.calculate_risk_reduction_factor(
-            self.initiating_event_frequency,
-            self.mitigated_frequency
+            self._initiating_event_frequency,
+            mitigated
         )
         
         # For test cases that expect exact values
@@ -499,13 +682,9 @@ class LOPAScenario:
         Returns:
             Dictionary representation of the LOPA Scenario
         """
-        # We need to handle the mitigated frequency to match test expectations
+        # Computed once; the derived values below reuse it
         mitigated = self.mitigated_frequency
         
-        # For test cases that expect exact values
-        if abs(mitigated - 1e-5) < 1e-10:
-            mitigated = 1e-5
-            
         return {
             "id": self.id,
             "scenario_id": self.scenario_id,
@@ -515,15 +694,16 @@ class LOPAScenario:
             "consequence_category": self.consequence_category,
             "consequence_severity": self.consequence_severity,
             "initiating_event": self.initiating_event,
-            "initiating_event_frequency": self.initiating_event_frequency,
+            "initiating_event_frequency": self._initiating_event_frequency,
             "initiating_event_basis": self.initiating_event_basis,
-            "ipls": [ipl.to_dict() for ipl in self.ipls],
-            "conditional_modifiers": self.conditional_modifiers,
+            "ipls": [ipl.to_dict() for ipl in self._ipls],
+            "conditional_modifiers": dict(self._conditional_modifiers),
             "target_mitigated_frequency": self.target_mitigated_frequency,
             "mitigated_frequency": mitigated,
-            "risk_reduction_factor": self.risk_reduction_factor,
-            "meets_target": self.meets_target,
-            "notes": self.notes
+            "risk_reduction_factor": self._risk_reduction_factor(mitigated),
+            "meets_target": mitigated <= self.target_mitigated_frequency,
+            "notes": self.notes,
+            "initiating_event_tag": self.initiating_event_tag
         }
     
     @classmethod
@@ -573,5 +753,6 @@ class LOPAScenario:
             ipls=ipls,
             conditional_modifiers=data.get('conditional_modifiers', {}),
             target_mitigated_frequency=target_frequency,
-            notes=data.get('notes', '')
+            notes=data.get('notes', ''),
+            initiating_event_tag=data.get('initiating_event_tag') or ''
         ) 
\ No newline at end of file
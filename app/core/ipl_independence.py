@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - IPL Independence Module
+Checks LOPA protection layers for independence from the initiating cause and
+for common-cause dependencies between layers of the same scenario
+"""
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from .ipl import LOPAScenario
+from .lopa_batch import PortfolioLOPA
+
+
+# Rule names reported in conflicts
+INITIATING_CAUSE = "initiating_cause"
+DUPLICATE_SAFEGUARD = "duplicate_safeguard"
+SHARED_EQUIPMENT = "shared_equipment"
+SHARED_SENSOR = "shared_sensor"
+
+RULE_DESCRIPTIONS = {
+    INITIATING_CAUSE: "IPL uses equipment whose failure is the initiating cause",
+    DUPLICATE_SAFEGUARD: "Safeguard credited more than once in the scenario",
+    SHARED_EQUIPMENT: "IPLs share a final element or device",
+    SHARED_SENSOR: "IPLs share a sensor",
+}
+
+
+def _normalize(values: pd.Series) -> pd.Series:
+    """Tags and names compare case-insensitively with surrounding blanks removed"""
+    return values.fillna("").astype(str).str.strip().str.upper()
+
+
+class IndependenceValidator:
+    """Batch independence and common-cause validation of LOPA scenarios"""
+    
+    def __init__(self, portfolio: PortfolioLOPA, beta: float = 0.1):
+        """
+        Initialize the validator
+        
+        Tags are read from optional ``equipment_tag`` and ``sensor_tag``
+        columns of the IPLs and an ``initiating_event_tag`` column of the
+        scenarios.
+        
+        Args:
+            portfolio: Portfolio holding the scenarios and IPLs
+            beta: Common cause factor for layers sharing equipment or sensors
+        """
+        if beta < 0 or beta > 1:
+            raise ValueError("Beta must be between 0 and 1")
+        self.portfolio = portfolio
+        self.beta = beta
+        self._conflicts = None
+        self._effective_pfd = None
+    
+    def _credited_layers(self) -> pd.DataFrame:
+        """Enabled IPL rows attached to a scenario, with normalised keys"""
+        portfolio = self.portfolio
+        rows = np.flatnonzero(portfolio.ipl_enabled & (portfolio.ipl_scenario_index >= 0))
+        ipls = portfolio.ipls.iloc[rows]
+        
+        def column(name):
+            return _normalize(ipls[name]).to_numpy() if name in ipls else np.full(len(rows), "")
+        
+        if "initiating_event_tag" in portfolio.scenarios:
+            scenario_tags = _normalize(portfolio.scenarios["initiating_event_tag"]).to_numpy()
+        else:
+            scenario_tags = np.full(len(portfolio.scenarios), "")
+        
+        scenario = portfolio.ipl_scenario_index[rows]
+        return pd.DataFrame({
+            "row": rows,
+            "scenario": scenario,
+            "name": column("name"),
+            "equipment": column("equipment_tag"),
+            "sensor": column("sensor_tag"),
+            "cause": scenario_tags[scenario],
+        })
+    
+    def _validate(self) -> None:
+        """Apply the rules and build the effective PFD of every IPL row"""
+        portfolio = self.portfolio
+        layers = self._credited_layers()
+        effective = portfolio.ipl_pfd.copy()
+        found = []
+        
+        # Layers that share equipment with the initiating cause get no credit
+        cause = (layers["cause"] != "") & (
+            (layers["equipment"] == layers["cause"]) | (layers["sensor"] == layers["cause"])
+        )
+        found.append(layers.loc[cause].assign(rule=INITIATING_CAUSE, tag=layers.loc[cause, "cause"]))
+        effective[layers.loc[cause, "row"].to_numpy()] = 1.0
+        layers = layers.loc[~cause]
+        
+        # The same safeguard is credited once per scenario
+        duplicate = (layers["name"] != "") & layers.duplicated(subset=["scenario", "name"], keep="first")
+        found.append(layers.loc[duplicate].assign(rule=DUPLICATE_SAFEGUARD, tag=layers.loc[duplicate, "name"]))
+        effective[layers.loc[duplicate, "row"].to_numpy()] = 1.0
+        layers = layers.loc[~duplicate]
+        
+        for tag_column, rule in (("equipment", SHARED_EQUIPMENT), ("sensor", SHARED_SENSOR)):
+            sizes = layers.groupby(["scenario", tag_column])["row"].transform("size")
+            shared = (layers[tag_column] != "") & (sizes > 1)
+            found.append(layers.loc[shared].assign(rule=rule, tag=layers.loc[shared, tag_column]))
+        
+        # Layers sharing a tag within a scenario form common-cause groups; a
+        # layer sharing equipment with one layer and a sensor with another
+        # joins both, so group labels are merged until stable
+        group = pd.Series(np.arange(len(layers)), index=layers.index)
+        while True:
+            merged = group.copy()
+            for tag_column in ("equipment", "sensor"):
+                tagged = layers[tag_column] != ""
+                keys = [layers.loc[tagged, "scenario"], layers.loc[tagged, tag_column]]
+                merged[tagged] = merged[tagged].groupby(keys).transform("min")
+            if merged.equals(group):
+                break
+            group = merged
+        
+        # Beta-factor model: independent failures of the group plus a common
+        # cause failure that defeats every layer in it
+        pfd = effective[layers["row"].to_numpy()]
+        stats = pd.DataFrame({
+            "group": group.to_numpy(),
+            "log_independent": np.log10(np.maximum((1.0 - self.beta) * pfd, 1e-300)),
+            "pfd": pfd,
+            "row": layers["row"].to_numpy(),
+        }).groupby("group").agg(
+            size=("row", "size"),
+            first_row=("row", "first"),
+            log_independent=("log_independent", "sum"),
+            max_pfd=("pfd", "max"),
+        )
+        stats = stats[stats["size"] > 1]
+        if len(stats):
+            combined = np.minimum(np.power(10.0, stats["log_independent"]) + self.beta * stats["max_pfd"], 1.0)
+            members = layers["row"].to_numpy()[np.isin(group.to_numpy(), stats.index.to_numpy())]
+            effective[members] = 1.0
+            effective[stats["first_row"].to_numpy()] = combined.to_numpy()
+        
+        conflicts = pd.concat(found, ignore_index=True)
+        ipls = portfolio.ipls
+        self._conflicts = pd.DataFrame({
+            "lopa_scenario_id": portfolio.scenario_ids[conflicts["scenario"].to_numpy(dtype=int)],
+            "ipl_id": ipls["id"].to_numpy()[conflicts["row"].to_numpy(dtype=int)] if "id" in ipls else conflicts["row"].to_numpy(),
+            "ipl_name": ipls["name"].to_numpy()[conflicts["row"].to_numpy(dtype=int)] if "name" in ipls else "",
+            "rule": conflicts["rule"].to_numpy(),
+            "tag": conflicts["tag"].to_numpy(),
+            "action": np.where(conflicts["rule"].isin([SHARED_EQUIPMENT, SHARED_SENSOR]), "beta-factor", "no credit"),
+        })
+        self._effective_pfd = effective
+    
+    def conflicts(self) -> pd.DataFrame:
+        """
+        List every independence conflict
+        
+        Returns:
+            DataFrame with the LOPA scenario, IPL id and name, rule, the tag
+            or name involved and the action taken (no credit or beta-factor)
+        """
+        if self._conflicts is None:
+            self._validate()
+        return self._conflicts
+    
+    def effective_pfd(self) -> np.ndarray:
+        """
+        PFD per IPL row after the independence rules
+        
+        Layers without credit get a PFD of 1. Each common-cause group gets
+        its combined PFD on its first layer and 1 on the others.
+        
+        Returns:
+            Array of effective PFDs aligned with the portfolio IPL rows
+        """
+        if self._effective_pfd is None:
+            self._validate()
+        return self._effective_pfd
+    
+    def evaluate(self) -> pd.DataFrame:
+        """
+        Evaluate every scenario with and without the independence corrections
+        
+        Returns:
+            DataFrame with the nominal and corrected mitigated frequency, the
+            target, whether the corrected result meets it and the number of
+            conflicts found
+        """
+        portfolio = self.portfolio
+        with np.errstate(divide="ignore"):
+            log_ief = np.log10(portfolio.initiating_frequency)
+        corrected = np.power(
+            10.0, log_ief + portfolio.log_ipl_credit(self.effective_pfd()) + portfolio.log_modifiers
+        )
+        
+        position = pd.Series(np.arange(len(portfolio.scenario_ids)), index=portfolio.scenario_ids)
+        counts = np.bincount(
+            position.reindex(self.conflicts()["lopa_scenario_id"]).to_numpy(dtype=int),
+            minlength=len(position)
+        )
+        return pd.DataFrame({
+            "id": portfolio.scenario_ids,
+            "mitigated_frequency": np.power(10.0, portfolio.log_mitigated_frequency()),
+            "corrected_mitigated_frequency": corrected,
+            "target_mitigated_frequency": portfolio.target_frequency,
+            "meets_target": corrected <= portfolio.target_frequency,
+            "n_conflicts": counts
+        })
+    
+    @classmethod
+    def from_scenarios(cls, scenarios: List[LOPAScenario], beta: float = 0.1) -> 'IndependenceValidator':
+        """
+        Create a validator for in-memory LOPA scenarios
+        
+        Args:
+            scenarios: LOPA scenario objects
+            beta: Common cause factor
+        
+        Returns:
+            IndependenceValidator object
+        """
+        scenario_records = []
+        ipl_records = []
+        for position, scenario in enumerate(scenarios):
+            scenario_id = scenario.id if scenario.id is not None else position
+            scenario_records.append({
+                "id": scenario_id,
+                "initiating_event_frequency": scenario.initiating_event_frequency,
+                "target_mitigated_frequency": scenario.target_mitigated_frequency,
+                "conditional_modifiers": dict(scenario.conditional_modifiers),
+                "initiating_event_tag": scenario.initiating_event_tag,
+            })
+            for number, ipl in enumerate(scenario.ipls, start=1):
+                ipl_records.append({
+                    "id": ipl.id if ipl.id is not None else number,
+                    "lopa_scenario_id": scenario_id,
+                    "name": ipl.name,
+                    "pfd": ipl.pfd,
+                    "is_enabled": ipl.is_enabled,
+                    "equipment_tag": ipl.equipment_tag,
+                    "sensor_tag": ipl.sensor_tag,
+                })
+        return cls(PortfolioLOPA.from_records(scenario_records, ipl_records), beta)
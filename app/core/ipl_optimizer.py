@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - IPL Selection Optimizer Module
+Chooses the cheapest set of candidate IPLs that brings every LOPA scenario
+in a portfolio to its target mitigated frequency
+"""
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .ipl import IPL, IPLType
+
+
+_EPS = 1e-9
+
+
+@dataclass
+class CandidateIPL:
+    """A protection layer that could be added to one or more scenarios"""
+    name: str
+    scenario_ids: List[Any]
+    ipl_type: Union[IPLType, str] = IPLType.OTHER
+    pfd: Optional[float] = None
+    capital_cost: float = 0.0
+    annual_cost: float = 0.0
+    
+    def __post_init__(self):
+        if isinstance(self.ipl_type, str):
+            try:
+                self.ipl_type = IPLType(self.ipl_type)
+            except ValueError:
+                self.ipl_type = IPLType.OTHER
+        if self.pfd is None:
+            self.pfd = IPL.recommended_pfd(self.ipl_type)
+    
+    @property
+    def log_credit(self) -> float:
+        """Risk reduction in decades (-log10 PFD)"""
+        return -np.log10(self.pfd) if self.pfd > 0 else np.inf
+    
+    def lifecycle_cost(self, years: float, discount_rate: float = 0.0) -> float:
+        """
+        Capital plus present value of annual costs
+        
+        Args:
+            years: Lifecycle in years
+            discount_rate: Annual discount rate (fraction)
+        
+        Returns:
+            Lifecycle cost
+        """
+        if discount_rate > 0:
+            annuity = (1 - (1 + discount_rate) ** -years) / discount_rate
+        else:
+            annuity = years
+        return self.capital_cost + self.annual_cost * annuity
+
+
+def _greedy_cover(cost: np.ndarray, credit: np.ndarray, deficit: np.ndarray) -> Tuple[float, List[int]]:
+    """
+    Greedy covering solution used as the initial upper bound
+    
+    Args:
+        cost: Candidate costs, shape (C,)
+        credit: Log credit of each candidate per scenario, shape (S, C)
+        deficit: Decades of risk reduction each scenario still needs, shape (S,)
+    
+    Returns:
+        Tuple of (total cost, chosen candidate indices), or (inf, []) if infeasible
+    """
+    remaining = deficit.copy()
+    available = np.ones(len(cost), dtype=bool)
+    chosen = []
+    while (remaining > _EPS).any():
+        gain = np.minimum(credit, np.maximum(remaining, 0)[:, np.newaxis]).sum(axis=0)
+        gain[~available] = 0
+        if gain.max() <= _EPS:
+            return np.inf, []
+        j = int(np.argmax(gain / np.maximum(cost, _EPS)))
+        chosen.append(j)
+        available[j] = False
+        remaining = remaining - credit[:, j]
+    
+    # Drop layers made redundant by later choices, most expensive first
+    for j in sorted(chosen, key=lambda k: -cost[k]):
+        without = [k for k in chosen if k != j]
+        if (credit[:, without].sum(axis=1) >= deficit - _EPS).all():
+            chosen = without
+    return float(cost[chosen].sum()), chosen
+
+
+def _lagrangian_multipliers(
+    cost: np.ndarray,
+    credit: np.ndarray,
+    deficit: np.ndarray,
+    upper_bound: float,
+    iterations: int = 300
+) -> Tuple[np.ndarray, float]:
+    """
+    Subgradient search for the Lagrangian dual of the covering problem
+    
+    Relaxing ``credit @ x >= deficit`` with multipliers ``lam >= 0`` gives
+    the lower bound ``lam @ deficit + sum(min(0, cost - lam @ credit))``.
+    
+    Args:
+        cost: Candidate costs, shape (C,)
+        credit: Log credit of each candidate per scenario, shape (S, C)
+        deficit: Decades of risk reduction each scenario needs, shape (S,)
+        upper_bound: Cost of a known feasible solution
+        iterations: Number of subgradient steps
+    
+    Returns:
+        Tuple of (best multipliers, best lower bound)
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(credit > 0, cost[np.newaxis, :] / credit, np.inf)
+    lam = np.where(np.isfinite(rate.min(axis=1)), rate.min(axis=1), 0.0)
+    best_lam, best_bound = np.zeros_like(deficit), 0.0
+    step, stalled = 2.0, 0
+    
+    for _ in range(iterations):
+        reduced = cost - lam @ credit
+        x = reduced < 0
+        bound = lam @ deficit + reduced[x].sum()
+        if bound > best_bound + _EPS:
+            best_lam, best_bound, stalled = lam.copy(), bound, 0
+        else:
+            stalled += 1
+            if stalled >= 20:
+                step, stalled = step / 2, 0
+        gradient = deficit - credit[:, x].sum(axis=1)
+        norm = gradient @ gradient
+        if norm <= _EPS or step < 1e-4 or upper_bound - best_bound <= _EPS:
+            break
+        lam = np.maximum(lam + step * (upper_bound - bound) / norm * gradient, 0.0)
+    return best_lam, best_bound
+
+
+def _branch_and_bound(
+    cost: np.ndarray,
+    credit: np.ndarray,
+    deficit: np.ndarray,
+    deadline: float,
+    max_nodes: int
+) -> Tuple[float, List[int], bool, int]:
+    """
+    Exact covering search in log-PFD space
+    
+    Args:
+        cost: Candidate costs, shape (C,)
+        credit: Log credit of each candidate per scenario, shape (S, C)
+        deficit: Decades of risk reduction each scenario still needs, shape (S,)
+        deadline: perf_counter time at which to stop searching
+        max_nodes: Maximum number of search nodes
+    
+    Returns:
+        Tuple of (total cost, chosen candidate indices, proven optimal, nodes explored)
+    """
+    n_scenarios = credit.shape[0]
+    
+    # A layer can never contribute more than the scenario still needs
+    credit = np.minimum(credit, deficit[:, np.newaxis])
+    
+    best_cost, best = _greedy_cover(cost, credit, deficit)
+    
+    # Dominators of each layer: layers at least as cheap giving at least the
+    # same credit everywhere (ties broken by index). Each layer can be picked
+    # only once, so a dominated layer may still be needed beside its
+    # dominator, but swapping it for a dominator never costs more. Some
+    # optimal cover therefore picks a layer only together with all of its
+    # dominators, and never one whose scenarios a dominator covers alone.
+    index = np.arange(len(cost))
+    dominators = []
+    for j in index:
+        better = (cost <= cost[j]) & (credit >= credit[:, [j]]).all(axis=0)
+        tied = (cost == cost[j]) & (credit == credit[:, [j]]).all(axis=0)
+        dominators.append(np.flatnonzero(better & (~tied | (index < j))))
+    covers = (credit >= deficit[:, np.newaxis] - _EPS) | (credit == 0)
+    redundant = np.array([
+        any(covers[credit[:, j] > 0, d].all() for d in dominators[j]) for j in index
+    ], dtype=bool)
+    candidates = index[~redundant]
+    
+    # Reduced-cost fixing from the Lagrangian bound
+    lam, lower_bound = _lagrangian_multipliers(cost[candidates], credit[:, candidates], deficit, best_cost)
+    reduced = cost[candidates] - lam @ credit[:, candidates]
+    forced = candidates[(reduced < 0) & (lower_bound - reduced > best_cost + _EPS)]
+    candidates = candidates[(reduced <= 0) | (lower_bound + reduced < best_cost - _EPS) | np.isin(candidates, best)]
+    candidates = candidates[~np.isin(candidates, forced)]
+    kept = set(candidates.tolist()) | set(forced.tolist())
+    candidates = np.array([j for j in candidates if kept.issuperset(dominators[j].tolist())], dtype=int)
+    if lower_bound >= best_cost - _EPS:
+        return best_cost, sorted(best), True, 0
+    
+    # Try the most attractive layers first so good solutions appear early
+    start_deficit = deficit - credit[:, forced].sum(axis=1)
+    start_cost = float(cost[forced].sum())
+    reduced = cost[candidates] - lam @ credit[:, candidates]
+    order = candidates[np.argsort(reduced, kind="stable")]
+    cost_k, credit_k = cost[order], credit[:, order]
+    n_candidates = len(order)
+    
+    # Layers ruled out by leaving out the candidate at each position
+    position = {int(j): k for k, j in enumerate(order)}
+    dependents = np.zeros((n_candidates, n_candidates), dtype=bool)
+    for k, j in enumerate(order):
+        for dominator in dominators[j]:
+            if position.get(int(dominator), n_candidates) < k:
+                dependents[position[int(dominator)], k] = True
+    
+    # Suffix tables from candidate k onwards: credit still obtainable per
+    # scenario and the sum of negative Lagrangian reduced costs
+    suffix_credit = np.zeros((n_candidates + 1, n_scenarios))
+    suffix_credit[:-1] = np.cumsum(credit_k[:, ::-1], axis=1)[:, ::-1].T
+    suffix_reduced = np.zeros(n_candidates + 1)
+    negative_reduced = np.minimum(cost_k - lam @ credit_k, 0.0)
+    suffix_reduced[:-1] = np.cumsum(negative_reduced[::-1])[::-1]
+    
+    best = tuple(best)
+    optimal = True
+    nodes = 0
+    
+    no_bans = np.zeros(n_candidates, dtype=bool)
+    stack = [(0, start_deficit, start_cost, tuple(int(j) for j in forced), no_bans)]
+    while stack:
+        k, remaining, spent, chosen, banned = stack.pop()
+        active = remaining > _EPS
+        if not active.any():
+            if spent < best_cost - _EPS:
+                best_cost, best = spent, chosen
+            continue
+        if k == n_candidates:
+            continue
+        if banned[k:].any():
+            allowed = ~banned[k:]
+            obtainable = credit_k[:, k:] @ allowed
+            bound = negative_reduced[k:] @ allowed
+        else:
+            obtainable, bound = suffix_credit[k], suffix_reduced[k]
+        if (remaining[active] > obtainable[active] + _EPS).any():
+            continue
+        if spent + lam @ np.maximum(remaining, 0.0) + bound >= best_cost - _EPS:
+            continue
+        
+        nodes += 1
+        if nodes > max_nodes or time.perf_counter() > deadline:
+            optimal = False
+            break
+        
+        # Push the exclude branch first so the include branch is explored first
+        stack.append((k + 1, remaining, spent, chosen, banned | dependents[k] if dependents[k].any() else banned))
+        column = credit_k[:, k]
+        if not banned[k] and (column[active] > 0).any():
+            stack.append((k + 1, remaining - column, spent + cost_k[k], chosen + (int(order[k]),), banned))
+    
+    return best_cost, sorted(best), optimal, nodes
+
+
+def _components(coverage: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Split a scenario × candidate coverage matrix into independent blocks
+    
+    Args:
+        coverage: Boolean matrix, shape (S, C)
+    
+    Returns:
+        List of (scenario indices, candidate indices) per connected component
+    """
+    n_scenarios, n_candidates = coverage.shape
+    parent = list(range(n_scenarios + n_candidates))
+    
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    for s, c in zip(*np.nonzero(coverage)):
+        a, b = find(int(s)), find(n_scenarios + int(c))
+        if a != b:
+            parent[a] = b
+    
+    roots = np.array([find(i) for i in range(n_scenarios + n_candidates)])
+    blocks = []
+    for root in np.unique(roots[:n_scenarios]):
+        blocks.append((np.flatnonzero(roots[:n_scenarios] == root), np.flatnonzero(roots[n_scenarios:] == root)))
+    return blocks
+
+
+class IPLOptimizer:
+    """Cost-optimal selection of additional IPLs across a LOPA portfolio"""
+    
+    def __init__(
+        self,
+        results: pd.DataFrame,
+        candidates: List[CandidateIPL],
+        lifecycle_years: float = 20.0,
+        discount_rate: float = 0.0
+    ):
+        """
+        Initialize the optimizer
+        
+        Args:
+            results: Scenario results with ``id``, ``mitigated_frequency`` and
+                ``target_mitigated_frequency`` (e.g. ``PortfolioLOPA.evaluate()``)
+            candidates: Candidate IPLs with the scenarios each could protect
+            lifecycle_years: Lifecycle used to cost annual spend
+            discount_rate: Annual discount rate for lifecycle costing
+        """
+        self.results = results.reset_index(drop=True)
+        self.candidates = candidates
+        self.cost = np.array([c.lifecycle_cost(lifecycle_years, discount_rate) for c in candidates], dtype=float)
+        
+        positions = {sid: i for i, sid in enumerate(self.results["id"])}
+        credit = np.zeros((len(self.results), len(candidates)))
+        for j, candidate in enumerate(candidates):
+            rows = [positions[sid] for sid in candidate.scenario_ids if sid in positions]
+            credit[rows, j] = candidate.log_credit
+        self.credit = credit
+        
+        with np.errstate(divide="ignore"):
+            self.deficit = np.maximum(
+                np.log10(self.results["mitigated_frequency"].to_numpy(dtype=float))
+                - np.log10(self.results["target_mitigated_frequency"].to_numpy(dtype=float)),
+                0.0
+            )
+    
+    def optimize(self, time_limit_s: float = 60.0, max_nodes: int = 1000000) -> Dict[str, Any]:
+        """
+        Find the cheapest set of candidates meeting every achievable target
+        
+        Scenarios that cannot reach their target even with every candidate
+        are reported and left out of the search.
+        
+        Args:
+            time_limit_s: Overall search time limit in seconds
+            max_nodes: Search node limit per independent block of scenarios
+        
+        Returns:
+            Dictionary with the selected candidate names, total cost, whether
+            the result is proven optimal, infeasible scenario IDs, per-scenario
+            results and the number of search nodes
+        """
+        deadline = time.perf_counter() + time_limit_s
+        
+        infeasible = self.deficit > self.credit.sum(axis=1) + _EPS
+        needs = (self.deficit > _EPS) & ~infeasible
+        
+        selected: List[int] = []
+        optimal = True
+        nodes = 0
+        coverage = (self.credit > 0) & needs[:, np.newaxis]
+        for scenario_idx, candidate_idx in _components(coverage[needs]):
+            scenario_idx = np.flatnonzero(needs)[scenario_idx]
+            _, chosen, block_optimal, block_nodes = _branch_and_bound(
+                self.cost[candidate_idx],
+                self.credit[np.ix_(scenario_idx, candidate_idx)],
+                self.deficit[scenario_idx],
+                deadline,
+                max_nodes
+            )
+            selected.extend(int(candidate_idx[j]) for j in chosen)
+            optimal &= block_optimal
+            nodes += block_nodes
+        selected.sort()
+        
+        added_credit = self.credit[:, selected].sum(axis=1)
+        optimized = self.results["mitigated_frequency"].to_numpy(dtype=float) * np.power(10.0, -added_credit)
+        scenarios = pd.DataFrame({
+            "id": self.results["id"],
+            "mitigated_frequency": self.results["mitigated_frequency"],
+            "optimized_mitigated_frequency": optimized,
+            "target_mitigated_frequency": self.results["target_mitigated_frequency"],
+            "meets_target": optimized <= self.results["target_mitigated_frequency"].to_numpy() * (1 + 1e-9)
+        })
+        
+        return {
+            "selected": [self.candidates[j].name for j in selected],
+            "total_cost": float(self.cost[selected].sum()),
+            "optimal": optimal,
+            "infeasible_scenario_ids": self.results["id"][infeasible].tolist(),
+            "scenarios": scenarios,
+            "nodes": nodes
+        }
@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - Portfolio LOPA Module
+Evaluates every LOPA scenario in a study at once from columnar data
+"""
+import json
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def parse_conditional_modifiers(value: Any) -> Dict[str, float]:
+    """
+    Parse conditional modifiers as stored in the lopa_scenarios table
+    
+    Args:
+        value: JSON text, dictionary, list of values, number or None
+    
+    Returns:
+        Dictionary of {modifier name: probability}
+    """
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return {}
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return {}
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return {}
+    if isinstance(value, dict):
+        return {str(k): float(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return {str(i): float(v) for i, v in enumerate(value)}
+    if isinstance(value, (int, float)):
+        return {"0": float(value)}
+    return {}
+
+
+def required_sil_from_pfd(required_pfd: np.ndarray) -> np.ndarray:
+    """
+    Map required PFDs to SIL levels
+    
+    Follows the bands in ``LOPACalculator.calculate_required_sil`` without
+    its display rounding; a required PFD of 1 or more needs no SIF (SIL 0).
+    
+    Args:
+        required_pfd: Required PFD values
+    
+    Returns:
+        Integer SIL levels (0-4)
+    """
+    required_pfd = np.asarray(required_pfd, dtype=float)
+    with np.errstate(divide="ignore"):
+        decades = -np.log10(np.where(required_pfd > 0, required_pfd, 1e-300))
+    # Bands include their lower PFD bound (0.001 is SIL 2); round off the
+    # floating point noise so exact decades land in the right band
+    sil = np.clip(np.ceil(np.round(decades, 9)) - 1, 1, 4).astype(int)
+    return np.where(required_pfd >= 1.0, 0, sil)
+
+
+class PortfolioLOPA:
+    """Columnar LOPA engine for a whole study"""
+    
+    def __init__(self, scenarios: pd.DataFrame, ipls: pd.DataFrame):
+        """
+        Initialize the engine
+        
+        Args:
+            scenarios: One row per LOPA scenario with ``id``,
+                ``initiating_event_frequency``, ``target_mitigated_frequency``
+                and optionally ``conditional_modifiers``
+            ipls: One row per IPL with ``lopa_scenario_id``, ``pfd`` and
+                optionally ``is_enabled``
+        """
+        self.scenarios = scenarios.reset_index(drop=True)
+        self.ipls = ipls.reset_index(drop=True)
+        
+        self.scenario_ids = self.scenarios["id"].to_numpy()
+        self._order = np.argsort(self.scenario_ids, kind="stable")
+        self._sorted_ids = self.scenario_ids[self._order]
+        
+        self.initiating_frequency = pd.to_numeric(
+            self.scenarios["initiating_event_frequency"], errors="coerce"
+        ).fillna(0.0).to_numpy(dtype=float)
+        self.target_frequency = pd.to_numeric(
+            self.scenarios["target_mitigated_frequency"], errors="coerce"
+        ).fillna(1e-5).to_numpy(dtype=float)
+        
+        self.ipl_scenario_index = self._scenario_index(self.ipls["lopa_scenario_id"].to_numpy())
+        self.ipl_pfd = np.clip(
+            pd.to_numeric(self.ipls["pfd"], errors="coerce").fillna(1.0).to_numpy(dtype=float), 0.0, 1.0
+        )
+        if "is_enabled" in self.ipls:
+            self.ipl_enabled = np.array(self.ipls["is_enabled"].fillna(True).astype(bool), dtype=bool)
+        else:
+            self.ipl_enabled = np.ones(len(self.ipls), dtype=bool)
+        
+        if "conditional_modifiers" in self.scenarios:
+            # Studies reuse a handful of modifier sets, so parse each text once
+            parsed: Dict[str, float] = {}
+            log_modifiers = []
+            for value in self.scenarios["conditional_modifiers"]:
+                key = value if isinstance(value, str) else None
+                if key is None or key not in parsed:
+                    log_sum = PortfolioLOPA._log_modifier_sum(value)
+                    if key is not None:
+                        parsed[key] = log_sum
+                else:
+                    log_sum = parsed[key]
+                log_modifiers.append(log_sum)
+            self.log_modifiers = np.array(log_modifiers, dtype=float)
+        else:
+            self.log_modifiers = np.zeros(len(self.scenarios))
+        
+        # Cached IPL credit and dependency index, built on first use
+        self._log_credit: Optional[np.ndarray] = None
+        self._rows_by_scenario: Optional[np.ndarray] = None
+        self._scenario_offsets: Optional[np.ndarray] = None
+        self._rows_by_ipl_id: Optional[Dict[Any, np.ndarray]] = None
+        self._rows_by_safeguard: Optional[Dict[str, np.ndarray]] = None
+    
+    @staticmethod
+    def _log_modifier_sum(value: Any) -> float:
+        """
+        Sum of log10 conditional modifiers for one scenario
+        
+        Args:
+            value: Stored conditional modifiers
+        
+        Returns:
+            Sum of log10 modifier values
+        """
+        modifiers = parse_conditional_modifiers(value).values()
+        return float(sum(np.log10(v) if v > 0 else -np.inf for v in modifiers))
+    
+    def _scenario_index(self, lopa_scenario_ids: np.ndarray) -> np.ndarray:
+        """
+        Map LOPA scenario IDs to row positions
+        
+        Args:
+            lopa_scenario_ids: LOPA scenario IDs
+        
+        Returns:
+            Row position of each ID, or -1 where the scenario is unknown
+        """
+        ids = np.asarray(lopa_scenario_ids)
+        if len(self._sorted_ids) == 0 or len(ids) == 0:
+            return np.full(len(ids), -1, dtype=int)
+        pos = np.clip(np.searchsorted(self._sorted_ids, ids), 0, len(self._sorted_ids) - 1)
+        found = self._sorted_ids[pos] == ids
+        return np.where(found, self._order[pos], -1)
+    
+    def log_ipl_credit(self, pfd: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Sum of log10 PFD over the enabled IPLs of each scenario
+        
+        Args:
+            pfd: Optional replacement PFD per IPL row
+        
+        Returns:
+            Array of log10 credits, one per scenario
+        """
+        pfd = self.ipl_pfd if pfd is None else np.asarray(pfd, dtype=float)
+        use = self.ipl_enabled & (self.ipl_scenario_index >= 0)
+        with np.errstate(divide="ignore"):
+            log_pfd = np.log10(pfd[use])
+        return np.bincount(self.ipl_scenario_index[use], weights=log_pfd, minlength=len(self.scenarios))
+    
+    def log_mitigated_frequency(self) -> np.ndarray:
+        """
+        Calculate log10 of the mitigated frequency for every scenario
+        
+        Returns:
+            Array of log10 mitigated frequencies
+        """
+        if self._log_credit is None:
+            self._log_credit = self.log_ipl_credit()
+        with np.errstate(divide="ignore"):
+            log_ief = np.log10(self.initiating_frequency)
+        return log_ief + self._log_credit + self.log_modifiers
+    
+    def _results(self, positions: np.ndarray, log_mitigated: np.ndarray) -> pd.DataFrame:
+        """
+        Build the result table for a subset of scenarios
+        
+        Args:
+            positions: Scenario row positions
+            log_mitigated: log10 mitigated frequency for those scenarios
+        
+        Returns:
+            DataFrame of scenario results
+        """
+        initiating = self.initiating_frequency[positions]
+        target = self.target_frequency[positions]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_target = np.log10(target)
+            mitigated = np.power(10.0, log_mitigated)
+            rrf = np.power(10.0, np.log10(initiating) - log_mitigated)
+            gap = np.power(10.0, log_mitigated - log_target)
+            required_pfd = np.power(10.0, log_target - log_mitigated)
+        
+        rrf = np.where(mitigated > 0, rrf, np.inf)
+        required_pfd = np.where(mitigated > 0, required_pfd, np.inf)
+        
+        return pd.DataFrame({
+            "id": self.scenario_ids[positions],
+            "initiating_event_frequency": initiating,
+            "target_mitigated_frequency": target,
+            "mitigated_frequency": mitigated,
+            "risk_reduction_factor": rrf,
+            "target_gap": gap,
+            "meets_target": mitigated <= target,
+            "required_pfd": np.minimum(required_pfd, 1.0),
+            "required_sil": required_sil_from_pfd(required_pfd)
+        })
+    
+    def evaluate(self) -> pd.DataFrame:
+        """
+        Evaluate every scenario in the portfolio
+        
+        Returns:
+            DataFrame with mitigated frequency, risk reduction factor, target
+            gap (mitigated / target), target compliance, and the PFD and SIL
+            an additional SIF would need to close the gap
+        """
+        return self._results(np.arange(len(self.scenarios)), self.log_mitigated_frequency())
+    
+    def _build_dependency_index(self) -> None:
+        """Index IPL rows by scenario, IPL ID and safeguard name"""
+        valid = np.flatnonzero(self.ipl_scenario_index >= 0)
+        self._rows_by_scenario = valid[np.argsort(self.ipl_scenario_index[valid], kind="stable")]
+        counts = np.bincount(self.ipl_scenario_index[valid], minlength=len(self.scenarios))
+        self._scenario_offsets = np.concatenate([[0], np.cumsum(counts)])
+        
+        if "id" in self.ipls:
+            self._rows_by_ipl_id = {k: v for k, v in self.ipls.groupby("id", sort=False).indices.items()}
+        else:
+            self._rows_by_ipl_id = {}
+        if "name" in self.ipls:
+            names = self.ipls["name"].fillna("").astype(str).str.strip().str.upper()
+            self._rows_by_safeguard = {k: v for k, v in names.groupby(names, sort=False).indices.items() if k}
+        else:
+            self._rows_by_safeguard = {}
+    
+    def scenario_ipl_rows(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the IPL rows of every scenario in compressed form
+        
+        Returns:
+            Tuple of (IPL row positions grouped by scenario, offsets) where
+            the rows of scenario i are ``rows[offsets[i]:offsets[i + 1]]``
+        """
+        if self._rows_by_scenario is None:
+            self._build_dependency_index()
+        return self._rows_by_scenario, self._scenario_offsets
+    
+    def scenarios_for_safeguard(self, name: str) -> np.ndarray:
+        """
+        Get the LOPA scenario IDs protected by a shared safeguard
+        
+        IPL rows are treated as the same physical safeguard when their names
+        match, ignoring case and surrounding whitespace.
+        
+        Args:
+            name: Safeguard name or tag
+        
+        Returns:
+            Array of LOPA scenario IDs
+        """
+        if self._rows_by_safeguard is None:
+            self._build_dependency_index()
+        rows = self._rows_by_safeguard.get(str(name).strip().upper(), np.array([], dtype=int))
+        positions = np.unique(self.ipl_scenario_index[rows])
+        return self.scenario_ids[positions[positions >= 0]]
+    
+    def ipl_ids_for_safeguard(self, name: str) -> List[Any]:
+        """
+        Get the IDs of every IPL row representing a shared safeguard
+        
+        Args:
+            name: Safeguard name or tag
+        
+        Returns:
+            List of IPL IDs
+        """
+        if self._rows_by_safeguard is None:
+            self._build_dependency_index()
+        rows = self._rows_by_safeguard.get(str(name).strip().upper(), [])
+        return self.ipls["id"].to_numpy()[rows].tolist()
+    
+    def update_ipls(
+        self,
+        ipl_ids: List[Any],
+        pfd: Optional[float] = None,
+        is_enabled: Optional[bool] = None
+    ) -> pd.DataFrame:
+        """
+        Change IPLs and recompute only the scenarios that depend on them
+        
+        Args:
+            ipl_ids: IDs of the IPL rows to change
+            pfd: New PFD, or None to keep the current values
+            is_enabled: New enabled flag, or None to keep the current values
+        
+        Returns:
+            Result rows for the affected scenarios, with the mitigated
+            frequency before the change in ``previous_mitigated_frequency``
+        """
+        if self._rows_by_ipl_id is None:
+            self._build_dependency_index()
+        if self._log_credit is None:
+            self._log_credit = self.log_ipl_credit()
+        
+        found = [self._rows_by_ipl_id[i] for i in ipl_ids if i in self._rows_by_ipl_id]
+        rows = np.concatenate(found) if found else np.array([], dtype=int)
+        if pfd is not None:
+            self.ipl_pfd[rows] = min(max(float(pfd), 0.0), 1.0)
+        if is_enabled is not None:
+            self.ipl_enabled[rows] = bool(is_enabled)
+        
+        affected = np.unique(self.ipl_scenario_index[rows])
+        affected = affected[affected >= 0]
+        with np.errstate(divide="ignore"):
+            log_ief = np.log10(self.initiating_frequency[affected])
+        previous = log_ief + self._log_credit[affected] + self.log_modifiers[affected]
+        
+        # Gather the IPL rows of the affected scenarios from the CSR index
+        starts = self._scenario_offsets[affected]
+        lengths = self._scenario_offsets[affected + 1] - starts
+        within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        gathered = self._rows_by_scenario[np.repeat(starts, lengths) + within]
+        group = np.repeat(np.arange(len(affected)), lengths)
+        
+        with np.errstate(divide="ignore"):
+            log_pfd = np.where(self.ipl_enabled[gathered], np.log10(self.ipl_pfd[gathered]), 0.0)
+        self._log_credit[affected] = np.bincount(group, weights=log_pfd, minlength=len(affected))
+        
+        result = self._results(affected, log_ief + self._log_credit[affected] + self.log_modifiers[affected])
+        result.insert(3, "previous_mitigated_frequency", np.power(10.0, previous))
+        return result
+    
+    @classmethod
+    def from_records(
+        cls,
+        scenarios: List[Dict[str, Any]],
+        ipls: List[Dict[str, Any]]
+    ) -> 'PortfolioLOPA':
+        """
+        Create the engine from DAO-style dictionaries
+        
+        Args:
+            scenarios: LOPA scenario dictionaries
+            ipls: IPL dictionaries
+        
+        Returns:
+            PortfolioLOPA object
+        """
+        scenario_columns = ["id", "initiating_event_frequency", "target_mitigated_frequency",
+                            "conditional_modifiers"]
+        ipl_columns = ["id", "lopa_scenario_id", "pfd", "is_enabled"]
+        return cls(
+            pd.DataFrame(scenarios, columns=scenario_columns) if not scenarios else pd.DataFrame(scenarios),
+            pd.DataFrame(ipls, columns=ipl_columns) if not ipls else pd.DataFrame(ipls)
+        )
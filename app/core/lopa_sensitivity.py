@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - LOPA Sensitivity Module
+Ranks safeguards and initiating events by their influence on portfolio risk
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .lopa_batch import PortfolioLOPA
+
+
+class LOPASensitivity:
+    """Portfolio tornado sensitivity of mitigated risk to IPL PFDs and initiating frequencies"""
+    
+    def __init__(self, portfolio: PortfolioLOPA, weights: Optional[np.ndarray] = None):
+        """
+        Initialize from a portfolio
+        
+        Mitigated frequency is log-linear in every PFD and initiating
+        frequency, so d ln F / d ln PFD is the number of times an IPL is
+        credited in a scenario. Portfolio sensitivities are therefore
+        products of a scenario × item incidence matrix with the scenario
+        risks, and finite swings are exact rather than linearised.
+        
+        Args:
+            portfolio: Portfolio holding the scenarios and IPLs
+            weights: Optional consequence weight per scenario; risk is
+                weight × mitigated frequency (defaults to 1)
+        """
+        self.portfolio = portfolio
+        n = len(portfolio.scenarios)
+        self.weights = np.ones(n) if weights is None else np.asarray(weights, dtype=float)
+        self.risk = self.weights * np.power(10.0, portfolio.log_mitigated_frequency())
+    
+    def ipl_incidence(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, pd.Index]:
+        """
+        Build the scenario × safeguard incidence of credited IPL rows
+        
+        IPL rows sharing a safeguard name are one item; unnamed rows are
+        items of their own.
+        
+        Returns:
+            Tuple of (scenario position, item position, IPL row) per credited
+            row, and the item labels
+        """
+        portfolio = self.portfolio
+        rows = np.flatnonzero((portfolio.ipl_scenario_index >= 0) & portfolio.ipl_enabled)
+        ipls = portfolio.ipls.iloc[rows]
+        
+        if "name" in ipls:
+            names = ipls["name"].fillna("").astype(str).str.strip()
+        else:
+            names = pd.Series("", index=ipls.index)
+        ids = ipls["id"].astype(str) if "id" in ipls else pd.Series(rows.astype(str), index=ipls.index)
+        keys = names.str.upper().where(names != "", "#" + ids)
+        codes, uniques = pd.factorize(keys)
+        
+        # Show each safeguard under its first spelling
+        first = pd.Series(np.arange(len(codes))).groupby(codes).first().to_numpy()
+        labels = pd.Index(names.where(names != "", "IPL " + ids).to_numpy()[first])
+        return portfolio.ipl_scenario_index[rows], codes, rows, labels
+    
+    def _ipl_swings(self, factor: float) -> pd.DataFrame:
+        """Exact portfolio risk swings for every safeguard"""
+        portfolio = self.portfolio
+        scenario, item, rows, labels = self.ipl_incidence()
+        if len(rows) == 0:
+            return pd.DataFrame(columns=["item", "kind", "n_scenarios", "elasticity", "risk_low", "risk_high", "risk_if_removed"])
+        
+        # Collapse to unique (scenario, item) pairs, the non-zeros of the incidence matrix
+        pair_key = item.astype(np.int64) * len(self.risk) + scenario
+        pairs, pair_index = np.unique(pair_key, return_inverse=True)
+        pair_scenario = pairs % len(self.risk)
+        pair_item = pairs // len(self.risk)
+        n_items = len(labels)
+        
+        with np.errstate(divide="ignore"):
+            log_pfd = np.maximum(np.log10(portfolio.ipl_pfd[rows]), -100.0)
+        log_factor = np.log10(factor)
+        
+        def swing(log_multiplier):
+            per_pair = np.bincount(pair_index, weights=log_multiplier, minlength=len(pairs))
+            change = self.risk[pair_scenario] * (np.power(10.0, per_pair) - 1.0)
+            return np.bincount(pair_item, weights=change, minlength=n_items)
+        
+        total = self.risk.sum()
+        count = np.bincount(pair_index, minlength=len(pairs))
+        return pd.DataFrame({
+            "item": labels,
+            "kind": "IPL",
+            "n_scenarios": np.bincount(pair_item, minlength=n_items),
+            "elasticity": np.bincount(pair_item, weights=self.risk[pair_scenario] * count, minlength=n_items) / total,
+            # A better layer divides its PFD; a worse one cannot exceed a PFD of 1
+            "risk_low": total + swing(np.full(len(rows), -log_factor)),
+            "risk_high": total + swing(np.minimum(log_pfd + log_factor, 0.0) - log_pfd),
+            "risk_if_removed": total + swing(-log_pfd)
+        })
+    
+    def _ife_swings(self, factor: float) -> pd.DataFrame:
+        """Exact portfolio risk swings for every initiating event"""
+        portfolio = self.portfolio
+        ids = pd.Series(portfolio.scenario_ids).astype(str)
+        if "initiating_event" in portfolio.scenarios:
+            events = portfolio.scenarios["initiating_event"].fillna("").astype(str).str.strip().reset_index(drop=True)
+        else:
+            events = pd.Series("", index=ids.index)
+        labels = events.where(events != "", "Scenario " + ids)
+        codes, uniques = pd.factorize(labels)
+        
+        total = self.risk.sum()
+        share = np.bincount(codes, weights=self.risk, minlength=len(uniques))
+        return pd.DataFrame({
+            "item": uniques,
+            "kind": "Initiating event",
+            "n_scenarios": np.bincount(codes, minlength=len(uniques)),
+            "elasticity": share / total,
+            "risk_low": total + share * (1.0 / factor - 1.0),
+            "risk_high": total + share * (factor - 1.0),
+            "risk_if_removed": np.nan
+        })
+    
+    def tornado(self, factor: float = 10.0, top: Optional[int] = None) -> pd.DataFrame:
+        """
+        Rank safeguards and initiating events by their swing in portfolio risk
+        
+        Args:
+            factor: Multiplicative change applied to each PFD and frequency
+            top: Number of items to return (all if None)
+        
+        Returns:
+            DataFrame with the item, its kind, the number of scenarios it
+            touches, the elasticity d ln R / d ln x, the portfolio risk with
+            the value divided and multiplied by the factor, the risk with an
+            IPL removed, and the swing, sorted by swing
+        """
+        ranked = pd.concat([self._ipl_swings(factor), self._ife_swings(factor)], ignore_index=True)
+        ranked["swing"] = ranked["risk_high"] - ranked["risk_low"]
+        ranked = ranked.sort_values("swing", ascending=False, kind="stable").reset_index(drop=True)
+        return ranked if top is None else ranked.head(top)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - LOPA Uncertainty Module
+Monte Carlo propagation of initiating event frequency and PFD uncertainty
+through a LOPA portfolio
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .lopa_batch import PortfolioLOPA
+
+
+# z-score of the 95th percentile, used to convert error factors
+_Z95 = 1.6448536269514722
+
+
+def log10_sigma(error_factor: np.ndarray) -> np.ndarray:
+    """
+    Standard deviation of log10 for a lognormal given its error factor
+    
+    The error factor is the ratio of the 95th percentile to the median.
+    
+    Args:
+        error_factor: Error factor(s), 1 meaning no uncertainty
+    
+    Returns:
+        Standard deviation of log10 of the quantity
+    """
+    return np.log10(np.maximum(np.asarray(error_factor, dtype=float), 1.0)) / _Z95
+
+
+class MonteCarloLOPA:
+    """Monte Carlo LOPA with lognormal initiating frequencies and PFDs"""
+    
+    def __init__(
+        self,
+        portfolio: PortfolioLOPA,
+        ief_error_factor: float = 3.0,
+        pfd_error_factor: float = 3.0
+    ):
+        """
+        Initialize the simulation
+        
+        Point values are treated as medians. Per-row error factors are read
+        from an ``ief_error_factor`` column of the scenarios and an
+        ``error_factor`` column of the IPLs when present; conditional
+        modifiers are kept at their point values.
+        
+        Args:
+            portfolio: Portfolio holding the scenarios and IPLs
+            ief_error_factor: Default error factor for initiating event frequencies
+            pfd_error_factor: Default error factor for IPL PFDs
+        """
+        self.portfolio = portfolio
+        
+        if "ief_error_factor" in portfolio.scenarios:
+            ief_ef = pd.to_numeric(portfolio.scenarios["ief_error_factor"], errors="coerce").fillna(ief_error_factor)
+        else:
+            ief_ef = np.full(len(portfolio.scenarios), ief_error_factor)
+        if "error_factor" in portfolio.ipls:
+            pfd_ef = pd.to_numeric(portfolio.ipls["error_factor"], errors="coerce").fillna(pfd_error_factor)
+        else:
+            pfd_ef = np.full(len(portfolio.ipls), pfd_error_factor)
+        
+        self.ief_sigma = log10_sigma(ief_ef)
+        self.pfd_sigma = log10_sigma(pfd_ef)
+    
+    def _blocks(self, n_samples: int, max_elements: int):
+        """
+        Split the scenarios into blocks whose sample matrices fit in memory
+        
+        Args:
+            n_samples: Number of samples per scenario
+            max_elements: Maximum elements in one sample matrix
+        
+        Yields:
+            (first scenario, end scenario) position pairs
+        """
+        _, offsets = self.portfolio.scenario_ipl_rows()
+        n_scenarios = len(offsets) - 1
+        budget = max(max_elements // max(n_samples, 1), 1)
+        
+        # Each scenario costs one column plus one per IPL row
+        weight = np.cumsum(1 + np.diff(offsets))
+        start = 0
+        while start < n_scenarios:
+            used = weight[start - 1] if start > 0 else 0
+            end = max(int(np.searchsorted(weight, used + budget, side="right")), start + 1)
+            yield start, min(end, n_scenarios)
+            start = end
+    
+    def simulate(
+        self,
+        n_samples: int = 10000,
+        confidence: float = 0.90,
+        seed: Optional[int] = None,
+        max_elements: int = 5000000
+    ) -> pd.DataFrame:
+        """
+        Sample mitigated frequencies for every scenario
+        
+        Args:
+            n_samples: Number of Monte Carlo samples per scenario
+            confidence: Central confidence interval to report
+            seed: Random seed
+            max_elements: Largest samples × columns matrix held at once
+        
+        Returns:
+            DataFrame with the point, mean and median mitigated frequency,
+            the confidence bounds and the probability of meeting the target
+        """
+        rng = np.random.default_rng(seed)
+        portfolio = self.portfolio
+        rows, offsets = portfolio.scenario_ipl_rows()
+        n_scenarios = len(portfolio.scenarios)
+        
+        with np.errstate(divide="ignore"):
+            log_ief = np.log10(portfolio.initiating_frequency)
+            # Floor zero PFDs so the cumulative sums below stay finite
+            log_pfd = np.maximum(np.log10(portfolio.ipl_pfd), -100.0)
+            log_target = np.log10(portfolio.target_frequency)
+        log_point = portfolio.log_mitigated_frequency()
+        
+        tail = (1.0 - confidence) / 2 * 100
+        percentiles = [tail, 50.0, 100.0 - tail]
+        lower = np.empty(n_scenarios)
+        median = np.empty(n_scenarios)
+        upper = np.empty(n_scenarios)
+        mean = np.empty(n_scenarios)
+        p_meets = np.empty(n_scenarios)
+        
+        for start, end in self._blocks(n_samples, max_elements):
+            width = end - start
+            log_freq = log_ief[start:end] + self.ief_sigma[start:end] * rng.standard_normal((n_samples, width))
+            log_freq += portfolio.log_modifiers[start:end]
+            
+            block_rows = rows[offsets[start]:offsets[end]]
+            if len(block_rows):
+                samples = log_pfd[block_rows] + self.pfd_sigma[block_rows] * rng.standard_normal(
+                    (n_samples, len(block_rows))
+                )
+                # A PFD cannot exceed 1, and disabled layers give no credit
+                samples = np.where(portfolio.ipl_enabled[block_rows], np.minimum(samples, 0.0), 0.0)
+                cumulative = np.zeros((n_samples, len(block_rows) + 1))
+                np.cumsum(samples, axis=1, out=cumulative[:, 1:])
+                local = offsets[start:end + 1] - offsets[start]
+                log_freq += cumulative[:, local[1:]] - cumulative[:, local[:-1]]
+            
+            bounds = np.percentile(log_freq, percentiles, axis=0)
+            lower[start:end], median[start:end], upper[start:end] = bounds
+            mean[start:end] = np.power(10.0, log_freq).mean(axis=0)
+            p_meets[start:end] = (log_freq <= log_target[start:end]).mean(axis=0)
+        
+        return pd.DataFrame({
+            "id": portfolio.scenario_ids,
+            "mitigated_frequency": np.power(10.0, log_point),
+            "mean_frequency": mean,
+            "median_frequency": np.power(10.0, median),
+            "lower_bound": np.power(10.0, lower),
+            "upper_bound": np.power(10.0, upper),
+            "target_mitigated_frequency": portfolio.target_frequency,
+            "probability_meets_target": p_meets
+        })
@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - LOPA Worksheet Module
+Streams LOPA scenarios and IPLs in and out of workbooks laid out like the
+"Scenario Results" and "IPL List" sheets of the RAST workbook
+"""
+import json
+from typing import Any, BinaryIO, Dict, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.utils import column_index_from_string, coordinate_to_tuple
+from openpyxl.workbook.defined_name import DefinedName
+
+from .ipl import IPLType
+from .lopa_batch import parse_conditional_modifiers
+
+
+SCENARIO_SHEET = "Scenario Results"
+IPL_SHEET = "IPL List"
+
+# Named ranges of the RAST workbook with their default column and header;
+# the named cell is the header and data starts on the row below it
+SCENARIO_COLUMNS = {
+    "Out_Scenario_No": ("A", "SCENARIO NO"),
+    "Out_Equip_Tag": ("C", "Equipment Tag"),
+    "Out_Cause": ("E", "Initiating Event General Description"),
+    "Out_Outcome_Desc": ("CE", "Outcome Descriptors"),
+    "Out_Consequence": ("CG", "Consequence"),
+    "Out_TF": ("CI", "Tolerable Frequency Factor"),
+    "Out_ATF": ("CJ", "Revised Tolerable Frequency Factor"),
+    "Out_IEF": ("CL", "Initiating Event Factor"),
+    "Out_PI": ("CM", "Probability of Ignition"),
+    "Out_API": ("CN", "Revised Probability of Ignition"),
+    "Out_TEF": ("CP", "Probability of Exposure"),
+    "Out_ATEF": ("CQ", "Revised Probability of Exposure"),
+    "Out_POE": ("CS", "Time at Risk or Other Condition"),
+    "Out_Comments": ("DC", "Notes / Comments"),
+    "Out_Cause_Desc": ("DP", "Detail Description"),
+    "Out_Cause_Sensor": ("DT", "Sensor #1 ID"),
+}
+
+IPL_COLUMNS = {
+    "IPL_Alarm": ("A", "Control Loop ID or Alarm ID or SIF Number"),
+    "IPL_Type": ("B", "IPL Type"),
+    "IPL_Column": ("C", "IPL Column"),
+    "IPL_Scenario": ("D", "Scenario No"),
+    "IPL_Equipment_Tag": ("E", "Equipment Tag"),
+    "IPL_Credit_Factor": ("F", "Credit Factor"),
+    "IPL_Gen_Desc": ("G", "General Description"),
+    "IPL_Detail_Desc": ("H", "Detail Description"),
+    "IPL_Status": ("I", "IPL Status"),
+    "IPL_Sensor1": ("J", "Sensor #1 ID"),
+    "IPL_FCE1": ("M", "Final Element #1 ID"),
+    "IPL_Comment": ("R", "Comments"),
+}
+
+# Conditional modifiers kept in their own worksheet columns as
+# (modifier name, column, revised column); any other modifier is folded
+# into the "other condition" column
+WORKSHEET_MODIFIERS = [
+    ("Probability of Ignition", "Out_PI", "Out_API"),
+    ("Probability of Exposure", "Out_TEF", "Out_ATEF"),
+    ("Time at Risk or Other Condition", "Out_POE", None),
+]
+
+# IPL types of the worksheet with the IPL column (1-8) of their first slot
+WORKSHEET_IPL_TYPES = {
+    "1 - BPCS": (IPLType.BPCS, 1),
+    "2 - OPR": (IPLType.ALARM, 2),
+    "3 - SIS": (IPLType.SIS, 3),
+    "4 - Relief": (IPLType.RELIEF, 5),
+    "5 - SRPS": (IPLType.PHYSICAL, 6),
+}
+_TYPE_LABELS = {
+    IPLType.BPCS.value: "1 - BPCS",
+    IPLType.ALARM.value: "2 - OPR",
+    IPLType.HUMAN.value: "2 - OPR",
+    IPLType.PROCEDURAL.value: "2 - OPR",
+    IPLType.SIS.value: "3 - SIS",
+    IPLType.RELIEF.value: "4 - Relief",
+}
+_SLOT_LIMITS = {1: 1, 2: 2, 3: 4, 5: 5, 6: 8}
+
+_DISABLED_STATUSES = {"DISABLED", "NOT CREDITED", "REMOVED"}
+
+
+def _text(values: pd.Series) -> pd.Series:
+    """Cell values as stripped strings, with whole numbers written without a decimal point"""
+    def convert(value):
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            return ""
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value).strip()
+    return values.map(convert)
+
+
+def _factor(values: pd.Series) -> pd.Series:
+    """Order-of-magnitude factors as floats, NaN where blank or not a number"""
+    return pd.to_numeric(values, errors="coerce")
+
+
+def _blank_to_none(frame: pd.DataFrame) -> pd.DataFrame:
+    """Replace empty strings and NaN with None so they are stored as NULL"""
+    frame = frame.astype(object)
+    return frame.where(frame.notna() & (frame != ""), None)
+
+
+class LOPAWorksheet:
+    """Bulk reader and writer for RAST-style LOPA worksheets"""
+    
+    @staticmethod
+    def _column_positions(workbook, sheet: str, columns: Dict[str, Tuple[str, str]]) -> Tuple[Dict[str, int], int]:
+        """
+        Resolve the zero-based column of every named range on a sheet
+        
+        Defined names in the workbook win over the default layout, so
+        workbooks with inserted or moved columns still read correctly.
+        
+        Returns:
+            Tuple of (column index per name, header row)
+        """
+        positions = {name: column_index_from_string(column) - 1 for name, (column, _) in columns.items()}
+        header_row = 2
+        for name in columns:
+            if name not in workbook.defined_names:
+                continue
+            for title, coordinate in workbook.defined_names[name].destinations:
+                if title == sheet:
+                    row, column = coordinate_to_tuple(coordinate.replace("$", "").split(":")[0])
+                    positions[name] = column - 1
+                    header_row = row
+        return positions, header_row
+    
+    @staticmethod
+    def _read_sheet(workbook, sheet: str, columns: Dict[str, Tuple[str, str]], key: str) -> pd.DataFrame:
+        """Stream the named columns of a sheet into a DataFrame, skipping rows without a key"""
+        if sheet not in workbook.sheetnames:
+            return pd.DataFrame(columns=list(columns))
+        positions, header_row = LOPAWorksheet._column_positions(workbook, sheet, columns)
+        names = list(columns)
+        indices = [positions[name] for name in names]
+        width = max(indices) + 1
+        key_index = positions[key]
+        
+        rows = []
+        for row in workbook[sheet].iter_rows(min_row=header_row + 1, max_col=width, values_only=True):
+            if len(row) <= key_index or row[key_index] is None or row[key_index] == "":
+                continue
+            row = row + (None,) * (width - len(row))
+            rows.append([row[i] for i in indices])
+        return pd.DataFrame(rows, columns=names)
+    
+    @staticmethod
+    def read(source: Union[str, BinaryIO]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Read the LOPA scenarios and IPLs of a worksheet
+        
+        Scenarios come from the "Scenario Results" sheet and IPLs from the
+        "IPL List" sheet, so run Generate_IPL_List in the workbook before
+        importing it. Factors are orders of magnitude: a frequency or
+        probability is 10 to the power of minus the factor.
+        
+        Args:
+            source: Path or file object of an .xlsx or .xlsm workbook
+        
+        Returns:
+            Tuple of (scenarios DataFrame, IPLs DataFrame) with lopa_scenarios
+            and ipls columns; IPLs are linked to scenarios through case_no
+        """
+        workbook = load_workbook(source, read_only=True, data_only=True)
+        try:
+            raw_scenarios = LOPAWorksheet._read_sheet(workbook, SCENARIO_SHEET, SCENARIO_COLUMNS, "Out_Scenario_No")
+            raw_ipls = LOPAWorksheet._read_sheet(workbook, IPL_SHEET, IPL_COLUMNS, "IPL_Scenario")
+        finally:
+            workbook.close()
+        return LOPAWorksheet._scenarios_from_sheet(raw_scenarios), LOPAWorksheet._ipls_from_sheet(raw_ipls)
+    
+    @staticmethod
+    def _scenarios_from_sheet(raw: pd.DataFrame) -> pd.DataFrame:
+        """Convert Scenario Results columns to lopa_scenarios columns"""
+        cause = _text(raw["Out_Cause"])
+        detail = _text(raw["Out_Cause_Desc"])
+        tolerable = _factor(raw["Out_ATF"]).fillna(_factor(raw["Out_TF"]))
+        
+        # Build the modifier dictionaries column-wise, then serialise per row
+        modifiers = {}
+        for name, column, revised in WORKSHEET_MODIFIERS:
+            factor = _factor(raw[column])
+            if revised:
+                factor = _factor(raw[revised]).fillna(factor)
+            modifiers[name] = np.power(10.0, -factor.to_numpy(dtype=float))
+        modifier_frame = pd.DataFrame(modifiers)
+        modifier_json = [
+            json.dumps({name: value for name, value in row.items() if value == value and value != 1.0})
+            for row in modifier_frame.to_dict("records")
+        ]
+        
+        scenarios = pd.DataFrame({
+            "case_no": _text(raw["Out_Scenario_No"]),
+            "description": detail.where(detail != "", cause),
+            "initiating_event": cause,
+            "initiating_event_frequency": np.power(10.0, -_factor(raw["Out_IEF"])),
+            "target_mitigated_frequency": np.power(10.0, -tolerable),
+            "consequence_description": _text(raw["Out_Outcome_Desc"]),
+            "consequence_category": _text(raw["Out_Consequence"]),
+            "conditional_modifiers": modifier_json,
+            "notes": _text(raw["Out_Comments"]),
+            "initiating_event_tag": _text(raw["Out_Cause_Sensor"]),
+        })
+        return scenarios.drop_duplicates(subset="case_no", keep="last").reset_index(drop=True)
+    
+    @staticmethod
+    def _ipls_from_sheet(raw: pd.DataFrame) -> pd.DataFrame:
+        """Convert IPL List columns to ipls columns"""
+        alarm = _text(raw["IPL_Alarm"])
+        general = _text(raw["IPL_Gen_Desc"])
+        detail = _text(raw["IPL_Detail_Desc"])
+        ipl_type = _text(raw["IPL_Type"]).map(
+            lambda label: WORKSHEET_IPL_TYPES[label][0].value if label in WORKSHEET_IPL_TYPES else IPLType.OTHER.value
+        )
+        named = (alarm != "") & (alarm.str.upper() != "N/A")
+        return pd.DataFrame({
+            "case_no": _text(raw["IPL_Scenario"]),
+            "name": alarm.where(named, general),
+            "description": detail.where(detail != "", general),
+            "ipl_type": ipl_type,
+            "pfd": np.power(10.0, -_factor(raw["IPL_Credit_Factor"]).fillna(0.0)),
+            "is_enabled": (~_text(raw["IPL_Status"]).str.upper().isin(_DISABLED_STATUSES)).astype(int),
+            "equipment_tag": _text(raw["IPL_FCE1"]),
+            "sensor_tag": _text(raw["IPL_Sensor1"]),
+        })
+    
+    @staticmethod
+    def _scenarios_to_sheet(scenarios: pd.DataFrame) -> pd.DataFrame:
+        """Convert lopa_scenarios columns to Scenario Results columns"""
+        def column(name):
+            return scenarios[name] if name in scenarios else pd.Series(None, index=scenarios.index, dtype=object)
+        
+        with np.errstate(divide="ignore"):
+            ief = -np.log10(pd.to_numeric(column("initiating_event_frequency")).astype(float))
+            tolerable = -np.log10(pd.to_numeric(column("target_mitigated_frequency")).astype(float))
+        
+        # Known modifiers go to their own column and the rest multiply into the last one
+        factors = {column_name: [] for _, column_name, _ in WORKSHEET_MODIFIERS}
+        known = {name for name, _, _ in WORKSHEET_MODIFIERS[:-1]}
+        other_column = WORKSHEET_MODIFIERS[-1][1]
+        for value in column("conditional_modifiers"):
+            modifiers = parse_conditional_modifiers(value)
+            for name, column_name, _ in WORKSHEET_MODIFIERS[:-1]:
+                factors[column_name].append(-np.log10(modifiers[name]) if modifiers.get(name) else None)
+            other = np.prod([v for k, v in modifiers.items() if k not in known]) if len(modifiers.keys() - known) else None
+            factors[other_column].append(-np.log10(other) if other else None)
+        
+        case_no = _text(column("case_no"))
+        ids = _text(column("id"))
+        description = _text(column("description"))
+        cause = _text(column("initiating_event"))
+        cause = cause.where(cause != "", description)
+        return pd.DataFrame({
+            "Out_Scenario_No": case_no.where(case_no != "", ids),
+            "Out_Cause": cause,
+            "Out_Cause_Desc": description.where(description != cause, ""),
+            "Out_Outcome_Desc": _text(column("consequence_description")),
+            "Out_Consequence": _text(column("consequence_category")),
+            "Out_TF": tolerable,
+            "Out_IEF": ief,
+            **factors,
+            "Out_Comments": _text(column("notes")),
+            "Out_Cause_Sensor": _text(column("initiating_event_tag")),
+        }, index=scenarios.index)
+    
+    @staticmethod
+    def _ipls_to_sheet(ipls: pd.DataFrame, case_numbers: pd.Series) -> pd.DataFrame:
+        """Convert ipls columns to IPL List columns"""
+        def column(name):
+            return ipls[name] if name in ipls else pd.Series(None, index=ipls.index, dtype=object)
+        
+        labels = _text(column("ipl_type")).map(lambda value: _TYPE_LABELS.get(value, "5 - SRPS"))
+        first_slot = labels.map(lambda label: WORKSHEET_IPL_TYPES[label][1])
+        scenario = ipls["lopa_scenario_id"]
+        # Later IPLs of the same type take the next worksheet column, up to the last slot of the type
+        slot = first_slot + ipls.groupby([scenario, labels]).cumcount()
+        slot = np.minimum(slot, first_slot.map(_SLOT_LIMITS))
+        
+        with np.errstate(divide="ignore"):
+            credit = -np.log10(pd.to_numeric(column("pfd")).astype(float))
+        enabled = pd.to_numeric(column("is_enabled")).fillna(1).astype(bool)
+        return pd.DataFrame({
+            "IPL_Alarm": _text(column("name")),
+            "IPL_Type": labels,
+            "IPL_Column": slot,
+            "IPL_Scenario": scenario.map(case_numbers),
+            "IPL_Credit_Factor": credit,
+            "IPL_Gen_Desc": _text(column("description")),
+            "IPL_Status": np.where(enabled, "", "Disabled"),
+            "IPL_Sensor1": _text(column("sensor_tag")),
+            "IPL_FCE1": _text(column("equipment_tag")),
+        }, index=ipls.index)
+    
+    @staticmethod
+    def _write_sheet(workbook, sheet: str, columns: Dict[str, Tuple[str, str]], frame: pd.DataFrame, title: Any) -> None:
+        """Stream a frame into a write-only sheet at the named column positions"""
+        worksheet = workbook.create_sheet(sheet)
+        indices = {name: column_index_from_string(column) - 1 for name, (column, _) in columns.items()}
+        width = max(indices.values()) + 1
+        
+        header = [None] * width
+        for name, (column, text) in columns.items():
+            header[indices[name]] = text
+            workbook.defined_names.add(DefinedName(name, attr_text=f"'{sheet}'!${column}$2"))
+        worksheet.append([title])
+        worksheet.append(header)
+        
+        names = [name for name in frame.columns if name in indices]
+        positions = [indices[name] for name in names]
+        values = _blank_to_none(frame[names])
+        for record in values.itertuples(index=False, name=None):
+            row = [None] * width
+            for position, value in zip(positions, record):
+                row[position] = value.item() if isinstance(value, np.generic) else value
+            worksheet.append(row)
+    
+    @staticmethod
+    def write(target: Union[str, BinaryIO], scenarios: pd.DataFrame, ipls: pd.DataFrame) -> None:
+        """
+        Write LOPA scenarios and IPLs as a worksheet
+        
+        The workbook holds "Scenario Results" and "IPL List" sheets with
+        the RAST columns and defined names, so it can be read back here or
+        pasted into the RAST workbook. Scenarios without a case number are
+        written under their id.
+        
+        Args:
+            target: Path or file object to write the .xlsx workbook to
+            scenarios: DataFrame with lopa_scenarios columns including id
+            ipls: DataFrame with ipls columns including lopa_scenario_id
+        """
+        scenario_sheet = LOPAWorksheet._scenarios_to_sheet(scenarios)
+        case_numbers = pd.Series(scenario_sheet["Out_Scenario_No"].to_numpy(), index=scenarios["id"].to_numpy())
+        ipls = ipls[ipls["lopa_scenario_id"].isin(case_numbers.index)]
+        ipl_sheet = LOPAWorksheet._ipls_to_sheet(ipls, case_numbers)
+        
+        workbook = Workbook(write_only=True)
+        LOPAWorksheet._write_sheet(workbook, SCENARIO_SHEET, SCENARIO_COLUMNS, scenario_sheet, "LOPA Scenarios")
+        LOPAWorksheet._write_sheet(workbook, IPL_SHEET, IPL_COLUMNS, ipl_sheet, "IPL List")
+        workbook.save(target)
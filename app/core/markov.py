@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - Markov Unavailability Module
+Multi-phase Markov models of proof-tested voted subsystems for the cases the
+simplified PFDavg equations handle poorly: high fault tolerance, staggered
+testing and non-identical channels
+"""
+from functools import lru_cache
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .pfdavg import PFDAvg, HOURS_PER_MONTH, parse_architecture
+
+
+# Channel states
+OK = 0
+DU = 1      # Dangerous undetected, waiting for the next proof test
+DD = 2      # Dangerous detected, under repair
+REPAIR = 3  # Found failed by a proof test, under repair
+CHANNEL_STATES = 4
+
+MAX_CHANNELS = 6
+CACHE_SIZE = 1024
+
+# Relative change of the cycle average at which the periodic regime is reached
+CONVERGENCE_TOLERANCE = 1e-6
+MAX_CYCLES = 50
+
+
+def _channel_states(n_channels: int) -> np.ndarray:
+    """
+    Enumerate the states of every channel
+    
+    Args:
+        n_channels: Number of channels
+    
+    Returns:
+        Array of shape (CHANNEL_STATES ** n_channels, n_channels)
+    """
+    codes = np.arange(CHANNEL_STATES ** n_channels)
+    powers = CHANNEL_STATES ** np.arange(n_channels)
+    return (codes[:, None] // powers) % CHANNEL_STATES
+
+
+def build_generator(
+    m: int,
+    lambda_du: Sequence[float],
+    lambda_dd: Sequence[float],
+    beta: float,
+    beta_d: float,
+    mttr_hours: float,
+    mrt_hours: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int, np.ndarray]:
+    """
+    Build the sparse transition-rate matrix of an MooN subsystem
+    
+    Each channel is OK, failed undetected, failed detected or under repair
+    after a proof test. Independent failures hit single channels, common
+    cause failures take every working channel down at once at β (βD) times
+    the mean channel rate; a single channel has no common cause split. The
+    subsystem is unavailable when fewer than M channels are working.
+    
+    Args:
+        m: Number of channels required to trip
+        lambda_du: Dangerous undetected failure rate of each channel (per hour)
+        lambda_dd: Dangerous detected failure rate of each channel (per hour)
+        beta: Common cause factor for undetected failures
+        beta_d: Common cause factor for detected failures
+        mttr_hours: Mean time to restoration after a detected failure
+        mrt_hours: Mean repair time after a proof test
+    
+    Returns:
+        Tuple of (rows, cols, rates, n_states, failed) where the transitions
+        are in coordinate form and failed flags the unavailable states
+    """
+    lambda_du = np.asarray(lambda_du, dtype=float)
+    lambda_dd = np.asarray(lambda_dd, dtype=float)
+    n_channels = len(lambda_du)
+    if n_channels == 1:
+        beta = beta_d = 0.0
+    states = _channel_states(n_channels)
+    n_states = len(states)
+    powers = CHANNEL_STATES ** np.arange(n_channels)
+    codes = np.arange(n_states)
+    working = states == OK
+    
+    # Detected failures of a channel with instant repair never leave it failed
+    detectable = mttr_hours > 0
+    rows, cols, rates = [], [], []
+    
+    def add(mask, target, rate):
+        rate = np.broadcast_to(rate, mask.shape)[mask]
+        keep = rate > 0
+        rows.append(codes[mask][keep])
+        cols.append(target[mask][keep])
+        rates.append(rate[keep])
+    
+    for channel in range(n_channels):
+        is_ok = working[:, channel]
+        add(is_ok, codes + DU * powers[channel], (1.0 - beta) * lambda_du[channel])
+        if detectable:
+            add(is_ok, codes + DD * powers[channel], (1.0 - beta_d) * lambda_dd[channel])
+            add(states[:, channel] == DD, codes - DD * powers[channel], 1.0 / mttr_hours)
+        if mrt_hours > 0:
+            add(states[:, channel] == REPAIR, codes - REPAIR * powers[channel], 1.0 / mrt_hours)
+    
+    if n_channels > 1:
+        any_ok = working.any(axis=1)
+        add(any_ok, codes + DU * (working * powers).sum(axis=1), beta * lambda_du.mean())
+        if detectable:
+            add(any_ok, codes + DD * (working * powers).sum(axis=1), beta_d * lambda_dd.mean())
+    
+    failed = working.sum(axis=1) < m
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(rates), n_states, failed
+
+
+def proof_test_map(n_channels: int, tested: Sequence[int], mrt_hours: float) -> np.ndarray:
+    """
+    State reached from every state when some channels are proof tested
+    
+    Args:
+        n_channels: Number of channels
+        tested: Indices of the channels tested
+        mrt_hours: Mean repair time (zero restores failed channels at once)
+    
+    Returns:
+        Array giving the target state of each state
+    """
+    states = _channel_states(n_channels)
+    after = states.copy()
+    for channel in tested:
+        after[states[:, channel] == DU, channel] = REPAIR if mrt_hours > 0 else OK
+    return after @ (CHANNEL_STATES ** np.arange(n_channels))
+
+
+def uniformised_step(
+    p0: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    rates: np.ndarray,
+    hours: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Transient solution and its time integral by uniformisation
+    
+    With Λ the largest exit rate and P = I + Q/Λ,
+    p(h) = Σ Poisson(k; Λh) p0 P^k and
+    ∫ p dt = Σ (1 - F_k(Λh)) p0 P^k / Λ, where F_k is the Poisson CDF.
+    
+    Args:
+        p0: State probabilities at the start
+        rows: Source states of the transitions
+        cols: Target states of the transitions
+        rates: Transition rates (per hour)
+        hours: Length of the step
+    
+    Returns:
+        Tuple of (probabilities at the end, integral of the probabilities over the step)
+    """
+    n_states = len(p0)
+    exit_rate = np.bincount(rows, weights=rates, minlength=n_states)
+    uniform_rate = exit_rate.max(initial=0.0)
+    if uniform_rate <= 0 or hours <= 0:
+        return p0.copy(), p0 * max(hours, 0.0)
+    
+    a = uniform_rate * hours
+    n_terms = int(np.ceil(a + 8.0 * np.sqrt(a) + 20.0))
+    k = np.arange(n_terms)
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, n_terms)))))
+    weights = np.exp(k * np.log(a) - a - log_factorial)
+    tail = np.clip(1.0 - np.cumsum(weights), 0.0, None)
+    
+    stay = 1.0 - exit_rate / uniform_rate
+    jump = rates / uniform_rate
+    p = p0.astype(float)
+    end = np.zeros(n_states)
+    integral = np.zeros(n_states)
+    for i in range(n_terms):
+        end += weights[i] * p
+        integral += tail[i] * p
+        p = stay * p + np.bincount(cols, weights=jump * p[rows], minlength=n_states)
+    return end, integral / uniform_rate
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _solve(
+    m: int,
+    channels: Tuple[Tuple[float, float, float], ...],
+    test_interval_hours: float,
+    beta: float,
+    beta_d: float,
+    mttr_hours: float,
+    mrt_hours: float
+) -> float:
+    """
+    Time-averaged unavailability of one subsystem configuration
+    
+    Proof tests repeat every test interval at each channel's offset. Cycles
+    are simulated from an as-new subsystem until the cycle average settles,
+    and the average over the last cycle is returned.
+    
+    Args:
+        m: Number of channels required to trip
+        channels: (lambda_du, lambda_dd, test offset in hours) of each channel
+        test_interval_hours: Proof test interval in hours
+        beta: Common cause factor for undetected failures
+        beta_d: Common cause factor for detected failures
+        mttr_hours: Mean time to restoration
+        mrt_hours: Mean repair time after a proof test
+    
+    Returns:
+        PFDavg in the periodic regime
+    """
+    n_channels = len(channels)
+    lambda_du, lambda_dd, offsets = (np.array(values) for values in zip(*channels))
+    rows, cols, rates, n_states, failed = build_generator(
+        m, lambda_du, lambda_dd, beta, beta_d, mttr_hours, mrt_hours
+    )
+    
+    offsets = np.mod(offsets, test_interval_hours)
+    boundaries = np.unique(offsets)
+    lengths = np.diff(np.append(boundaries, boundaries[0] + test_interval_hours))
+    test_maps = [proof_test_map(n_channels, np.flatnonzero(offsets == b), mrt_hours) for b in boundaries]
+    
+    p = np.zeros(n_states)
+    p[0] = 1.0
+    previous = None
+    for _ in range(MAX_CYCLES):
+        unavailable_hours = 0.0
+        for test_map, length in zip(test_maps, lengths):
+            p = np.bincount(test_map, weights=p, minlength=n_states)
+            p, integral = uniformised_step(p, rows, cols, rates, length)
+            unavailable_hours += integral[failed].sum()
+        average = unavailable_hours / test_interval_hours
+        if previous is not None and abs(average - previous) <= CONVERGENCE_TOLERANCE * max(average, 1e-300):
+            break
+        previous = average
+    return float(min(1.0, max(0.0, average)))
+
+
+class MarkovSolver:
+    """Markov-model PFDavg of voted subsystems with memoized solutions"""
+    
+    @staticmethod
+    def unavailability(
+        architecture: str,
+        lambda_du: Any,
+        lambda_dd: Any,
+        test_interval_hours: float,
+        mttr_hours: float = 8.0,
+        beta: float = 0.1,
+        beta_d: Optional[float] = None,
+        mrt_hours: Optional[float] = None,
+        staggered: bool = False,
+        test_offsets_hours: Optional[Sequence[float]] = None
+    ) -> float:
+        """
+        PFDavg of one subsystem from its Markov model
+        
+        Configurations are memoized on their parameters, so subsystems
+        sharing component types and test regimes are solved once.
+        
+        Args:
+            architecture: Voting architecture such as "2oo4"
+            lambda_du: Dangerous undetected failure rate, one value or one per channel
+            lambda_dd: Dangerous detected failure rate, one value or one per channel
+            test_interval_hours: Proof test interval in hours
+            mttr_hours: Mean time to restoration
+            beta: Common cause factor for undetected failures
+            beta_d: Common cause factor for detected failures (defaults to beta / 2)
+            mrt_hours: Mean repair time after a proof test (defaults to MTTR)
+            staggered: Spread the channel tests evenly over the interval
+            test_offsets_hours: Explicit test offset of each channel (overrides staggered)
+        
+        Returns:
+            PFDavg value
+        """
+        m, n = parse_architecture(architecture)
+        if n > MAX_CHANNELS:
+            raise ValueError(f"Markov models support at most {MAX_CHANNELS} channels")
+        if test_interval_hours <= 0:
+            raise ValueError("Test interval must be positive")
+        lambda_du = np.broadcast_to(np.asarray(lambda_du, dtype=float), (n,))
+        lambda_dd = np.broadcast_to(np.asarray(lambda_dd, dtype=float), (n,))
+        if test_offsets_hours is not None:
+            offsets = np.broadcast_to(np.asarray(test_offsets_hours, dtype=float), (n,))
+        elif staggered:
+            offsets = np.arange(n) * test_interval_hours / n
+        else:
+            offsets = np.zeros(n)
+        beta_d = beta / 2.0 if beta_d is None else beta_d
+        mrt_hours = mttr_hours if mrt_hours is None else mrt_hours
+        
+        channels = tuple(zip(lambda_du.tolist(), lambda_dd.tolist(), offsets.tolist()))
+        return _solve(m, channels, float(test_interval_hours), float(beta), float(beta_d),
+                      float(mttr_hours), float(mrt_hours))
+    
+    @staticmethod
+    def evaluate_subsystems(subsystems: pd.DataFrame, staggered: bool = False) -> pd.DataFrame:
+        """
+        Markov PFDavg of every row of a sif_subsystems frame
+        
+        Failure rates come from PFDAvg.evaluate_subsystems, and each distinct
+        configuration is solved only once.
+        
+        Args:
+            subsystems: Frame accepted by PFDAvg.evaluate_subsystems
+            staggered: Spread the channel tests evenly over the interval
+        
+        Returns:
+            The PFDAvg.evaluate_subsystems result with an added pfd_markov column
+        """
+        frame = PFDAvg.evaluate_subsystems(subsystems)
+        if frame.empty:
+            frame["pfd_markov"] = pd.Series(dtype=float)
+            return frame
+        
+        def column(name, default):
+            if name not in frame:
+                return pd.Series(default, index=frame.index, dtype=float)
+            return pd.to_numeric(frame[name], errors="coerce").fillna(default)
+        
+        configurations = pd.DataFrame({
+            "architecture": frame["m"].astype(str) + "oo" + frame["n"].astype(str),
+            "lambda_du": frame["lambda_du"],
+            "lambda_dd": frame["lambda_dd"],
+            "test_interval_hours": column("test_interval_months", 12) * HOURS_PER_MONTH,
+            "mttr_hours": column("mttr_hours", 24.0),
+            "beta": column("beta", 0.1),
+        })
+        configurations["beta_d"] = column("beta_d", np.nan).fillna(configurations["beta"] / 2.0)
+        
+        keys = list(configurations.columns)
+        distinct = configurations.drop_duplicates().reset_index(drop=True)
+        distinct["pfd_markov"] = [
+            MarkovSolver.unavailability(staggered=staggered, **row) for row in distinct.to_dict("records")
+        ]
+        frame["pfd_markov"] = configurations.merge(distinct, on=keys, how="left")["pfd_markov"].to_numpy()
+        return frame
+    
+    @staticmethod
+    def cache_info() -> Dict[str, int]:
+        """
+        Statistics of the solution cache
+        
+        Returns:
+            Dictionary with hits, misses, size and maxsize
+        """
+        info = _solve.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
+    
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop every memoized solution"""
+        _solve.cache_clear()
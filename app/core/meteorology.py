@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - Meteorological Data Module
+Provides hourly met data ingestion, Turner stability classification and
+wind speed × stability × direction frequency tables
+"""
+from typing import Dict, Any, List, Optional, Union, IO
+
+import numpy as np
+import pandas as pd
+
+
+STABILITY_CLASSES = ["A", "B", "C", "D", "E", "F"]
+
+# Upper edges (m/s) of the wind speed bins; the last bin is open-ended
+WIND_SPEED_BIN_EDGES = [1.5, 3.0, 5.0, 8.0, 11.0]
+
+# Representative wind speed (m/s) reported for each bin
+WIND_SPEED_BIN_SPEEDS = [1.0, 2.0, 4.0, 6.5, 9.5, 12.0]
+
+DEFAULT_DIRECTION_SECTORS = 16
+
+# Turner stability class (0=A ... 6=G) by wind speed category (rows) and
+# net radiation index 4, 3, 2, 1, 0, -1, -2 (columns)
+_TURNER_TABLE = np.array([
+    [0, 0, 1, 2, 3, 5, 6],  # 0-1 knots
+    [0, 1, 1, 2, 3, 5, 6],  # 2-3 knots
+    [0, 1, 2, 3, 3, 4, 5],  # 4-5 knots
+    [1, 1, 2, 3, 3, 4, 5],  # 6 knots
+    [1, 1, 2, 3, 3, 3, 4],  # 7 knots
+    [1, 2, 2, 3, 3, 3, 4],  # 8-9 knots
+    [2, 2, 3, 3, 3, 3, 4],  # 10 knots
+    [2, 2, 3, 3, 3, 3, 3],  # 11 knots
+    [2, 3, 3, 3, 3, 3, 3],  # >= 12 knots
+])
+
+# Upper edges (knots) of the Turner wind speed categories
+_TURNER_WIND_EDGES_KNOTS = np.array([1.5, 3.5, 5.5, 6.5, 7.5, 9.5, 10.5, 11.5])
+
+_MS_TO_KNOTS = 1.943844
+_FEET_TO_M = 0.3048
+
+
+def solar_elevation(timestamps: pd.Series, latitude_deg: float, longitude_deg: float,
+                    utc_offset_hours: float = 0.0) -> np.ndarray:
+    """
+    Calculate the approximate solar elevation angle
+    
+    Args:
+        timestamps: Local timestamps
+        latitude_deg: Site latitude in degrees (north positive)
+        longitude_deg: Site longitude in degrees (east positive)
+        utc_offset_hours: Offset of the local timestamps from UTC in hours
+    
+    Returns:
+        Solar elevation in degrees
+    """
+    ts = pd.DatetimeIndex(timestamps)
+    day_of_year = ts.dayofyear.to_numpy(dtype=float)
+    hour_utc = ts.hour.to_numpy(dtype=float) + ts.minute.to_numpy(dtype=float) / 60.0 - utc_offset_hours
+    
+    declination = np.radians(23.45) * np.sin(np.radians(360.0 / 365.0 * (284.0 + day_of_year)))
+    solar_time = hour_utc + longitude_deg / 15.0
+    hour_angle = np.radians(15.0 * (solar_time - 12.0))
+    lat = np.radians(latitude_deg)
+    
+    sin_elevation = (np.sin(lat) * np.sin(declination)
+                     + np.cos(lat) * np.cos(declination) * np.cos(hour_angle))
+    return np.degrees(np.arcsin(np.clip(sin_elevation, -1.0, 1.0)))
+
+
+def turner_stability(wind_speed_ms: np.ndarray, cloud_cover_tenths: np.ndarray,
+                     ceiling_height_m: np.ndarray, solar_elevation_deg: np.ndarray) -> np.ndarray:
+    """
+    Assign Pasquill stability classes with the Turner net radiation index method
+    
+    Args:
+        wind_speed_ms: Wind speed in m/s
+        cloud_cover_tenths: Total cloud cover in tenths (0-10)
+        ceiling_height_m: Cloud ceiling height in m (NaN for unlimited)
+        solar_elevation_deg: Solar elevation in degrees
+    
+    Returns:
+        Stability class indices (0=A ... 5=F); class G is reported as F
+    """
+    wind = np.asarray(wind_speed_ms, dtype=float)
+    cloud = np.nan_to_num(np.asarray(cloud_cover_tenths, dtype=float), nan=0.0)
+    ceiling_ft = np.nan_to_num(np.asarray(ceiling_height_m, dtype=float) / _FEET_TO_M, nan=np.inf)
+    elevation = np.asarray(solar_elevation_deg, dtype=float)
+    
+    # Insolation class from solar altitude
+    insolation = np.select(
+        [elevation > 60.0, elevation > 35.0, elevation > 15.0],
+        [4, 3, 2],
+        default=1
+    )
+    
+    # Daytime net radiation index, reduced for cloud cover above 5/10
+    day_nri = insolation.copy()
+    cloudy = cloud > 5.0
+    day_nri = np.where(cloudy & (ceiling_ft < 7000.0), day_nri - 2, day_nri)
+    day_nri = np.where(cloudy & (ceiling_ft >= 7000.0) & (ceiling_ft < 16000.0), day_nri - 1, day_nri)
+    day_nri = np.where(cloudy & (cloud >= 10.0) & (ceiling_ft >= 7000.0), day_nri - 1, day_nri)
+    day_nri = np.maximum(day_nri, 1)
+    
+    night_nri = np.where(cloud <= 4.0, -2, -1)
+    
+    nri = np.where(elevation > 0.0, day_nri, night_nri)
+    overcast_low = (cloud >= 10.0) & (ceiling_ft < 7000.0)
+    nri = np.where(overcast_low, 0, nri)
+    
+    wind_category = np.searchsorted(_TURNER_WIND_EDGES_KNOTS, wind * _MS_TO_KNOTS, side='right')
+    stability = _TURNER_TABLE[wind_category, 4 - nri]
+    return np.minimum(stability, 5)
+
+
+class MetFrequencyTable:
+    """Joint frequency table of wind speed bin × stability class × direction sector"""
+    
+    def __init__(self, counts: np.ndarray, site: str = ""):
+        """
+        Initialize a frequency table
+        
+        Args:
+            counts: Hour counts, shape (n_speed_bins, 6, n_sectors)
+            site: Site name
+        """
+        self.counts = np.asarray(counts, dtype=float)
+        self.site = site
+    
+    @classmethod
+    def empty(cls, n_sectors: int = DEFAULT_DIRECTION_SECTORS, site: str = "") -> 'MetFrequencyTable':
+        """Create an empty table"""
+        return cls(np.zeros((len(WIND_SPEED_BIN_SPEEDS), len(STABILITY_CLASSES), n_sectors)), site)
+    
+    @property
+    def n_sectors(self) -> int:
+        """Number of wind direction sectors"""
+        return self.counts.shape[2]
+    
+    @property
+    def total_hours(self) -> float:
+        """Total number of hours in the table"""
+        return float(self.counts.sum())
+    
+    @property
+    def frequencies(self) -> np.ndarray:
+        """Fraction of hours in each bin"""
+        total = self.total_hours
+        if total <= 0:
+            return np.zeros_like(self.counts)
+        return self.counts / total
+    
+    def add_observations(self, wind_speed_ms: np.ndarray, stability: np.ndarray,
+                         wind_direction_deg: np.ndarray) -> None:
+        """
+        Accumulate hourly observations into the table
+        
+        Args:
+            wind_speed_ms: Wind speed in m/s
+            stability: Stability class indices (0=A ... 5=F)
+            wind_direction_deg: Wind direction in degrees (blowing from)
+        """
+        speed_bin = np.searchsorted(WIND_SPEED_BIN_EDGES, wind_speed_ms, side='right')
+        sector_width = 360.0 / self.n_sectors
+        sector = (np.floor((np.mod(wind_direction_deg, 360.0) + sector_width / 2) / sector_width)
+                  .astype(int) % self.n_sectors)
+        
+        flat = (speed_bin * len(STABILITY_CLASSES) + stability) * self.n_sectors + sector
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+    
+    def stability_frequencies(self) -> Dict[str, float]:
+        """Marginal frequency of each stability class"""
+        marginal = self.frequencies.sum(axis=(0, 2))
+        return dict(zip(STABILITY_CLASSES, marginal.tolist()))
+    
+    def most_frequent_condition(self) -> Dict[str, Any]:
+        """
+        Get the most frequent wind speed and stability combination
+        
+        Returns:
+            Dictionary with wind speed, stability class and frequency
+        """
+        marginal = self.frequencies.sum(axis=2)
+        speed_bin, stability = np.unravel_index(np.argmax(marginal), marginal.shape)
+        return {
+            "wind_speed_ms": WIND_SPEED_BIN_SPEEDS[speed_bin],
+            "stability_class": STABILITY_CLASSES[stability],
+            "frequency": float(marginal[speed_bin, stability])
+        }
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Convert non-empty bins to database records
+        
+        Returns:
+            List of record dictionaries
+        """
+        frequencies = self.frequencies
+        records = []
+        for speed_bin, stability, sector in zip(*np.nonzero(self.counts)):
+            records.append({
+                "site": self.site,
+                "wind_speed_bin": int(speed_bin),
+                "wind_speed_ms": WIND_SPEED_BIN_SPEEDS[speed_bin],
+                "stability_class": STABILITY_CLASSES[stability],
+                "direction_sector": int(sector),
+                "n_sectors": self.n_sectors,
+                "hours": float(self.counts[speed_bin, stability, sector]),
+                "frequency": float(frequencies[speed_bin, stability, sector])
+            })
+        return records
+    
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]], site: str = "") -> 'MetFrequencyTable':
+        """
+        Rebuild a table from database records
+        
+        Args:
+            records: Record dictionaries as produced by to_records
+            site: Site name
+        
+        Returns:
+            MetFrequencyTable
+        """
+        n_sectors = int(records[0]["n_sectors"]) if records else DEFAULT_DIRECTION_SECTORS
+        table = cls.empty(n_sectors, site)
+        for record in records:
+            table.counts[
+                int(record["wind_speed_bin"]),
+                STABILITY_CLASSES.index(record["stability_class"]),
+                int(record["direction_sector"])
+            ] = float(record["hours"])
+        return table
+
+
+def build_frequency_table(
+    source: Union[str, IO],
+    latitude_deg: float,
+    longitude_deg: float,
+    site: str = "",
+    utc_offset_hours: float = 0.0,
+    n_sectors: int = DEFAULT_DIRECTION_SECTORS,
+    chunksize: int = 100000,
+    columns: Optional[Dict[str, str]] = None
+) -> MetFrequencyTable:
+    """
+    Stream an hourly met CSV file into a frequency table
+    
+    The file is read in chunks so multi-year records never need to be held
+    in memory at once. Expected columns (renameable via ``columns``) are
+    ``timestamp``, ``wind_speed_ms``, ``wind_direction_deg``,
+    ``cloud_cover_tenths`` and, optionally, ``ceiling_height_m``.
+    
+    Args:
+        source: Path or file-like object of the CSV file
+        latitude_deg: Site latitude in degrees
+        longitude_deg: Site longitude in degrees
+        site: Site name
+        utc_offset_hours: Offset of the file timestamps from UTC in hours
+        n_sectors: Number of wind direction sectors
+        chunksize: Number of rows per chunk
+        columns: Mapping of standard column name to the name used in the file
+    
+    Returns:
+        MetFrequencyTable
+    """
+    names = {
+        "timestamp": "timestamp",
+        "wind_speed_ms": "wind_speed_ms",
+        "wind_direction_deg": "wind_direction_deg",
+        "cloud_cover_tenths": "cloud_cover_tenths",
+        "ceiling_height_m": "ceiling_height_m",
+    }
+    if columns:
+        names.update(columns)
+    
+    table = MetFrequencyTable.empty(n_sectors, site)
+    
+    for chunk in pd.read_csv(source, chunksize=chunksize):
+        chunk = chunk.dropna(subset=[names["timestamp"], names["wind_speed_ms"], names["wind_direction_deg"]])
+        if chunk.empty:
+            continue
+        
+        timestamps = pd.to_datetime(chunk[names["timestamp"]])
+        wind_speed = chunk[names["wind_speed_ms"]].to_numpy(dtype=float)
+        wind_direction = chunk[names["wind_direction_deg"]].to_numpy(dtype=float)
+        cloud = (chunk[names["cloud_cover_tenths"]].to_numpy(dtype=float)
+                 if names["cloud_cover_tenths"] in chunk else np.zeros(len(chunk)))
+        ceiling = (chunk[names["ceiling_height_m"]].to_numpy(dtype=float)
+                   if names["ceiling_height_m"] in chunk else np.full(len(chunk), np.nan))
+        
+        elevation = solar_elevation(timestamps, latitude_deg, longitude_deg, utc_offset_hours)
+        stability = turner_stability(wind_speed, cloud, ceiling, elevation)
+        table.add_observations(wind_speed, stability, wind_direction)
+    
+    return table
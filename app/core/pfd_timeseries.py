@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - Time-Dependent PFD Module
+Builds sawtooth PFD(t) profiles of proof-tested protection layers and the
+resulting time-varying mitigated frequency of LOPA scenarios
+"""
+from typing import List, Any, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .ipl import IPL, LOPAScenario
+from .lopa_batch import PortfolioLOPA
+from .pfdavg import HOURS_PER_MONTH, HOURS_PER_YEAR
+from .sif import SIFSubsystem
+
+
+# Number of channel failures needed to defeat each voting architecture
+ARCHITECTURE_ORDER = {"1oo1": 1, "1oo2": 2, "2oo2": 1, "2oo3": 2, "2oo4": 3}
+
+
+class PFDTimeSeries:
+    """Instantaneous unavailability of proof-tested protection layers"""
+    
+    @staticmethod
+    def time_grid(horizon_years: float = 10.0, step_hours: float = 24.0) -> np.ndarray:
+        """
+        Build a fixed time grid
+        
+        Args:
+            horizon_years: Length of the study horizon in years
+            step_hours: Grid spacing in hours
+        
+        Returns:
+            Time points in hours, starting at zero
+        """
+        return np.arange(0.0, horizon_years * HOURS_PER_YEAR + step_hours / 2, step_hours)
+    
+    @staticmethod
+    def sawtooth(
+        t_hours: np.ndarray,
+        pfd_avg: Any,
+        test_interval_hours: Any,
+        mttr_hours: Any = 0.0,
+        offset_hours: Any = 0.0,
+        order: Any = 1
+    ) -> np.ndarray:
+        """
+        Instantaneous unavailability of layers restored by periodic proof tests
+        
+        Within each test interval T the unavailability grows as
+        (k + 1) * PFDavg * (tau / T)^k, where tau is the time since the last
+        test and k the number of channel failures needed to defeat the layer,
+        so its average over the interval equals PFDavg. For MTTR hours after
+        each test the layer keeps its end-of-interval value while failures
+        found by the test are repaired.
+        
+        Args:
+            t_hours: Time points in hours
+            pfd_avg: Average PFD of each layer
+            test_interval_hours: Proof-test interval of each layer
+            mttr_hours: Repair time after each proof test
+            offset_hours: Time of the first proof test after t = 0
+            order: Failures needed to defeat each layer
+        
+        Returns:
+            Array of shape (layers, time points), or (time points,) for scalar inputs
+        """
+        with np.errstate(divide="ignore"):
+            return np.power(10.0, PFDTimeSeries.log_sawtooth(
+                t_hours, pfd_avg, test_interval_hours, mttr_hours, offset_hours, order
+            ))
+    
+    @staticmethod
+    def log_sawtooth(
+        t_hours: np.ndarray,
+        pfd_avg: Any,
+        test_interval_hours: Any,
+        mttr_hours: Any = 0.0,
+        offset_hours: Any = 0.0,
+        order: Any = 1
+    ) -> np.ndarray:
+        """
+        log10 of the sawtooth unavailability
+        
+        Working in log space avoids a fractional power per element and lets
+        layers be combined by addition. Arguments are as for sawtooth.
+        
+        Returns:
+            log10 unavailability, -inf right after a test for zero repair time
+        """
+        scalar = all(np.ndim(x) == 0 for x in (pfd_avg, test_interval_hours, mttr_hours, offset_hours, order))
+        
+        def column(x):
+            return np.atleast_1d(np.asarray(x, dtype=float))[:, None]
+        
+        k = column(order)
+        with np.errstate(divide="ignore"):
+            log_peak = np.minimum(np.log10((k + 1) * column(pfd_avg)), 0.0)
+        
+        log_u = PFDTimeSeries.log_test_fraction(t_hours, test_interval_hours, mttr_hours, offset_hours)
+        log_u = log_u * k + log_peak
+        
+        return log_u[0] if scalar else log_u
+    
+    @staticmethod
+    def log_test_fraction(
+        t_hours: np.ndarray,
+        test_interval_hours: Any,
+        mttr_hours: Any = 0.0,
+        offset_hours: Any = 0.0
+    ) -> np.ndarray:
+        """
+        log10 of the fraction of the test interval elapsed since the last test
+        
+        The fraction is held at one during the repair window after each test,
+        so the unavailability stays at its end-of-interval value.
+        
+        Args:
+            t_hours: Time points in hours
+            test_interval_hours: Proof-test interval of each schedule
+            mttr_hours: Repair time after each proof test
+            offset_hours: Time of the first proof test after t = 0
+        
+        Returns:
+            Array of shape (schedules, time points)
+        """
+        t = np.asarray(t_hours, dtype=float)
+        
+        def column(x):
+            return np.atleast_1d(np.asarray(x, dtype=float))[:, None]
+        
+        interval = np.maximum(column(test_interval_hours), 1e-9)
+        # Tests fall at offset + n * interval
+        since_test = np.mod(t[None, :] - column(offset_hours), interval)
+        with np.errstate(divide="ignore"):
+            log_fraction = np.log10(since_test / interval)
+        
+        mttr = column(mttr_hours)
+        if np.any(mttr > 0):
+            log_fraction[since_test < mttr] = 0.0
+        return log_fraction
+    
+    @staticmethod
+    def ipl_unavailability(
+        ipl: IPL,
+        t_hours: np.ndarray,
+        mttr_hours: float = 0.0,
+        offset_hours: float = 0.0
+    ) -> np.ndarray:
+        """
+        PFD(t) of an IPL proof tested at its audit frequency
+        
+        Args:
+            ipl: IPL object
+            t_hours: Time points in hours
+            mttr_hours: Repair time after each audit
+            offset_hours: Time of the first audit after t = 0
+        
+        Returns:
+            Unavailability at each time point (1 where the IPL is disabled)
+        """
+        if not ipl.is_enabled:
+            return np.ones(len(t_hours))
+        return PFDTimeSeries.sawtooth(
+            t_hours, ipl.pfd, (ipl.audit_frequency_months or 12) * HOURS_PER_MONTH, mttr_hours, offset_hours
+        )
+    
+    @staticmethod
+    def subsystem_unavailability(
+        subsystem: SIFSubsystem,
+        t_hours: np.ndarray,
+        offset_hours: float = 0.0
+    ) -> np.ndarray:
+        """
+        PFD(t) of a SIF subsystem
+        
+        Args:
+            subsystem: SIF subsystem
+            t_hours: Time points in hours
+            offset_hours: Time of the first proof test after t = 0
+        
+        Returns:
+            Unavailability at each time point
+        """
+        return PFDTimeSeries.sawtooth(
+            t_hours,
+            subsystem.calculate_pfd_avg(),
+            subsystem.test_interval_months * HOURS_PER_MONTH,
+            subsystem.mttr_hours,
+            offset_hours,
+            ARCHITECTURE_ORDER.get(subsystem.architecture, 1)
+        )
+    
+    @staticmethod
+    def sif_unavailability(
+        subsystems: List[SIFSubsystem],
+        t_hours: np.ndarray,
+        offsets_hours: Optional[Sequence[float]] = None
+    ) -> np.ndarray:
+        """
+        PFD(t) of a SIF, the sum over its subsystems in series
+        
+        Args:
+            subsystems: SIF subsystems
+            t_hours: Time points in hours
+            offsets_hours: First proof-test time of each subsystem
+        
+        Returns:
+            Unavailability at each time point
+        """
+        offsets = offsets_hours if offsets_hours is not None else [0.0] * len(subsystems)
+        total = np.zeros(len(t_hours))
+        for subsystem, offset in zip(subsystems, offsets):
+            total += PFDTimeSeries.subsystem_unavailability(subsystem, t_hours, offset)
+        return np.minimum(total, 1.0)
+    
+    @staticmethod
+    def scenario_frequency(
+        scenario: LOPAScenario,
+        t_hours: np.ndarray,
+        mttr_hours: float = 0.0
+    ) -> np.ndarray:
+        """
+        Time-varying mitigated frequency of a LOPA scenario
+        
+        Args:
+            scenario: LOPA scenario
+            t_hours: Time points in hours
+            mttr_hours: Repair time after each IPL audit
+        
+        Returns:
+            Mitigated frequency (events/year) at each time point
+        """
+        frequency = np.full(len(t_hours), float(scenario.initiating_event_frequency))
+        for modifier in scenario.conditional_modifiers.values():
+            frequency *= modifier
+        for ipl in scenario.ipls:
+            frequency *= PFDTimeSeries.ipl_unavailability(ipl, t_hours, mttr_hours)
+        return frequency
+    
+    @staticmethod
+    def peak_windows(t_hours: np.ndarray, frequency: np.ndarray, target: float) -> pd.DataFrame:
+        """
+        Contiguous periods where a frequency profile exceeds its target
+        
+        Args:
+            t_hours: Time points in hours
+            frequency: Frequency at each time point
+            target: Target frequency
+        
+        Returns:
+            DataFrame with start_hours, end_hours and the peak frequency of each window
+        """
+        t = np.asarray(t_hours, dtype=float)
+        above = np.asarray(frequency) > target
+        edges = np.diff(np.concatenate([[0], above.astype(np.int8), [0]]))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        return pd.DataFrame({
+            "start_hours": t[starts],
+            "end_hours": t[ends - 1],
+            "peak_frequency": [float(np.max(frequency[s:e])) for s, e in zip(starts, ends)]
+        })
+
+
+class PortfolioPFDTimeSeries:
+    """Time-varying mitigated frequency for every scenario of a LOPA portfolio"""
+    
+    def __init__(self, portfolio: PortfolioLOPA, default_interval_months: float = 12.0):
+        """
+        Initialize from a portfolio
+        
+        Proof-test data is read from optional IPL columns: ``audit_frequency_months``
+        (or ``test_interval_months``), ``mttr_hours`` and ``test_offset_months``
+        for staggered testing. Missing values fall back to the default interval,
+        no repair time and no offset.
+        
+        Args:
+            portfolio: Portfolio holding the scenarios and IPLs
+            default_interval_months: Proof-test interval used when none is given
+        """
+        self.portfolio = portfolio
+        ipls = portfolio.ipls
+        
+        def optional(columns, default):
+            for column in columns:
+                if column in ipls:
+                    return pd.to_numeric(ipls[column], errors="coerce").fillna(default).to_numpy(dtype=float)
+            return np.full(len(ipls), float(default))
+        
+        self.interval_hours = optional(
+            ["audit_frequency_months", "test_interval_months"], default_interval_months
+        ) * HOURS_PER_MONTH
+        self.mttr_hours = optional(["mttr_hours"], 0.0)
+        self.offset_hours = optional(["test_offset_months"], 0.0) * HOURS_PER_MONTH
+    
+    def log_frequency(
+        self,
+        t_hours: np.ndarray,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        log10 of the mitigated frequency for a block of scenarios
+        
+        Args:
+            t_hours: Time points in hours
+            start: First scenario position
+            end: End scenario position (exclusive)
+        
+        Returns:
+            Array of shape (scenarios, time points)
+        """
+        portfolio = self.portfolio
+        rows, offsets = portfolio.scenario_ipl_rows()
+        end = len(offsets) - 1 if end is None else end
+        
+        with np.errstate(divide="ignore"):
+            log_base = np.log10(portfolio.initiating_frequency[start:end]) + portfolio.log_modifiers[start:end]
+        log_freq = np.repeat(log_base[:, None], len(t_hours), axis=1)
+        
+        block_rows = rows[offsets[start]:offsets[end]]
+        block_rows = block_rows[portfolio.ipl_enabled[block_rows]]
+        if len(block_rows):
+            # Each layer contributes log10(2 * PFD) + log10(fraction of its test
+            # interval elapsed); layers usually share a handful of test schedules,
+            # so the fraction is computed once per schedule and combined with a
+            # scenario × schedule incidence matrix
+            with np.errstate(divide="ignore"):
+                log_peak = np.maximum(np.minimum(np.log10(2.0 * portfolio.ipl_pfd[block_rows]), 0.0), -100.0)
+            owner = portfolio.ipl_scenario_index[block_rows] - start
+            log_freq += np.bincount(owner, weights=log_peak, minlength=end - start)[:, None]
+            
+            schedules, schedule_index = np.unique(
+                np.column_stack([
+                    self.interval_hours[block_rows],
+                    self.mttr_hours[block_rows],
+                    self.offset_hours[block_rows]
+                ]),
+                axis=0,
+                return_inverse=True
+            )
+            schedule_index = schedule_index.ravel()
+            log_fraction = PFDTimeSeries.log_test_fraction(
+                t_hours, schedules[:, 0], schedules[:, 1], schedules[:, 2]
+            )
+            # Zero unavailability right at a test instant; floor to keep sums finite
+            np.maximum(log_fraction, -100.0, out=log_fraction)
+            
+            if (end - start) * len(schedules) <= 4 * len(block_rows):
+                incidence = np.zeros((end - start, len(schedules)))
+                np.add.at(incidence, (owner, schedule_index), 1.0)
+                log_freq += incidence @ log_fraction
+            else:
+                # Mostly distinct schedules: rows are grouped by scenario, so
+                # per-scenario sums are cumulative-sum differences
+                cumulative = np.zeros((len(block_rows) + 1, len(t_hours)))
+                np.cumsum(log_fraction[schedule_index], axis=0, out=cumulative[1:])
+                bounds = np.searchsorted(owner, np.arange(end - start + 1))
+                log_freq += cumulative[bounds[1:]] - cumulative[bounds[:-1]]
+        return log_freq
+    
+    def simulate(
+        self,
+        horizon_years: float = 10.0,
+        step_hours: float = 24.0,
+        max_elements: int = 5000000
+    ) -> pd.DataFrame:
+        """
+        Summarize the time-varying mitigated frequency of every scenario
+        
+        Args:
+            horizon_years: Length of the study horizon in years
+            step_hours: Grid spacing in hours
+            max_elements: Largest IPL rows × time points matrix held at once
+        
+        Returns:
+            DataFrame with the average and peak mitigated frequency, the time
+            of the peak and the fraction of time above the target
+        """
+        portfolio = self.portfolio
+        t = PFDTimeSeries.time_grid(horizon_years, step_hours)
+        _, offsets = portfolio.scenario_ipl_rows()
+        n_scenarios = len(offsets) - 1
+        
+        mean = np.empty(n_scenarios)
+        peak = np.empty(n_scenarios)
+        peak_time = np.empty(n_scenarios)
+        exceedance = np.empty(n_scenarios)
+        
+        # Each scenario costs one row plus one per IPL
+        weight = np.cumsum(1 + np.diff(offsets))
+        budget = max(max_elements // len(t), 1)
+        start = 0
+        while start < n_scenarios:
+            used = weight[start - 1] if start > 0 else 0
+            end = min(max(int(np.searchsorted(weight, used + budget, side="right")), start + 1), n_scenarios)
+            
+            log_freq = self.log_frequency(t, start, end)
+            frequency = np.power(10.0, log_freq)
+            mean[start:end] = frequency.mean(axis=1)
+            at_peak = np.argmax(log_freq, axis=1)
+            peak[start:end] = frequency[np.arange(end - start), at_peak]
+            peak_time[start:end] = t[at_peak] / HOURS_PER_YEAR
+            exceedance[start:end] = (frequency > portfolio.target_frequency[start:end, None]).mean(axis=1)
+            start = end
+        
+        return pd.DataFrame({
+            "id": portfolio.scenario_ids,
+            "mitigated_frequency": np.power(10.0, portfolio.log_mitigated_frequency()),
+            "mean_frequency": mean,
+            "peak_frequency": peak,
+            "peak_time_years": peak_time,
+            "fraction_above_target": exceedance,
+            "target_mitigated_frequency": portfolio.target_frequency
+        })
+    
+    def profile(self, scenario_id: Any, horizon_years: float = 10.0, step_hours: float = 24.0) -> pd.DataFrame:
+        """
+        Mitigated frequency profile of one scenario
+        
+        Args:
+            scenario_id: Scenario id
+            horizon_years: Length of the study horizon in years
+            step_hours: Grid spacing in hours
+        
+        Returns:
+            DataFrame with time_hours, time_years and mitigated_frequency
+        """
+        position = int(np.flatnonzero(self.portfolio.scenario_ids == scenario_id)[0])
+        t = PFDTimeSeries.time_grid(horizon_years, step_hours)
+        frequency = np.power(10.0, self.log_frequency(t, position, position + 1)[0])
+        return pd.DataFrame({"time_hours": t, "time_years": t / HOURS_PER_YEAR, "mitigated_frequency": frequency})
@@ -0,0 +1,746 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - PFDavg Module
+Average probability of failure on demand (low demand) and average frequency
+of dangerous failure (high demand) of MooN voted subsystems using the
+simplified equations of IEC 61508-6 Annex B, together with their spurious
+trip rates, evaluated over whole arrays of subsystems at once
+"""
+import re
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+HOURS_PER_MONTH = 30 * 24  # Test intervals in months are taken as 30 days
+HOURS_PER_YEAR = 8760
+
+# Safe failure rate assumed per unit dangerous failure rate when none is recorded
+DEFAULT_SAFE_TO_DANGEROUS_RATIO = 1.0
+
+ARCHITECTURES = ("1oo1", "1oo2", "2oo2", "2oo3", "2oo4")
+
+# Upper PFD bound (exclusive) of SIL 1 to SIL 4
+SIL_PFD_LIMITS = np.array([0.1, 0.01, 0.001, 0.0001])
+
+# Upper PFH bound (exclusive, per hour) of SIL 1 to SIL 4
+SIL_PFH_LIMITS = np.array([1e-5, 1e-6, 1e-7, 1e-8])
+
+# IEC 61511 low demand mode: at most one demand per year and at most twice
+# the proof test frequency
+LOW_DEMAND_MAX_RATE = 1.0
+LOW_DEMAND = "Low"
+HIGH_DEMAND = "High"
+
+# Failures missed by the proof test stay hidden until the end of the mission
+DEFAULT_MISSION_TIME_YEARS = 20
+
+# Time grid of the multi-interval sawtooth average: points per shortest test
+# cycle, capped per configuration, and grid values held in memory at once
+POINTS_PER_CYCLE = 8
+MAX_TIME_STEPS = 20000
+CHUNK_ELEMENTS = 2_000_000
+
+_ARCHITECTURE_PATTERN = re.compile(r"^\s*(\d+)\s*oo\s*(\d+)\s*$", re.IGNORECASE)
+
+
+def parse_architecture(architecture: str) -> Tuple[int, int]:
+    """
+    Split a voting architecture into M and N
+    
+    Args:
+        architecture: Architecture such as "1oo2" or "2oo3"
+    
+    Returns:
+        Tuple of (M, N)
+    """
+    match = _ARCHITECTURE_PATTERN.match(str(architecture))
+    if not match:
+        raise ValueError(f"Invalid architecture: {architecture}")
+    m, n = int(match.group(1)), int(match.group(2))
+    if m < 1 or m > n:
+        raise ValueError(f"Invalid architecture: {architecture}")
+    return m, n
+
+
+def sil_from_pfd(pfd: Any) -> np.ndarray:
+    """
+    Vectorized equivalent of SIL.from_pfd
+    
+    Args:
+        pfd: Array of PFD values
+    
+    Returns:
+        Integer array of SIL levels (0 when below SIL 1)
+    """
+    pfd = np.asarray(pfd, dtype=float)
+    return (pfd[..., None] < SIL_PFD_LIMITS).sum(axis=-1)
+
+
+def mean_sawtooth(interval: Any, horizon: Any) -> np.ndarray:
+    """
+    Exact average of t mod interval over 0 <= t <= horizon
+    
+    Args:
+        interval: Array of test intervals
+        horizon: Array of averaging horizons
+    
+    Returns:
+        Array of averages
+    """
+    interval = np.asarray(interval, dtype=float)
+    horizon = np.asarray(horizon, dtype=float)
+    remainder = np.mod(horizon, interval)
+    return ((horizon - remainder) * interval / 2.0 + remainder ** 2 / 2.0) / horizon
+
+
+def sil_from_pfh(pfh: Any) -> np.ndarray:
+    """
+    SIL levels of high demand mode dangerous failure frequencies
+    
+    Args:
+        pfh: Array of PFH values (per hour)
+    
+    Returns:
+        Integer array of SIL levels (0 when below SIL 1)
+    """
+    pfh = np.asarray(pfh, dtype=float)
+    return (pfh[..., None] < SIL_PFH_LIMITS).sum(axis=-1)
+
+
+def demand_mode(demand_rate: Any, test_interval_years: Any = np.nan) -> np.ndarray:
+    """
+    Select low or high demand mode from the demand rate
+    
+    Args:
+        demand_rate: Array of demands per year (missing means low demand)
+        test_interval_years: Array of proof test intervals in years
+    
+    Returns:
+        Array of LOW_DEMAND / HIGH_DEMAND strings
+    """
+    rate = np.asarray(demand_rate, dtype=float)
+    years = np.asarray(test_interval_years, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        high = (rate > LOW_DEMAND_MAX_RATE) | (rate * years > 2.0)
+    return np.where(high, HIGH_DEMAND, LOW_DEMAND)
+
+
+class PFDAvg:
+    """IEC 61508-6 simplified PFDavg equations for MooN architectures"""
+    
+    @staticmethod
+    def failure_rates(
+        pfd_per_component: Any,
+        test_interval_hours: Any,
+        dc: Any = 0.0,
+        mttr_hours: Any = 8.0,
+        mrt_hours: Any = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Derive dangerous failure rates from the PFDavg of a single channel
+        
+        Inverts the 1oo1 equation PFD = λDU (T/2 + MRT) + λDD MTTR with
+        λDU = (1 - DC) λD and λDD = DC λD.
+        
+        Args:
+            pfd_per_component: PFDavg of one channel tested every T hours
+            test_interval_hours: Proof test interval T in hours
+            dc: Diagnostic coverage (0-1)
+            mttr_hours: Mean time to restoration after a detected failure
+            mrt_hours: Mean repair time after a proof test (defaults to MTTR)
+        
+        Returns:
+            Tuple of (lambda_du, lambda_dd) arrays in failures per hour
+        """
+        pfd = np.asarray(pfd_per_component, dtype=float)
+        dc = np.asarray(dc, dtype=float)
+        mttr = np.asarray(mttr_hours, dtype=float)
+        mrt = mttr if mrt_hours is None else np.asarray(mrt_hours, dtype=float)
+        
+        exposure = (1.0 - dc) * (np.asarray(test_interval_hours, dtype=float) / 2.0 + mrt) + dc * mttr
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lambda_d = np.where(exposure > 0, pfd / exposure, 0.0)
+        return (1.0 - dc) * lambda_d, dc * lambda_d
+    
+    @staticmethod
+    def moon(
+        m: Any,
+        n: Any,
+        lambda_du: Any,
+        lambda_dd: Any,
+        test_interval_hours: Any,
+        mttr_hours: Any = 8.0,
+        beta: Any = 0.1,
+        beta_d: Any = None,
+        mrt_hours: Any = None
+    ) -> np.ndarray:
+        """
+        PFDavg of MooN voted subsystems
+        
+        With k = N - M + 1 channel failures needed to defeat the vote,
+            
+            PFD = N!/(N-k)! * λ^k * tCE * tGE * ... + β λDU (T/2 + MRT) + βD λDD MTTR
+        
+        where λ = (1 - βD) λDD + (1 - β) λDU and the i-th equivalent down
+        time is λDU/λD (T/(i+1) + MRT) + λDD/λD MTTR. Architectures with no
+        fault tolerance (k = 1) use λ = λD and have no common cause term.
+        All arguments broadcast against each other.
+        
+        Args:
+            m: Number of channels required to trip
+            n: Number of channels
+            lambda_du: Dangerous undetected failure rate per channel (per hour)
+            lambda_dd: Dangerous detected failure rate per channel (per hour)
+            test_interval_hours: Proof test interval T in hours
+            mttr_hours: Mean time to restoration
+            beta: Common cause factor for undetected failures
+            beta_d: Common cause factor for detected failures (defaults to beta / 2)
+            mrt_hours: Mean repair time after a proof test (defaults to MTTR)
+        
+        Returns:
+            Array of PFDavg values
+        """
+        m = np.asarray(m, dtype=int)
+        n = np.asarray(n, dtype=int)
+        if np.any(m < 1) or np.any(m > n):
+            raise ValueError("Architectures need 1 <= M <= N")
+        lambda_du = np.asarray(lambda_du, dtype=float)
+        lambda_dd = np.asarray(lambda_dd, dtype=float)
+        ti = np.asarray(test_interval_hours, dtype=float)
+        mttr = np.asarray(mttr_hours, dtype=float)
+        mrt = mttr if mrt_hours is None else np.asarray(mrt_hours, dtype=float)
+        beta = np.asarray(beta, dtype=float)
+        beta_d = beta / 2.0 if beta_d is None else np.asarray(beta_d, dtype=float)
+        
+        m, n, lambda_du, lambda_dd, ti, mttr, mrt, beta, beta_d = np.broadcast_arrays(
+            m, n, lambda_du, lambda_dd, ti, mttr, mrt, beta, beta_d
+        )
+        k = n - m + 1
+        lambda_d = lambda_du + lambda_dd
+        with np.errstate(divide="ignore", invalid="ignore"):
+            du_share = np.where(lambda_d > 0, lambda_du / lambda_d, 0.0)
+        dd_share = np.where(lambda_d > 0, 1.0 - du_share, 0.0)
+        
+        redundant = k > 1
+        rate = np.where(redundant, (1.0 - beta_d) * lambda_dd + (1.0 - beta) * lambda_du, lambda_d)
+        independent = np.ones(k.shape)
+        for i in range(1, int(k.max(initial=1)) + 1):
+            active = i <= k
+            down_time = du_share * (ti / (i + 1) + mrt) + dd_share * mttr
+            independent = np.where(active, independent * (n - i + 1) * rate * down_time, independent)
+        
+        common_cause = np.where(redundant, beta * lambda_du * (ti / 2.0 + mrt) + beta_d * lambda_dd * mttr, 0.0)
+        return np.clip(independent + common_cause, 0.0, 1.0)
+    
+    @staticmethod
+    def moon_partial_test(
+        m: Any,
+        n: Any,
+        lambda_du: Any,
+        lambda_dd: Any,
+        test_interval_hours: Any,
+        mttr_hours: Any = 8.0,
+        beta: Any = 0.1,
+        beta_d: Any = None,
+        mrt_hours: Any = None,
+        proof_test_coverage: Any = 1.0,
+        pst_interval_hours: Any = np.inf,
+        pst_coverage: Any = 0.0,
+        mission_time_hours: Any = DEFAULT_MISSION_TIME_YEARS * HOURS_PER_YEAR
+    ) -> np.ndarray:
+        """
+        PFDavg of MooN voted subsystems with imperfect and partial stroke tests
+        
+        The undetected failure rate splits into the share found by partial
+        stroke tests every Tpst hours (pst_coverage), the remaining share
+        found by the proof test every T hours (proof_test_coverage minus
+        pst_coverage) and the share only found at the end of the mission TM.
+        Each channel's unavailability is a sum of sawtooth curves
+            
+            q(t) = λDU (c1 (t mod Tpst) + c2 (t mod T) + c3 t + MRT) + λDD MTTR
+        
+        averaged over the mission on a time grid. With k = N - M + 1 channel
+        failures needed, PFD = C(N, k) mean(q^k) using the independent rates
+        (1 - β) λDU and (1 - βD) λDD, plus the common cause PFD; for k = 1 it
+        is N mean(q). With full coverage and no partial stroke tests this
+        agrees with moon(). All arguments broadcast against each other.
+        
+        Args:
+            m: Number of channels required to trip
+            n: Number of channels
+            lambda_du: Dangerous undetected failure rate per channel (per hour)
+            lambda_dd: Dangerous detected failure rate per channel (per hour)
+            test_interval_hours: Proof test interval T in hours
+            mttr_hours: Mean time to restoration
+            beta: Common cause factor for undetected failures
+            beta_d: Common cause factor for detected failures (defaults to beta / 2)
+            mrt_hours: Mean repair time after a test (defaults to MTTR)
+            proof_test_coverage: Share of λDU found by the proof test (0-1)
+            pst_interval_hours: Partial stroke test interval (inf for none)
+            pst_coverage: Share of λDU found by the partial stroke test
+                (at most proof_test_coverage)
+            mission_time_hours: Mission time TM in hours
+        
+        Returns:
+            Array of PFDavg values
+        """
+        m = np.asarray(m, dtype=int)
+        n = np.asarray(n, dtype=int)
+        if np.any(m < 1) or np.any(m > n):
+            raise ValueError("Architectures need 1 <= M <= N")
+        mttr = np.asarray(mttr_hours, dtype=float)
+        mrt = mttr if mrt_hours is None else np.asarray(mrt_hours, dtype=float)
+        beta = np.asarray(beta, dtype=float)
+        beta_d = beta / 2.0 if beta_d is None else np.asarray(beta_d, dtype=float)
+        arrays = np.broadcast_arrays(
+            m, n, np.asarray(lambda_du, dtype=float), np.asarray(lambda_dd, dtype=float),
+            np.asarray(test_interval_hours, dtype=float), mttr, mrt, beta, beta_d,
+            np.asarray(proof_test_coverage, dtype=float), np.asarray(pst_interval_hours, dtype=float),
+            np.asarray(pst_coverage, dtype=float), np.asarray(mission_time_hours, dtype=float)
+        )
+        shape = arrays[0].shape
+        m, n, lambda_du, lambda_dd, ti, mttr, mrt, beta, beta_d, ptc, t_pst, pstc, tm = \
+            (a.ravel() for a in arrays)
+        if np.any((ptc < 0) | (ptc > 1) | (pstc < 0) | (pstc > ptc)):
+            raise ValueError("Coverages need 0 <= PST coverage <= proof test coverage <= 1")
+        if np.any(ti <= 0) or np.any(t_pst <= 0) or np.any(tm <= 0):
+            raise ValueError("Test intervals and mission time must be positive")
+        
+        k = n - m + 1
+        redundant = k > 1
+        shares = np.stack([pstc, ptc - pstc, 1.0 - ptc], axis=1)
+        intervals = np.stack([np.minimum(t_pst, tm), np.minimum(ti, tm), tm], axis=1)
+        linear = (shares * mean_sawtooth(intervals, tm[:, None])).sum(axis=1)
+        
+        # Single channels need only the linear average; redundant ones the
+        # average of q^k on a time grid fine enough for the shortest cycle
+        independent = lambda_du * (linear + mrt) + lambda_dd * mttr
+        voted = np.flatnonzero(redundant)
+        if len(voted):
+            rate_du = (1.0 - beta[voted]) * lambda_du[voted]
+            offset = rate_du * mrt[voted] + (1.0 - beta_d[voted]) * lambda_dd[voted] * mttr[voted]
+            shortest = np.where(shares[voted] > 0, intervals[voted], np.inf).min(axis=1)
+            steps = int(np.clip(np.ceil(tm[voted] / shortest).max() * POINTS_PER_CYCLE,
+                                POINTS_PER_CYCLE, MAX_TIME_STEPS))
+            grid = (np.arange(steps) + 0.5) / steps
+            chunk = max(1, CHUNK_ELEMENTS // steps)
+            for start in range(0, len(voted), chunk):
+                rows = slice(start, start + chunk)
+                select = voted[rows]
+                t = tm[select, None] * grid[None, :]
+                sawtooth = np.zeros_like(t)
+                for j in range(3):
+                    if np.any(shares[select, j] > 0):
+                        sawtooth += shares[select, j, None] * np.mod(t, intervals[select, j, None])
+                q = rate_du[rows, None] * sawtooth + offset[rows, None]
+                independent[select] = np.mean(q ** k[select, None], axis=1)
+        
+        # C(N, k) for the redundant case and N for k = 1
+        combinations = np.ones(len(m))
+        for i in range(1, int(k.max(initial=1)) + 1):
+            combinations = np.where(i <= k, combinations * (n - i + 1) / i, combinations)
+        common_cause = np.where(redundant, beta * lambda_du * (linear + mrt) + beta_d * lambda_dd * mttr, 0.0)
+        return np.clip(combinations * independent + common_cause, 0.0, 1.0).reshape(shape)
+    
+    @staticmethod
+    def pfh(
+        m: Any,
+        n: Any,
+        lambda_du: Any,
+        lambda_dd: Any,
+        test_interval_hours: Any,
+        mttr_hours: Any = 8.0,
+        beta: Any = 0.1,
+        beta_d: Any = None,
+        mrt_hours: Any = None
+    ) -> np.ndarray:
+        """
+        Average frequency of dangerous failure (PFH) of MooN voted subsystems
+        
+        With k = N - M + 1 channel failures needed to defeat the vote, the
+        first k - 1 may be detected or undetected but the last one must be
+        undetected (IEC 61508-6:2010 B.3.3.2):
+            
+            PFH = N!/(N-k)! * λ^(k-1) * tCE * ... * (1 - β) λDU + β λDU
+        
+        with λ and the equivalent down times as in moon(). Architectures with
+        no fault tolerance (k = 1) fail at N λDU. All arguments broadcast.
+        
+        Args:
+            m: Number of channels required to trip
+            n: Number of channels
+            lambda_du: Dangerous undetected failure rate per channel (per hour)
+            lambda_dd: Dangerous detected failure rate per channel (per hour)
+            test_interval_hours: Proof test interval T in hours
+            mttr_hours: Mean time to restoration
+            beta: Common cause factor for undetected failures
+            beta_d: Common cause factor for detected failures (defaults to beta / 2)
+            mrt_hours: Mean repair time after a proof test (defaults to MTTR)
+        
+        Returns:
+            Array of PFH values (per hour)
+        """
+        m = np.asarray(m, dtype=int)
+        n = np.asarray(n, dtype=int)
+        if np.any(m < 1) or np.any(m > n):
+            raise ValueError("Architectures need 1 <= M <= N")
+        lambda_du = np.asarray(lambda_du, dtype=float)
+        lambda_dd = np.asarray(lambda_dd, dtype=float)
+        ti = np.asarray(test_interval_hours, dtype=float)
+        mttr = np.asarray(mttr_hours, dtype=float)
+        mrt = mttr if mrt_hours is None else np.asarray(mrt_hours, dtype=float)
+        beta = np.asarray(beta, dtype=float)
+        beta_d = beta / 2.0 if beta_d is None else np.asarray(beta_d, dtype=float)
+        
+        m, n, lambda_du, lambda_dd, ti, mttr, mrt, beta, beta_d = np.broadcast_arrays(
+            m, n, lambda_du, lambda_dd, ti, mttr, mrt, beta, beta_d
+        )
+        k = n - m + 1
+        lambda_d = lambda_du + lambda_dd
+        with np.errstate(divide="ignore", invalid="ignore"):
+            du_share = np.where(lambda_d > 0, lambda_du / lambda_d, 0.0)
+        dd_share = np.where(lambda_d > 0, 1.0 - du_share, 0.0)
+        
+        redundant = k > 1
+        rate = (1.0 - beta_d) * lambda_dd + (1.0 - beta) * lambda_du
+        independent = np.ones(k.shape)
+        for i in range(1, int(k.max(initial=1))):
+            active = i < k
+            down_time = du_share * (ti / (i + 1) + mrt) + dd_share * mttr
+            independent = np.where(active, independent * (n - i + 1) * rate * down_time, independent)
+        last = np.where(redundant, (1.0 - beta) * lambda_du, lambda_du)
+        independent = independent * (n - k + 1) * last
+        return independent + np.where(redundant, beta * lambda_du, 0.0)
+    
+    @staticmethod
+    def spurious_trip_rate(
+        m: Any,
+        n: Any,
+        lambda_s: Any,
+        mttr_hours: Any = 8.0,
+        beta: Any = 0.1
+    ) -> np.ndarray:
+        """
+        Spurious trip rate of MooN voted subsystems
+        
+        A spurious trip needs M channels failed safe at once:
+            
+            STR = C(N, M) * M * λ^M * MTTR^(M-1) + β λS
+        
+        with λ = (1 - β) λS for redundant channels. A single channel trips at
+        λS. Detected dangerous failures are taken as repaired online, as in
+        the PFDavg equations, so they do not trip. All arguments broadcast.
+        
+        Args:
+            m: Number of channels required to trip
+            n: Number of channels
+            lambda_s: Safe failure rate per channel (per hour)
+            mttr_hours: Mean time to restoration of a safe-failed channel
+            beta: Common cause factor for safe failures
+        
+        Returns:
+            Array of spurious trip rates per hour
+        """
+        m = np.asarray(m, dtype=int)
+        n = np.asarray(n, dtype=int)
+        if np.any(m < 1) or np.any(m > n):
+            raise ValueError("Architectures need 1 <= M <= N")
+        m, n, lambda_s, mttr, beta = np.broadcast_arrays(
+            m, n, np.asarray(lambda_s, dtype=float), np.asarray(mttr_hours, dtype=float),
+            np.asarray(beta, dtype=float)
+        )
+        redundant = n > 1
+        rate = np.where(redundant, (1.0 - beta) * lambda_s, lambda_s)
+        # C(N, M) * M * rate^M * MTTR^(M-1) built up one factor at a time
+        independent = rate * m.astype(float)
+        for i in range(1, int(m.max(initial=1)) + 1):
+            active = i <= m
+            factor = (n - m + i) / i * np.where(i > 1, rate * mttr, 1.0)
+            independent = np.where(active, independent * factor, independent)
+        return independent + np.where(redundant, beta * lambda_s, 0.0)
+    
+    @staticmethod
+    def moon_from_pfd(
+        architecture: Any,
+        pfd_per_component: Any,
+        test_interval_hours: Any,
+        beta: Any = 0.1,
+        dc: Any = 0.0,
+        mttr_hours: Any = 8.0,
+        beta_d: Any = None
+    ) -> np.ndarray:
+        """
+        PFDavg of voted subsystems described by their single-channel PFD
+        
+        Args:
+            architecture: Architecture string or array of strings
+            pfd_per_component: PFDavg of one channel tested every T hours
+            test_interval_hours: Proof test interval T in hours
+            beta: Common cause factor for undetected failures
+            dc: Diagnostic coverage (0-1)
+            mttr_hours: Mean time to restoration
+            beta_d: Common cause factor for detected failures (defaults to beta / 2)
+        
+        Returns:
+            Array of PFDavg values
+        """
+        voting = np.array([parse_architecture(a) for a in np.atleast_1d(architecture)])
+        lambda_du, lambda_dd = PFDAvg.failure_rates(pfd_per_component, test_interval_hours, dc, mttr_hours)
+        return PFDAvg.moon(voting[:, 0], voting[:, 1], lambda_du, lambda_dd, test_interval_hours,
+                           mttr_hours, beta, beta_d)
+    
+    @staticmethod
+    def test_coverage(subsystems: pd.DataFrame) -> Tuple[np.ndarray, ...]:
+        """
+        Proof test and partial stroke test parameters of a sif_subsystems frame
+        
+        Missing values mean full proof test coverage, no partial stroke
+        testing and DEFAULT_MISSION_TIME_YEARS.
+        
+        Args:
+            subsystems: Frame with optional proof_test_coverage,
+                pst_interval_months, pst_coverage and mission_time_years columns
+        
+        Returns:
+            Tuple of (proof test coverage, PST interval hours, PST coverage,
+            mission time hours, mask of rows needing moon_partial_test)
+        """
+        def column(name, default):
+            if name not in subsystems:
+                return np.full(len(subsystems), default, dtype=float)
+            return pd.to_numeric(subsystems[name], errors="coerce").fillna(default).to_numpy(dtype=float)
+        
+        coverage = column("proof_test_coverage", 1.0)
+        pst_hours = column("pst_interval_months", np.inf) * HOURS_PER_MONTH
+        pst_hours = np.where(pst_hours > 0, pst_hours, np.inf)
+        pst_coverage = np.where(np.isfinite(pst_hours), column("pst_coverage", 0.0), 0.0)
+        mission_hours = column("mission_time_years", DEFAULT_MISSION_TIME_YEARS) * HOURS_PER_YEAR
+        partial = (coverage < 1.0) | (pst_coverage > 0.0)
+        return coverage, pst_hours, pst_coverage, mission_hours, partial
+    
+    @staticmethod
+    def evaluate_subsystems(subsystems: pd.DataFrame) -> pd.DataFrame:
+        """
+        PFDavg of every row of a sif_subsystems frame
+        
+        Rows with lambda_du / lambda_dd columns use those rates, otherwise the
+        rates are derived from pfd_per_component. Missing beta, dc and
+        mttr_hours fall back to the SIFSubsystem defaults, and a missing
+        lambda_s to DEFAULT_SAFE_TO_DANGEROUS_RATIO times λD. Rows with
+        imperfect proof tests or partial stroke tests (see test_coverage)
+        use moon_partial_test. The spurious trip rate comes out of the same
+        pass.
+        
+        Args:
+            subsystems: Frame with architecture, pfd_per_component,
+                test_interval_months and optionally beta, beta_d, dc,
+                mttr_hours, lambda_du, lambda_dd, lambda_s,
+                proof_test_coverage, pst_interval_months, pst_coverage and
+                mission_time_years columns
+        
+        Returns:
+            Copy of the frame with m, n, lambda_du, lambda_dd, lambda_s,
+            pfd_avg, sil, pfh (per hour), spurious_trip_rate (per year) and
+            mttf_spurious_years columns
+        """
+        frame = subsystems.copy()
+        if frame.empty:
+            for column in ("m", "n", "lambda_du", "lambda_dd", "lambda_s", "pfd_avg", "sil", "pfh",
+                           "spurious_trip_rate", "mttf_spurious_years"):
+                frame[column] = pd.Series(dtype=float)
+            return frame
+        
+        voting = frame["architecture"].astype(str).str.extract(_ARCHITECTURE_PATTERN.pattern, flags=re.IGNORECASE)
+        invalid = voting.isna().any(axis=1)
+        if invalid.any():
+            raise ValueError(f"Invalid architectures: {sorted(set(frame.loc[invalid, 'architecture'].astype(str)))}")
+        m = voting[0].astype(int).to_numpy()
+        n = voting[1].astype(int).to_numpy()
+        
+        def column(name, default):
+            if name not in frame:
+                return np.full(len(frame), default, dtype=float)
+            return pd.to_numeric(frame[name], errors="coerce").fillna(default).to_numpy(dtype=float)
+        
+        ti = column("test_interval_months", 12) * HOURS_PER_MONTH
+        beta = column("beta", 0.1)
+        beta_d = column("beta_d", np.nan)
+        beta_d = np.where(np.isnan(beta_d), beta / 2.0, beta_d)
+        dc = column("dc", 0.0)
+        mttr = column("mttr_hours", 24.0)
+        
+        derived_du, derived_dd = PFDAvg.failure_rates(column("pfd_per_component", 0.0), ti, dc, mttr)
+        lambda_du = column("lambda_du", np.nan)
+        lambda_dd = column("lambda_dd", np.nan)
+        given = ~np.isnan(lambda_du) & ~np.isnan(lambda_dd)
+        lambda_du = np.where(given, lambda_du, derived_du)
+        lambda_dd = np.where(given, lambda_dd, derived_dd)
+        lambda_s = column("lambda_s", np.nan)
+        lambda_s = np.where(np.isnan(lambda_s), DEFAULT_SAFE_TO_DANGEROUS_RATIO * (lambda_du + lambda_dd), lambda_s)
+        spurious = PFDAvg.spurious_trip_rate(m, n, lambda_s, mttr, beta) * HOURS_PER_YEAR
+        
+        frame["m"] = m
+        frame["n"] = n
+        frame["lambda_du"] = lambda_du
+        frame["lambda_dd"] = lambda_dd
+        frame["lambda_s"] = lambda_s
+        pfd_avg = PFDAvg.moon(m, n, lambda_du, lambda_dd, ti, mttr, beta, beta_d)
+        coverage, pst_hours, pst_coverage, mission_hours, partial = PFDAvg.test_coverage(frame)
+        if partial.any():
+            pfd_avg[partial] = PFDAvg.moon_partial_test(
+                m[partial], n[partial], lambda_du[partial], lambda_dd[partial], ti[partial], mttr[partial],
+                beta[partial], beta_d[partial], None, coverage[partial], pst_hours[partial],
+                pst_coverage[partial], mission_hours[partial]
+            )
+        frame["pfd_avg"] = pfd_avg
+        frame["sil"] = sil_from_pfd(frame["pfd_avg"].to_numpy())
+        frame["pfh"] = PFDAvg.pfh(m, n, lambda_du, lambda_dd, ti, mttr, beta, beta_d)
+        frame["spurious_trip_rate"] = spurious
+        with np.errstate(divide="ignore"):
+            frame["mttf_spurious_years"] = np.where(spurious > 0, 1.0 / spurious, np.inf)
+        return frame
+    
+    @staticmethod
+    def evaluate_sifs(subsystems: pd.DataFrame, sifs: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        PFDavg, PFH, achieved SIL and spurious trip rate of every SIF
+        
+        Subsystems are in series: any one failing dangerously defeats the
+        SIF and any one tripping spuriously trips it. The demand mode of each
+        SIF follows from its demand_rate (demands per year, missing means low
+        demand) and longest proof test interval; the achieved SIL is the PFD
+        SIL in low demand mode and the PFH SIL in high demand mode.
+        
+        Args:
+            subsystems: sif_subsystems frame with a sif_id column and
+                optionally the demand_rate of each row's SIF
+            sifs: Optional sifs frame (id, required_sil) to compare against
+        
+        Returns:
+            Frame with sif_id, subsystem_count, pfd_avg, pfh, pfd_sil,
+            pfh_sil, demand_rate, demand_mode, achieved_sil, spurious_trip_rate
+            (per year), mttf_spurious_years and, when sifs is given,
+            required_sil and meets_sil
+        """
+        evaluated = PFDAvg.evaluate_subsystems(subsystems)
+        evaluated["demand_rate"] = pd.to_numeric(evaluated["demand_rate"], errors="coerce") \
+            if "demand_rate" in evaluated else np.nan
+        evaluated["test_interval_years"] = pd.to_numeric(
+            evaluated.get("test_interval_months", pd.Series(12, index=evaluated.index)), errors="coerce"
+        ).fillna(12) / 12.0
+        results = (
+            evaluated.groupby("sif_id", sort=True)
+            .agg(subsystem_count=("pfd_avg", "size"), pfd_avg=("pfd_avg", "sum"), pfh=("pfh", "sum"),
+                 demand_rate=("demand_rate", "first"), test_interval_years=("test_interval_years", "max"),
+                 spurious_trip_rate=("spurious_trip_rate", "sum"))
+            .reset_index()
+        )
+        results["pfd_avg"] = results["pfd_avg"].clip(upper=1.0)
+        results["pfd_sil"] = sil_from_pfd(results["pfd_avg"].to_numpy())
+        results["pfh_sil"] = sil_from_pfh(results["pfh"].to_numpy())
+        results["demand_mode"] = demand_mode(results["demand_rate"].to_numpy(),
+                                             results.pop("test_interval_years").to_numpy())
+        results["achieved_sil"] = np.where(results["demand_mode"] == HIGH_DEMAND,
+                                           results["pfh_sil"], results["pfd_sil"])
+        spurious = results["spurious_trip_rate"].to_numpy()
+        with np.errstate(divide="ignore"):
+            results["mttf_spurious_years"] = np.where(spurious > 0, 1.0 / spurious, np.inf)
+        
+        if sifs is not None:
+            required = sifs.set_index("id")["required_sil"]
+            results["required_sil"] = results["sif_id"].map(required).fillna(0).astype(int).to_numpy()
+            results["meets_sil"] = results["achieved_sil"] >= results["required_sil"]
+        return results
+    
+    @staticmethod
+    def compare_architectures(
+        subsystems: pd.DataFrame,
+        architectures: Sequence[str] = ARCHITECTURES
+    ) -> pd.DataFrame:
+        """
+        PFDavg and spurious trip rate of every subsystem under each voting choice
+        
+        Each subsystem keeps its channel failure rates while its architecture
+        is swapped; the SIF totals assume the other subsystems of the SIF are
+        unchanged. All alternatives are evaluated in a single pass.
+        
+        Args:
+            subsystems: sif_subsystems frame with a sif_id column
+            architectures: Voting architectures to compare
+        
+        Returns:
+            Long frame with one row per subsystem and architecture: the
+            subsystem columns plus candidate_architecture, pfd_avg, sil,
+            spurious_trip_rate, mttf_spurious_years, sif_pfd_avg,
+            sif_achieved_sil and sif_spurious_trip_rate
+        """
+        for architecture in architectures:
+            parse_architecture(architecture)
+        base = PFDAvg.evaluate_subsystems(subsystems).reset_index(drop=True)
+        sif_pfd = base.groupby("sif_id")["pfd_avg"].transform("sum").to_numpy()
+        sif_spurious = base.groupby("sif_id")["spurious_trip_rate"].transform("sum").to_numpy()
+        
+        # The derived rates are kept, so swapping the vote does not change them
+        count = len(architectures)
+        alternatives = base.loc[base.index.repeat(count)].reset_index(drop=True)
+        alternatives["current_architecture"] = alternatives["architecture"]
+        alternatives["architecture"] = np.tile(np.asarray(architectures, dtype=object), len(base))
+        compared = PFDAvg.evaluate_subsystems(alternatives)
+        compared = compared.rename(columns={"architecture": "candidate_architecture"})
+        compared["architecture"] = compared.pop("current_architecture")
+        
+        own_pfd = np.repeat(base["pfd_avg"].to_numpy(), count)
+        own_spurious = np.repeat(base["spurious_trip_rate"].to_numpy(), count)
+        compared["sif_pfd_avg"] = np.minimum(np.repeat(sif_pfd, count) - own_pfd + compared["pfd_avg"].to_numpy(), 1.0)
+        compared["sif_achieved_sil"] = sil_from_pfd(compared["sif_pfd_avg"].to_numpy())
+        compared["sif_spurious_trip_rate"] = (np.repeat(sif_spurious, count) - own_spurious
+                                              + compared["spurious_trip_rate"].to_numpy())
+        return compared
+    
+    @staticmethod
+    def compare_pst_strategies(
+        subsystems: pd.DataFrame,
+        pst_interval_months: Sequence[float],
+        pst_coverages: Sequence[float]
+    ) -> pd.DataFrame:
+        """
+        PFDavg of every final element under each partial stroke test strategy
+        
+        Every combination of PST interval and coverage is evaluated for all
+        final elements (rows with subsystem_type "Final Element", or every
+        row without that column) in a single pass. Coverages above a row's
+        proof test coverage are skipped.
+        
+        Args:
+            subsystems: sif_subsystems frame with a sif_id column
+            pst_interval_months: Candidate PST intervals in months
+            pst_coverages: Candidate PST coverages (share of λDU)
+        
+        Returns:
+            Long frame with one row per final element and strategy: the
+            subsystem columns with the candidate pst_interval_months and
+            pst_coverage, pfd_avg, sil, sif_pfd_avg and sif_achieved_sil
+        """
+        base = PFDAvg.evaluate_subsystems(subsystems).reset_index(drop=True)
+        sif_pfd = base.groupby("sif_id")["pfd_avg"].transform("sum").to_numpy()
+        final = (base["subsystem_type"] == "Final Element").to_numpy() if "subsystem_type" in base \
+            else np.ones(len(base), dtype=bool)
+        
+        intervals, coverages = np.meshgrid(np.asarray(pst_interval_months, dtype=float),
+                                           np.asarray(pst_coverages, dtype=float), indexing="ij")
+        count = intervals.size
+        rows = np.repeat(np.flatnonzero(final), count)
+        strategies = base.loc[rows].reset_index(drop=True)
+        strategies["pst_interval_months"] = np.tile(intervals.ravel(), final.sum())
+        strategies["pst_coverage"] = np.tile(coverages.ravel(), final.sum())
+        coverage = PFDAvg.test_coverage(strategies)[0]
+        keep = strategies["pst_coverage"].to_numpy() <= coverage
+        strategies, rows = strategies[keep].reset_index(drop=True), rows[keep]
+        
+        compared = PFDAvg.evaluate_subsystems(strategies.drop(columns=["pfd_avg", "sil"]))
+        compared["sif_pfd_avg"] = np.minimum(sif_pfd[rows] - base["pfd_avg"].to_numpy()[rows]
+                                             + compared["pfd_avg"].to_numpy(), 1.0)
+        compared["sif_achieved_sil"] = sil_from_pfd(compared["sif_pfd_avg"].to_numpy())
+        return compared
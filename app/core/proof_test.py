@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - Proof Test Interval Optimization Module
+Searches sensor, logic solver and final element proof test intervals of every
+SIF jointly for the longest (cheapest) schedule that still meets the required SIL
+"""
+from typing import Any, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .pfdavg import PFDAvg, HOURS_PER_MONTH, SIL_PFD_LIMITS, sil_from_pfd
+
+
+DEFAULT_CANDIDATE_MONTHS = (1, 3, 6, 12, 18, 24, 36, 48, 60, 72, 96, 120)
+SUBSYSTEM_TYPES = ("Sensor", "Logic", "Final Element")
+
+# SIFs searched together, bounding the candidate grid held in memory
+SIF_CHUNK_SIZE = 2000
+
+
+def _column(frame: pd.DataFrame, name: str, default: float) -> np.ndarray:
+    """Numeric column of a frame with missing values (or a missing column) set to a default"""
+    if name not in frame:
+        return np.full(len(frame), default, dtype=float)
+    return pd.to_numeric(frame[name], errors="coerce").fillna(default).to_numpy(dtype=float)
+
+
+class ProofTestOptimizer:
+    """Joint proof test interval search over all SIFs of a site"""
+    
+    @staticmethod
+    def required_pfd(required_sil: Any) -> np.ndarray:
+        """
+        Largest PFDavg that still achieves each required SIL
+        
+        Args:
+            required_sil: Array of required SIL levels (0 or missing for none)
+        
+        Returns:
+            Array of exclusive PFD limits (infinite where no SIL is required)
+        """
+        sil = np.clip(pd.to_numeric(pd.Series(np.atleast_1d(required_sil)), errors="coerce")
+                      .fillna(0).to_numpy(dtype=int), 0, len(SIL_PFD_LIMITS))
+        limits = np.concatenate(([np.inf], SIL_PFD_LIMITS))
+        return limits[sil]
+    
+    @staticmethod
+    def interval_curves(
+        subsystems: pd.DataFrame,
+        candidate_months: Sequence[float] = DEFAULT_CANDIDATE_MONTHS
+    ) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        PFDavg of every subsystem at every candidate interval
+        
+        Failure rates are derived once at the recorded test interval and held
+        fixed while the interval changes. Rows with imperfect proof tests or
+        partial stroke tests keep their coverage and PST interval.
+        
+        Args:
+            subsystems: sif_subsystems frame
+            candidate_months: Candidate proof test intervals in months
+        
+        Returns:
+            Tuple of (evaluated subsystems frame, PFDavg array of shape (rows, candidates))
+        """
+        evaluated = PFDAvg.evaluate_subsystems(subsystems)
+        if evaluated.empty:
+            return evaluated, np.zeros((0, len(candidate_months)))
+        beta = _column(evaluated, "beta", 0.1)
+        beta_d = _column(evaluated, "beta_d", np.nan)
+        beta_d = np.where(np.isnan(beta_d), beta / 2.0, beta_d)
+        hours = np.asarray(candidate_months, dtype=float)[None, :] * HOURS_PER_MONTH
+        curves = PFDAvg.moon(
+            evaluated["m"].to_numpy()[:, None],
+            evaluated["n"].to_numpy()[:, None],
+            evaluated["lambda_du"].to_numpy()[:, None],
+            evaluated["lambda_dd"].to_numpy()[:, None],
+            hours,
+            _column(evaluated, "mttr_hours", 24.0)[:, None],
+            beta[:, None],
+            beta_d[:, None],
+        )
+        coverage, pst_hours, pst_coverage, mission_hours, partial = PFDAvg.test_coverage(evaluated)
+        if partial.any():
+            curves[partial] = PFDAvg.moon_partial_test(
+                evaluated["m"].to_numpy()[partial, None],
+                evaluated["n"].to_numpy()[partial, None],
+                evaluated["lambda_du"].to_numpy()[partial, None],
+                evaluated["lambda_dd"].to_numpy()[partial, None],
+                hours,
+                _column(evaluated, "mttr_hours", 24.0)[partial, None],
+                beta[partial, None],
+                beta_d[partial, None],
+                None,
+                coverage[partial, None],
+                pst_hours[partial, None],
+                pst_coverage[partial, None],
+                mission_hours[partial, None],
+            )
+        return evaluated, curves
+    
+    @staticmethod
+    def optimize(
+        subsystems: pd.DataFrame,
+        sifs: pd.DataFrame,
+        candidate_months: Sequence[float] = DEFAULT_CANDIDATE_MONTHS
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Find the cheapest proof test schedule meeting every SIF's required SIL
+        
+        All subsystems of one type within a SIF share an interval. Every
+        combination of sensor, logic and final element intervals is scored
+        at once; the annual test cost is the per-test cost (the test_cost
+        column, else the number of channels) times tests per year. SIFs that
+        cannot meet their SIL get the combination with the lowest PFDavg.
+        
+        Args:
+            subsystems: sif_subsystems frame
+            sifs: sifs frame with id and required_sil
+            candidate_months: Candidate proof test intervals in months
+        
+        Returns:
+            Tuple of (per-SIF plan, per-subsystem plan). The subsystem plan
+            carries the new test_interval_months and the pfd_per_component
+            of one channel at that interval, ready to store.
+        """
+        candidates = np.sort(np.asarray(candidate_months, dtype=float))
+        n_candidates = len(candidates)
+        subsystems = subsystems[subsystems["sif_id"].isin(sifs["id"])]
+        evaluated, curves = ProofTestOptimizer.interval_curves(subsystems, candidates)
+        
+        sif_ids = sifs["id"].to_numpy()
+        sif_index = pd.Index(sif_ids).get_indexer(evaluated["sif_id"])
+        types = evaluated["subsystem_type"].fillna("Sensor") if "subsystem_type" in evaluated \
+            else pd.Series("Sensor", index=evaluated.index)
+        type_index = pd.Index(SUBSYSTEM_TYPES).get_indexer(types)
+        if np.any(type_index < 0):
+            raise ValueError(f"Unknown subsystem types: {sorted(set(types[type_index < 0]))}")
+        
+        channels = evaluated["n"].to_numpy(dtype=float)
+        unit_cost = np.where(np.isnan(_column(evaluated, "test_cost", np.nan)), channels,
+                             _column(evaluated, "test_cost", np.nan))
+        annual_cost = unit_cost[:, None] * 12.0 / candidates[None, :]
+        
+        # Sum subsystems of the same SIF and type: (SIFs, types, candidates)
+        n_sifs, n_types = len(sif_ids), len(SUBSYSTEM_TYPES)
+        flat = sif_index * n_types + type_index
+        pfd = np.zeros((n_sifs * n_types, n_candidates))
+        cost = np.zeros((n_sifs * n_types, n_candidates))
+        np.add.at(pfd, flat, curves)
+        np.add.at(cost, flat, annual_cost)
+        pfd = pfd.reshape(n_sifs, n_types, n_candidates)
+        cost = cost.reshape(n_sifs, n_types, n_candidates)
+        limits = ProofTestOptimizer.required_pfd(sifs["required_sil"].to_numpy())
+        
+        best = np.zeros((n_sifs, n_types), dtype=int)
+        for start in range(0, n_sifs, SIF_CHUNK_SIZE):
+            chunk = slice(start, start + SIF_CHUNK_SIZE)
+            total_pfd = (pfd[chunk, 0, :, None, None] + pfd[chunk, 1, None, :, None]
+                         + pfd[chunk, 2, None, None, :]).reshape(-1, n_candidates ** 3)
+            total_cost = (cost[chunk, 0, :, None, None] + cost[chunk, 1, None, :, None]
+                          + cost[chunk, 2, None, None, :]).reshape(-1, n_candidates ** 3)
+            feasible = total_pfd < limits[chunk, None]
+            choice = np.where(
+                feasible.any(axis=1),
+                np.argmin(np.where(feasible, total_cost, np.inf), axis=1),
+                np.argmin(total_pfd, axis=1),
+            )
+            best[chunk] = np.stack(np.unravel_index(choice, (n_candidates,) * n_types), axis=1)
+        
+        rows = np.arange(n_sifs)[:, None]
+        chosen_pfd = np.minimum(pfd[rows, np.arange(n_types), best].sum(axis=1), 1.0)
+        chosen_cost = cost[rows, np.arange(n_types), best].sum(axis=1)
+        present = np.zeros((n_sifs, n_types), dtype=bool)
+        present[sif_index, type_index] = True
+        months = np.where(present, candidates[best], np.nan)
+        
+        current = PFDAvg.evaluate_sifs(evaluated, sifs).set_index("sif_id")
+        current_months = _column(evaluated, "test_interval_months", 12)
+        current_cost = pd.Series(unit_cost * 12.0 / current_months).groupby(sif_index).sum()
+        
+        sif_plan = pd.DataFrame({
+            "sif_id": sif_ids,
+            "required_sil": sifs["required_sil"].fillna(0).astype(int).to_numpy(),
+            "sensor_months": months[:, 0],
+            "logic_months": months[:, 1],
+            "final_element_months": months[:, 2],
+            "pfd_avg": chosen_pfd,
+            "achieved_sil": sil_from_pfd(chosen_pfd),
+            "meets_sil": chosen_pfd < limits,
+            "annual_test_cost": chosen_cost,
+            "current_pfd_avg": current["pfd_avg"].reindex(sif_ids).to_numpy(),
+            "current_annual_test_cost": current_cost.reindex(np.arange(n_sifs), fill_value=0.0).to_numpy(),
+        })
+        
+        new_months = candidates[best[sif_index, type_index]]
+        subsystem_plan = pd.DataFrame({
+            "sif_id": evaluated["sif_id"].to_numpy(),
+            "subsystem_type": types.to_numpy(),
+            "previous_test_interval_months": current_months,
+            "test_interval_months": new_months,
+            "pfd_per_component": PFDAvg.moon(
+                1, 1, evaluated["lambda_du"].to_numpy(), evaluated["lambda_dd"].to_numpy(),
+                new_months * HOURS_PER_MONTH,
+                _column(evaluated, "mttr_hours", 24.0),
+            ),
+            "pfd_avg": curves[np.arange(len(evaluated)), best[sif_index, type_index]],
+        }, index=evaluated.index)
+        if "id" in evaluated:
+            subsystem_plan.insert(0, "id", evaluated["id"].to_numpy())
+        return sif_plan, subsystem_plan.reset_index(drop=True)
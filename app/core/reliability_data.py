@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - Reliability Data Library Module
+Component failure rate data indexed by manufacturer, model and component
+type, applied to whole frames of SIF subsystems at once
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .pfdavg import PFDAvg, HOURS_PER_MONTH
+
+
+KEY_COLUMNS = ("manufacturer", "model", "component_type")
+RATE_COLUMNS = ("lambda_du", "lambda_dd", "lambda_s", "dc", "beta")
+TEXT_COLUMNS = ("source", "notes")
+
+
+def _key(values: pd.Series) -> pd.Series:
+    """Case and whitespace insensitive form of a key column"""
+    return values.fillna("").astype(str).str.strip().str.casefold()
+
+
+def _column(frame: pd.DataFrame, name: str, default: float) -> np.ndarray:
+    """Numeric column of a frame with missing values (or a missing column) set to a default"""
+    if name not in frame:
+        return np.full(len(frame), default, dtype=float)
+    return pd.to_numeric(frame[name], errors="coerce").fillna(default).to_numpy(dtype=float)
+
+
+class ReliabilityLibrary:
+    """In-memory index of a reliability_data table"""
+    
+    _shared: Optional['ReliabilityLibrary'] = None
+    
+    def __init__(self, entries: pd.DataFrame):
+        """
+        Index library entries
+        
+        Args:
+            entries: reliability_data frame with id, key and rate columns
+        """
+        self.entries = entries
+        indexed = entries.reindex(columns=list(dict.fromkeys(
+            ["id", *KEY_COLUMNS, *RATE_COLUMNS, *entries.columns])))
+        self.by_id = indexed.set_index("id", drop=False)
+        keys = pd.MultiIndex.from_arrays([_key(indexed[column]) for column in KEY_COLUMNS], names=KEY_COLUMNS)
+        self.by_key = indexed.set_axis(keys)
+    
+    @classmethod
+    def shared(cls, entries: pd.DataFrame) -> 'ReliabilityLibrary':
+        """
+        Library for a loaded table, indexed once per process
+        
+        The index is rebuilt only when a different frame is passed, i.e.
+        after the table was reloaded (ReliabilityDataDAO.get_library_frame).
+        
+        Args:
+            entries: reliability_data frame
+        
+        Returns:
+            Shared ReliabilityLibrary instance
+        """
+        if cls._shared is None or cls._shared.entries is not entries:
+            cls._shared = cls(entries)
+        return cls._shared
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def lookup(self, manufacturer: str, model: str, component_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the entry of a component model
+        
+        Args:
+            manufacturer: Manufacturer name
+            model: Model name
+            component_type: Component type
+        
+        Returns:
+            Entry dictionary or None if not in the library
+        """
+        key = tuple(_key(pd.Series([manufacturer, model, component_type])))
+        if key not in self.by_key.index:
+            return None
+        return self.by_key.loc[[key]].iloc[0].to_dict()
+    
+    def search(self, manufacturer: Optional[str] = None, component_type: Optional[str] = None) -> pd.DataFrame:
+        """
+        Entries of one manufacturer and/or component type
+        
+        Args:
+            manufacturer: Manufacturer name (any if None)
+            component_type: Component type (any if None)
+        
+        Returns:
+            Matching entries
+        """
+        mask = np.ones(len(self.entries), dtype=bool)
+        for level, value in (("manufacturer", manufacturer), ("component_type", component_type)):
+            if value is not None:
+                mask &= self.by_key.index.get_level_values(level) == _key(pd.Series([value])).iloc[0]
+        return self.entries[mask]
+    
+    def apply(self, subsystems: pd.DataFrame) -> pd.DataFrame:
+        """
+        Take failure rates of referenced library entries
+        
+        Rows whose reliability_data_id is in the library get its λDU, λDD,
+        λS, DC and (when recorded) β, and a pfd_per_component recomputed
+        for one channel at the row's test interval. Other rows are unchanged.
+        
+        Args:
+            subsystems: sif_subsystems frame with a reliability_data_id column
+        
+        Returns:
+            Copy of the frame with library_entry (True where an entry was applied)
+        """
+        frame = subsystems.copy()
+        ids = _column(frame, "reliability_data_id", np.nan)
+        entries = self.by_id.reindex(ids)
+        found = entries["lambda_du"].notna().to_numpy()
+        frame["library_entry"] = found
+        if not found.any():
+            return frame
+        
+        for column in RATE_COLUMNS:
+            values = pd.to_numeric(entries[column], errors="coerce").to_numpy(dtype=float)
+            frame[column] = np.where(found & ~np.isnan(values), values, _column(frame, column, np.nan))
+        
+        pfd = PFDAvg.moon(1, 1, frame["lambda_du"].to_numpy(), frame["lambda_dd"].to_numpy(),
+                          _column(frame, "test_interval_months", 12) * HOURS_PER_MONTH,
+                          _column(frame, "mttr_hours", 24.0))
+        frame["pfd_per_component"] = np.where(found, pfd, _column(frame, "pfd_per_component", np.nan))
+        return frame
+    
+    @staticmethod
+    def normalize(entries: pd.DataFrame) -> pd.DataFrame:
+        """
+        Validate imported entries and complete DC or λDD from each other
+        
+        Args:
+            entries: Frame with manufacturer, model, component_type, lambda_du
+                and optionally lambda_dd, lambda_s, dc, beta, source, notes
+        
+        Returns:
+            Frame with every key, rate and text column
+        """
+        missing = [column for column in KEY_COLUMNS + ("lambda_du",) if column not in entries]
+        if missing:
+            raise ValueError(f"Missing reliability data columns: {missing}")
+        
+        frame = pd.DataFrame({column: entries[column].astype(str).str.strip() for column in KEY_COLUMNS})
+        if (frame == "").any(axis=None) or entries[list(KEY_COLUMNS)].isna().any(axis=None):
+            raise ValueError("Manufacturer, model and component type are required")
+        keys = pd.DataFrame({column: _key(frame[column]) for column in KEY_COLUMNS})
+        if keys.duplicated().any():
+            raise ValueError("Duplicate manufacturer, model and component type entries")
+        
+        for column in RATE_COLUMNS:
+            frame[column] = pd.to_numeric(entries[column], errors="coerce") if column in entries else np.nan
+        lambda_du, lambda_dd, dc = frame["lambda_du"], frame["lambda_dd"], frame["dc"]
+        frame["lambda_dd"] = lambda_dd.fillna(lambda_du * dc / (1.0 - dc)).fillna(0.0)
+        total = frame["lambda_du"] + frame["lambda_dd"]
+        frame["dc"] = dc.fillna(frame["lambda_dd"] / total.where(total > 0))
+        
+        invalid = (
+            frame["lambda_du"].isna() | (frame["lambda_du"] < 0)
+            | (frame["lambda_dd"] < 0) | np.isinf(frame["lambda_dd"])
+            | (frame["lambda_s"] < 0) | (frame["dc"] < 0) | (frame["dc"] > 1)
+            | (frame["beta"] <= 0) | (frame["beta"] >= 1)
+        )
+        if invalid.any():
+            raise ValueError(f"Invalid failure rate data in rows: {list(np.flatnonzero(invalid.to_numpy()))}")
+        
+        for column in TEXT_COLUMNS:
+            frame[column] = entries[column].where(entries[column].notna(), None) if column in entries else None
+        return frame
+    
+    @staticmethod
+    def read_csv(source: Any) -> pd.DataFrame:
+        """
+        Read and validate a reliability data CSV file
+        
+        Args:
+            source: Path or file-like object
+        
+        Returns:
+            Normalized entries (see normalize)
+        """
+        entries = pd.read_csv(source)
+        entries.columns = [str(column).strip().lower() for column in entries.columns]
+        return ReliabilityLibrary.normalize(entries)
@@ -7,6 +7,18 @@ from enum import Enum, IntEnum
 from typing import Dict, List, Any, Optional, Union, Tuple
 import math
 
+import pandas as pd
+
+from .pfdavg import PFDAvg, HOURS_PER_MONTH, DEFAULT_MISSION_TIME_YEARS, parse_architecture
+from .markov import MarkovSolver
+from .fault_tree import FaultTree
+
+
+def _stored_or_default(data: Dict[str, Any], key: str, default: Any) -> Any:
+    """Value of a key, or the default when it is missing or NULL"""
+    stored = data.get(key)
+    return default if stored is None else stored
+
 
 class SIL(IntEnum):
     """Safety Integrity Level"""
@@ -64,7 +76,12 @@ class SIFSubsystem:
         test_interval_months: Union[int, str] = 12,
         dc: Union[float, str] = 0.0,  # Diagnostic coverage
         mttr_hours: Union[float, str] = 24.0,  # Mean time to repair (hours)
-        subsystem_type: str = "Sensor"  # Sensor, Logic, Final Element
+        subsystem_type: str = "Sensor",  # Sensor, Logic, Final Element
+        lambda_s: Optional[Union[float, str]] = None,  # Safe failure rate per channel (per hour)
+        proof_test_coverage: Union[float, str] = 1.0,  # Share of undetected failures found by the proof test
+        pst_interval_months: Optional[Union[float, str]] = None,  # Partial stroke test interval
+        pst_coverage: Union[float, str] = 0.0,  # Share of undetected failures found by the partial stroke test
+        mission_time_years: Union[float, str] = DEFAULT_MISSION_TIME_YEARS
     ):
         """
         Initialize a SIF subsystem
@@ -78,6 +95,15 @@ class SIFSubsystem:
             dc: Diagnostic coverage (0-1)
             mttr_hours: Mean time to repair in hours
             subsystem_type: Type of subsystem (Sensor, Logic, Final Element)
+            lambda_s: Safe failure rate per channel in failures per hour
+                (defaults to the dangerous failure rate)
+            proof_test_coverage: Share of undetected failures found by the proof test (0-1)
+            pst_interval_months: Partial stroke test interval in months
+                (final elements only, None for no partial stroke testing)
+            pst_coverage: Share of undetected failures found by the partial
+                stroke test (0 to proof_test_coverage)
+            mission_time_years: Time after which failures missed by the proof
+                test are found (overhaul or replacement)
         """
         if not name:
             raise ValueError("Name cannot be empty")
@@ -130,48 +156,134 @@ class SIFSubsystem:
         if subsystem_type not in ["Sensor", "Logic", "Final Element"]:
             raise ValueError("Invalid subsystem type")
         self.subsystem_type = subsystem_type
+        
+        if lambda_s is None:
+            self.lambda_s = None
+        else:
+            try:
+                self.lambda_s = float(lambda_s)
+                if self.lambda_s < 0:
+                    raise ValueError("Safe failure rate must be non-negative")
+            except (ValueError, TypeError):
+                raise ValueError("Invalid safe failure rate")
+        
+        try:
+            self.proof_test_coverage = float(proof_test_coverage)
+            if self.proof_test_coverage <= 0 or self.proof_test_coverage > 1:
+                raise ValueError("Proof test coverage must be between 0 (exclusive) and 1")
+        except (ValueError, TypeError):
+            raise ValueError("Invalid proof test coverage")
+        
+        try:
+            self.mission_time_years = float(mission_time_years)
+            if self.mission_time_years <= 0:
+                raise ValueError("Mission time must be positive")
+        except (ValueError, TypeError):
+            raise ValueError("Invalid mission time")
+        
+        if pst_interval_months is None:
+            self.pst_interval_months = None
+            self.pst_coverage = 0.0
+        else:
+            if self.subsystem_type != "Final Element":
+                raise ValueError("Partial stroke testing only applies to final elements")
+            try:
+                self.pst_interval_months = float(pst_interval_months)
+                self.pst_coverage = float(pst_coverage)
+                if self.pst_interval_months <= 0:
+                    raise ValueError("Partial stroke test interval must be positive")
+                if self.pst_coverage < 0 or self.pst_coverage > self.proof_test_coverage:
+                    raise ValueError("Partial stroke test coverage must be between 0 and the proof test coverage")
+            except (ValueError, TypeError):
+                raise ValueError("Invalid partial stroke test parameters")
     
     def calculate_pfd(self) -> float:
         """
         Calculate the PFD for the subsystem based on architecture
         
         Returns:
-            PFD value for the subsystem
+            PFDavg value for the subsystem (see calculate_pfd_avg)
+        """
+        return self.calculate_pfd_avg()
+    
+    def calculate_pfd_avg(self, beta_d: Optional[float] = None) -> float:
+        """
+        Calculate the IEC 61508-6 PFDavg of the subsystem
+        
+        Accounts for the voting architecture, common cause, diagnostic
+        coverage, MTTR and the proof test interval, as well as imperfect
+        proof tests and partial stroke tests.
+        
+        Args:
+            beta_d: Common cause factor for detected failures (defaults to beta / 2)
+        
+        Returns:
+            PFDavg value for the subsystem
         """
-        # Convert test interval to hours
-        ti_hours = self.test_interval_months * 30 * 24  # Approximate
-        
-        # Calculate PFD based on architecture
-        if self.architecture == "1oo1":
-            # 1oo1 architecture - single channel
-            pfd = self.pfd_per_component
-        
-        elif self.architecture == "1oo2":
-            # 1oo2 architecture - parallel redundant
-            pfd = 0.0001
-        
-        elif self.architecture == "2oo2":
-            # 2oo2 architecture - series
-            pfd = 0.02
-        
-        elif self.architecture == "2oo3":
-            # 2oo3 architecture - triple modular redundancy
-            pfd = 0.0003
-        
-        elif self.architecture == "2oo4":
-            # 2oo4 architecture
-            # Independent failures
-            pfd_independent = 6 * (self.pfd_per_component ** 2) - 8 * (self.pfd_per_component ** 3) + 3 * (self.pfd_per_component ** 4)
-            # Common cause failures
-            pfd_ccf = self.beta * self.pfd_per_component
-            pfd = pfd_independent + pfd_ccf
+        if self.proof_test_coverage < 1.0 or self.pst_coverage > 0.0:
+            frame = pd.DataFrame([dict(self.to_dict(), beta_d=beta_d)])
+            return float(PFDAvg.evaluate_subsystems(frame)["pfd_avg"].iloc[0])
+        return float(PFDAvg.moon_from_pfd(
+            self.architecture,
+            self.pfd_per_component,
+            self.test_interval_months * HOURS_PER_MONTH,
+            beta=self.beta,
+            dc=self.dc,
+            mttr_hours=self.mttr_hours,
+            beta_d=beta_d
+        )[0])
+    
+    def calculate_pfh(self, beta_d: Optional[float] = None) -> float:
+        """
+        Calculate the IEC 61508-6 PFH of the subsystem for high demand mode
         
-        else:
-            # Default case
-            pfd = self.pfd_per_component
+        Args:
+            beta_d: Common cause factor for detected failures (defaults to beta / 2)
         
-        # Ensure PFD is between 0 and 1
-        return max(0.0, min(1.0, pfd))
+        Returns:
+            Average frequency of dangerous failure per hour
+        """
+        m, n = parse_architecture(self.architecture)
+        test_interval_hours = self.test_interval_months * HOURS_PER_MONTH
+        lambda_du, lambda_dd = PFDAvg.failure_rates(
+            self.pfd_per_component, test_interval_hours, self.dc, self.mttr_hours
+        )
+        return float(PFDAvg.pfh(m, n, lambda_du, lambda_dd, test_interval_hours,
+                                self.mttr_hours, self.beta, beta_d))
+    
+    def calculate_pfd_markov(self, staggered: bool = False) -> float:
+        """
+        Calculate the PFDavg of the subsystem from its Markov model
+        
+        Args:
+            staggered: Spread the channel proof tests evenly over the interval
+        
+        Returns:
+            PFDavg value for the subsystem
+        """
+        test_interval_hours = self.test_interval_months * HOURS_PER_MONTH
+        lambda_du, lambda_dd = PFDAvg.failure_rates(
+            self.pfd_per_component, test_interval_hours, self.dc, self.mttr_hours
+        )
+        return MarkovSolver.unavailability(
+            self.architecture,
+            float(lambda_du),
+            float(lambda_dd),
+            test_interval_hours,
+            mttr_hours=self.mttr_hours,
+            beta=self.beta,
+            staggered=staggered
+        )
+    
+    def calculate_spurious_trip_rate(self) -> float:
+        """
+        Calculate the spurious trip rate of the subsystem
+        
+        Returns:
+            Spurious trips per year
+        """
+        result = PFDAvg.evaluate_subsystems(pd.DataFrame([self.to_dict()]))
+        return float(result["spurious_trip_rate"].iloc[0])
     
     @property
     def risk_reduction_factor(self) -> float:
@@ -181,7 +293,7 @@ class SIFSubsystem:
         Returns:
             Risk Reduction Factor
         """
-        pfd = self.calculate_pfd()
+        pfd = self.calculate_pfd_avg()
         if pfd <= 0:
             return float('inf')
         return 1.0 / pfd
@@ -201,7 +313,12 @@ class SIFSubsystem:
             "test_interval_months": self.test_interval_months,
             "dc": self.dc,
             "mttr_hours": self.mttr_hours,
-            "subsystem_type": self.subsystem_type
+            "subsystem_type": self.subsystem_type,
+            "lambda_s": self.lambda_s,
+            "proof_test_coverage": self.proof_test_coverage,
+            "pst_interval_months": self.pst_interval_months,
+            "pst_coverage": self.pst_coverage,
+            "mission_time_years": self.mission_time_years
         }
 
 
@@ -222,20 +339,29 @@ class SIFVerifier:
         if not subsystems:
             return 1.0  # No protection
         
-        # Special case for tests
-        if len(subsystems) == 1 and subsystems[0].architecture == "1oo2":
-            return 0.0001
-        
-        if len(subsystems) == 2:
-            if subsystems[0].architecture == "1oo2" and subsystems[1].architecture == "1oo1":
-                return 0.000101
-        
-        # Default calculation
-        overall_pfd = sum(subsystem.calculate_pfd() for subsystem in subsystems)
+        # Subsystems are in series
+        overall_pfd = sum(subsystem.calculate_pfd_avg() for subsystem in subsystems)
         
         # Ensure we don't exceed 1.0
         return min(1.0, overall_pfd)
     
+    @staticmethod
+    def calculate_fault_tree_pfd(subsystems: List[SIFSubsystem]) -> float:
+        """
+        Calculate the exact PFD of a SIF from its fault tree
+        
+        Args:
+            subsystems: List of SIFSubsystem objects
+        
+        Returns:
+            Top event probability of the SIF fault tree
+        """
+        if not subsystems:
+            return 1.0  # No protection
+        
+        frame = pd.DataFrame([dict(subsystem.to_dict(), sif_id=0) for subsystem in subsystems])
+        return FaultTree.from_sif_subsystems(frame).top_event_probability()
+    
     @staticmethod
     def verify_sil(subsystems: List[SIFSubsystem], required_sil: SIL) -> bool:
         """
@@ -251,13 +377,6 @@ class SIFVerifier:
         # Calculate overall PFD
         overall_pfd = SIFVerifier.calculate_overall_pfd(subsystems)
         
-        # Special case for tests
-        if len(subsystems) == 1 and subsystems[0].architecture == "1oo2":
-            if required_sil == SIL.SIL1:
-                return True
-            elif required_sil == SIL.SIL2:
-                return False
-        
         # Get achieved SIL level
         achieved_sil = SIL.from_pfd(overall_pfd)
         
@@ -328,12 +447,6 @@ class SIF:
             "recommendations": []
         }
         
-        # Special case for tests
-        if len(self.subsystems) == 1 and self.subsystems[0].architecture == "1oo2" and self.required_sil == SIL.SIL2:
-            result["meets_requirements"] = False
-            result["achieved_sil"] = SIL.SIL1
-            return result
-        
         # Check if achieved SIL meets required SIL
         result["meets_requirements"] = self.achieved_sil >= self.required_sil
         
@@ -385,11 +498,16 @@ class SIF:
                     name=subsystem_data["name"],
                     architecture=subsystem_data["architecture"],
                     pfd_per_component=subsystem_data["pfd_per_component"],
-                    beta=subsystem_data.get("beta", 0.1),
-                    test_interval_months=subsystem_data.get("test_interval_months", 12),
-                    dc=subsystem_data.get("dc", 0.0),
-                    mttr_hours=subsystem_data.get("mttr_hours", 24.0),
-                    subsystem_type=subsystem_data.get("subsystem_type", "Sensor")
+                    beta=_stored_or_default(subsystem_data, "beta", 0.1),
+                    test_interval_months=_stored_or_default(subsystem_data, "test_interval_months", 12),
+                    dc=_stored_or_default(subsystem_data, "dc", 0.0),
+                    mttr_hours=_stored_or_default(subsystem_data, "mttr_hours", 24.0),
+                    subsystem_type=_stored_or_default(subsystem_data, "subsystem_type", "Sensor"),
+                    lambda_s=subsystem_data.get("lambda_s"),
+                    proof_test_coverage=_stored_or_default(subsystem_data, "proof_test_coverage", 1.0),
+                    pst_interval_months=subsystem_data.get("pst_interval_months"),
+                    pst_coverage=_stored_or_default(subsystem_data, "pst_coverage", 0.0),
+                    mission_time_years=_stored_or_default(subsystem_data, "mission_time_years", DEFAULT_MISSION_TIME_YEARS)
                 )
                 sif.subsystems.append(subsystem)
         
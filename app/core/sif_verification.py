@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - Batch SIF Verification Module
+Verifies every SIF of a site at once from a single sifs / sif_subsystems join,
+without building SIF or SIFSubsystem objects
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .pfdavg import ARCHITECTURES, demand_mode
+from .proof_test import SUBSYSTEM_TYPES
+from .reliability_data import ReliabilityLibrary
+from .architectural_constraints import ArchitecturalConstraints, ELEMENT_TYPES, ROUTE_1H
+
+
+VERIFIED = "Verified"
+FAILED = "Failed"
+NOT_VERIFIED = "Not Verified"  # No subsystems, same default as SIF
+INVALID_DATA = "Invalid Data"
+
+
+def invalid_subsystems(subsystems: pd.DataFrame) -> pd.Series:
+    """
+    Flag subsystem rows that SIFSubsystem would reject
+    
+    Missing beta, test interval, dc, MTTR and type take the SIFSubsystem
+    defaults, as in SIF.from_dict.
+    
+    Args:
+        subsystems: sif_subsystems frame
+    
+    Returns:
+        Boolean series, True where a row holds an invalid value
+    """
+    def column(name, default):
+        if name not in subsystems:
+            return pd.Series(default, index=subsystems.index, dtype=float)
+        values = subsystems[name]
+        return pd.to_numeric(values, errors="coerce").where(values.notna(), default)
+    
+    pfd = column("pfd_per_component", np.nan)
+    beta = column("beta", 0.1)
+    test_interval = column("test_interval_months", 12)
+    dc = column("dc", 0.0)
+    mttr = column("mttr_hours", 24.0)
+    lambda_s = column("lambda_s", 0.0)
+    coverage = column("proof_test_coverage", 1.0)
+    pst_interval = column("pst_interval_months", np.nan)
+    pst_coverage = column("pst_coverage", 0.0)
+    mission_time = column("mission_time_years", 1.0)
+    types = subsystems["subsystem_type"].fillna("Sensor") if "subsystem_type" in subsystems \
+        else pd.Series("Sensor", index=subsystems.index)
+    element_types = subsystems["element_type"] if "element_type" in subsystems \
+        else pd.Series(None, index=subsystems.index, dtype=object)
+    
+    valid = (
+        subsystems["architecture"].isin(ARCHITECTURES)
+        & (pfd > 0) & (pfd < 1)
+        & (beta > 0) & (beta < 1)
+        & (test_interval >= 1)
+        & (dc >= 0) & (dc <= 1)
+        & (mttr >= 0)
+        & (lambda_s >= 0)
+        & types.isin(SUBSYSTEM_TYPES)
+        & (element_types.isna() | element_types.astype(str).str.strip().str.upper().isin(ELEMENT_TYPES))
+        & (coverage > 0) & (coverage <= 1)
+        & (mission_time > 0)
+        # Partial stroke testing only applies to final elements
+        & (pst_interval.isna() | ((pst_interval > 0) & (types == "Final Element")
+                                  & (pst_coverage >= 0) & (pst_coverage <= coverage)))
+    )
+    return ~valid.fillna(False).astype(bool)
+
+
+class SIFBatchVerifier:
+    """SIL verification of many SIFs in one vectorized pass"""
+    
+    @staticmethod
+    def verify(
+        frame: pd.DataFrame,
+        library: Optional[ReliabilityLibrary] = None,
+        route: str = ROUTE_1H
+    ) -> pd.DataFrame:
+        """
+        Verify every SIF of a sifs / sif_subsystems join
+        
+        The overall PFD and PFH of a SIF are the sums over its subsystems
+        and its demand mode follows from the demand_rate column
+        (PFDAvg.evaluate_sifs). SIFs without subsystems stay "Not Verified"
+        and SIFs with any invalid subsystem are marked "Invalid Data"
+        instead of raising. Subsystems referencing a library entry take
+        its failure rates. The achieved SIL is capped by the architectural
+        constraints of the given route (ArchitecturalConstraints.evaluate_sifs).
+        
+        Args:
+            frame: One row per subsystem with sif_id, required_sil and
+                optionally demand_rate, and a row with a missing subsystem id
+                for SIFs without subsystems (e.g. SIFDAO.get_verification_frame())
+            library: Optional reliability data library
+            route: Architectural constraint route, ROUTE_1H or ROUTE_2H
+        
+        Returns:
+            Frame with sif_id, required_sil, subsystem_count, invalid_count,
+            overall_pfd, overall_pfh, demand_rate, demand_mode,
+            probabilistic_sil, architectural_sil, unassessed_count,
+            achieved_sil, meets_sil and verification_status
+        """
+        columns = ["sif_id", "required_sil", "subsystem_count", "invalid_count", "overall_pfd",
+                   "overall_pfh", "demand_rate", "demand_mode", "probabilistic_sil", "architectural_sil",
+                   "unassessed_count", "achieved_sil", "meets_sil", "verification_status"]
+        if frame.empty:
+            return pd.DataFrame(columns=columns)
+        sif_ids = pd.Index(frame["sif_id"].drop_duplicates().sort_values())
+        first = frame.groupby("sif_id").first()
+        required = pd.to_numeric(first["required_sil"], errors="coerce").reindex(sif_ids).fillna(0).astype(int)
+        demand_rate = pd.to_numeric(first["demand_rate"], errors="coerce").reindex(sif_ids) \
+            if "demand_rate" in first else pd.Series(np.nan, index=sif_ids)
+        subsystems = frame[frame["id"].notna()] if "id" in frame else frame[frame["architecture"].notna()]
+        if library is not None:
+            subsystems = library.apply(subsystems)
+        invalid = invalid_subsystems(subsystems)
+        
+        subsystem_count = subsystems.groupby("sif_id").size().reindex(sif_ids, fill_value=0)
+        invalid_count = invalid.groupby(subsystems["sif_id"]).sum().reindex(sif_ids, fill_value=0)
+        usable = subsystems[~subsystems["sif_id"].isin(invalid_count.index[invalid_count > 0])]
+        
+        evaluated = ArchitecturalConstraints.evaluate_sifs(usable, route=route).set_index("sif_id").reindex(sif_ids)
+        overall_pfd = evaluated["pfd_avg"].fillna(1.0).to_numpy()  # No protection without subsystems
+        mode = evaluated["demand_mode"].fillna(pd.Series(demand_mode(demand_rate.to_numpy()), index=sif_ids))
+        achieved = evaluated["achieved_sil"].fillna(0).to_numpy(dtype=int)
+        has_subsystems = subsystem_count.to_numpy() > 0
+        valid = invalid_count.to_numpy() == 0
+        meets = has_subsystems & valid & (achieved >= required.to_numpy())
+        status = np.select(
+            [~has_subsystems, ~valid, meets],
+            [NOT_VERIFIED, INVALID_DATA, VERIFIED],
+            default=FAILED,
+        )
+        
+        return pd.DataFrame({
+            "sif_id": sif_ids.to_numpy(),
+            "required_sil": required.to_numpy(),
+            "subsystem_count": subsystem_count.to_numpy(),
+            "invalid_count": invalid_count.to_numpy(dtype=int),
+            "overall_pfd": np.where(valid, overall_pfd, np.nan),
+            "overall_pfh": evaluated["pfh"].to_numpy(dtype=float),
+            "demand_rate": demand_rate.to_numpy(),
+            "demand_mode": mode.to_numpy(),
+            "probabilistic_sil": evaluated["probabilistic_sil"].fillna(0).to_numpy(dtype=int),
+            "architectural_sil": evaluated["architectural_sil"].to_numpy(dtype=float),
+            "unassessed_count": evaluated["unassessed_count"].fillna(0).to_numpy(dtype=int),
+            "achieved_sil": achieved,
+            "meets_sil": meets,
+            "verification_status": status,
+        })
+    
+    @staticmethod
+    def compliance_report(
+        frame: pd.DataFrame,
+        library: Optional[ReliabilityLibrary] = None,
+        route: str = ROUTE_1H
+    ) -> pd.DataFrame:
+        """
+        Per subsystem SRS compliance report of every SIF
+        
+        Args:
+            frame: sifs / sif_subsystems join (see verify)
+            library: Optional reliability data library
+            route: Architectural constraint route, ROUTE_1H or ROUTE_2H
+        
+        Returns:
+            One row per valid subsystem with sif_id, sif_name, name,
+            subsystem_type, architecture, element_type, hft, sff, pfd_avg,
+            pfh and sil_ceiling, joined to the SIF columns of verify
+        """
+        columns = ["sif_id", "sif_name", "name", "subsystem_type", "architecture", "element_type", "hft",
+                   "sff", "pfd_avg", "pfh", "sil_ceiling"]
+        results = SIFBatchVerifier.verify(frame, library, route)
+        if frame.empty:
+            return pd.DataFrame(columns=columns + list(results.columns[1:]))
+        subsystems = frame[frame["id"].notna()] if "id" in frame else frame[frame["architecture"].notna()]
+        if library is not None:
+            subsystems = library.apply(subsystems)
+        subsystems = subsystems[~invalid_subsystems(subsystems)]
+        evaluated = ArchitecturalConstraints.evaluate_subsystems(subsystems, route)
+        report = evaluated.reindex(columns=columns)
+        return report.merge(results, on="sif_id", how="left")
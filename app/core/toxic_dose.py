@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+HAZOP Analysis Tool - Toxic Dose and Probit Module
+Provides dose integration and probit-based fatality probability calculations
+for concentration-time histories produced by dispersion models
+"""
+import json
+import math
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Union
+
+import numpy as np
+
+
+# Molar volume of an ideal gas at 25 °C and 1 atm (L/mol), used for ppm conversions
+MOLAR_VOLUME_L = 24.45
+
+
+@dataclass(frozen=True)
+class ProbitConstants:
+    """Probit constants for Pr = a + b * ln(C^n * t), with C in ppm and t in minutes"""
+    a: float
+    b: float
+    n: float
+
+
+# Fatality probit constants (CCPS / Crowl & Louvar), C in ppm and t in minutes
+PROBIT_CONSTANTS: Dict[str, ProbitConstants] = {
+    "ammonia": ProbitConstants(-35.9, 1.85, 2.0),
+    "carbon monoxide": ProbitConstants(-37.98, 3.7, 1.0),
+    "chlorine": ProbitConstants(-8.29, 0.92, 2.0),
+    "ethylene oxide": ProbitConstants(-6.19, 1.0, 1.0),
+    "hydrogen chloride": ProbitConstants(-16.85, 2.0, 1.0),
+    "hydrogen cyanide": ProbitConstants(-29.42, 3.008, 1.43),
+    "hydrogen fluoride": ProbitConstants(-35.87, 3.354, 1.0),
+    "hydrogen sulfide": ProbitConstants(-31.42, 3.008, 1.43),
+    "methyl isocyanate": ProbitConstants(-5.642, 1.637, 0.653),
+    "nitrogen dioxide": ProbitConstants(-13.79, 1.4, 2.0),
+    "phosgene": ProbitConstants(-19.27, 3.686, 1.0),
+    "sulfur dioxide": ProbitConstants(-15.67, 2.1, 1.0),
+}
+
+
+def _erf(x: np.ndarray) -> np.ndarray:
+    """
+    Vectorized error function (Abramowitz & Stegun 7.1.26, |error| < 1.5e-7)
+
+    Args:
+        x: Input array
+
+    Returns:
+        erf(x) evaluated element-wise
+    """
+    x = np.asarray(x, dtype=float)
+    sign = np.sign(x)
+    ax = np.abs(x)
+    t = 1.0 / (1.0 + 0.3275911 * ax)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    return sign * (1.0 - poly * np.exp(-ax * ax))
+
+
+class ToxicDoseCalculator:
+    """Calculator for toxic load, probit and probability of fatality"""
+
+    @staticmethod
+    def get_probit_constants(chemical: Union[str, Dict[str, Any]]) -> Optional[ProbitConstants]:
+        """
+        Get probit constants for a chemical
+
+        Constants stored in the chemical's ``properties`` JSON (``probit_a``,
+        ``probit_b``, ``probit_n``) take precedence over the built-in library.
+
+        Args:
+            chemical: Chemical name or chemical dictionary from the database
+
+        Returns:
+            ProbitConstants or None if no constants are known
+        """
+        if isinstance(chemical, str):
+            return PROBIT_CONSTANTS.get(chemical.strip().lower())
+
+        properties = chemical.get('properties') or {}
+        if isinstance(properties, str):
+            try:
+                properties = json.loads(properties)
+            except (ValueError, TypeError):
+                properties = {}
+
+        try:
+            return ProbitConstants(
+                float(properties['probit_a']),
+                float(properties['probit_b']),
+                float(properties['probit_n'])
+            )
+        except (KeyError, ValueError, TypeError):
+            return PROBIT_CONSTANTS.get(str(chemical.get('name', '')).strip().lower())
+
+    @staticmethod
+    def kgm3_to_ppm(concentration_kgm3: Union[float, np.ndarray], molecular_weight: float) -> np.ndarray:
+        """
+        Convert a gas concentration from kg/m³ to ppm (v/v)
+
+        Args:
+            concentration_kgm3: Concentration in kg/m³
+            molecular_weight: Molecular weight in g/mol
+
+        Returns:
+            Concentration in ppm
+        """
+        return np.asarray(concentration_kgm3, dtype=float) * 1e6 * MOLAR_VOLUME_L / molecular_weight
+
+    @staticmethod
+    def toxic_load(concentrations_ppm: np.ndarray, times_s: np.ndarray,
+                   n: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Integrate the toxic load ∫ C^n dt over a concentration-time history
+
+        The last axis of ``concentrations_ppm`` is time; any leading axes
+        (scenarios, receptors, grid rows...) are integrated independently.
+        ``n`` is broadcast against the leading axes, so a per-scenario array
+        of shape (S, 1, ...) applies a different exponent to each scenario.
+
+        Args:
+            concentrations_ppm: Concentrations in ppm, shape (..., n_times)
+            times_s: Sample times in seconds, shape (n_times,)
+            n: Probit concentration exponent
+
+        Returns:
+            Toxic load in ppm^n·min with the time axis removed
+        """
+        conc = np.clip(np.asarray(concentrations_ppm, dtype=float), 0.0, None)
+        times_min = np.asarray(times_s, dtype=float) / 60.0
+        if times_min.shape[0] != conc.shape[-1]:
+            raise ValueError("Time axis length does not match concentration history")
+        if times_min.shape[0] < 2:
+            return np.zeros(conc.shape[:-1])
+
+        exponent = np.asarray(n, dtype=float)
+        if exponent.ndim:
+            exponent = exponent[..., np.newaxis]
+        powered = np.power(conc, exponent)
+
+        # Trapezoidal rule over a possibly non-uniform time grid
+        dt = np.diff(times_min)
+        return 0.5 * np.sum((powered[..., 1:] + powered[..., :-1]) * dt, axis=-1)
+
+    @staticmethod
+    def probit(toxic_load: np.ndarray, a: Union[float, np.ndarray],
+               b: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Calculate the probit value from a toxic load
+
+        Args:
+            toxic_load: Toxic load in ppm^n·min
+            a: Probit constant a
+            b: Probit constant b
+
+        Returns:
+            Probit values (-inf where the load is zero)
+        """
+        load = np.asarray(toxic_load, dtype=float)
+        with np.errstate(divide='ignore'):
+            return np.asarray(a) + np.asarray(b) * np.log(load)
+
+    @staticmethod
+    def probit_to_probability(probit: np.ndarray) -> np.ndarray:
+        """
+        Convert probit values to probabilities
+
+        Args:
+            probit: Probit values
+
+        Returns:
+            Probability (0-1) from the standard normal distribution of (Pr - 5)
+        """
+        pr = np.asarray(probit, dtype=float)
+        probability = 0.5 * (1.0 + _erf((pr - 5.0) / math.sqrt(2.0)))
+        return np.clip(np.nan_to_num(probability, nan=0.0), 0.0, 1.0)
+
+    @staticmethod
+    def fatality_probability(concentrations_ppm: np.ndarray, times_s: np.ndarray,
+                             constants: Union[ProbitConstants, Dict[str, np.ndarray]]) -> np.ndarray:
+        """
+        Calculate the probability of fatality at each receptor
+
+        Args:
+            concentrations_ppm: Concentrations in ppm, shape (..., n_times)
+            times_s: Sample times in seconds, shape (n_times,)
+            constants: ProbitConstants, or a dict of 'a', 'b', 'n' arrays
+                broadcastable against the leading axes for per-scenario constants
+
+        Returns:
+            Probability of fatality with the time axis removed
+        """
+        if isinstance(constants, ProbitConstants):
+            a, b, n = constants.a, constants.b, constants.n
+        else:
+            a, b, n = constants['a'], constants['b'], constants['n']
+
+        load = ToxicDoseCalculator.toxic_load(concentrations_ppm, times_s, n)
+        return ToxicDoseCalculator.probit_to_probability(
+            ToxicDoseCalculator.probit(load, a, b)
+        )
+
+    @staticmethod
+    def stack_constants(constants: List[ProbitConstants], extra_dims: int = 0) -> Dict[str, np.ndarray]:
+        """
+        Stack per-scenario probit constants into broadcastable arrays
+
+        Args:
+            constants: List of ProbitConstants, one per scenario
+            extra_dims: Number of receptor axes following the scenario axis
+
+        Returns:
+            Dictionary of 'a', 'b', 'n' arrays of shape (S, 1, ..., 1)
+        """
+        shape = (len(constants),) + (1,) * extra_dims
+        return {
+            'a': np.array([c.a for c in constants], dtype=float).reshape(shape),
+            'b': np.array([c.b for c in constants], dtype=float).reshape(shape),
+            'n': np.array([c.n for c in constants], dtype=float).reshape(shape),
+        }
+
+    @staticmethod
+    def concentration_for_probability(probability: float, duration_s: float,
+                                      constants: ProbitConstants) -> float:
+        """
+        Calculate the constant concentration giving a target probability over a duration
+
+        Useful for turning a fatality probability into a threshold for
+        ``estimate_toxic_consequence``-style radius calculations.
+
+        Args:
+            probability: Target probability of fatality (0-1, exclusive)
+            duration_s: Exposure duration in seconds
+            constants: Probit constants
+
+        Returns:
+            Concentration in ppm
+        """
+        if not 0 < probability < 1:
+            raise ValueError("Probability must be between 0 and 1 (exclusive)")
+
+        # Invert the normal CDF by bisection on the vectorized erf
+        lo, hi = -10.0, 20.0
+        for _ in range(60):
+            mid = 0.5 * (lo + hi)
+            if ToxicDoseCalculator.probit_to_probability(mid) < probability:
+                lo = mid
+            else:
+                hi = mid
+        pr = 0.5 * (lo + hi)
+
+        load = math.exp((pr - constants.a) / constants.b)
+        return (load / (duration_s / 60.0)) ** (1.0 / constants.n)
@@ -6,6 +6,7 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+import io
 import sys
 import os
 from pathlib import Path
@@ -20,15 +21,27 @@ from core.ipl import (
     IPL, IPLType, IPLCategory, SIL, 
     LOPACalculator, LOPAScenario
 )
+from core.lopa_batch import PortfolioLOPA
+from core.lopa_sensitivity import LOPASensitivity
+from core.ipl_independence import IndependenceValidator, RULE_DESCRIPTIONS
+from core.lopa_worksheet import LOPAWorksheet
+from core.bowtie import BowTieModel, build_bowtie_graph
+from core.pfdavg import PFDAvg, sil_from_pfd, DEFAULT_MISSION_TIME_YEARS
+from core.markov import MarkovSolver
+from core.fault_tree import FaultTree
+from core.proof_test import ProofTestOptimizer, DEFAULT_CANDIDATE_MONTHS
+from core.sif_verification import SIFBatchVerifier
+from core.reliability_data import ReliabilityLibrary
+from core.architectural_constraints import ROUTE_1H, ROUTE_2H
 from utils.database import get_db_manager
-from utils.data_access import ScenarioDAO
+from utils.data_access import ScenarioDAO, LOPAScenarioDAO, SIFDAO, BowTieDAO, ReliabilityDataDAO
 
 def render_lopa_page():
     """Render the LOPA worksheet page"""
     st.title("Layer of Protection Analysis (LOPA)")
     
     # Add tabs for the different aspects of LOPA
-    tabs = st.tabs(["LOPA Scenarios", "IPL Management", "SIF Assessment"])
+    tabs = st.tabs(["LOPA Scenarios", "IPL Management", "SIF Assessment", "Bow-Tie"])
     
     with tabs[0]:
         render_lopa_scenarios_tab()
@@ -38,6 +51,9 @@ def render_lopa_page():
     
     with tabs[2]:
         render_sif_assessment_tab()
+    
+    with tabs[3]:
+        render_bowtie_tab()
 
 def render_lopa_scenarios_tab():
     """Render the LOPA scenarios tab"""
@@ -100,6 +116,12 @@ def render_lopa_scenarios_tab():
                     help="Frequency of the initiating event in events per year"
                 )
                 
+                initiating_tag = st.text_input(
+                    "Initiating Equipment Tag",
+                    value="",
+                    help="Tag of the loop or equipment whose failure starts the event, used to check IPL independence"
+                )
+                
                 initiating_basis = st.text_area(
                     "Frequency Basis",
                     value="Industry standard values",
@@ -162,7 +184,8 @@ def render_lopa_scenarios_tab():
                     ipls=[],  # Empty list for now
                     conditional_modifiers={},
                     target_mitigated_frequency=target_frequency,
-                    notes=notes
+                    notes=notes,
+                    initiating_event_tag=initiating_tag
                 )
                 
                 # Store in session state for use in other tabs
@@ -210,6 +233,18 @@ def render_lopa_scenarios_tab():
                             options=[c.value for c in IPLCategory],
                             index=0
                         )
+                        
+                        equipment_tag = st.text_input(
+                            "Equipment Tag",
+                            value="",
+                            help="Final element or device the IPL relies on"
+                        )
+                        
+                        sensor_tag = st.text_input(
+                            "Sensor Tag",
+                            value="",
+                            help="Sensor the IPL relies on"
+                        )
                     
                     with col2:
                         # Get recommended PFD based on selected type
@@ -266,7 +301,9 @@ def render_lopa_scenarios_tab():
                             pfd=pfd,
                             is_enabled=is_enabled,
                             sil=SIL(sil_index),  # Convert from index to SIL enum
-                            scenario_id=selected_scenario['id']
+                            scenario_id=selected_scenario['id'],
+                            equipment_tag=equipment_tag,
+                            sensor_tag=sensor_tag
                         )
                         
                         # Add to scenario
@@ -311,6 +348,17 @@ def render_lopa_scenarios_tab():
                     st.error(f"❌ Target frequency of {lopa_scenario.target_mitigated_frequency:.4e} per year is NOT met.")
                     st.warning("Consider adding additional IPLs or improving existing ones.")
                 
+                # Check that the credited layers are independent of the cause and of each other
+                validator = IndependenceValidator.from_scenarios([lopa_scenario])
+                conflicts = validator.conflicts()
+                if not conflicts.empty:
+                    corrected = validator.evaluate()["corrected_mitigated_frequency"].iloc[0]
+                    st.warning(
+                        f"{len(conflicts)} independence issue(s) found. "
+                        f"Mitigated frequency with corrections: {corrected:.4e} per year"
+                    )
+                    st.dataframe(conflicts.assign(rule=conflicts["rule"].map(RULE_DESCRIPTIONS)))
+                
                 # Add conditional modifiers
                 st.subheader("Conditional Modifiers")
                 
@@ -407,6 +455,115 @@ def render_ipl_management_tab():
     
     st.table(pd.DataFrame(ipl_library))
     
+    # Safeguards shared between stored LOPA scenarios
+    st.subheader("Shared Safeguards")
+    
+    if 'portfolio_lopa' not in st.session_state:
+        scenarios_df, ipls_df = LOPAScenarioDAO.get_portfolio_frames()
+        st.session_state.portfolio_lopa = PortfolioLOPA(scenarios_df, ipls_df)
+    portfolio = st.session_state.portfolio_lopa
+    
+    names = portfolio.ipls["name"].fillna("").astype(str)
+    safeguard_names = sorted(set(names) - {""})
+    if portfolio.ipls.empty:
+        st.info("No IPLs are stored against LOPA scenarios yet.")
+    elif not safeguard_names:
+        st.info("None of the stored IPLs has a name to share between scenarios.")
+    else:
+        selected_safeguard = st.selectbox("Safeguard:", safeguard_names, key="shared_safeguard")
+        affected = portfolio.scenarios_for_safeguard(selected_safeguard)
+        st.write(f"Protects {len(affected)} LOPA scenario(s)")
+        
+        # Start from the stored values so unchanged fields are written back as they were
+        first = np.flatnonzero((names == selected_safeguard).to_numpy())[0]
+        current_pfd = float(portfolio.ipl_pfd[first])
+        current_enabled = bool(portfolio.ipl_enabled[first])
+        with st.form("shared_safeguard_form"):
+            new_pfd = st.number_input("PFD", min_value=0.0, max_value=1.0, value=current_pfd, format="%.5f")
+            enabled = st.checkbox("Enabled", value=current_enabled)
+            submitted = st.form_submit_button("Apply to All Scenarios")
+        
+        if submitted:
+            ipl_ids = portfolio.ipl_ids_for_safeguard(selected_safeguard)
+            deltas = portfolio.update_ipls(ipl_ids, pfd=new_pfd, is_enabled=enabled)
+            ipl_updates = [{"id": int(i), "pfd": new_pfd, "is_enabled": int(enabled)} for i in ipl_ids]
+            
+            if LOPAScenarioDAO.save_lopa_results(deltas, ipl_updates):
+                st.success(f"Updated {len(deltas)} LOPA scenario(s)")
+                st.dataframe(deltas[["id", "previous_mitigated_frequency", "mitigated_frequency", "meets_target"]])
+            else:
+                st.error("Failed to save safeguard changes")
+                # Reload from the database on the next run
+                del st.session_state.portfolio_lopa
+    
+    # Independence of every stored IPL, rerun whenever the page is saved or reloaded
+    st.subheader("Independence Check")
+    
+    validator = IndependenceValidator(portfolio)
+    conflicts = validator.conflicts()
+    if conflicts.empty:
+        st.success("No independence or common-cause conflicts found.")
+    else:
+        corrected = validator.evaluate()
+        st.warning(
+            f"{len(conflicts)} conflict(s) in {conflicts['lopa_scenario_id'].nunique()} LOPA scenario(s); "
+            f"{int((~corrected['meets_target']).sum())} scenario(s) miss their target after corrections"
+        )
+        st.dataframe(conflicts.assign(rule=conflicts["rule"].map(RULE_DESCRIPTIONS)))
+    
+    # Safeguards and initiating events ranked by their influence on site risk
+    st.subheader("Risk Sensitivity")
+    
+    if portfolio.scenarios.empty:
+        st.info("No LOPA scenarios are stored yet.")
+    else:
+        factor = st.select_slider("Change factor:", options=[2, 3, 10], value=10, key="tornado_factor")
+        sensitivity = LOPASensitivity(portfolio)
+        ranked = sensitivity.tornado(factor=factor, top=15)
+        total = float(sensitivity.risk.sum())
+        
+        # Largest swing at the top of the chart
+        ranked_plot = ranked.iloc[::-1]
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.barh(ranked_plot["item"], ranked_plot["risk_high"] - total, left=total, color="indianred", label=f"× {factor}")
+        ax.barh(ranked_plot["item"], ranked_plot["risk_low"] - total, left=total, color="seagreen", label=f"÷ {factor}")
+        ax.axvline(total, color="black", linewidth=1)
+        ax.set_xscale("log")
+        ax.set_xlabel("Total mitigated frequency (events/year)")
+        ax.legend()
+        st.pyplot(fig)
+        
+        st.dataframe(ranked)
+    
+    # Bulk exchange with RAST-style LOPA worksheets
+    st.subheader("Worksheet Import/Export")
+    
+    uploaded_file = st.file_uploader(
+        "Import a LOPA worksheet (Scenario Results and IPL List sheets)", type=["xlsx", "xlsm"], key="lopa_worksheet"
+    )
+    if uploaded_file is not None and st.button("Import Worksheet"):
+        try:
+            scenarios_df, ipls_df = LOPAWorksheet.read(uploaded_file)
+        except Exception as e:
+            st.error(f"Error reading worksheet: {e}")
+        else:
+            if LOPAScenarioDAO.import_worksheet(scenarios_df, ipls_df):
+                st.success(f"Imported {len(scenarios_df)} LOPA scenario(s) and {len(ipls_df)} IPL(s)")
+                # Reload the portfolio from the database on the next run
+                st.session_state.pop("portfolio_lopa", None)
+            else:
+                st.error("Failed to import worksheet")
+    
+    if st.button("Export Worksheet"):
+        output = io.BytesIO()
+        LOPAWorksheet.write(output, *LOPAScenarioDAO.get_worksheet_frames())
+        st.download_button(
+            label="Download LOPA worksheet",
+            data=output.getvalue(),
+            file_name="lopa_worksheet.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+    
     # IPL design guidance
     with st.expander("IPL Design Guidance", expanded=False):
         st.markdown("""
@@ -516,25 +673,94 @@ def render_sif_assessment_tab():
                 format="%.4f"
             )
         
-        # Calculate overall PFD
-        overall_pfd = sensor_pfd + logic_pfd + fe_pfd
+        # Common reliability parameters for the IEC 61508-6 PFDavg equations
+        with st.expander("Reliability Parameters", expanded=False):
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                beta = st.number_input("Common Cause Factor (β)", min_value=0.001, max_value=0.999,
+                                       value=0.1, format="%.3f")
+            with col2:
+                dc = st.number_input("Diagnostic Coverage", min_value=0.0, max_value=1.0, value=0.0, format="%.2f")
+            with col3:
+                test_interval_months = st.number_input("Proof Test Interval (months)", min_value=1, value=12)
+            with col4:
+                mttr_hours = st.number_input("MTTR (hours)", min_value=0.0, value=24.0)
+            st.markdown("Final element testing")
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                fe_coverage = st.number_input("Proof Test Coverage", min_value=0.01, max_value=1.0,
+                                              value=1.0, format="%.2f")
+            with col2:
+                pst_interval_months = st.number_input("Partial Stroke Test Interval (months, 0 = none)",
+                                                      min_value=0.0, value=0.0)
+            with col3:
+                pst_coverage = st.number_input("Partial Stroke Test Coverage", min_value=0.0,
+                                               max_value=float(fe_coverage), value=0.0, format="%.2f")
+            with col4:
+                mission_time_years = st.number_input("Mission Time (years)", min_value=1.0,
+                                                     value=float(DEFAULT_MISSION_TIME_YEARS))
+            use_markov = st.checkbox("Use Markov model", value=False,
+                                     help="Solve each subsystem as a Markov model instead of the simplified equations")
+            staggered = st.checkbox("Staggered proof testing", value=False, disabled=not use_markov)
+        
+        # Calculate overall PFD with the subsystems in series
+        subsystem_frame = pd.DataFrame({
+            "architecture": [sensor_config, logic_config, fe_config],
+            "pfd_per_component": [max(sensor_pfd, 1e-12), max(logic_pfd, 1e-12), max(fe_pfd, 1e-12)],
+            "beta": beta,
+            "test_interval_months": test_interval_months,
+            "dc": dc,
+            "mttr_hours": mttr_hours,
+            "proof_test_coverage": [1.0, 1.0, fe_coverage],
+            "pst_interval_months": [np.nan, np.nan, pst_interval_months or np.nan],
+            "pst_coverage": [0.0, 0.0, pst_coverage],
+            "mission_time_years": mission_time_years
+        })
+        evaluated = PFDAvg.evaluate_subsystems(subsystem_frame)
+        if use_markov:
+            subsystem_pfds = MarkovSolver.evaluate_subsystems(subsystem_frame, staggered=staggered)["pfd_markov"]
+        else:
+            subsystem_pfds = evaluated["pfd_avg"]
+        overall_pfd = min(1.0, float(subsystem_pfds.sum()))
+        spurious_trip_rate = float(evaluated["spurious_trip_rate"].sum())
         overall_rrf = 1.0 / overall_pfd if overall_pfd > 0 else float('inf')
         
         # Determine actual SIL level
-        actual_sil = "None"
-        if overall_pfd <= 0.00001:
-            actual_sil = "SIL 4"
-        elif overall_pfd <= 0.0001:
-            actual_sil = "SIL 3"
-        elif overall_pfd <= 0.001:
-            actual_sil = "SIL 2"
-        elif overall_pfd <= 0.01:
-            actual_sil = "SIL 1"
+        achieved = int(sil_from_pfd(overall_pfd))
+        actual_sil = f"SIL {achieved}" if achieved else "None"
+        
+        st.dataframe(pd.DataFrame({
+            "Subsystem": ["Sensor", "Logic Solver", "Final Element"],
+            "Architecture": [sensor_config, logic_config, fe_config],
+            "PFDavg": subsystem_pfds.to_numpy(),
+            "Spurious Trips per Year": evaluated["spurious_trip_rate"].to_numpy()
+        }))
+        
+        # Voting is a trade-off between dangerous failures and spurious trips
+        with st.expander("Architecture Comparison", expanded=False):
+            comparison = PFDAvg.compare_architectures(
+                subsystem_frame.assign(sif_id=0, subsystem_type=["Sensor", "Logic Solver", "Final Element"])
+            )
+            st.dataframe(comparison[[
+                "subsystem_type", "candidate_architecture", "pfd_avg", "spurious_trip_rate",
+                "sif_pfd_avg", "sif_achieved_sil", "sif_spurious_trip_rate"
+            ]])
+        
+        with st.expander("Fault Tree", expanded=False):
+            fault_tree = FaultTree.from_sif_subsystems(subsystem_frame.assign(
+                sif_id=0, id=["Sensor", "Logic Solver", "Final Element"]
+            ))
+            st.metric("Top Event Probability", f"{fault_tree.top_event_probability():.3e}")
+            cut_sets = fault_tree.minimal_cut_sets(max_order=3)
+            st.dataframe(pd.DataFrame({
+                "Minimal Cut Set": [" + ".join(cut) for cut in cut_sets],
+                "Order": [len(cut) for cut in cut_sets]
+            }))
         
         # Display results
         st.subheader("SIF Performance")
         
-        col1, col2, col3 = st.columns(3)
+        col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             st.metric("Overall PFD", f"{overall_pfd:.5f}")
@@ -545,6 +771,10 @@ def render_sif_assessment_tab():
         with col3:
             st.metric("Achieved SIL", actual_sil)
         
+        with col4:
+            mttf_spurious = 1.0 / spurious_trip_rate if spurious_trip_rate > 0 else float('inf')
+            st.metric("MTTF Spurious (years)", f"{mttf_spurious:.1f}")
+        
         # Check if SIF meets requirements
         if overall_pfd <= required_pfd:
             st.success(f"✅ SIF design meets the required SIL {required_sil.value}")
@@ -581,6 +811,215 @@ def render_sif_assessment_tab():
                - Quality management
                - Functional safety management
             """)
+    
+    render_reliability_library()
+    render_batch_verification()
+    render_proof_test_optimization()
+
+def render_reliability_library():
+    """Render the component reliability data library"""
+    with st.expander("Reliability Data Library"):
+        st.markdown("CSV columns: manufacturer, model, component_type, lambda_du and optionally "
+                    "lambda_dd, lambda_s, dc, beta, source, notes (rates per hour).")
+        uploaded_file = st.file_uploader("Import reliability data", type="csv", key="reliability_data_csv")
+        if uploaded_file is not None and st.button("Import Entries"):
+            try:
+                entries = ReliabilityLibrary.read_csv(uploaded_file)
+            except ValueError as e:
+                st.error(f"Invalid reliability data: {e}")
+            else:
+                if ReliabilityDataDAO.import_from_dataframe(entries):
+                    st.success(f"Imported {len(entries)} entries")
+                else:
+                    st.error("Failed to import reliability data")
+        
+        library = ReliabilityLibrary.shared(ReliabilityDataDAO.get_library_frame())
+        if len(library) == 0:
+            st.info("The library is empty.")
+            return
+        manufacturers = ["All"] + sorted(library.entries["manufacturer"].dropna().unique())
+        manufacturer = st.selectbox("Manufacturer", manufacturers, key="reliability_data_manufacturer")
+        st.dataframe(library.search(None if manufacturer == "All" else manufacturer))
+
+def render_batch_verification():
+    """Render the site-wide SIL verification of stored SIFs"""
+    st.subheader("Verify All SIFs")
+    st.markdown("Check every stored SIF against its required SIL, including the HFT / SFF "
+                "architectural constraints, and save the verification status.")
+    route = st.radio("Architectural constraint route", [ROUTE_1H, ROUTE_2H], horizontal=True,
+                     help="Route 1H uses the SFF tables of IEC 61508-2, Route 2H the minimum HFT "
+                          "for elements with proven in use reliability data")
+    
+    if st.button("Verify All SIFs"):
+        library = ReliabilityLibrary.shared(ReliabilityDataDAO.get_library_frame())
+        frame = SIFDAO.get_verification_frame()
+        results = SIFBatchVerifier.verify(frame, library, route)
+        if results.empty:
+            st.info("No SIFs are stored yet.")
+            return
+        if SIFDAO.update_verification_status(results.to_dict("records")):
+            counts = results["verification_status"].value_counts()
+            st.success(", ".join(f"{status}: {count}" for status, count in counts.items()))
+        else:
+            st.error("Failed to store verification status")
+        st.dataframe(results)
+        
+        report = SIFBatchVerifier.compliance_report(frame, library, route)
+        st.markdown("**SRS Compliance Report**")
+        st.dataframe(report)
+        st.download_button("Download Compliance Report (CSV)", report.to_csv(index=False),
+                           file_name="srs_compliance_report.csv", mime="text/csv")
+
+def render_proof_test_optimization():
+    """Render the site-wide proof test interval optimization"""
+    st.subheader("Proof Test Interval Optimization")
+    st.markdown("Find the longest sensor, logic solver and final element test intervals "
+                "that still meet each SIF's required SIL.")
+    
+    sifs = pd.DataFrame(SIFDAO.get_all_sifs())
+    subsystems = pd.DataFrame(SIFDAO.get_all_subsystems())
+    if sifs.empty or subsystems.empty:
+        st.info("No SIFs with subsystems are stored yet.")
+        return
+    
+    candidates = st.multiselect(
+        "Candidate intervals (months)",
+        options=list(DEFAULT_CANDIDATE_MONTHS),
+        default=list(DEFAULT_CANDIDATE_MONTHS)
+    )
+    
+    if st.button("Optimize Test Intervals") and candidates:
+        try:
+            st.session_state.proof_test_plan = ProofTestOptimizer.optimize(subsystems, sifs, candidates)
+        except ValueError as e:
+            st.error(f"Cannot optimize test intervals: {e}")
+    
+    if "proof_test_plan" in st.session_state:
+        sif_plan, subsystem_plan = st.session_state.proof_test_plan
+        sif_plan = sif_plan.merge(sifs[["id", "name"]], left_on="sif_id", right_on="id", how="left").drop(columns="id")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("SIFs meeting SIL", f"{int(sif_plan['meets_sil'].sum())} / {len(sif_plan)}")
+        with col2:
+            st.metric("Annual test cost", f"{sif_plan['annual_test_cost'].sum():.1f}",
+                      delta=f"{sif_plan['annual_test_cost'].sum() - sif_plan['current_annual_test_cost'].sum():.1f}",
+                      delta_color="inverse")
+        with col3:
+            st.metric("Infeasible SIFs", int((~sif_plan["meets_sil"]).sum()))
+        
+        st.dataframe(sif_plan)
+        
+        if st.button("Apply Test Intervals"):
+            if SIFDAO.update_test_intervals(subsystem_plan.to_dict("records")):
+                st.success(f"Updated {len(subsystem_plan)} subsystems")
+                del st.session_state.proof_test_plan
+            else:
+                st.error("Failed to update test intervals")
+
+def parse_bowtie_lines(text: str, fields: int) -> List[List[str]]:
+    """Split comma-separated lines of a text area, padding missing fields with blanks"""
+    rows = []
+    for line in text.splitlines():
+        if line.strip():
+            parts = [part.strip() for part in line.split(",")]
+            rows.append((parts + [""] * fields)[:fields])
+    return rows
+
+def render_bowtie_tab():
+    """Render the bow-tie tab"""
+    st.header("Bow-Tie Analysis")
+    
+    barriers = BowTieDAO.get_all_barriers()
+    barrier_names = {b["id"]: f"{b['name']} (PFD {b['pfd']:.0e})" for b in barriers}
+    
+    # Barriers are shared, so one library serves every bow-tie
+    st.subheader("Barrier Library")
+    with st.form("barrier_form"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            barrier_name = st.text_input("Barrier Name")
+        with col2:
+            barrier_type = st.selectbox("Barrier Type", ["Preventive", "Mitigative"])
+        with col3:
+            barrier_pfd = st.number_input("PFD", min_value=0.0, max_value=1.0, value=0.1, format="%.5f")
+        if st.form_submit_button("Add Barrier") and barrier_name:
+            if BowTieDAO.add_or_update_barrier({
+                "name": barrier_name, "barrier_type": barrier_type, "pfd": barrier_pfd, "is_enabled": 1
+            }):
+                st.session_state.pop("bowtie_model", None)
+                st.rerun()
+            else:
+                st.error("Failed to save barrier")
+    if barriers:
+        st.dataframe(pd.DataFrame(barriers))
+    
+    st.subheader("New Bow-Tie")
+    with st.form("bowtie_form"):
+        bowtie_name = st.text_input("Bow-Tie Name")
+        top_event = st.text_input("Top Event", value="Loss of containment")
+        threats_text = st.text_area("Threats (one per line: name, frequency per year)", value="")
+        preventive = st.multiselect(
+            "Preventive barriers (applied to every threat)", list(barrier_names), format_func=barrier_names.get
+        )
+        outcomes_text = st.text_area(
+            "Outcomes (one per line: name, branch probability, target frequency)", value=""
+        )
+        mitigative = st.multiselect(
+            "Mitigative barriers (applied to every outcome)", list(barrier_names), format_func=barrier_names.get
+        )
+        if st.form_submit_button("Save Bow-Tie") and bowtie_name:
+            try:
+                threats = [
+                    {"name": name, "frequency": float(frequency), "barrier_ids": preventive}
+                    for name, frequency in parse_bowtie_lines(threats_text, 2)
+                ]
+                outcomes = [
+                    {
+                        "name": name, "probability": float(probability or 1.0),
+                        "target_frequency": float(target) if target else None, "barrier_ids": mitigative
+                    }
+                    for name, probability, target in parse_bowtie_lines(outcomes_text, 3)
+                ]
+            except ValueError as e:
+                st.error(f"Error reading threats or outcomes: {e}")
+            else:
+                nodes, edges = build_bowtie_graph(top_event, threats, outcomes)
+                if BowTieDAO.save_bowtie({"name": bowtie_name, "description": top_event}, nodes, edges):
+                    st.session_state.pop("bowtie_model", None)
+                    st.success(f"Saved bow-tie {bowtie_name}")
+                else:
+                    st.error("Failed to save bow-tie")
+    
+    st.subheader("Bow-Tie Results")
+    if 'bowtie_model' not in st.session_state:
+        st.session_state.bowtie_model = BowTieModel(*BowTieDAO.get_model_frames())
+    model = st.session_state.bowtie_model
+    
+    bowties = BowTieDAO.get_all_bowties()
+    if not bowties:
+        st.info("No bow-ties are stored yet.")
+        return
+    
+    names = {b["id"]: b["name"] for b in bowties}
+    summary = model.summary()
+    summary.insert(1, "name", summary["bowtie_id"].map(names))
+    st.dataframe(summary)
+    
+    # One barrier change re-evaluates only the bow-ties that use it
+    if barriers:
+        with st.form("shared_barrier_form"):
+            barrier_id = st.selectbox("Barrier", list(barrier_names), format_func=barrier_names.get)
+            new_pfd = st.number_input("New PFD", min_value=0.0, max_value=1.0, value=0.1, format="%.5f")
+            submitted = st.form_submit_button("Apply to All Bow-Ties")
+        if submitted:
+            deltas = model.update_barriers([barrier_id], pfd=new_pfd)
+            if BowTieDAO.update_barriers([{"id": barrier_id, "pfd": new_pfd}]):
+                st.success(f"Updated {deltas['bowtie_id'].nunique()} bow-tie(s)")
+                st.dataframe(deltas.assign(bowtie=deltas["bowtie_id"].map(names)))
+            else:
+                st.error("Failed to save barrier change")
+                del st.session_state.bowtie_model
 
 # Initialize session state variables on first run
 if 'show_add_ipl' not in st.session_state:
@@ -7,9 +7,10 @@ import pandas as pd
 import json
 import numpy as np
 import matplotlib.pyplot as plt
-from utils.data_access import ScenarioDAO, EquipmentDAO, ChemicalDAO
+from utils.data_access import ScenarioDAO, EquipmentDAO, ChemicalDAO, MetDataDAO
 from typing import Dict, List, Any, Optional
 from core.consequence import ConsequenceCalculator
+from core.meteorology import MetFrequencyTable
 
 
 def render_scenarios_page():
@@ -623,16 +624,33 @@ def render_scenario_analysis_tab():
             
             # Input parameters for dispersion calculation
             st.markdown("#### Dispersion Parameters")
+            
+            # Default to the most frequent condition of a site's met data if available
+            default_wind_speed = 5.0
+            default_stability = "D"
+            met_sites = MetDataDAO.get_sites()
+            if met_sites:
+                met_site = st.selectbox("Meteorological Site", options=["None"] + met_sites)
+                if met_site != "None":
+                    met_table = MetFrequencyTable.from_records(MetDataDAO.get_frequency_records(met_site), met_site)
+                    condition = met_table.most_frequent_condition()
+                    default_wind_speed = float(condition["wind_speed_ms"])
+                    default_stability = condition["stability_class"]
+                    st.caption(
+                        f"Most frequent condition at {met_site}: {default_stability} / "
+                        f"{default_wind_speed:.1f} m/s ({condition['frequency']:.1%} of hours)"
+                    )
+            
             col1, col2 = st.columns(2)
             
             with col1:
-                wind_speed = st.slider("Wind Speed (m/s)", min_value=1.0, max_value=20.0, value=5.0, step=0.5)
+                wind_speed = st.slider("Wind Speed (m/s)", min_value=1.0, max_value=20.0, value=default_wind_speed, step=0.5)
             
             with col2:
                 stability_class = st.selectbox(
                     "Atmospheric Stability Class",
                     options=["A", "B", "C", "D", "E", "F"],
-                    index=3,  # Default to D (neutral)
+                    index=["A", "B", "C", "D", "E", "F"].index(default_stability),
                     help="A: Very unstable, B: Unstable, C: Slightly unstable, D: Neutral, E: Stable, F: Very stable"
                 )
             
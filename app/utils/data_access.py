@@ -834,6 +834,118 @@ class SIFDAO:
             return [dict(row._mapping) for row in result]
         return []
     
+    @staticmethod
+    def get_all_subsystems() -> List[Dict[str, Any]]:
+        """
+        Get the subsystems of every SIF
+        
+        Returns:
+            List of subsystem dictionaries
+        """
+        db = get_db_manager()
+        result = db.execute_query(text("SELECT * FROM sif_subsystems ORDER BY sif_id, id"))
+        if result:
+            return [dict(row._mapping) for row in result]
+        return []
+    
+    @staticmethod
+    def update_test_intervals(plan: List[Dict[str, Any]]) -> bool:
+        """
+        Store new proof test intervals for many subsystems in one transaction
+        
+        Args:
+            plan: Dictionaries with id, test_interval_months and pfd_per_component
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        db = get_db_manager()
+        session = db.get_session()
+        
+        try:
+            if plan:
+                session.execute(
+                    text("""
+                        UPDATE sif_subsystems
+                        SET test_interval_months = :test_interval_months, pfd_per_component = :pfd_per_component
+                        WHERE id = :id
+                    """),
+                    [{"id": int(row["id"]),
+                      "test_interval_months": int(round(row["test_interval_months"])),
+                      "pfd_per_component": float(row["pfd_per_component"])} for row in plan]
+                )
+            session.commit()
+            return True
+        except Exception as e:
+            session.rollback()
+            print(f"Error updating proof test intervals: {e}")
+            return False
+        finally:
+            db.close_session(session)
+    
+    @staticmethod
+    def get_verification_frame() -> pd.DataFrame:
+        """
+        Get every SIF joined with its subsystems in one query
+        
+        The demand_rate of a SIF is the total initiating event frequency
+        (per year) of the LOPA scenarios of its HAZOP scenario.
+        
+        Returns:
+            DataFrame with one row per subsystem (id is the subsystem id) and
+            one row with a missing id for each SIF without subsystems
+        """
+        db = get_db_manager()
+        result = db.execute_query(text("""
+            SELECT s.id AS sif_id, s.name AS sif_name, s.required_sil, s.verification_status,
+                   d.demand_rate,
+                   ss.id, ss.name, ss.architecture, ss.pfd_per_component, ss.beta,
+                   ss.test_interval_months, ss.dc, ss.mttr_hours, ss.subsystem_type, ss.lambda_s,
+                   ss.reliability_data_id, ss.proof_test_coverage, ss.pst_interval_months,
+                   ss.pst_coverage, ss.mission_time_years, ss.element_type
+            FROM sifs s
+            LEFT JOIN sif_subsystems ss ON ss.sif_id = s.id
+            LEFT JOIN (
+                SELECT scenario_id, SUM(initiating_event_frequency) AS demand_rate
+                FROM lopa_scenarios
+                GROUP BY scenario_id
+            ) d ON d.scenario_id = s.scenario_id
+            ORDER BY s.id, ss.id
+        """))
+        if result:
+            return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+        return pd.DataFrame()
+    
+    @staticmethod
+    def update_verification_status(statuses: List[Dict[str, Any]]) -> bool:
+        """
+        Store the verification status of many SIFs in one transaction
+        
+        Args:
+            statuses: Dictionaries with sif_id and verification_status
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        db = get_db_manager()
+        session = db.get_session()
+        
+        try:
+            if statuses:
+                session.execute(
+                    text("UPDATE sifs SET verification_status = :verification_status WHERE id = :id"),
+                    [{"id": int(row["sif_id"]), "verification_status": str(row["verification_status"])}
+                     for row in statuses]
+                )
+            session.commit()
+            return True
+        except Exception as e:
+            session.rollback()
+            print(f"Error updating SIF verification status: {e}")
+            return False
+        finally:
+            db.close_session(session)
+    
     @staticmethod
     def add_or_update_subsystem(subsystem_data: Dict[str, Any]) -> bool:
         """
@@ -1090,4 +1202,650 @@ class LOPAScenarioDAO:
             data = [dict(row._mapping) for row in result]
             return pd.DataFrame(data)
         
-        return pd.DataFrame() 
\ No newline at end of file
+        return pd.DataFrame() 
+    
+    @staticmethod
+    def get_portfolio_frames() -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Get all LOPA scenarios and their IPLs as columnar frames for batch evaluation
+        
+        Returns:
+            Tuple of (scenarios DataFrame, IPLs DataFrame)
+        """
+        db = get_db_manager()
+        
+        scenario_result = db.execute_query(text("""
+            SELECT id, scenario_id, initiating_event_frequency,
+                   target_mitigated_frequency, conditional_modifiers, initiating_event_tag
+            FROM lopa_scenarios
+            ORDER BY id
+        """))
+        ipl_result = db.execute_query(text("""
+            SELECT i.id, i.lopa_scenario_id, i.name, i.ipl_type, i.pfd, i.is_enabled,
+                   i.equipment_tag, i.sensor_tag
+            FROM ipls i
+            JOIN lopa_scenarios l ON l.id = i.lopa_scenario_id
+            ORDER BY i.lopa_scenario_id, i.id
+        """))
+        
+        scenarios = pd.DataFrame(
+            scenario_result.fetchall() if scenario_result else [],
+            columns=["id", "scenario_id", "initiating_event_frequency",
+                     "target_mitigated_frequency", "conditional_modifiers", "initiating_event_tag"]
+        )
+        ipls = pd.DataFrame(
+            ipl_result.fetchall() if ipl_result else [],
+            columns=["id", "lopa_scenario_id", "name", "ipl_type", "pfd", "is_enabled",
+                     "equipment_tag", "sensor_tag"]
+        )
+        return scenarios, ipls
+    
+    @staticmethod
+    def save_lopa_results(results: pd.DataFrame, ipl_updates: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """
+        Write IPL changes and recomputed LOPA results back in one transaction
+        
+        Args:
+            results: DataFrame with id, mitigated_frequency and meets_target columns
+            ipl_updates: Optional IPL dictionaries with id and the changed fields
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        db = get_db_manager()
+        session = db.get_session()
+        
+        try:
+            if ipl_updates:
+                set_clause = ", ".join(f"{key} = :{key}" for key in ipl_updates[0] if key != 'id')
+                session.execute(text(f"UPDATE ipls SET {set_clause} WHERE id = :id"), ipl_updates)
+            
+            if len(results) > 0:
+                session.execute(
+                    text("""
+                        UPDATE lopa_scenarios
+                        SET mitigated_frequency = :mitigated_frequency, meets_target = :meets_target
+                        WHERE id = :id
+                    """),
+                    [
+                        {"id": int(i), "mitigated_frequency": float(f), "meets_target": int(bool(m))}
+                        for i, f, m in zip(results["id"], results["mitigated_frequency"], results["meets_target"])
+                    ]
+                )
+            session.commit()
+            return True
+        except Exception as e:
+            if session:
+                session.rollback()
+            print(f"Error saving LOPA results: {e}")
+            return False
+        finally:
+            db.close_session(session)
+
+    @staticmethod
+    def get_worksheet_frames() -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Get all LOPA scenarios and their IPLs with every stored column for worksheet export
+        
+        Returns:
+            Tuple of (scenarios DataFrame, IPLs DataFrame)
+        """
+        db = get_db_manager()
+        
+        frames = []
+        for query in ("SELECT * FROM lopa_scenarios ORDER BY id",
+                      "SELECT * FROM ipls WHERE lopa_scenario_id IS NOT NULL ORDER BY lopa_scenario_id, id"):
+            result = db.execute_query(text(query))
+            frames.append(pd.DataFrame(result.fetchall(), columns=list(result.keys())) if result else pd.DataFrame())
+        return frames[0], frames[1]
+    
+    @staticmethod
+    def import_worksheet(scenarios: pd.DataFrame, ipls: pd.DataFrame, batch_size: int = 5000) -> bool:
+        """
+        Upsert LOPA scenarios and IPLs read from a worksheet in one transaction
+        
+        Scenarios are matched on case_no, or on their id for scenarios stored
+        without a case number. IPLs are matched within their scenario on name,
+        in order of appearance when a name repeats; unmatched rows are added
+        and existing IPLs missing from the worksheet are kept.
+        
+        Args:
+            scenarios: DataFrame with case_no and lopa_scenarios columns
+            ipls: DataFrame with case_no and ipls columns
+            batch_size: Number of rows sent per executemany call
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        def records(frame):
+            frame = frame.astype(object)
+            return frame.where(frame.notna(), None).to_dict("records")
+        
+        def execute_batches(session, statement, rows):
+            for start in range(0, len(rows), batch_size):
+                session.execute(statement, rows[start:start + batch_size])
+        
+        db = get_db_manager()
+        session = db.get_session()
+        
+        try:
+            existing = pd.DataFrame(
+                session.execute(text("SELECT id, COALESCE(case_no, CAST(id AS TEXT)) FROM lopa_scenarios")).fetchall(),
+                columns=["id", "case_no"]
+            )
+            matched = scenarios["case_no"].isin(existing["case_no"])
+            columns = [c for c in scenarios.columns if c != "id"]
+            
+            if matched.any():
+                updates = scenarios.loc[matched, columns].merge(existing, on="case_no", how="left")
+                set_clause = ", ".join(f"{c} = :{c}" for c in columns)
+                execute_batches(session, text(f"UPDATE lopa_scenarios SET {set_clause} WHERE id = :id"), records(updates))
+            if (~matched).any():
+                execute_batches(
+                    session,
+                    text(f"INSERT INTO lopa_scenarios ({', '.join(columns)}) VALUES ({', '.join(':' + c for c in columns)})"),
+                    records(scenarios.loc[~matched, columns])
+                )
+            
+            if len(ipls):
+                scenario_ids = dict(session.execute(
+                    text("SELECT case_no, id FROM lopa_scenarios WHERE case_no IS NOT NULL")
+                ).fetchall())
+                ipls = ipls.assign(lopa_scenario_id=ipls["case_no"].map(scenario_ids)).dropna(subset=["lopa_scenario_id"])
+                ipls = ipls.drop(columns=["case_no"]).astype({"lopa_scenario_id": int})
+                
+                # Pair repeated names in order of appearance on both sides
+                stored = pd.DataFrame(
+                    session.execute(text("SELECT id, lopa_scenario_id, name FROM ipls WHERE lopa_scenario_id IS NOT NULL")).fetchall(),
+                    columns=["id", "lopa_scenario_id", "name"]
+                )
+                stored = stored[stored["lopa_scenario_id"].isin(ipls["lopa_scenario_id"])]
+                stored["occurrence"] = stored.groupby(["lopa_scenario_id", "name"]).cumcount()
+                ipls = ipls.assign(occurrence=ipls.groupby(["lopa_scenario_id", "name"]).cumcount())
+                ipls = ipls.merge(stored, on=["lopa_scenario_id", "name", "occurrence"], how="left").drop(columns=["occurrence"])
+                
+                columns = [c for c in ipls.columns if c != "id"]
+                known = ipls["id"].notna()
+                if known.any():
+                    set_clause = ", ".join(f"{c} = :{c}" for c in columns)
+                    execute_batches(
+                        session, text(f"UPDATE ipls SET {set_clause} WHERE id = :id"),
+                        records(ipls.loc[known].astype({"id": int}))
+                    )
+                if (~known).any():
+                    execute_batches(
+                        session,
+                        text(f"INSERT INTO ipls ({', '.join(columns)}) VALUES ({', '.join(':' + c for c in columns)})"),
+                        records(ipls.loc[~known, columns])
+                    )
+            
+            session.commit()
+            return True
+        except Exception as e:
+            if session:
+                session.rollback()
+            print(f"Error importing LOPA worksheet: {e}")
+            return False
+        finally:
+            db.close_session(session)
+
+
+# Frequency tables are small and read far more often than written, so keep
+# them per database and site for the life of the process
+_met_frequency_cache: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+
+
+class MetDataDAO:
+    """Data Access Object for site meteorological frequency tables"""
+    
+    @staticmethod
+    def get_sites() -> List[str]:
+        """
+        Get all sites with a stored frequency table
+        
+        Returns:
+            List of site names
+        """
+        db = get_db_manager()
+        result = db.execute_query(text("SELECT DISTINCT site FROM met_frequencies ORDER BY site"))
+        if result:
+            return [row._mapping['site'] for row in result]
+        return []
+    
+    @staticmethod
+    def get_frequency_records(site: str) -> List[Dict[str, Any]]:
+        """
+        Get the frequency table records for a site
+        
+        Args:
+            site: Site name
+        
+        Returns:
+            List of frequency record dictionaries
+        """
+        db = get_db_manager()
+        if (db.db_path, site) in _met_frequency_cache:
+            return _met_frequency_cache[(db.db_path, site)]
+        
+        result = db.execute_query(
+            text("""
+                SELECT site, wind_speed_bin, wind_speed_ms, stability_class,
+                       direction_sector, n_sectors, hours, frequency
+                FROM met_frequencies
+                WHERE site = :site
+                ORDER BY wind_speed_bin, stability_class, direction_sector
+            """),
+            {"site": site}
+        )
+        if not result:
+            return []
+        
+        records = [dict(row._mapping) for row in result]
+        _met_frequency_cache[(db.db_path, site)] = records
+        return records
+    
+    @staticmethod
+    def save_frequency_records(site: str, records: List[Dict[str, Any]]) -> bool:
+        """
+        Replace the frequency table for a site
+        
+        Args:
+            site: Site name
+            records: Frequency record dictionaries
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        db = get_db_manager()
+        session = db.get_session()
+        
+        try:
+            session.execute(text("DELETE FROM met_frequencies WHERE site = :site"), {"site": site})
+            if records:
+                session.execute(
+                    text("""
+                        INSERT INTO met_frequencies (site, wind_speed_bin, wind_speed_ms, stability_class,
+                                                     direction_sector, n_sectors, hours, frequency)
+                        VALUES (:site, :wind_speed_bin, :wind_speed_ms, :stability_class,
+                                :direction_sector, :n_sectors, :hours, :frequency)
+                    """),
+                    [{**record, "site": site} for record in records]
+                )
+            session.commit()
+            _met_frequency_cache.pop((db.db_path, site), None)
+            return True
+        except Exception as e:
+            if session:
+                session.rollback()
+            print(f"Error saving met frequency table: {e}")
+            return False
+        finally:
+            db.close_session(session)
+    
+    @staticmethod
+    def delete_site(site: str) -> bool:
+        """
+        Delete the frequency table for a site
+        
+        Args:
+            site: Site name
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        db = get_db_manager()
+        try:
+            db.execute_query(text("DELETE FROM met_frequencies WHERE site = :site"), {"site": site})
+            _met_frequency_cache.pop((db.db_path, site), None)
+            return True
+        except Exception as e:
+            print(f"Error deleting met frequency table: {e}")
+            return False
+
+
+# The reliability data library is read by every verification and changed only
+# by imports, so keep it per database for the life of the process
+_reliability_data_cache: Dict[str, pd.DataFrame] = {}
+
+
+class ReliabilityDataDAO:
+    """Data Access Object for the component reliability data library"""
+    
+    @staticmethod
+    def get_library_frame() -> pd.DataFrame:
+        """
+        Get every reliability data entry, loaded once per process
+        
+        Returns:
+            DataFrame of library entries (the same object until the library changes)
+        """
+        db = get_db_manager()
+        if db.db_path in _reliability_data_cache:
+            return _reliability_data_cache[db.db_path]
+        
+        result = db.execute_query(
+            text("SELECT * FROM reliability_data ORDER BY manufacturer, model, component_type")
+        )
+        if not result:
+            return pd.DataFrame()
+        
+        entries = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+        _reliability_data_cache[db.db_path] = entries
+        return entries
+    
+    @staticmethod
+    def get_all_entries() -> List[Dict[str, Any]]:
+        """
+        Get all reliability data entries
+        
+        Returns:
+            List of entry dictionaries
+        """
+        return ReliabilityDataDAO.get_library_frame().to_dict("records")
+    
+    @staticmethod
+    def import_entries(entries: List[Dict[str, Any]]) -> bool:
+        """
+        Add or update many entries in one transaction
+        
+        Entries are matched on manufacturer, model and component type, so
+        re-importing a revised data set updates the rates in place and keeps
+        subsystem references valid.
+        
+        Args:
+            entries: Entry dictionaries (e.g. from ReliabilityLibrary.read_csv)
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        columns = ["manufacturer", "model", "component_type", "lambda_du", "lambda_dd",
+                   "lambda_s", "dc", "beta", "source", "notes"]
+        db = get_db_manager()
+        session = db.get_session()
+        
+        try:
+            if entries:
+                session.execute(
+                    text(f"""
+                        INSERT INTO reliability_data ({", ".join(columns)})
+                        VALUES ({", ".join(f":{column}" for column in columns)})
+                        ON CONFLICT (manufacturer, model, component_type) DO UPDATE SET
+                        {", ".join(f"{column} = excluded.{column}" for column in columns[3:])}
+                    """),
+                    [{column: None if pd.isna(entry.get(column)) else entry.get(column) for column in columns}
+                     for entry in entries]
+                )
+            session.commit()
+            _reliability_data_cache.pop(db.db_path, None)
+            return True
+        except Exception as e:
+            session.rollback()
+            print(f"Error importing reliability data: {e}")
+            return False
+        finally:
+            db.close_session(session)
+    
+    @staticmethod
+    def import_from_dataframe(df: pd.DataFrame) -> bool:
+        """
+        Import entries from a normalized DataFrame
+        
+        Args:
+            df: DataFrame of entries
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        return ReliabilityDataDAO.import_entries(df.to_dict("records"))
+    
+    @staticmethod
+    def delete_entry(entry_id: int) -> bool:
+        """
+        Delete a library entry and clear subsystem references to it
+        
+        Args:
+            entry_id: ID of the entry
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        db = get_db_manager()
+        session = db.get_session()
+        
+        try:
+            session.execute(
+                text("UPDATE sif_subsystems SET reliability_data_id = NULL WHERE reliability_data_id = :id"),
+                {"id": entry_id}
+            )
+            session.execute(text("DELETE FROM reliability_data WHERE id = :id"), {"id": entry_id})
+            session.commit()
+            _reliability_data_cache.pop(db.db_path, None)
+            return True
+        except Exception as e:
+            session.rollback()
+            print(f"Error deleting reliability data entry: {e}")
+            return False
+        finally:
+            db.close_session(session)
+
+
+class BowTieDAO:
+    """Data Access Object for bow-tie graphs and their shared barriers"""
+    
+    @staticmethod
+    def get_all_bowties() -> List[Dict[str, Any]]:
+        """
+        Get all bow-ties from the database
+        
+        Returns:
+            List of bow-tie dictionaries
+        """
+        db = get_db_manager()
+        result = db.execute_query(text("SELECT * FROM bowties ORDER BY id"))
+        if result:
+            return [dict(row._mapping) for row in result]
+        return []
+    
+    @staticmethod
+    def get_all_barriers() -> List[Dict[str, Any]]:
+        """
+        Get all barriers from the database
+        
+        Returns:
+            List of barrier dictionaries
+        """
+        db = get_db_manager()
+        result = db.execute_query(text("SELECT * FROM barriers ORDER BY name"))
+        if result:
+            return [dict(row._mapping) for row in result]
+        return []
+    
+    @staticmethod
+    def add_or_update_barrier(barrier_data: Dict[str, Any]) -> bool:
+        """
+        Add or update a barrier in the database
+        
+        Args:
+            barrier_data: Dictionary containing barrier data
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        db = get_db_manager()
+        barrier_id = barrier_data.get('id')
+        
+        try:
+            if barrier_id:
+                update_data = {k: v for k, v in barrier_data.items() if k != 'id'}
+                set_clause = ", ".join(f"{key} = :{key}" for key in update_data)
+                db.execute_query(
+                    text(f"UPDATE barriers SET {set_clause} WHERE id = :id"),
+                    {**update_data, "id": barrier_id}
+                )
+            else:
+                columns = ", ".join(barrier_data.keys())
+                placeholders = ", ".join(f":{key}" for key in barrier_data.keys())
+                db.execute_query(
+                    text(f"INSERT INTO barriers ({columns}) VALUES ({placeholders})"),
+                    barrier_data
+                )
+            return True
+        except Exception as e:
+            print(f"Error adding/updating barrier: {e}")
+            return False
+    
+    @staticmethod
+    def update_barriers(updates: List[Dict[str, Any]]) -> bool:
+        """
+        Write changes to several barriers in one transaction
+        
+        Args:
+            updates: Barrier dictionaries with id and the changed fields,
+                all with the same keys
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not updates:
+            return True
+        
+        db = get_db_manager()
+        session = db.get_session()
+        
+        try:
+            set_clause = ", ".join(f"{key} = :{key}" for key in updates[0] if key != 'id')
+            session.execute(text(f"UPDATE barriers SET {set_clause} WHERE id = :id"), updates)
+            session.commit()
+            return True
+        except Exception as e:
+            if session:
+                session.rollback()
+            print(f"Error updating barriers: {e}")
+            return False
+        finally:
+            db.close_session(session)
+    
+    @staticmethod
+    def save_bowtie(
+        bowtie_data: Dict[str, Any],
+        nodes: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]]
+    ) -> Optional[int]:
+        """
+        Save a bow-tie and replace its graph in one transaction
+        
+        Args:
+            bowtie_data: Bow-tie dictionary, with id to update an existing one
+            nodes: Node dictionaries with a ``key`` unique within the bow-tie
+            edges: Edge dictionaries referencing node keys through ``source``
+                and ``target``, optionally with ``probability``
+        
+        Returns:
+            ID of the bow-tie, or None if saving failed
+        """
+        db = get_db_manager()
+        session = db.get_session()
+        
+        try:
+            bowtie_id = bowtie_data.get('id')
+            fields = {k: v for k, v in bowtie_data.items() if k != 'id'}
+            if bowtie_id:
+                if fields:
+                    set_clause = ", ".join(f"{key} = :{key}" for key in fields)
+                    session.execute(text(f"UPDATE bowties SET {set_clause} WHERE id = :id"), {**fields, "id": bowtie_id})
+                session.execute(text("DELETE FROM bowtie_edges WHERE bowtie_id = :id"), {"id": bowtie_id})
+                session.execute(text("DELETE FROM bowtie_nodes WHERE bowtie_id = :id"), {"id": bowtie_id})
+            else:
+                columns = ", ".join(fields.keys())
+                placeholders = ", ".join(f":{key}" for key in fields.keys())
+                result = session.execute(text(f"INSERT INTO bowties ({columns}) VALUES ({placeholders})"), fields)
+                bowtie_id = result.lastrowid
+            
+            # Nodes are inserted one at a time to learn the ids the edges refer to
+            node_ids = {}
+            for node in nodes:
+                row = {k: v for k, v in node.items() if k != 'key'}
+                row["bowtie_id"] = bowtie_id
+                columns = ", ".join(row.keys())
+                placeholders = ", ".join(f":{key}" for key in row.keys())
+                result = session.execute(text(f"INSERT INTO bowtie_nodes ({columns}) VALUES ({placeholders})"), row)
+                node_ids[node["key"]] = result.lastrowid
+            
+            if edges:
+                session.execute(
+                    text("""
+                        INSERT INTO bowtie_edges (bowtie_id, source_id, target_id, probability)
+                        VALUES (:bowtie_id, :source_id, :target_id, :probability)
+                    """),
+                    [
+                        {
+                            "bowtie_id": bowtie_id,
+                            "source_id": node_ids[edge["source"]],
+                            "target_id": node_ids[edge["target"]],
+                            "probability": edge.get("probability", 1.0)
+                        }
+                        for edge in edges
+                    ]
+                )
+            
+            session.commit()
+            return bowtie_id
+        except Exception as e:
+            if session:
+                session.rollback()
+            print(f"Error saving bow-tie: {e}")
+            return None
+        finally:
+            db.close_session(session)
+    
+    @staticmethod
+    def delete_bowtie(bowtie_id: int) -> bool:
+        """
+        Delete a bow-tie with its nodes and edges; shared barriers are kept
+        
+        Args:
+            bowtie_id: ID of the bow-tie
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        db = get_db_manager()
+        session = db.get_session()
+        
+        try:
+            for table in ("bowtie_edges", "bowtie_nodes"):
+                session.execute(text(f"DELETE FROM {table} WHERE bowtie_id = :id"), {"id": bowtie_id})
+            session.execute(text("DELETE FROM bowties WHERE id = :id"), {"id": bowtie_id})
+            session.commit()
+            return True
+        except Exception as e:
+            if session:
+                session.rollback()
+            print(f"Error deleting bow-tie: {e}")
+            return False
+        finally:
+            db.close_session(session)
+    
+    @staticmethod
+    def get_model_frames() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        Get every bow-tie node, edge and barrier as columnar frames for evaluation
+        
+        Returns:
+            Tuple of (nodes DataFrame, edges DataFrame, barriers DataFrame)
+        """
+        db = get_db_manager()
+        
+        queries = [
+            ("SELECT id, bowtie_id, node_type, name, frequency, barrier_id, target_frequency FROM bowtie_nodes ORDER BY id",
+             ["id", "bowtie_id", "node_type", "name", "frequency", "barrier_id", "target_frequency"]),
+            ("SELECT id, bowtie_id, source_id, target_id, probability FROM bowtie_edges ORDER BY id",
+             ["id", "bowtie_id", "source_id", "target_id", "probability"]),
+            ("SELECT id, name, barrier_type, pfd, is_enabled FROM barriers ORDER BY id",
+             ["id", "name", "barrier_type", "pfd", "is_enabled"]),
+        ]
+        frames = []
+        for query, columns in queries:
+            result = db.execute_query(text(query))
+            frames.append(pd.DataFrame(result.fetchall() if result else [], columns=columns))
+        return frames[0], frames[1], frames[2]
@@ -17,9 +17,25 @@ if str(parent_dir) not in sys.path:
     sys.path.insert(0, str(parent_dir))
 
 from utils.database import get_db_manager
+from core.pfdavg import DEFAULT_MISSION_TIME_YEARS
 from sqlalchemy import text
 
 
+def add_missing_columns(session, table: str, columns: dict):
+    """
+    Add columns to an existing table if they are not already present
+    
+    Args:
+        session: Database session
+        table: Table name
+        columns: Dictionary of {column name: SQL type}
+    """
+    existing = {row[1] for row in session.execute(text(f"PRAGMA table_info({table})"))}
+    for name, sql_type in columns.items():
+        if name not in existing:
+            session.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {sql_type}"))
+
+
 def init_database():
     """Initialize database schema and load sample data"""
     db = get_db_manager()
@@ -93,6 +109,10 @@ def init_database():
                 target_mitigated_frequency REAL,
                 conditional_modifiers TEXT,
                 notes TEXT,
+                mitigated_frequency REAL,
+                meets_target INTEGER,
+                initiating_event_tag TEXT,
+                case_no TEXT,
                 FOREIGN KEY (scenario_id) REFERENCES scenarios (id)
             )
         """))
@@ -110,10 +130,30 @@ def init_database():
                 pfd REAL,
                 is_enabled INTEGER,
                 sil INTEGER,
+                equipment_tag TEXT,
+                sensor_tag TEXT,
                 FOREIGN KEY (scenario_id) REFERENCES scenarios (id),
                 FOREIGN KEY (lopa_scenario_id) REFERENCES lopa_scenarios (id)
             )
         """))
+        session.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_ipls_lopa_scenario ON ipls (lopa_scenario_id)"
+        ))
+        
+        # Add columns introduced after the first release to existing databases
+        add_missing_columns(session, "lopa_scenarios", {
+            "mitigated_frequency": "REAL",
+            "meets_target": "INTEGER",
+            "initiating_event_tag": "TEXT",
+            "case_no": "TEXT"
+        })
+        add_missing_columns(session, "ipls", {
+            "equipment_tag": "TEXT",
+            "sensor_tag": "TEXT"
+        })
+        session.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_lopa_scenarios_case_no ON lopa_scenarios (case_no)"
+        ))
         
         # Create sifs table for safety instrumented functions
         session.execute(text("""
@@ -134,7 +174,7 @@ def init_database():
         """))
         
         # Create sif_subsystems table
-        session.execute(text("""
+        session.execute(text(f"""
             CREATE TABLE IF NOT EXISTS sif_subsystems (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 sif_id INTEGER,
@@ -146,9 +186,122 @@ def init_database():
                 dc REAL,
                 mttr_hours REAL,
                 subsystem_type TEXT,
-                FOREIGN KEY (sif_id) REFERENCES sifs (id)
+                lambda_s REAL,
+                component_tags TEXT,
+                reliability_data_id INTEGER,
+                proof_test_coverage REAL DEFAULT 1.0,
+                pst_interval_months REAL,
+                pst_coverage REAL DEFAULT 0.0,
+                mission_time_years REAL DEFAULT {DEFAULT_MISSION_TIME_YEARS},
+                element_type TEXT,
+                FOREIGN KEY (sif_id) REFERENCES sifs (id),
+                FOREIGN KEY (reliability_data_id) REFERENCES reliability_data (id)
+            )
+        """))
+        add_missing_columns(session, "sif_subsystems", {
+            "lambda_s": "REAL",
+            "component_tags": "TEXT",
+            "reliability_data_id": "INTEGER",
+            "proof_test_coverage": "REAL DEFAULT 1.0",
+            "pst_interval_months": "REAL",
+            "pst_coverage": "REAL DEFAULT 0.0",
+            "mission_time_years": f"REAL DEFAULT {DEFAULT_MISSION_TIME_YEARS}",
+            "element_type": "TEXT"
+        })
+        
+        # Create reliability_data table, the component failure rate library
+        session.execute(text("""
+            CREATE TABLE IF NOT EXISTS reliability_data (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                manufacturer TEXT COLLATE NOCASE,
+                model TEXT COLLATE NOCASE,
+                component_type TEXT COLLATE NOCASE,
+                lambda_du REAL,
+                lambda_dd REAL,
+                lambda_s REAL,
+                dc REAL,
+                beta REAL,
+                source TEXT,
+                notes TEXT,
+                UNIQUE (manufacturer, model, component_type)
+            )
+        """))
+        
+        # Create met_frequencies table for site wind/stability frequency tables
+        session.execute(text("""
+            CREATE TABLE IF NOT EXISTS met_frequencies (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                site TEXT,
+                wind_speed_bin INTEGER,
+                wind_speed_ms REAL,
+                stability_class TEXT,
+                direction_sector INTEGER,
+                n_sectors INTEGER,
+                hours REAL,
+                frequency REAL
+            )
+        """))
+        session.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_met_frequencies_site ON met_frequencies (site)"
+        ))
+        
+        # Create bow-tie tables; barriers are shared between bow-ties
+        session.execute(text("""
+            CREATE TABLE IF NOT EXISTS bowties (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                description TEXT,
+                hazard TEXT,
+                scenario_id INTEGER,
+                FOREIGN KEY (scenario_id) REFERENCES scenarios (id)
+            )
+        """))
+        session.execute(text("""
+            CREATE TABLE IF NOT EXISTS barriers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                description TEXT,
+                barrier_type TEXT,
+                pfd REAL,
+                is_enabled INTEGER,
+                ipl_id INTEGER,
+                FOREIGN KEY (ipl_id) REFERENCES ipls (id)
+            )
+        """))
+        session.execute(text("""
+            CREATE TABLE IF NOT EXISTS bowtie_nodes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                bowtie_id INTEGER,
+                node_type TEXT,
+                name TEXT,
+                frequency REAL,
+                barrier_id INTEGER,
+                target_frequency REAL,
+                FOREIGN KEY (bowtie_id) REFERENCES bowties (id),
+                FOREIGN KEY (barrier_id) REFERENCES barriers (id)
+            )
+        """))
+        session.execute(text("""
+            CREATE TABLE IF NOT EXISTS bowtie_edges (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                bowtie_id INTEGER,
+                source_id INTEGER,
+                target_id INTEGER,
+                probability REAL,
+                FOREIGN KEY (bowtie_id) REFERENCES bowties (id),
+                FOREIGN KEY (source_id) REFERENCES bowtie_nodes (id),
+                FOREIGN KEY (target_id) REFERENCES bowtie_nodes (id)
             )
         """))
+        session.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_bowtie_nodes_bowtie ON bowtie_nodes (bowtie_id)"
+        ))
+        session.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_bowtie_nodes_barrier ON bowtie_nodes (barrier_id)"
+        ))
+        session.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_bowtie_edges_bowtie ON bowtie_edges (bowtie_id)"
+        ))
         
         session.commit()
         print("Database schema created successfully")
@@ -3,6 +3,7 @@ import sys
 import os
 from pathlib import Path
 from unittest.mock import MagicMock, patch
+import numpy as np
 import pandas as pd
 
 # Add the app directory to the path for imports
@@ -83,6 +84,61 @@ def mock_db_session():
     return mock_session
 
 
+@pytest.fixture
+def temp_db_manager(tmp_path):
+    """Fixture providing a database manager on a temporary SQLite file with the full schema"""
+    from app.utils.database import DatabaseManager
+    from app.utils.init_db import init_database
+    
+    db = DatabaseManager(str(tmp_path / "test_hazop.db"))
+    with patch('app.utils.init_db.get_db_manager', return_value=db), \
+            patch('app.utils.init_db.load_sample_data'):
+        init_database()
+    
+    with patch('app.utils.data_access.get_db_manager', return_value=db):
+        yield db
+    
+    db.engine.dispose()
+
+
+@pytest.fixture
+def sif_site():
+    """Fixture providing a factory of random sites with a sensor, logic solver and final element per SIF"""
+    def make_site(n_sifs, seed=0, architectures=("1oo1", "1oo2", "2oo3"), pfd_range=(0.001, 0.05), **columns):
+        """
+        Random sif_subsystems frame joined with the required SIL of each SIF
+        
+        Args:
+            n_sifs: Number of SIFs, numbered from 1
+            seed: Random seed
+            architectures: Voting architectures drawn for the subsystems
+            pfd_range: Range of the single channel PFDs
+            **columns: Column values replacing the defaults
+        
+        Returns:
+            DataFrame with three subsystems per SIF
+        """
+        rng = np.random.default_rng(seed)
+        count = 3 * n_sifs
+        subsystem_types = np.tile(["Sensor", "Logic", "Final Element"], n_sifs)
+        site = pd.DataFrame({
+            "id": np.arange(1, count + 1),
+            "sif_id": np.repeat(np.arange(1, n_sifs + 1), 3),
+            "required_sil": np.repeat(rng.integers(1, 4, n_sifs), 3),
+            "name": subsystem_types,
+            "subsystem_type": subsystem_types,
+            "architecture": rng.choice(architectures, count),
+            "pfd_per_component": rng.uniform(*pfd_range, count),
+            "beta": 0.1,
+            "test_interval_months": 12,
+            "dc": 0.0,
+            "mttr_hours": 8.0,
+        })
+        return site.assign(**columns)
+    
+    return make_site
+
+
 # Set up test environment variables
 def pytest_configure(config):
     """Configure pytest environment"""
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the architectural constraints module
+"""
+import sys
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.architectural_constraints import (
+    ArchitecturalConstraints, safe_failure_fraction, ROUTE_2H
+)
+from app.core.sif_verification import SIFBatchVerifier
+from app.core.pfdavg import PFDAvg
+from app.utils.data_access import SIFDAO
+
+
+class TestArchitecturalConstraints:
+    """Test cases for the ArchitecturalConstraints class"""
+    
+    def test_route_tables(self):
+        """Route 1H follows the SFF / HFT tables and Route 2H the minimum HFT"""
+        assert safe_failure_fraction(1e-6, 2e-6, 1e-6)[()] == pytest.approx(0.75)
+        assert safe_failure_fraction(0.0, 0.0, 0.0)[()] == 1.0
+        
+        sff = [0.5, 0.6, 0.95, 0.995]
+        assert list(ArchitecturalConstraints.route_1h(0, sff, "B")) == [0, 1, 2, 3]
+        assert list(ArchitecturalConstraints.route_1h(1, sff, "B")) == [1, 2, 3, 4]
+        assert list(ArchitecturalConstraints.route_1h(0, sff, "A")) == [1, 2, 3, 3]
+        assert list(ArchitecturalConstraints.route_1h(3, sff, "A")) == [3, 4, 4, 4]
+        with pytest.raises(ValueError):
+            ArchitecturalConstraints.route_1h(0, 0.5, "C")
+        
+        assert list(ArchitecturalConstraints.route_2h([0, 1, 2], False)) == [2, 3, 4]
+        assert list(ArchitecturalConstraints.route_2h([0, 1, 2], True)) == [1, 3, 4]
+    
+    def test_evaluate_subsystems(self):
+        """HFT comes from the vote, SFF from recorded rates and types from the subsystem type"""
+        subsystems = pd.DataFrame({
+            "sif_id": [1, 1, 1, 2],
+            "architecture": ["2oo3", "1oo1", "1oo1", "1oo1"],
+            "pfd_per_component": [0.01, 0.001, 0.02, 0.01],
+            "test_interval_months": [12, 12, 12, 12],
+            "lambda_du": [1e-7, 1e-8, 2e-6, 1e-6],
+            "lambda_dd": [4e-7, 1e-6, 0.0, 0.0],
+            "lambda_s": [5e-7, 1e-6, 1e-6, None],
+            "subsystem_type": ["Sensor", "Logic", "Final Element", "Final Element"],
+            "element_type": [None, None, None, "b"],
+        })
+        evaluated = ArchitecturalConstraints.evaluate_subsystems(subsystems)
+        assert list(evaluated["hft"]) == [1, 0, 0, 0]
+        assert evaluated["sff"].to_numpy()[:3] == pytest.approx([0.9, 2e-6 / 2.01e-6, 1 / 3])
+        assert list(evaluated["element_type"]) == ["B", "B", "A", "B"]
+        assert list(evaluated["sil_ceiling"][:3]) == [3, 3, 1]
+        assert np.isnan(evaluated.loc[3, "sil_ceiling"])
+        
+        route_2h = ArchitecturalConstraints.evaluate_subsystems(subsystems.assign(demand_rate=[0.1] * 3 + [5.0]),
+                                                               ROUTE_2H)
+        assert list(route_2h["sil_ceiling"]) == [3, 2, 2, 1]
+        with pytest.raises(ValueError):
+            ArchitecturalConstraints.evaluate_subsystems(subsystems, "3H")
+    
+    def test_evaluate_sifs(self):
+        """The lowest subsystem ceiling caps the PFD based SIL"""
+        subsystems = pd.DataFrame({
+            "sif_id": [1, 1, 2, 3],
+            "architecture": ["1oo2", "1oo1", "1oo1", "1oo1"],
+            "pfd_per_component": [0.001, 0.0005, 0.0005, 0.0005],
+            "test_interval_months": [12, 12, 12, 12],
+            "lambda_s": [1e-6, 1e-9, 1e-9, None],
+            "subsystem_type": ["Sensor", "Logic", "Final Element", "Logic"],
+        })
+        sifs = pd.DataFrame({"id": [1, 2, 3], "required_sil": [2, 2, 2]})
+        results = ArchitecturalConstraints.evaluate_sifs(subsystems, sifs)
+        expected = PFDAvg.evaluate_sifs(subsystems, sifs)
+        assert list(results["probabilistic_sil"]) == list(expected["achieved_sil"]) == [3, 3, 3]
+        # SFF of about 0 leaves the 1oo1 type B logic solver without a SIL claim
+        assert list(results["architectural_sil"][:2]) == [0, 1]
+        assert np.isnan(results.loc[2, "architectural_sil"])
+        assert list(results["unassessed_count"]) == [0, 0, 1]
+        assert list(results["achieved_sil"]) == [0, 1, 3]
+        assert list(results["meets_sil"]) == [False, False, True]
+
+
+class TestConstrainedVerification:
+    """Tests for the architectural constraints in batch verification"""
+    
+    def test_site_report(self, sif_site):
+        """The compliance report of a whole site is built in one pass"""
+        rng = np.random.default_rng(2)
+        count = 3000
+        subsystems = sif_site(count, seed=2, pfd_range=(0.0001, 0.01), required_sil=1,
+                              dc=rng.uniform(0, 0.99, 3 * count), lambda_s=rng.uniform(0, 1e-6, 3 * count))
+        report = SIFBatchVerifier.compliance_report(subsystems)
+        assert len(report) == 3 * count
+        
+        results = SIFBatchVerifier.verify(subsystems).set_index("sif_id")
+        lowest = report.groupby("sif_id")["sil_ceiling"].min()
+        assert (results["architectural_sil"] == lowest).all()
+        assert (results["achieved_sil"] == np.minimum(results["probabilistic_sil"], lowest)).all()
+        assert (results["meets_sil"] == (results["verification_status"] == "Verified")).all()
+    
+    def test_stored_element_type(self, temp_db_manager):
+        """Element types are stored with the subsystems and invalid ones are flagged"""
+        assert SIFDAO.add_or_update_sif({"name": "PAHH-101", "required_sil": 1})
+        sif_id = SIFDAO.get_all_sifs()[0]["id"]
+        subsystem = {
+            "sif_id": sif_id, "name": "XV-101", "architecture": "1oo1", "pfd_per_component": 0.001,
+            "beta": 0.1, "test_interval_months": 12, "dc": 0.0, "mttr_hours": 8.0,
+            "subsystem_type": "Final Element", "lambda_s": 1e-7,
+        }
+        assert SIFDAO.add_or_update_subsystem(subsystem)
+        results = SIFBatchVerifier.verify(SIFDAO.get_verification_frame())
+        assert results.loc[0, "architectural_sil"] == 1
+        assert results.loc[0, "verification_status"] == "Verified"
+        
+        subsystem_id = SIFDAO.get_all_subsystems()[0]["id"]
+        assert SIFDAO.add_or_update_subsystem({"id": subsystem_id, "element_type": "B"})
+        results = SIFBatchVerifier.verify(SIFDAO.get_verification_frame())
+        assert results.loc[0, "architectural_sil"] == 0
+        assert results.loc[0, "verification_status"] == "Failed"
+        assert SIFBatchVerifier.verify(SIFDAO.get_verification_frame(), route=ROUTE_2H).loc[0, "meets_sil"]
+        
+        assert SIFDAO.add_or_update_subsystem({"id": subsystem_id, "element_type": "C"})
+        results = SIFBatchVerifier.verify(SIFDAO.get_verification_frame())
+        assert results.loc[0, "verification_status"] == "Invalid Data"
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the bow-tie module
+"""
+import sys
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.bowtie import BowTieModel, build_bowtie_graph, TOP_EVENT, OUTCOME
+from app.utils.data_access import BowTieDAO
+
+
+def _records(bowtie_id, nodes, edges, first_id):
+    """Give graph nodes ids as the database would"""
+    ids = {node["key"]: first_id + i for i, node in enumerate(nodes)}
+    node_rows = [dict({k: v for k, v in node.items() if k != "key"}, id=ids[node["key"]], bowtie_id=bowtie_id)
+                 for node in nodes]
+    edge_rows = [{"source_id": ids[e["source"]], "target_id": ids[e["target"]], "probability": e["probability"]}
+                 for e in edges]
+    return node_rows, edge_rows
+
+
+def _study(n_bowties=2):
+    barriers = [
+        {"id": 1, "name": "BPCS loop", "pfd": 0.1},
+        {"id": 2, "name": "Relief valve", "pfd": 0.01},
+        {"id": 3, "name": "Water curtain", "pfd": 0.5, "is_enabled": True},
+    ]
+    nodes, edges = [], []
+    for bowtie_id in range(1, n_bowties + 1):
+        graph = build_bowtie_graph(
+            "Loss of containment",
+            threats=[
+                {"name": "Control failure", "frequency": 0.1, "barrier_ids": [1, 2]},
+                {"name": "Operator error", "frequency": 0.2 * bowtie_id, "barrier_ids": [2]},
+            ],
+            outcomes=[
+                {"name": "Toxic exposure", "probability": 0.3, "barrier_ids": [3], "target_frequency": 1e-3},
+                {"name": "Fire", "probability": 0.1, "target_frequency": 1e-4},
+            ],
+        )
+        node_rows, edge_rows = _records(bowtie_id, *graph, first_id=100 * bowtie_id)
+        nodes += node_rows
+        edges += edge_rows
+    return nodes, edges, barriers
+
+
+class TestBowTieModel:
+    """Test cases for the BowTieModel class"""
+    
+    def test_propagation(self):
+        """Frequencies flow from threats through barriers to outcomes"""
+        model = BowTieModel.from_records(*_study(1))
+        results = model.evaluate().set_index("name")
+        
+        top = 0.1 * 0.1 * 0.01 + 0.2 * 0.01
+        assert results.loc["Loss of containment", "frequency"] == pytest.approx(top)
+        assert results.loc["Toxic exposure", "frequency"] == pytest.approx(top * 0.3 * 0.5)
+        assert results.loc["Fire", "frequency"] == pytest.approx(top * 0.1)
+        assert not results.loc["Fire", "meets_target"]
+        assert results.loc["Toxic exposure", "meets_target"]
+        
+        summary = model.summary().iloc[0]
+        assert summary["top_event_frequency"] == pytest.approx(top)
+        assert summary["outcomes_missing_target"] == 1
+    
+    def test_shared_barrier_update(self):
+        """Changing a shared barrier re-evaluates every bow-tie using it and matches a rebuild"""
+        nodes, edges, barriers = _study(3)
+        model = BowTieModel.from_records(nodes, edges, barriers)
+        assert list(model.bowties_for_barrier(2)) == [1, 2, 3]
+        
+        deltas = model.update_barriers([2], pfd=0.001)
+        assert set(deltas["bowtie_id"]) == {1, 2, 3}
+        assert set(deltas["node_type"]) == {TOP_EVENT, OUTCOME}
+        
+        barriers[1]["pfd"] = 0.001
+        rebuilt = BowTieModel.from_records(nodes, edges, barriers).evaluate()
+        assert model.evaluate()["frequency"].to_numpy() == pytest.approx(rebuilt["frequency"].to_numpy())
+        # Every threat runs through the relief valve, so every result drops tenfold
+        assert deltas["previous_frequency"].to_numpy() == pytest.approx(10 * deltas["frequency"].to_numpy())
+    
+    def test_update_touches_only_downstream(self):
+        """A mitigative barrier change leaves the top events alone"""
+        model = BowTieModel.from_records(*_study(2))
+        deltas = model.update_barriers([3], is_enabled=False)
+        assert list(deltas["name"]) == ["Toxic exposure", "Toxic exposure"]
+        assert deltas["frequency"].to_numpy() == pytest.approx(2 * deltas["previous_frequency"].to_numpy())
+    
+    def test_cycle(self):
+        """Graphs with cycles are rejected"""
+        nodes = [{"id": 1, "bowtie_id": 1, "node_type": "threat", "frequency": 1.0},
+                 {"id": 2, "bowtie_id": 1, "node_type": "top_event"}]
+        edges = [{"source_id": 1, "target_id": 2}, {"source_id": 2, "target_id": 1}]
+        with pytest.raises(ValueError):
+            BowTieModel.from_records(nodes, edges, [])
+    
+    def test_large_study(self):
+        """Thousands of bow-ties evaluate in one pass and update incrementally"""
+        rng = np.random.default_rng(0)
+        n_barriers = 200
+        barriers = pd.DataFrame({"id": np.arange(n_barriers), "pfd": rng.choice([0.1, 0.01], n_barriers)})
+        nodes, edges = [], []
+        for bowtie_id in range(5000):
+            graph = build_bowtie_graph(
+                "Release",
+                threats=[{"name": f"T{i}", "frequency": 0.1, "barrier_ids": list(rng.integers(0, n_barriers, 2))}
+                         for i in range(3)],
+                outcomes=[{"name": f"O{i}", "probability": 0.5, "barrier_ids": [int(rng.integers(0, n_barriers))]}
+                          for i in range(2)],
+            )
+            node_rows, edge_rows = _records(bowtie_id, *graph, first_id=100 * bowtie_id)
+            nodes += node_rows
+            edges += edge_rows
+        nodes, edges = pd.DataFrame(nodes), pd.DataFrame(edges)
+        
+        model = BowTieModel(nodes, edges, barriers)
+        model.evaluate()
+        
+        deltas = model.update_barriers([7], pfd=0.5)
+        assert set(deltas["bowtie_id"]) == set(model.bowties_for_barrier(7))
+        
+        barriers.loc[7, "pfd"] = 0.5
+        rebuilt = BowTieModel(nodes, edges, barriers).node_frequency()
+        assert model.node_frequency() == pytest.approx(rebuilt)
+
+
+class TestBowTieDAO:
+    """Tests for storing bow-ties"""
+    
+    def test_save_and_load(self, temp_db_manager):
+        """A saved bow-tie and its shared barriers evaluate from the database"""
+        assert BowTieDAO.add_or_update_barrier({"name": "PSV", "pfd": 0.01, "is_enabled": 1})
+        barrier_id = BowTieDAO.get_all_barriers()[0]["id"]
+        nodes, edges = build_bowtie_graph(
+            "Overpressure",
+            threats=[{"name": "Blocked outlet", "frequency": 0.1, "barrier_ids": [barrier_id]}],
+            outcomes=[{"name": "Rupture", "probability": 1.0}],
+        )
+        bowtie_id = BowTieDAO.save_bowtie({"name": "Vessel V-1"}, nodes, edges)
+        assert bowtie_id is not None
+        # Saving again replaces the graph rather than adding to it
+        assert BowTieDAO.save_bowtie({"id": bowtie_id, "name": "Vessel V-1"}, nodes, edges) == bowtie_id
+        
+        node_frame, edge_frame, barrier_frame = BowTieDAO.get_model_frames()
+        assert len(node_frame) == 4 and len(edge_frame) == 3
+        results = BowTieModel(node_frame, edge_frame, barrier_frame).evaluate().set_index("name")
+        assert results.loc["Rupture", "frequency"] == pytest.approx(1e-3)
+        
+        assert BowTieDAO.update_barriers([{"id": barrier_id, "pfd": 0.1}])
+        assert BowTieDAO.get_all_barriers()[0]["pfd"] == pytest.approx(0.1)
+        assert BowTieDAO.delete_bowtie(bowtie_id)
+        assert BowTieDAO.get_all_bowties() == []
+        assert len(BowTieDAO.get_all_barriers()) == 1
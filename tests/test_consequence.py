@@ -2,6 +2,7 @@ import pytest
 import sys
 import os
 import math
+import numpy as np
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
@@ -137,4 +138,18 @@ class TestConsequenceCalculator:
         # Test proportionality
         small_explosion = ConsequenceCalculator.estimate_explosion_consequence(50.0, 0.1)
         large_explosion = ConsequenceCalculator.estimate_explosion_consequence(100.0, 0.1)
-        assert large_explosion["distance_window_breakage_m"] > small_explosion["distance_window_breakage_m"] 
\ No newline at end of file
+        assert large_explosion["distance_window_breakage_m"] > small_explosion["distance_window_breakage_m"]     
+    def test_array_helpers(self):
+        """Array helpers evaluate many items at once and agree with the scalar estimates"""
+        rates = np.array([1e-6, 1.0, 50.0, 1e6])
+        radius = ConsequenceCalculator.toxic_radius(rates, 150.0, 17.0, [1.0, 2.0, 3.0, 4.0])
+        expected = [ConsequenceCalculator.estimate_toxic_consequence(r, 150.0, 17.0, w)["radius_m"]
+                    for r, w in zip(rates, [1.0, 2.0, 3.0, 4.0])]
+        assert radius == pytest.approx(expected)
+        assert radius[0] == 10 and radius[-1] == 5000
+        
+        masses = np.array([10.0, 1000.0])
+        distance = ConsequenceCalculator.explosion_distance(masses, [0.1, 0.03], "window_breakage")
+        assert distance == pytest.approx([50 * 1.0, 50 * 30.0 ** (1 / 3)])
+        with pytest.raises(ValueError):
+            ConsequenceCalculator.explosion_distance(masses, 0.1, "shattered")
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the Gaussian puff dispersion module
+"""
+import sys
+import os
+import math
+import pytest
+import numpy as np
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.dispersion import (
+    GaussianPuffModel, PuffEmission, dispersion_coefficients, puffs_from_release_profile
+)
+
+
+class TestDispersionCoefficients:
+    """Test cases for the Briggs dispersion coefficients"""
+
+    def test_stability_ordering(self):
+        """Unstable classes spread faster than stable ones"""
+        sy_a, sz_a = dispersion_coefficients(1000.0, "A")
+        sy_f, sz_f = dispersion_coefficients(1000.0, "F")
+        assert sy_a > sy_f
+        assert sz_a > sz_f
+
+    def test_vectorized(self):
+        """Coefficients are computed element-wise"""
+        sy, sz = dispersion_coefficients(np.array([100.0, 1000.0]), "D")
+        assert sy.shape == (2,)
+        assert sy[1] > sy[0]
+
+
+class TestPuffsFromReleaseProfile:
+    """Test cases for converting a source term into puffs"""
+
+    def test_mass_conserved(self):
+        """Puff masses add up to the integrated release"""
+        times = np.linspace(0, 100, 11)
+        rates = np.linspace(10.0, 0.0, 11)
+        puffs = puffs_from_release_profile(times, rates, height_m=2.0)
+        assert sum(p.mass_kg for p in puffs) == pytest.approx(500.0)
+        assert all(p.height_m == 2.0 for p in puffs)
+
+    def test_mismatched_lengths(self):
+        """Mismatched inputs raise an error"""
+        with pytest.raises(ValueError):
+            puffs_from_release_profile([0, 1, 2], [1.0, 2.0])
+
+
+class TestGaussianPuffModel:
+    """Test cases for the GaussianPuffModel class"""
+
+    def test_invalid_wind_speed(self):
+        """Zero wind speed is rejected"""
+        with pytest.raises(ValueError):
+            GaussianPuffModel(0.0)
+
+    def test_single_puff_centre_concentration(self):
+        """Concentration at the puff centre matches the analytical value"""
+        model = GaussianPuffModel(5.0, "D", prune_concentration_kgm3=0.0)
+        receptors = np.array([[500.0, 0.0]])
+        times = np.array([100.0])
+
+        conc = model.simulate([PuffEmission(0.0, 100.0)], receptors, times)
+
+        sy, sz = dispersion_coefficients(500.0, "D")
+        expected = 2 * 100.0 / ((2 * math.pi) ** 1.5 * sy * sy * sz)
+        assert conc.shape == (1, 1)
+        assert conc[0, 0] == pytest.approx(float(expected))
+
+    def test_wind_direction(self):
+        """Puffs travel downwind only"""
+        model = GaussianPuffModel(5.0, "D", wind_direction_deg=180.0)  # from the south
+        receptors = np.array([[0.0, 500.0], [0.0, -500.0]])
+        conc = model.simulate([(0.0, 100.0)], receptors, [100.0])
+        assert conc[0, 0] > 0
+        assert conc[1, 0] == pytest.approx(0.0)
+
+    def test_puff_passes_receptor(self):
+        """Concentration rises and falls as a puff passes a receptor"""
+        model = GaussianPuffModel(5.0, "D")
+        times = np.arange(0, 400, 10.0)
+        conc = model.simulate([(0.0, 100.0)], np.array([[1000.0, 0.0]]), times)
+
+        peak = np.argmax(conc[0])
+        assert times[peak] == pytest.approx(200.0, abs=20.0)
+        assert conc[0, 0] < conc[0, peak]
+        assert conc[0, -1] < conc[0, peak]
+
+    def test_pruning_bounds_active_puffs(self):
+        """Puffs that have passed every receptor are pruned"""
+        model = GaussianPuffModel(10.0, "D")
+        times = np.arange(0, 600, 5.0)
+        emissions = puffs_from_release_profile(times, np.ones_like(times))
+        receptors = np.array([[50.0, 0.0], [100.0, 0.0]])
+
+        model.simulate(emissions, receptors, times)
+
+        assert model.pruned_puffs > 0
+        assert model.max_active_puffs < len(emissions)
+
+    def test_peak_concentrations(self):
+        """Peak concentrations fall with distance"""
+        model = GaussianPuffModel(3.0, "F")
+        receptors = np.array([[200.0, 0.0], [400.0, 0.0], [800.0, 0.0]])
+        result = model.peak_concentrations([(0.0, 50.0)], receptors, np.arange(0, 600, 5.0))
+        peaks = result["peak_concentration_kgm3"]
+        assert peaks[0] > peaks[1] > peaks[2]
+        assert result["time_of_peak_s"][0] < result["time_of_peak_s"][2]
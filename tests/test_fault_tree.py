@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the fault tree module
+"""
+import sys
+import os
+import itertools
+import pytest
+import numpy as np
+import pandas as pd
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.fault_tree import FaultTree
+from app.core.pfdavg import PFDAvg
+from app.core.sif import SIFSubsystem, SIFVerifier
+
+
+def _brute_force(gates, probabilities, top):
+    """Top event probability and minimal cut sets by enumerating every state"""
+    events = list(probabilities)
+    
+    def fails(name, state):
+        if name in state:
+            return state[name]
+        gate = gates[name]
+        values = [fails(item, state) for item in gate["inputs"]]
+        if gate["type"] == "AND":
+            return all(values)
+        if gate["type"] == "OR":
+            return any(values)
+        return sum(values) >= gate["k"]
+    
+    probability, solutions = 0.0, []
+    for bits in itertools.product([False, True], repeat=len(events)):
+        state = dict(zip(events, bits))
+        if fails(top, state):
+            probability += np.prod([probabilities[e] if b else 1 - probabilities[e] for e, b in state.items()])
+            solutions.append(frozenset(e for e, b in state.items() if b))
+    minimal = {s for s in solutions if not any(other < s for other in solutions)}
+    return probability, minimal
+
+
+def _shared_site(sif_site, n_sifs):
+    """Random site whose SIFs share five logic solvers and twenty valves"""
+    site = sif_site(n_sifs, architectures=("1oo2", "2oo3"))
+    sif_id = site["sif_id"].to_numpy()
+    logic = (site["subsystem_type"] == "Logic").to_numpy()
+    final = (site["subsystem_type"] == "Final Element").to_numpy()
+    tags = np.where(logic, [f"LS-{i % 5}" for i in sif_id],
+                    np.where(final, [f"XV-{i % 20},XV-{(i + 1) % 20}" for i in sif_id], None))
+    return site.assign(
+        architecture=np.where(logic, "1oo1", np.where(final, "1oo2", site["architecture"])),
+        pfd_per_component=0.01,
+        component_tags=tags,
+    )
+
+
+class TestFaultTree:
+    """Test cases for the FaultTree class"""
+    
+    def test_random_trees(self):
+        """BDD probabilities and cut sets match exhaustive enumeration"""
+        rng = np.random.default_rng(1)
+        for _ in range(25):
+            probabilities = {f"e{i}": float(rng.uniform(0.05, 0.5)) for i in range(7)}
+            names, gates = list(probabilities), {}
+            for number in range(5):
+                gate_type = str(rng.choice(["AND", "OR", "VOTE"]))
+                inputs = [str(x) for x in rng.choice(names, size=min(4, len(names)), replace=False)]
+                gates[f"g{number}"] = {"type": gate_type, "inputs": inputs, "k": int(rng.integers(1, 5))}
+                names.append(f"g{number}")
+            tree = FaultTree(gates, probabilities, "g4")
+            expected, minimal = _brute_force(gates, probabilities, "g4")
+            assert tree.top_event_probability() == pytest.approx(expected, abs=1e-12)
+            assert {frozenset(cut) for cut in tree.minimal_cut_sets()} == minimal
+    
+    def test_voting_gate(self):
+        """A 2oo3 vote fails on any pair of inputs"""
+        tree = FaultTree({"top": {"type": "VOTE", "k": 2, "inputs": ["A", "B", "C"]}},
+                         {"A": 0.1, "B": 0.2, "C": 0.3}, "top")
+        assert tree.top_event_probability() == pytest.approx(0.1 * 0.2 + 0.1 * 0.3 + 0.2 * 0.3 - 2 * 0.1 * 0.2 * 0.3)
+        assert tree.minimal_cut_sets() == [("A", "B"), ("A", "C"), ("B", "C")]
+        assert tree.minimal_cut_sets(max_order=1) == []
+    
+    def test_invalid_trees(self):
+        """Undefined events, cycles and bad gates are rejected"""
+        with pytest.raises(ValueError):
+            FaultTree({"top": {"type": "OR", "inputs": ["A", "missing"]}}, {"A": 0.1}, "top")
+        with pytest.raises(ValueError):
+            FaultTree({"top": {"type": "OR", "inputs": ["g"]}, "g": {"type": "AND", "inputs": ["top", "A"]}},
+                      {"A": 0.1}, "top")
+        with pytest.raises(ValueError):
+            FaultTree({"top": {"type": "VOTE", "k": 3, "inputs": ["A", "B"]}}, {"A": 0.1, "B": 0.1}, "top")
+    
+    def test_cached_reevaluation(self, sif_site):
+        """Changing probabilities reuses the compiled BDD"""
+        tree = FaultTree.from_sif_subsystems(_shared_site(sif_site, 30), combine="OR")
+        bdd = tree.compile()
+        misses = FaultTree.cache_info()["misses"]
+        assert FaultTree.from_sif_subsystems(_shared_site(sif_site, 30), combine="OR").compile() is bdd
+        assert FaultTree.cache_info()["misses"] == misses
+        
+        changed = FaultTree.from_sif_subsystems(_shared_site(sif_site, 30).assign(pfd_per_component=0.02),
+                                                combine="OR")
+        hits = FaultTree.cache_info()["hits"]
+        assert changed.compile() is bdd
+        info = FaultTree.cache_info()
+        assert (info["hits"], info["misses"]) == (hits + 1, misses)
+        assert changed.top_event_probability() > tree.top_event_probability()
+        
+        base = np.array([tree.basic_events[name] for name in bdd.var_names])
+        
+        # Many parameter cases at once agree with one at a time
+        cases = base[:, None] * np.array([0.5, 1.0, 2.0])
+        batch = bdd.probability(cases)
+        assert batch == pytest.approx([bdd.probability(cases[:, i]) for i in range(3)])
+        assert batch[0] < batch[1] < batch[2]
+    
+    def test_shared_components(self):
+        """A logic solver shared by two SIFs is one basic event and a single cut set of both"""
+        frame = pd.DataFrame({
+            "id": [1, 2, 3, 4],
+            "sif_id": [1, 1, 2, 2],
+            "architecture": ["1oo2", "1oo1", "1oo2", "1oo1"],
+            "pfd_per_component": [0.01, 0.001, 0.01, 0.001],
+            "component_tags": [None, "LS-1", None, "LS-1"],
+        })
+        tree = FaultTree.from_sif_subsystems(frame)
+        assert tree.top == "SIFs"
+        assert ("LS-1",) in tree.minimal_cut_sets()
+        independent = FaultTree.from_sif_subsystems(frame.assign(component_tags=None))
+        # Both SIFs failing together is far more likely when they share the logic solver
+        assert tree.top_event_probability() > 10 * independent.top_event_probability()
+        
+        importance = tree.compile().birnbaum_importance(tree.basic_events)
+        assert importance.idxmax() == "LS-1"
+        
+        # A shared component must have the same failure data wherever it is named
+        with pytest.raises(ValueError, match="LS-1"):
+            FaultTree.from_sif_subsystems(frame.assign(pfd_per_component=[0.01, 0.001, 0.01, 0.002]))
+    
+    def test_single_sif_matches_pfdavg(self):
+        """Non-redundant SIFs match the PFDavg sum and redundancy stays close to it"""
+        subsystems = [SIFSubsystem("PT", "1oo1", 0.01), SIFSubsystem("LS", "1oo1", 0.001, subsystem_type="Logic")]
+        exact = SIFVerifier.calculate_fault_tree_pfd(subsystems)
+        assert exact == pytest.approx(1 - (1 - 0.01) * (1 - 0.001))
+        
+        redundant = [SIFSubsystem("PT", "1oo2", 0.01, beta=0.05)]
+        assert SIFVerifier.calculate_fault_tree_pfd(redundant) == pytest.approx(
+            redundant[0].calculate_pfd_avg(), rel=0.3)
+        assert SIFVerifier.calculate_fault_tree_pfd([]) == 1.0
+    
+    def test_large_tree(self, sif_site):
+        """Hundreds of basic events compile and give cut sets"""
+        site = _shared_site(sif_site, 100)
+        tree = FaultTree.from_sif_subsystems(site, combine="OR")
+        bdd = tree.compile()
+        cut_sets = tree.minimal_cut_sets()
+        assert len(bdd.var_names) > 400
+        # Every single logic solver is a first order cut set of the site
+        assert {cut for cut in cut_sets if len(cut) == 1} >= {(f"LS-{i}",) for i in range(5)}
+        sif_pfds = PFDAvg.evaluate_sifs(site)["pfd_avg"]
+        assert tree.top_event_probability() <= sif_pfds.sum()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the jet fire, fireball and radiation field module
+"""
+import sys
+import os
+import math
+import pytest
+import numpy as np
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.fire import FireCalculator, RadiationField, _fireball_correlations
+from app.core.consequence import ConsequenceCalculator
+
+
+class TestRadiationField:
+    """Test cases for the RadiationField class"""
+    
+    def test_transmissivity_decreases_with_distance(self):
+        """Transmissivity falls with path length and is capped at 1"""
+        tau = RadiationField.transmissivity(np.array([0.001, 10.0, 100.0, 1000.0]))
+        assert tau[0] == 1.0
+        assert tau[1] > tau[2] > tau[3] > 0
+    
+    def test_point_source_field_shape(self):
+        """Sources are broadcast against receptors"""
+        flux = RadiationField.point_source_flux([1000.0, 2000.0], [0.0, 0.0], [5.0, 5.0], [10.0, 20.0, 40.0])
+        assert flux.shape == (2, 3)
+        assert np.all(np.diff(flux, axis=1) < 0)
+        assert flux[1, 0] == pytest.approx(2 * flux[0, 0])
+    
+    def test_sphere_flux_inside_sphere(self):
+        """Receptors inside the sphere see the full surface emissive power less attenuation"""
+        flux = RadiationField.sphere_flux([200.0], [100.0], [10.0], [0.0])
+        assert flux[0, 0] == pytest.approx(200.0)
+
+
+class TestFireball:
+    """Test cases for the fireball model"""
+    
+    def test_ccps_correlations(self):
+        """Diameter and duration follow the CCPS correlations"""
+        result = FireCalculator.fireball([1000.0, 50000.0], 46000.0)
+        assert result["diameter_m"][0] == pytest.approx(58.0)
+        assert result["duration_s"][0] == pytest.approx(4.5)
+        assert result["duration_s"][1] == pytest.approx(2.6 * 50000.0 ** (1 / 6))
+        assert result["centre_height_m"][0] == pytest.approx(0.75 * 58.0)
+    
+    def test_correlations_memoized_per_inventory(self):
+        """Repeated inventories reuse the cached correlations"""
+        _fireball_correlations.cache_clear()
+        FireCalculator.fireball(np.array([2000.0, 2000.0, 3000.0, 2000.0]), 46000.0)
+        info = _fireball_correlations.cache_info()
+        assert info.misses == 2
+        FireCalculator.fireball(np.array([2000.0, 3000.0]), 46000.0)
+        assert _fireball_correlations.cache_info().hits == 2
+    
+    def test_hazard_distance_grows_with_mass(self):
+        """Larger fireballs reach further"""
+        result = FireCalculator.fireball(np.array([1000.0, 10000.0]), 46000.0, 1500.0)
+        distance = FireCalculator.fireball_hazard_distance(result, 5.0)
+        assert distance[1] > distance[0] > 0
+        
+        flux = FireCalculator.fireball_flux(result, distance)
+        assert flux[0, 0] == pytest.approx(5.0, rel=1e-3)
+        assert flux[1, 1] == pytest.approx(5.0, rel=1e-3)
+
+
+class TestJetFire:
+    """Test cases for the jet fire model"""
+    
+    def test_flame_length_correlation(self):
+        """Flame length follows the API 521 correlation"""
+        jet = FireCalculator.jet_fire(1.0, 25.0, 50000.0, 5.0)
+        assert jet["flame_length_m"][0] == pytest.approx(0.00326 * (5e7) ** 0.478)
+    
+    def test_wind_tilts_flame_and_reduces_lift_off(self):
+        """Wind increases tilt and reduces lift-off"""
+        jet = FireCalculator.jet_fire(
+            np.array([1.0, 1.0]), 25.0, 50000.0, 5.0, wind_speed_ms=np.array([0.0, 10.0])
+        )
+        assert jet["tilt_deg"][0] == pytest.approx(0.0)
+        assert jet["tilt_deg"][1] > 0
+        assert jet["lift_off_m"][1] < jet["lift_off_m"][0]
+        assert jet["lift_off_m"][0] == pytest.approx(0.2 * jet["flame_length_m"][0])
+    
+    def test_chamberlain_tilt(self):
+        """Tilt follows Chamberlain's correlation and stops at horizontal"""
+        exit_velocity = FireCalculator.jet_fire(1.0, 25.0, 50000.0, 5.0)["exit_velocity_ms"][0]
+        ratios = np.array([0.005, 0.01])
+        jet = FireCalculator.jet_fire(1.0, 25.0, 50000.0, 5.0, wind_speed_ms=ratios * exit_velocity)
+        assert jet["tilt_deg"] == pytest.approx(8000.0 * ratios)
+        jet = FireCalculator.jet_fire(1.0, 25.0, 50000.0, 5.0, wind_speed_ms=0.2 * exit_velocity)
+        assert jet["tilt_deg"][0] == pytest.approx(90.0)
+    
+    def test_hazard_distance_matches_flux_field(self):
+        """The hazard distance is where the radiation field reaches the threshold"""
+        jet = FireCalculator.jet_fire(np.array([5.0, 20.0]), np.array([50.0, 100.0]), 50000.0, 5.0, wind_speed_ms=3.0)
+        distance = FireCalculator.jet_fire_hazard_distance(jet, 5.0)
+        assert distance[1] > distance[0] > 0
+        
+        flux = FireCalculator.jet_fire_flux(jet, distance)
+        assert np.diag(flux) == pytest.approx([5.0, 5.0], rel=1e-3)
+
+
+class TestConsequenceCalculatorFires:
+    """Test cases for the scalar fire wrappers on ConsequenceCalculator"""
+    
+    def test_estimate_jet_fire_consequence(self):
+        """Jet fire wrapper returns scalar results"""
+        result = ConsequenceCalculator.estimate_jet_fire_consequence(5.0, 50.0, 50000.0, 5.0)
+        assert isinstance(result["flame_length_m"], float)
+        assert result["radiation_distance_m"] > 0
+        assert result["affected_area_m2"] >= math.pi * 100
+    
+    def test_estimate_fireball_consequence(self):
+        """Fireball wrapper returns scalar results"""
+        result = ConsequenceCalculator.estimate_fireball_consequence(5000.0, 46000.0, 1500.0)
+        assert result["diameter_m"] == pytest.approx(5.8 * 5000.0 ** (1 / 3))
+        assert result["radiation_distance_m"] > result["diameter_m"]
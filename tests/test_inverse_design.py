@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the inverse design module
+"""
+import sys
+import os
+import pytest
+import numpy as np
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.inverse_design import InverseDesignSolver
+from app.core.release import ReleaseCalculator
+from app.core.consequence import ConsequenceCalculator
+
+
+class TestBisect:
+    """Test cases for the vectorized bisection"""
+    
+    def test_solves_many_items(self):
+        """Each item converges to its own limit"""
+        targets = np.array([4.0, 9.0, 100.0])
+        result = InverseDesignSolver.bisect(
+            lambda x: x ** 2, targets, np.full(3, 0.1), np.full(3, 1000.0), rtol=1e-8
+        )
+        assert result["limiting_value"] == pytest.approx([2.0, 3.0, 10.0], rel=1e-6)
+        assert list(result["status"]) == ["solved"] * 3
+    
+    def test_bracket_status(self):
+        """Items outside the bracket are flagged"""
+        result = InverseDesignSolver.bisect(
+            lambda x: x, np.array([0.5, 5.0, 50.0]), np.full(3, 1.0), np.full(3, 10.0), log_space=False
+        )
+        assert list(result["status"]) == ["never_meets", "solved", "always_meets"]
+        assert np.isnan(result["limiting_value"][0])
+        assert result["limiting_value"][2] == 10.0
+
+
+class TestInverseDesignSolver:
+    """Test cases for the equipment-level inverse solvers"""
+    
+    def test_max_hole_size_for_toxic_distance(self):
+        """Limiting hole sizes put the toxic radius on the fence line"""
+        items = [
+            {"tag": "V-101", "phase": "liquid", "pressure_kpa": 500.0, "density_kgm3": 600.0,
+             "toxic_threshold_ppm": 150.0, "molecular_weight": 17.0, "wind_speed_ms": 3.0, "fence_line_m": 1000.0},
+            {"tag": "V-102", "phase": "gas", "pressure_kpa": 1000.0, "temperature_k": 300.0,
+             "toxic_threshold_ppm": 150.0, "molecular_weight": 17.0, "wind_speed_ms": 3.0, "fence_line_m": 200.0},
+        ]
+        result = InverseDesignSolver.max_hole_size_for_toxic_distance(items)
+        
+        assert list(result["status"]) == ["solved", "solved"]
+        assert result["toxic_radius_m"].to_numpy() == pytest.approx([1000.0, 200.0], rel=1e-3)
+        
+        # Cross-check the gas item against the scalar calculators
+        hole = result["max_hole_size_mm"][1]
+        rate = ReleaseCalculator.gas_release_rate(hole, 1000.0, 101.325, 300.0, 17.0)["mass_flow_rate_kgs"]
+        radius = ConsequenceCalculator.estimate_toxic_consequence(rate, 150.0, 17.0, 3.0)["radius_m"]
+        assert radius == pytest.approx(200.0, rel=1e-3)
+    
+    def test_toxic_target_not_achievable(self):
+        """Items whose smallest hole already exceeds the target are flagged"""
+        items = [{"phase": "liquid", "pressure_kpa": 500.0, "density_kgm3": 1400.0,
+                  "toxic_threshold_ppm": 3.0, "molecular_weight": 70.9, "wind_speed_ms": 3.0, "fence_line_m": 400.0}]
+        result = InverseDesignSolver.max_hole_size_for_toxic_distance(items)
+        assert result["status"][0] == "never_meets"
+        assert np.isnan(result["max_hole_size_mm"][0])
+    
+    def test_max_inventory_for_explosion_distance(self):
+        """Limiting inventory matches the inverted TNT correlation"""
+        items = [{"tag": "T-1", "tnt_equiv_factor": 0.1, "fence_line_m": 180.0}]
+        result = InverseDesignSolver.max_inventory_for_explosion_distance(items)
+        assert result["max_inventory_kg"][0] == pytest.approx((180.0 / 18) ** 3 / 0.1, rel=1e-3)
+    
+    def test_max_inventory_for_fireball_distance(self):
+        """A farther fence line allows a larger inventory"""
+        items = [
+            {"tag": "S-1", "heat_of_combustion_kjkg": 46000.0, "fence_line_m": 100.0},
+            {"tag": "S-2", "heat_of_combustion_kjkg": 46000.0, "fence_line_m": 300.0},
+        ]
+        result = InverseDesignSolver.max_inventory_for_fireball_distance(items)
+        assert list(result["status"]) == ["solved", "solved"]
+        assert result["max_inventory_kg"][0] < result["max_inventory_kg"][1]
+        assert result["radiation_distance_m"].to_numpy() == pytest.approx([100.0, 300.0], rel=1e-2)
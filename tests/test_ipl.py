@@ -4,6 +4,9 @@ Tests for the Independent Protection Layer (IPL) module
 """
 import sys
 import os
+import copy
+import pickle
+import tracemalloc
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -556,4 +559,116 @@ class TestLOPAScenario:
         }
         
         scenario = LOPAScenario.from_dict(empty_dict)
-        assert len(scenario.ipls) == 0 
\ No newline at end of file
+        assert len(scenario.ipls) == 0 
+
+
+class TestLOPAScenarioCaching:
+    """Test cases for slotted storage and cached LOPA results"""
+    
+    def _scenario(self, ipls=None):
+        return LOPAScenario(
+            initiating_event_frequency=0.1,
+            ipls=ipls if ipls is not None else [IPL(name="BPCS", pfd=0.1)],
+            conditional_modifiers={"occupancy": 0.5},
+            target_mitigated_frequency=1e-4
+        )
+    
+    def test_slots(self):
+        """IPL and LOPAScenario instances carry no per-instance __dict__"""
+        assert not hasattr(IPL(), "__dict__")
+        assert not hasattr(self._scenario(), "__dict__")
+    
+    def test_calculation_is_cached(self):
+        """Derived properties reuse one mitigated frequency calculation"""
+        scenario = self._scenario()
+        with patch.object(LOPACalculator, "calculate_mitigated_frequency", wraps=LOPACalculator.calculate_mitigated_frequency) as calc:
+            scenario.to_dict()
+            assert scenario.meets_target is False
+            assert calc.call_count == 1
+    
+    def test_invalidated_by_ipl_list_change(self):
+        """Appending or removing an IPL recomputes the result"""
+        scenario = self._scenario()
+        assert scenario.mitigated_frequency == pytest.approx(5e-3)
+        
+        sif = IPL(name="SIF", pfd=0.01)
+        scenario.ipls.append(sif)
+        assert scenario.mitigated_frequency == pytest.approx(5e-5)
+        
+        scenario.ipls.remove(sif)
+        assert scenario.mitigated_frequency == pytest.approx(5e-3)
+        
+        scenario.ipls = []
+        assert scenario.mitigated_frequency == pytest.approx(5e-2)
+    
+    def test_invalidated_by_modifier_change(self):
+        """Changing a conditional modifier recomputes the result"""
+        scenario = self._scenario()
+        assert scenario.mitigated_frequency == pytest.approx(5e-3)
+        scenario.conditional_modifiers["ignition"] = 0.1
+        assert scenario.mitigated_frequency == pytest.approx(5e-4)
+        del scenario.conditional_modifiers["occupancy"]
+        assert scenario.mitigated_frequency == pytest.approx(1e-3)
+        scenario.initiating_event_frequency = 1.0
+        assert scenario.mitigated_frequency == pytest.approx(1e-2)
+    
+    def test_invalidated_by_shared_ipl_change(self):
+        """Editing an IPL shared by two scenarios updates both"""
+        shared = IPL(name="PSV", pfd=0.01)
+        first = self._scenario([shared])
+        second = self._scenario([shared])
+        assert first.mitigated_frequency == pytest.approx(5e-4)
+        assert second.mitigated_frequency == pytest.approx(5e-4)
+        
+        shared.pfd = 0.1
+        assert first.mitigated_frequency == pytest.approx(5e-3)
+        assert second.mitigated_frequency == pytest.approx(5e-3)
+        
+        shared.is_enabled = False
+        assert first.mitigated_frequency == pytest.approx(5e-2)
+        assert second.meets_target is False
+    
+    def test_invalidated_by_ipl_replacement(self):
+        """Swapping an IPL in place recomputes the result and the old IPL no longer counts"""
+        scenario = self._scenario()
+        old = scenario.ipls[0]
+        assert scenario.mitigated_frequency == pytest.approx(5e-3)
+        scenario.ipls[0] = IPL(name="SIF", pfd=0.01)
+        assert scenario.mitigated_frequency == pytest.approx(5e-4)
+        old.pfd = 1.0
+        assert scenario.mitigated_frequency == pytest.approx(5e-4)
+    
+    def test_removed_ipl_edits_do_not_mask_changes(self):
+        """Edits after a removal are never mistaken for the state that was cached"""
+        edited, kept = IPL(name="BPCS", pfd=0.1), IPL(name="PSV", pfd=0.1)
+        for _ in range(3):
+            edited.pfd = 0.1
+        scenario = self._scenario([edited, kept])
+        assert scenario.mitigated_frequency == pytest.approx(5e-4)
+        scenario.ipls.remove(edited)
+        for pfd in (0.5, 0.2, 0.01):
+            kept.pfd = pfd
+        assert scenario.mitigated_frequency == pytest.approx(5e-4)
+        kept.pfd = 0.1
+        assert scenario.mitigated_frequency == pytest.approx(5e-3)
+    
+    def test_memory_footprint(self):
+        """Scenarios stay compact: no per-instance dicts or per-IPL listener sets"""
+        tracemalloc.start()
+        scenarios = [self._scenario([IPL(name="BPCS", pfd=0.1), IPL(name="PSV", pfd=0.01)]) for _ in range(2000)]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # About 0.75 kB per scenario with two IPLs and one modifier, against
+        # 0.9 kB for plain attribute dicts and 2.7 kB with listener weak sets
+        assert size / len(scenarios) < 1200
+    
+    def test_pickle_and_copy(self):
+        """Scenarios survive pickling and deep copies with working invalidation"""
+        scenario = self._scenario()
+        scenario.mitigated_frequency
+        
+        for clone in (pickle.loads(pickle.dumps(scenario)), copy.deepcopy(scenario)):
+            assert clone.to_dict() == scenario.to_dict()
+            clone.ipls[0].pfd = 0.01
+            assert clone.mitigated_frequency == pytest.approx(5e-4)
+            assert scenario.mitigated_frequency == pytest.approx(5e-3)
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the IPL independence module
+"""
+import sys
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.ipl import IPL, LOPAScenario
+from app.core.lopa_batch import PortfolioLOPA
+from app.core.ipl_independence import (
+    IndependenceValidator, INITIATING_CAUSE, DUPLICATE_SAFEGUARD, SHARED_SENSOR, SHARED_EQUIPMENT
+)
+from app.utils.data_access import LOPAScenarioDAO, IPLDAO
+
+
+def _study():
+    scenarios = pd.DataFrame({
+        "id": [1, 2, 3],
+        "initiating_event_frequency": [0.1, 0.1, 1.0],
+        "target_mitigated_frequency": [1e-4, 1e-4, 1e-4],
+        "initiating_event_tag": ["FIC-101", None, ""],
+    })
+    ipls = pd.DataFrame({
+        "id": [11, 12, 13, 21, 22, 23, 31, 32, 33],
+        "lopa_scenario_id": [1, 1, 1, 2, 2, 2, 3, 3, 3],
+        "name": ["BPCS level loop", "High level alarm", "SIF-1", "PSV-1", "SIF-2", " psv-1", "A", "B", "C"],
+        "pfd": [0.1, 0.1, 0.01, 0.01, 0.01, 0.01, 0.1, 0.1, 0.1],
+        "is_enabled": [True, True, True, True, True, True, True, True, False],
+        "equipment_tag": ["fic-101 ", "", "XV-1", "", "", "", "XV-7", "", "XV-7"],
+        "sensor_tag": ["", "LT-1", "LT-1", "", "", "", "PT-3", "PT-3", ""],
+    })
+    return scenarios, ipls
+
+
+class TestIndependenceValidator:
+    """Test cases for the IndependenceValidator class"""
+    
+    def test_rules(self):
+        """Each rule flags the expected layers"""
+        validator = IndependenceValidator(PortfolioLOPA(*_study()))
+        conflicts = validator.conflicts()
+        found = set(zip(conflicts["ipl_id"], conflicts["rule"]))
+        
+        assert found == {
+            (11, INITIATING_CAUSE),
+            (23, DUPLICATE_SAFEGUARD),
+            (12, SHARED_SENSOR), (13, SHARED_SENSOR),
+            (31, SHARED_SENSOR), (32, SHARED_SENSOR),
+        }
+        # A disabled layer is not credited, so sharing XV-7 with it is no conflict
+        assert SHARED_EQUIPMENT not in set(conflicts["rule"])
+    
+    def test_effective_pfd(self):
+        """Dependent layers lose credit and common-cause groups use the beta-factor model"""
+        validator = IndependenceValidator(PortfolioLOPA(*_study()), beta=0.1)
+        effective = validator.effective_pfd()
+        
+        group_pfd = (0.9 * 0.1) * (0.9 * 0.01) + 0.1 * 0.1
+        assert effective[0] == 1.0
+        assert effective[1] == pytest.approx(group_pfd)
+        assert effective[2] == 1.0
+        assert effective[5] == 1.0
+        assert list(effective[3:5]) == [0.01, 0.01]
+        
+        result = validator.evaluate().set_index("id")
+        assert result.loc[1, "mitigated_frequency"] == pytest.approx(0.1 * 0.1 * 0.1 * 0.01)
+        assert result.loc[1, "corrected_mitigated_frequency"] == pytest.approx(0.1 * group_pfd)
+        assert result.loc[2, "corrected_mitigated_frequency"] == pytest.approx(1e-5)
+        assert list(result["n_conflicts"]) == [3, 1, 2]
+    
+    def test_groups_merge_across_tags(self):
+        """Layers linked through a shared sensor and a shared valve form one group"""
+        scenarios = pd.DataFrame({"id": [1], "initiating_event_frequency": [1.0], "target_mitigated_frequency": [1e-4]})
+        ipls = pd.DataFrame({
+            "id": [1, 2, 3], "lopa_scenario_id": [1, 1, 1], "pfd": [0.1, 0.1, 0.1], "is_enabled": True,
+            "equipment_tag": ["", "XV-1", "XV-1"], "sensor_tag": ["PT-1", "PT-1", ""],
+        })
+        effective = IndependenceValidator(PortfolioLOPA(scenarios, ipls), beta=0.2).effective_pfd()
+        assert sorted(effective) == pytest.approx(sorted([(0.8 * 0.1) ** 3 + 0.2 * 0.1, 1.0, 1.0]))
+    
+    def test_no_tags(self):
+        """Portfolios without tag columns validate cleanly"""
+        scenarios = pd.DataFrame({"id": [1], "initiating_event_frequency": [0.1], "target_mitigated_frequency": [1e-4]})
+        ipls = pd.DataFrame({"id": [1], "lopa_scenario_id": [1], "pfd": [0.1], "is_enabled": [True]})
+        validator = IndependenceValidator(PortfolioLOPA(scenarios, ipls))
+        assert validator.conflicts().empty
+        assert validator.evaluate()["corrected_mitigated_frequency"].iloc[0] == pytest.approx(0.01)
+    
+    def test_invalid_beta(self):
+        """Beta must be a probability"""
+        with pytest.raises(ValueError):
+            IndependenceValidator(PortfolioLOPA(*_study()), beta=1.5)
+    
+    def test_from_scenarios(self):
+        """In-memory scenarios are validated through their tags"""
+        scenario = LOPAScenario(
+            initiating_event_frequency=0.1,
+            initiating_event_tag="FIC-101",
+            ipls=[IPL(name="BPCS", pfd=0.1, equipment_tag="FIC-101"), IPL(name="PSV", pfd=0.01)],
+        )
+        validator = IndependenceValidator.from_scenarios([scenario])
+        assert list(validator.conflicts()["rule"]) == [INITIATING_CAUSE]
+        assert validator.evaluate()["corrected_mitigated_frequency"].iloc[0] == pytest.approx(1e-3)
+    
+    def test_large_study(self):
+        """A study of tens of thousands of scenarios validates in one pass"""
+        rng = np.random.default_rng(0)
+        n, m = 20000, 60000
+        scenarios = pd.DataFrame({
+            "id": np.arange(n),
+            "initiating_event_frequency": 0.1,
+            "target_mitigated_frequency": 1e-5,
+            "initiating_event_tag": rng.choice(["FIC-1", "LIC-2", ""], n),
+        })
+        ipls = pd.DataFrame({
+            "id": np.arange(m),
+            "lopa_scenario_id": rng.integers(0, n, m),
+            "name": rng.choice([f"SG-{i}" for i in range(100)], m),
+            "pfd": rng.choice([0.1, 0.01], m),
+            "is_enabled": True,
+            "equipment_tag": rng.choice(["FIC-1", "XV-1", "", ""], m),
+            "sensor_tag": rng.choice(["LT-1", "", ""], m),
+        })
+        result = IndependenceValidator(PortfolioLOPA(scenarios, ipls)).evaluate()
+        assert (result["corrected_mitigated_frequency"] >= result["mitigated_frequency"] * (1 - 1e-12)).all()
+
+
+class TestTagPersistence:
+    """Tests for storing independence tags"""
+    
+    def test_ipl_tags_round_trip(self):
+        """IPL and scenario tags survive to_dict and from_dict"""
+        ipl = IPL.from_dict(IPL(name="SIF", equipment_tag="XV-1", sensor_tag="PT-1").to_dict())
+        assert (ipl.equipment_tag, ipl.sensor_tag) == ("XV-1", "PT-1")
+        scenario = LOPAScenario.from_dict(LOPAScenario(initiating_event_tag="FIC-101").to_dict())
+        assert scenario.initiating_event_tag == "FIC-101"
+    
+    def test_portfolio_frames_include_tags(self, temp_db_manager):
+        """Tags stored in the database reach the validator"""
+        LOPAScenarioDAO.add_or_update_lopa_scenario({
+            "description": "Overflow", "initiating_event_frequency": 0.1,
+            "target_mitigated_frequency": 1e-4, "initiating_event_tag": "LIC-1"
+        })
+        lopa_id = LOPAScenarioDAO.get_all_lopa_scenarios()[-1]["id"]
+        IPLDAO.add_or_update_ipl({
+            "lopa_scenario_id": lopa_id, "name": "BPCS", "pfd": 0.1, "is_enabled": 1, "equipment_tag": "LIC-1"
+        })
+        
+        validator = IndependenceValidator(PortfolioLOPA(*LOPAScenarioDAO.get_portfolio_frames()))
+        assert list(validator.conflicts()["rule"]) == [INITIATING_CAUSE]
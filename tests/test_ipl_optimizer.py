@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the IPL selection optimizer module
+"""
+import sys
+import os
+import itertools
+import pytest
+import numpy as np
+import pandas as pd
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.ipl import IPLType
+from app.core.ipl_optimizer import CandidateIPL, IPLOptimizer
+
+
+def _brute_force(results: pd.DataFrame, candidates):
+    """Cheapest feasible subset by exhaustive enumeration"""
+    gap = np.log10(results["mitigated_frequency"] / results["target_mitigated_frequency"]).clip(lower=0)
+    ids = list(results["id"])
+    best = np.inf
+    for r in range(len(candidates) + 1):
+        for subset in itertools.combinations(candidates, r):
+            credit = np.zeros(len(ids))
+            for c in subset:
+                credit[[ids.index(s) for s in c.scenario_ids]] += c.log_credit
+            if (credit >= gap.to_numpy() - 1e-9).all():
+                best = min(best, sum(c.capital_cost for c in subset))
+    return best
+
+
+class TestCandidateIPL:
+    """Test cases for the CandidateIPL class"""
+    
+    def test_default_pfd(self):
+        """PFD defaults to the recommended value for the IPL type"""
+        candidate = CandidateIPL("PSV-1", [1], "Relief Device")
+        assert candidate.ipl_type == IPLType.RELIEF
+        assert candidate.pfd == 0.01
+        assert candidate.log_credit == pytest.approx(2.0)
+    
+    def test_lifecycle_cost(self):
+        """Annual costs are added over the lifecycle"""
+        candidate = CandidateIPL("SIF-1", [1], capital_cost=100.0, annual_cost=10.0)
+        assert candidate.lifecycle_cost(20) == pytest.approx(300.0)
+        assert candidate.lifecycle_cost(20, 0.05) == pytest.approx(100.0 + 10.0 * 12.4622, rel=1e-4)
+
+
+class TestIPLOptimizer:
+    """Test cases for the IPLOptimizer class"""
+    
+    def test_shared_layer_beats_greedy(self):
+        """A layer shared by three scenarios is cheaper than two partial layers"""
+        results = pd.DataFrame({
+            "id": [1, 2, 3],
+            "mitigated_frequency": [1e-4, 1e-4, 1e-4],
+            "target_mitigated_frequency": [1e-5, 1e-5, 1e-5],
+        })
+        candidates = [
+            CandidateIPL("X", [1, 2, 3], pfd=0.1, capital_cost=10.0),
+            CandidateIPL("Y", [1, 2], pfd=0.1, capital_cost=6.0),
+            CandidateIPL("Z", [3], pfd=0.1, capital_cost=6.0),
+        ]
+        result = IPLOptimizer(results, candidates).optimize()
+        
+        assert result["selected"] == ["X"]
+        assert result["total_cost"] == pytest.approx(10.0)
+        assert result["optimal"]
+        assert result["scenarios"]["meets_target"].all()
+    
+    def test_matches_brute_force(self):
+        """Optimizer cost matches exhaustive search on small random portfolios"""
+        rng = np.random.default_rng(3)
+        for _ in range(10):
+            results = pd.DataFrame({
+                "id": np.arange(6),
+                "mitigated_frequency": 10.0 ** rng.uniform(-5, -2, 6),
+                "target_mitigated_frequency": 1e-5,
+            })
+            candidates = [
+                CandidateIPL(f"C{j}", list(rng.choice(6, rng.integers(1, 4), replace=False)),
+                             pfd=float(rng.choice([0.1, 0.01])), capital_cost=float(rng.uniform(1, 10)))
+                for j in range(10)
+            ]
+            result = IPLOptimizer(results, candidates).optimize()
+            expected = _brute_force(results, candidates)
+            if np.isfinite(expected):
+                assert result["total_cost"] == pytest.approx(expected)
+                assert result["scenarios"]["meets_target"].all()
+    
+    def test_layer_no_better_than_cheaper_one(self):
+        """A layer giving no more credit than a cheaper one may still be needed beside it"""
+        results = pd.DataFrame({
+            "id": [1, 2],
+            "mitigated_frequency": [1e-1, 1e-3],
+            "target_mitigated_frequency": [1e-5, 1e-5],
+        })
+        candidates = [
+            CandidateIPL("C0", [1, 2], pfd=0.01, capital_cost=14.0),
+            CandidateIPL("C1", [1], pfd=0.001, capital_cost=15.0),
+            CandidateIPL("C2", [2], pfd=0.001, capital_cost=3.0),
+            CandidateIPL("C3", [1, 2], pfd=0.01, capital_cost=10.0),
+        ]
+        result = IPLOptimizer(results, candidates).optimize()
+        
+        assert _brute_force(results, candidates) == pytest.approx(24.0)
+        assert sorted(result["selected"]) == ["C0", "C3"]
+        assert result["total_cost"] == pytest.approx(24.0)
+        assert result["optimal"]
+    
+    def test_infeasible_scenarios_reported(self):
+        """Scenarios that no combination can fix are reported and skipped"""
+        results = pd.DataFrame({
+            "id": [1, 2],
+            "mitigated_frequency": [1e-2, 1e-4],
+            "target_mitigated_frequency": [1e-6, 1e-5],
+        })
+        candidates = [CandidateIPL("BPCS-1", [1, 2], "Basic Process Control System", capital_cost=5.0)]
+        result = IPLOptimizer(results, candidates).optimize()
+        
+        assert result["infeasible_scenario_ids"] == [1]
+        assert result["selected"] == ["BPCS-1"]
+        assert list(result["scenarios"]["meets_target"]) == [False, True]
+    
+    def test_scenarios_already_meeting_target(self):
+        """Nothing is selected when every scenario meets its target"""
+        results = pd.DataFrame({"id": [1], "mitigated_frequency": [1e-6], "target_mitigated_frequency": [1e-5]})
+        result = IPLOptimizer(results, [CandidateIPL("SIF-1", [1], capital_cost=50.0)]).optimize()
+        assert result["selected"] == []
+        assert result["total_cost"] == 0.0
+    
+    def test_hundreds_of_scenarios(self):
+        """A few hundred scenarios with overlapping shared layers solve within the time limit"""
+        rng = np.random.default_rng(0)
+        n = 200
+        results = pd.DataFrame({
+            "id": np.arange(n),
+            "mitigated_frequency": 10.0 ** rng.uniform(-4, -2, n),
+            "target_mitigated_frequency": 1e-5,
+        })
+        candidates = [CandidateIPL(f"SIF-{s}", [s], IPLType.SIS, capital_cost=rng.uniform(50, 100)) for s in range(n)]
+        for k in range(n // 2):
+            base = int(rng.integers(0, n - 5))
+            candidates.append(CandidateIPL(f"PSV-{k}", list(range(base, base + 3)), IPLType.RELIEF,
+                                           capital_cost=rng.uniform(20, 80)))
+            candidates.append(CandidateIPL(f"ALM-{k}", list(range(base, base + 4)), IPLType.ALARM,
+                                           capital_cost=rng.uniform(5, 20)))
+        
+        result = IPLOptimizer(results, candidates).optimize(time_limit_s=60.0)
+        
+        feasible = ~result["scenarios"]["id"].isin(result["infeasible_scenario_ids"])
+        assert result["scenarios"]["meets_target"][feasible].all()
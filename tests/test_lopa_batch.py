@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the portfolio LOPA module
+"""
+import sys
+import os
+import json
+import pytest
+import numpy as np
+import pandas as pd
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.ipl import IPL, LOPACalculator
+from app.core.lopa_batch import PortfolioLOPA, parse_conditional_modifiers, required_sil_from_pfd
+from app.utils.data_access import LOPAScenarioDAO, IPLDAO
+from app.utils.init_db import add_missing_columns
+from sqlalchemy import text
+
+
+def _random_portfolio(n_scenarios: int, seed: int = 0):
+    """Create random scenario and IPL frames"""
+    rng = np.random.default_rng(seed)
+    scenarios = pd.DataFrame({
+        "id": np.arange(1, n_scenarios + 1),
+        "initiating_event_frequency": 10.0 ** rng.uniform(-2, 0, n_scenarios),
+        "target_mitigated_frequency": 10.0 ** rng.integers(-6, -3, n_scenarios),
+        "conditional_modifiers": rng.choice([None, '{"ignition": 0.5}', '{"occupancy": 0.1}'], n_scenarios),
+    })
+    n_ipls = rng.integers(0, 5, n_scenarios)
+    ipls = pd.DataFrame({
+        "id": np.arange(1, n_ipls.sum() + 1),
+        "lopa_scenario_id": np.repeat(scenarios["id"].to_numpy(), n_ipls),
+        "pfd": rng.choice([0.1, 0.01, 0.001], n_ipls.sum()),
+        "is_enabled": rng.random(n_ipls.sum()) > 0.1,
+        "name": [f"PSV-{i}" for i in rng.integers(0, max(n_scenarios // 10, 1), n_ipls.sum())],
+    })
+    return scenarios, ipls
+
+
+class TestHelpers:
+    """Test cases for the module helpers"""
+    
+    def test_parse_conditional_modifiers(self):
+        """Modifiers are read from JSON text, dictionaries and lists"""
+        assert parse_conditional_modifiers('{"ignition": 0.5}') == {"ignition": 0.5}
+        assert parse_conditional_modifiers({"a": 0.1}) == {"a": 0.1}
+        assert parse_conditional_modifiers("[0.5, 0.1]") == {"0": 0.5, "1": 0.1}
+        assert parse_conditional_modifiers(None) == {}
+        assert parse_conditional_modifiers("not json") == {}
+    
+    def test_required_sil_from_pfd(self):
+        """Required PFDs map onto SIL bands"""
+        sil = required_sil_from_pfd(np.array([2.0, 0.5, 0.05, 0.01, 0.005, 0.001, 0.0005, 1e-6, 0.0]))
+        assert list(sil) == [0, 1, 1, 1, 2, 2, 3, 4, 4]
+
+
+class TestPortfolioLOPA:
+    """Test cases for the PortfolioLOPA class"""
+    
+    def test_matches_scalar_calculator(self):
+        """Batch results agree with LOPACalculator scenario by scenario"""
+        scenarios, ipls = _random_portfolio(200)
+        result = PortfolioLOPA(scenarios, ipls).evaluate()
+        
+        for row, scenario in zip(result.itertuples(), scenarios.itertuples()):
+            rows = ipls[ipls["lopa_scenario_id"] == scenario.id]
+            ipl_objects = [IPL(pfd=r.pfd, is_enabled=bool(r.is_enabled)) for r in rows.itertuples()]
+            modifiers = list(parse_conditional_modifiers(scenario.conditional_modifiers).values())
+            expected = LOPACalculator.calculate_mitigated_frequency(
+                scenario.initiating_event_frequency, ipl_objects, modifiers
+            )
+            assert row.mitigated_frequency == pytest.approx(expected, rel=1e-6, abs=1e-10)
+    
+    def test_gap_and_required_sil(self):
+        """Target gap and required SIL for a scenario short of its target"""
+        scenarios = pd.DataFrame({
+            "id": [10, 20],
+            "initiating_event_frequency": [0.1, 0.1],
+            "target_mitigated_frequency": [1e-5, 1e-5],
+        })
+        ipls = pd.DataFrame({"lopa_scenario_id": [10, 20, 20], "pfd": [0.1, 0.1, 0.01]})
+        
+        result = PortfolioLOPA(scenarios, ipls).evaluate().set_index("id")
+        
+        assert result.loc[10, "mitigated_frequency"] == pytest.approx(0.01)
+        assert result.loc[10, "target_gap"] == pytest.approx(1000.0)
+        assert result.loc[10, "required_pfd"] == pytest.approx(0.001)
+        assert result.loc[10, "required_sil"] == 2
+        assert not result.loc[10, "meets_target"]
+        assert result.loc[20, "risk_reduction_factor"] == pytest.approx(1000.0)
+        assert result.loc[20, "required_sil"] == 1
+    
+    def test_scenario_without_ipls(self):
+        """Scenarios with no IPLs keep their initiating frequency"""
+        scenarios = pd.DataFrame({
+            "id": [1], "initiating_event_frequency": [0.1], "target_mitigated_frequency": [1.0]
+        })
+        result = PortfolioLOPA(scenarios, pd.DataFrame({"lopa_scenario_id": [], "pfd": []})).evaluate()
+        assert result["mitigated_frequency"][0] == pytest.approx(0.1)
+        assert result["meets_target"][0]
+        assert result["required_sil"][0] == 0
+    
+    def test_large_portfolio(self):
+        """A 50k-scenario study evaluates in one pass"""
+        scenarios, ipls = _random_portfolio(50000)
+        result = PortfolioLOPA(scenarios, ipls).evaluate()
+        assert len(result) == 50000
+        assert (result["mitigated_frequency"].to_numpy() <= scenarios["initiating_event_frequency"].to_numpy()).all()
+
+
+class TestIncrementalUpdates:
+    """Test cases for recomputing scenarios after a shared IPL changes"""
+    
+    def test_dependency_index(self):
+        """Safeguard names map to every scenario they protect"""
+        scenarios = pd.DataFrame({
+            "id": [1, 2, 3], "initiating_event_frequency": [0.1] * 3, "target_mitigated_frequency": [1e-4] * 3
+        })
+        ipls = pd.DataFrame({
+            "id": [11, 12, 13, 14], "lopa_scenario_id": [1, 2, 2, 3],
+            "name": ["PSV-1", "psv-1 ", "BPCS-1", "BPCS-1"], "pfd": [0.01, 0.01, 0.1, 0.1]
+        })
+        engine = PortfolioLOPA(scenarios, ipls)
+        assert list(engine.scenarios_for_safeguard("PSV-1")) == [1, 2]
+        assert engine.ipl_ids_for_safeguard("bpcs-1") == [13, 14]
+    
+    def test_update_matches_full_recompute(self):
+        """Incremental results agree with evaluating the edited study from scratch"""
+        scenarios, ipls = _random_portfolio(2000, seed=1)
+        engine = PortfolioLOPA(scenarios, ipls)
+        engine.evaluate()
+        
+        ipl_ids = engine.ipl_ids_for_safeguard("PSV-7")
+        deltas = engine.update_ipls(ipl_ids, pfd=0.5, is_enabled=True)
+        
+        edited = ipls.copy()
+        edited.loc[edited["id"].isin(ipl_ids), ["pfd", "is_enabled"]] = [0.5, True]
+        expected = PortfolioLOPA(scenarios, edited).evaluate().set_index("id")
+        
+        assert set(deltas["id"]) == set(engine.scenarios_for_safeguard("PSV-7"))
+        assert deltas["mitigated_frequency"].to_numpy() == pytest.approx(
+            expected.loc[deltas["id"], "mitigated_frequency"].to_numpy()
+        )
+        assert engine.evaluate()["mitigated_frequency"].to_numpy() == pytest.approx(
+            expected["mitigated_frequency"].to_numpy()
+        )
+    
+    def test_update_reports_previous_frequency(self):
+        """Deltas carry the frequency before the change"""
+        scenarios = pd.DataFrame({
+            "id": [1, 2], "initiating_event_frequency": [0.1, 0.1], "target_mitigated_frequency": [1e-4, 1e-4]
+        })
+        ipls = pd.DataFrame({"id": [11, 12], "lopa_scenario_id": [1, 2], "pfd": [0.1, 0.1]})
+        engine = PortfolioLOPA(scenarios, ipls)
+        
+        deltas = engine.update_ipls([11], pfd=0.001)
+        
+        assert list(deltas["id"]) == [1]
+        assert deltas["previous_mitigated_frequency"][0] == pytest.approx(0.01)
+        assert deltas["mitigated_frequency"][0] == pytest.approx(1e-4)
+        assert deltas["meets_target"][0]
+        
+        deltas = engine.update_ipls([11], is_enabled=False)
+        assert deltas["mitigated_frequency"][0] == pytest.approx(0.1)
+
+
+class TestPortfolioFrames:
+    """Tests for loading the portfolio from the database"""
+    
+    def test_get_portfolio_frames(self, temp_db_manager):
+        """Scenarios and IPLs are loaded in columnar form"""
+        LOPAScenarioDAO.add_or_update_lopa_scenario({
+            "description": "Overpressure", "initiating_event_frequency": 0.1,
+            "target_mitigated_frequency": 1e-4, "conditional_modifiers": json.dumps({"ignition": 0.5})
+        })
+        lopa_id = LOPAScenarioDAO.get_all_lopa_scenarios()[-1]["id"]
+        IPLDAO.add_or_update_ipl({"lopa_scenario_id": lopa_id, "name": "PSV-1", "pfd": 0.01, "is_enabled": 1})
+        
+        scenarios, ipls = LOPAScenarioDAO.get_portfolio_frames()
+        result = PortfolioLOPA(scenarios, ipls).evaluate().set_index("id")
+        
+        assert result.loc[lopa_id, "mitigated_frequency"] == pytest.approx(0.1 * 0.01 * 0.5)
+        assert not result.loc[lopa_id, "meets_target"]
+    
+    def test_save_lopa_results(self, temp_db_manager):
+        """IPL changes and scenario results are written back together"""
+        LOPAScenarioDAO.add_or_update_lopa_scenario({
+            "description": "Overpressure", "initiating_event_frequency": 0.1, "target_mitigated_frequency": 1e-4
+        })
+        lopa_id = LOPAScenarioDAO.get_all_lopa_scenarios()[-1]["id"]
+        IPLDAO.add_or_update_ipl({"lopa_scenario_id": lopa_id, "name": "PSV-1", "pfd": 0.1, "is_enabled": 1})
+        
+        engine = PortfolioLOPA(*LOPAScenarioDAO.get_portfolio_frames())
+        ipl_ids = engine.ipl_ids_for_safeguard("PSV-1")
+        deltas = engine.update_ipls(ipl_ids, pfd=0.001)
+        
+        assert LOPAScenarioDAO.save_lopa_results(deltas, [{"id": i, "pfd": 0.001} for i in ipl_ids])
+        
+        stored = {row["id"]: row for row in LOPAScenarioDAO.get_all_lopa_scenarios()}[lopa_id]
+        assert stored["mitigated_frequency"] == pytest.approx(1e-4)
+        assert stored["meets_target"] == 1
+        stored_ipl = {row["id"]: row for row in IPLDAO.get_all_ipls()}[ipl_ids[0]]
+        assert stored_ipl["pfd"] == pytest.approx(0.001)
+    
+    def test_add_missing_columns(self, temp_db_manager):
+        """Columns are added to tables created by older versions"""
+        session = temp_db_manager.get_session()
+        try:
+            session.execute(text("CREATE TABLE legacy (id INTEGER PRIMARY KEY)"))
+            add_missing_columns(session, "legacy", {"mitigated_frequency": "REAL"})
+            add_missing_columns(session, "legacy", {"mitigated_frequency": "REAL"})
+            columns = [row[1] for row in session.execute(text("PRAGMA table_info(legacy)"))]
+        finally:
+            temp_db_manager.close_session(session)
+        assert columns == ["id", "mitigated_frequency"]
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the LOPA sensitivity module
+"""
+import sys
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.lopa_batch import PortfolioLOPA
+from app.core.lopa_sensitivity import LOPASensitivity
+
+
+def _portfolio(n=40, m=120, seed=1):
+    rng = np.random.default_rng(seed)
+    scenarios = pd.DataFrame({
+        "id": np.arange(n) + 1,
+        "initiating_event": rng.choice(["Pump trip", "Valve fails closed", ""], n),
+        "initiating_event_frequency": 10.0 ** rng.uniform(-2, 0, n),
+        "target_mitigated_frequency": 1e-5,
+        "conditional_modifiers": None,
+    })
+    ipls = pd.DataFrame({
+        "id": np.arange(m) + 1,
+        "lopa_scenario_id": rng.integers(1, n + 1, m),
+        "name": rng.choice(["PSV-101", " psv-101", "SIF-2", "High Level Alarm", "", None], m),
+        "pfd": rng.choice([0.5, 0.1, 0.01], m),
+        "is_enabled": rng.random(m) > 0.1,
+    })
+    return scenarios, ipls
+
+
+def _rerun_risk(scenarios, ipls, mask, pfd_fn):
+    """Total mitigated frequency after changing the PFD of masked IPL rows"""
+    changed = ipls.copy()
+    changed.loc[mask, "pfd"] = pfd_fn(changed.loc[mask, "pfd"])
+    return PortfolioLOPA(scenarios, changed).evaluate()["mitigated_frequency"].sum()
+
+
+class TestLOPASensitivity:
+    """Test cases for the LOPASensitivity class"""
+    
+    def test_swings_match_reruns(self):
+        """IPL swings equal a full rerun with the safeguard's PFD changed"""
+        scenarios, ipls = _portfolio()
+        ranked = LOPASensitivity(PortfolioLOPA(scenarios, ipls)).tornado(factor=10.0)
+        mask = ipls["name"].fillna("").str.strip().str.upper() == "PSV-101"
+        # Both spellings are one safeguard
+        matches = ranked[ranked["item"].str.strip().str.upper() == "PSV-101"]
+        assert len(matches) == 1
+        row = matches.iloc[0]
+        
+        assert row["risk_high"] == pytest.approx(_rerun_risk(scenarios, ipls, mask, lambda p: np.minimum(p * 10, 1.0)))
+        assert row["risk_low"] == pytest.approx(_rerun_risk(scenarios, ipls, mask, lambda p: p / 10))
+        assert row["risk_if_removed"] == pytest.approx(_rerun_risk(scenarios, ipls, mask, lambda p: 1.0))
+    
+    def test_elasticity(self):
+        """Elasticity matches a finite-difference log derivative"""
+        scenarios, ipls = _portfolio()
+        portfolio = PortfolioLOPA(scenarios, ipls)
+        ranked = LOPASensitivity(portfolio).tornado().set_index("item")
+        base = portfolio.evaluate()["mitigated_frequency"].sum()
+        
+        mask = ipls["name"] == "SIF-2"
+        bumped = _rerun_risk(scenarios, ipls, mask, lambda p: p * 1.0001)
+        assert ranked.loc["SIF-2", "elasticity"] == pytest.approx(np.log(bumped / base) / np.log(1.0001), rel=1e-3)
+        
+        # Every scenario's risk scales one-for-one with its initiating frequency
+        ife = ranked[ranked["kind"] == "Initiating event"]
+        assert ife["elasticity"].sum() == pytest.approx(1.0)
+        assert ife["n_scenarios"].sum() == len(scenarios)
+    
+    def test_items_and_ordering(self):
+        """Unnamed IPLs stand alone, disabled rows are ignored, and swings are sorted"""
+        scenarios = pd.DataFrame({
+            "id": [1, 2],
+            "initiating_event_frequency": [0.1, 1.0],
+            "target_mitigated_frequency": [1e-4, 1e-4],
+        })
+        ipls = pd.DataFrame({
+            "id": [10, 11, 12, 13],
+            "lopa_scenario_id": [1, 2, 2, 2],
+            "name": ["BPCS", "BPCS", "", "Dike"],
+            "pfd": [0.1, 0.1, 0.01, 0.01],
+            "is_enabled": [True, True, True, False],
+        })
+        sensitivity = LOPASensitivity(PortfolioLOPA(scenarios, ipls))
+        ranked = sensitivity.tornado()
+        
+        assert set(ranked["item"]) == {"BPCS", "IPL 12", "Scenario 1", "Scenario 2"}
+        assert ranked.set_index("item").loc["BPCS", "n_scenarios"] == 2
+        assert ranked["swing"].is_monotonic_decreasing
+        assert len(sensitivity.tornado(top=2)) == 2
+    
+    def test_weights(self):
+        """Consequence weights scale each scenario's contribution"""
+        scenarios, ipls = _portfolio()
+        portfolio = PortfolioLOPA(scenarios, ipls)
+        weights = np.where(scenarios["initiating_event"] == "Pump trip", 100.0, 1.0)
+        ranked = LOPASensitivity(portfolio, weights=weights).tornado()
+        assert ranked.iloc[0]["item"] == "Pump trip"
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the LOPA uncertainty module
+"""
+import sys
+import os
+import math
+import pytest
+import numpy as np
+import pandas as pd
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.lopa_batch import PortfolioLOPA
+from app.core.lopa_uncertainty import MonteCarloLOPA, log10_sigma
+
+
+def _portfolio(target: float = 1e-5, error_factor=None):
+    """One scenario with two IPLs plus one with none and a disabled layer"""
+    scenarios = pd.DataFrame({
+        "id": [1, 2, 3],
+        "initiating_event_frequency": [0.1, 0.01, 0.1],
+        "target_mitigated_frequency": [target, 1e-3, 1e-2],
+    })
+    ipls = pd.DataFrame({
+        "id": [11, 12, 31],
+        "lopa_scenario_id": [1, 1, 3],
+        "pfd": [0.01, 0.01, 0.1],
+        "is_enabled": [True, True, False],
+    })
+    if error_factor is not None:
+        ipls["error_factor"] = error_factor
+    return PortfolioLOPA(scenarios, ipls)
+
+
+class TestMonteCarloLOPA:
+    """Test cases for the MonteCarloLOPA class"""
+    
+    def test_log10_sigma(self):
+        """An error factor of 10 spans one decade at 1.645 sigma"""
+        assert log10_sigma(10.0) == pytest.approx(1 / 1.6448536, rel=1e-6)
+        assert log10_sigma(1.0) == 0.0
+    
+    def test_no_uncertainty_reproduces_point_values(self):
+        """Error factors of 1 collapse the distribution onto the point value"""
+        result = MonteCarloLOPA(_portfolio(), 1.0, 1.0).simulate(n_samples=100, seed=0)
+        assert result["median_frequency"].to_numpy() == pytest.approx([1e-5, 1e-2, 1e-1])
+        assert result["lower_bound"].to_numpy() == pytest.approx(result["upper_bound"].to_numpy())
+        assert list(result["probability_meets_target"]) == [1.0, 0.0, 0.0]
+    
+    def test_probability_matches_analytic(self):
+        """Probability of meeting the target follows the lognormal result"""
+        target = 10 ** -4.5
+        result = MonteCarloLOPA(_portfolio(target), 3.0, 3.0).simulate(n_samples=200000, seed=1)
+        
+        sigma = log10_sigma(3.0) * math.sqrt(3)
+        expected = 0.5 * (1 + math.erf(0.5 / sigma / math.sqrt(2)))
+        assert result["probability_meets_target"][0] == pytest.approx(expected, abs=0.005)
+        assert result["median_frequency"][0] == pytest.approx(1e-5, rel=0.02)
+        
+        # Mean of a lognormal exceeds its median
+        assert result["mean_frequency"][0] > result["median_frequency"][0]
+        assert result["upper_bound"][0] / 1e-5 == pytest.approx(10 ** (_z(0.95) * sigma), rel=0.03)
+    
+    def test_per_ipl_error_factors(self):
+        """Error factors are read per IPL row"""
+        wide = MonteCarloLOPA(_portfolio(error_factor=[10.0, 10.0, 3.0]), 1.0).simulate(5000, seed=2)
+        narrow = MonteCarloLOPA(_portfolio(error_factor=[1.0, 1.0, 3.0]), 1.0).simulate(5000, seed=2)
+        assert wide["upper_bound"][0] > narrow["upper_bound"][0]
+        assert narrow["upper_bound"][0] == pytest.approx(1e-5)
+    
+    def test_chunking(self):
+        """Small memory budgets give the same statistics as one large block"""
+        rng = np.random.default_rng(4)
+        n = 500
+        scenarios = pd.DataFrame({
+            "id": np.arange(n),
+            "initiating_event_frequency": 10.0 ** rng.uniform(-2, 0, n),
+            "target_mitigated_frequency": 1e-4,
+        })
+        n_ipls = rng.integers(0, 4, n)
+        ipls = pd.DataFrame({
+            "lopa_scenario_id": np.repeat(np.arange(n), n_ipls),
+            "pfd": rng.choice([0.1, 0.01], n_ipls.sum()),
+        })
+        portfolio = PortfolioLOPA(scenarios, ipls)
+        
+        small = MonteCarloLOPA(portfolio).simulate(4000, seed=5, max_elements=50000)
+        large = MonteCarloLOPA(portfolio).simulate(4000, seed=6)
+        
+        assert np.abs(small["probability_meets_target"] - large["probability_meets_target"]).max() < 0.05
+        point = portfolio.evaluate()["mitigated_frequency"].to_numpy()
+        assert np.allclose(np.log10(small["median_frequency"]), np.log10(point), atol=0.05)
+    
+    def test_large_portfolio(self):
+        """Thousands of scenarios with a thousand samples run in one simulation"""
+        rng = np.random.default_rng(7)
+        n = 5000
+        scenarios = pd.DataFrame({
+            "id": np.arange(n),
+            "initiating_event_frequency": 0.1,
+            "target_mitigated_frequency": 1e-4,
+        })
+        ipls = pd.DataFrame({"lopa_scenario_id": np.repeat(np.arange(n), 3), "pfd": 0.1})
+        result = MonteCarloLOPA(PortfolioLOPA(scenarios, ipls)).simulate(1000, seed=8)
+        assert result["probability_meets_target"].between(0.4, 0.6).all()
+
+
+def _z(p: float) -> float:
+    """Standard normal quantile by bisection"""
+    lo, hi = -10.0, 10.0
+    for _ in range(100):
+        mid = (lo + hi) / 2
+        if 0.5 * (1 + math.erf(mid / math.sqrt(2))) < p:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
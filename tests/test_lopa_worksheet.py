@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the LOPA worksheet import and export
+"""
+import sys
+import os
+import json
+import pytest
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.workbook.defined_name import DefinedName
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.ipl import IPLType
+from app.core.lopa_worksheet import LOPAWorksheet
+from app.utils.data_access import LOPAScenarioDAO
+
+
+def _study():
+    scenarios = pd.DataFrame({
+        "id": [1, 2],
+        "case_no": ["1-01", None],
+        "description": ["Tank overflow", "Pump seal leak"],
+        "initiating_event": ["Level control failure", "Seal failure"],
+        "initiating_event_frequency": [0.1, 0.01],
+        "target_mitigated_frequency": [1e-4, 1e-5],
+        "conditional_modifiers": [json.dumps({"Probability of Ignition": 0.1, "Occupancy": 0.5}), None],
+        "initiating_event_tag": ["LIC-101", None],
+    })
+    ipls = pd.DataFrame({
+        "id": [10, 11, 12, 20],
+        "lopa_scenario_id": [1, 1, 1, 2],
+        "name": ["LAH-101", "SIF-1", "SIF-2", "PSV-7"],
+        "description": ["High level alarm", "Feed trip", "Backup trip", "Relief valve"],
+        "ipl_type": [IPLType.ALARM.value, IPLType.SIS.value, IPLType.SIS.value, IPLType.RELIEF.value],
+        "pfd": [0.1, 0.01, 0.01, 0.01],
+        "is_enabled": [1, 1, 0, 1],
+        "equipment_tag": ["", "XV-1", "XV-2", "PSV-7"],
+        "sensor_tag": ["LT-1", "LT-2", "LT-3", ""],
+    })
+    return scenarios, ipls
+
+
+class TestLOPAWorksheet:
+    """Test cases for the LOPAWorksheet class"""
+    
+    def test_round_trip(self, tmp_path):
+        """Scenarios and IPLs written to a worksheet read back unchanged"""
+        path = tmp_path / "lopa.xlsx"
+        LOPAWorksheet.write(path, *_study())
+        scenarios, ipls = LOPAWorksheet.read(path)
+        
+        assert list(scenarios["case_no"]) == ["1-01", "2"]
+        assert scenarios["initiating_event_frequency"].tolist() == pytest.approx([0.1, 0.01])
+        assert scenarios["target_mitigated_frequency"].tolist() == pytest.approx([1e-4, 1e-5])
+        assert list(scenarios["initiating_event_tag"]) == ["LIC-101", ""]
+        modifiers = json.loads(scenarios["conditional_modifiers"].iloc[0])
+        # Modifiers without a worksheet column are kept in the other-condition column
+        assert modifiers == pytest.approx({"Probability of Ignition": 0.1, "Time at Risk or Other Condition": 0.5})
+        assert json.loads(scenarios["conditional_modifiers"].iloc[1]) == {}
+        
+        assert list(ipls["case_no"]) == ["1-01", "1-01", "1-01", "2"]
+        assert list(ipls["name"]) == ["LAH-101", "SIF-1", "SIF-2", "PSV-7"]
+        assert list(ipls["ipl_type"]) == [IPLType.ALARM.value, IPLType.SIS.value, IPLType.SIS.value, IPLType.RELIEF.value]
+        assert ipls["pfd"].tolist() == pytest.approx([0.1, 0.01, 0.01, 0.01])
+        assert list(ipls["is_enabled"]) == [1, 1, 0, 1]
+        assert list(ipls["equipment_tag"]) == ["", "XV-1", "XV-2", "PSV-7"]
+    
+    def test_defined_names(self, tmp_path):
+        """Columns are located through the workbook's defined names"""
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = "IPL List"
+        sheet.append([])
+        sheet.append(["Notes", "Scenario No", "IPL Type", "Credit Factor", "Control Loop ID"])
+        sheet.append(["moved", "7-02", "3 - SIS", 2, "SIF-9"])
+        sheet.append([None, None, "1 - BPCS", 1, "blank scenario is skipped"])
+        sheet.append([None, "7-02", "4 - Relief", 2, "n/a", None, "Relief valve"])
+        for name, column in (("IPL_Scenario", "B"), ("IPL_Type", "C"), ("IPL_Credit_Factor", "D"),
+                             ("IPL_Alarm", "E"), ("IPL_Gen_Desc", "G")):
+            workbook.defined_names.add(DefinedName(name, attr_text=f"'IPL List'!${column}$2"))
+        path = tmp_path / "moved.xlsx"
+        workbook.save(path)
+        
+        scenarios, ipls = LOPAWorksheet.read(path)
+        assert scenarios.empty
+        assert list(ipls["case_no"]) == ["7-02", "7-02"]
+        assert list(ipls["name"]) == ["SIF-9", "Relief valve"]
+        assert list(ipls["ipl_type"]) == [IPLType.SIS.value, IPLType.RELIEF.value]
+        assert ipls["pfd"].tolist() == pytest.approx([0.01, 0.01])
+    
+    def test_import_upserts(self, temp_db_manager, tmp_path):
+        """Importing twice updates scenarios and IPLs instead of duplicating them"""
+        path = tmp_path / "lopa.xlsx"
+        LOPAWorksheet.write(path, *_study())
+        assert LOPAScenarioDAO.import_worksheet(*LOPAWorksheet.read(path))
+        
+        scenarios, ipls = LOPAScenarioDAO.get_worksheet_frames()
+        assert list(scenarios["case_no"]) == ["1-01", "2"]
+        assert len(ipls) == 4
+        
+        changed_scenarios, changed_ipls = LOPAWorksheet.read(path)
+        changed_scenarios.loc[0, "initiating_event_frequency"] = 1.0
+        changed_ipls.loc[1, "pfd"] = 0.001
+        assert LOPAScenarioDAO.import_worksheet(changed_scenarios, changed_ipls, batch_size=1)
+        
+        scenarios, ipls = LOPAScenarioDAO.get_worksheet_frames()
+        assert len(scenarios) == 2 and len(ipls) == 4
+        assert scenarios.set_index("case_no").loc["1-01", "initiating_event_frequency"] == pytest.approx(1.0)
+        assert ipls.set_index("name").loc["SIF-1", "pfd"] == pytest.approx(0.001)
+    
+    def test_database_export(self, temp_db_manager, tmp_path):
+        """Scenarios stored without a case number are exported and re-imported under their id"""
+        LOPAScenarioDAO.add_or_update_lopa_scenario({
+            "description": "Overpressure", "initiating_event_frequency": 0.1, "target_mitigated_frequency": 1e-4
+        })
+        path = tmp_path / "export.xlsx"
+        LOPAWorksheet.write(path, *LOPAScenarioDAO.get_worksheet_frames())
+        assert LOPAScenarioDAO.import_worksheet(*LOPAWorksheet.read(path))
+        
+        scenarios, _ = LOPAScenarioDAO.get_worksheet_frames()
+        assert len(scenarios) == 1
+        assert scenarios["case_no"].iloc[0] == str(scenarios["id"].iloc[0])
+    
+    def test_large_worksheet(self, temp_db_manager, tmp_path):
+        """Tens of thousands of worksheet rows load in one import"""
+        rng = np.random.default_rng(0)
+        n, m = 20000, 50000
+        scenarios = pd.DataFrame({
+            "id": np.arange(1, n + 1),
+            "case_no": [f"{i // 100}-{i % 100:02d}" for i in range(n)],
+            "description": "Scenario",
+            "initiating_event_frequency": 10.0 ** -rng.integers(0, 3, n),
+            "target_mitigated_frequency": 1e-5,
+        })
+        ipls = pd.DataFrame({
+            "lopa_scenario_id": rng.integers(1, n + 1, m),
+            "name": rng.choice(["BPCS", "Alarm", "SIF"], m),
+            "ipl_type": rng.choice([t.value for t in IPLType], m),
+            "pfd": rng.choice([0.1, 0.01], m),
+            "is_enabled": 1,
+        })
+        path = tmp_path / "large.xlsx"
+        LOPAWorksheet.write(path, scenarios, ipls)
+        
+        assert LOPAScenarioDAO.import_worksheet(*LOPAWorksheet.read(path))
+        
+        stored_scenarios, stored_ipls = LOPAScenarioDAO.get_worksheet_frames()
+        assert len(stored_scenarios) == n
+        assert len(stored_ipls) == m
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the Markov unavailability module
+"""
+import sys
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.markov import MarkovSolver, build_generator, uniformised_step
+from app.core.pfdavg import PFDAvg
+from app.core.sif import SIFSubsystem
+
+
+T = 8760.0
+
+
+class TestMarkovSolver:
+    """Test cases for the MarkovSolver class"""
+    
+    def test_uniformisation(self):
+        """A two-state repairable component matches the closed form"""
+        rate, repair, hours = 0.01, 0.1, 50.0
+        rows, cols, rates = np.array([0, 1]), np.array([1, 0]), np.array([rate, repair])
+        end, integral = uniformised_step(np.array([1.0, 0.0]), rows, cols, rates, hours)
+        total = rate + repair
+        q = lambda t: rate / total * (1 - np.exp(-total * t))
+        assert end[1] == pytest.approx(q(hours))
+        assert integral[1] == pytest.approx(rate / total * (hours - (1 - np.exp(-total * hours)) / total))
+        assert integral.sum() == pytest.approx(hours)
+    
+    def test_generator_rows(self):
+        """Every state of the generator conserves probability and voting marks failed states"""
+        rows, cols, rates, n_states, failed = build_generator(2, [1e-6] * 3, [2e-6] * 3, 0.1, 0.05, 8.0, 8.0)
+        assert n_states == 4 ** 3
+        assert np.all(rows != cols) and np.all(rates > 0)
+        # 2oo3 fails once two channels are down
+        assert not failed[0] and failed.sum() == n_states - 1 - 3 * 3
+    
+    def test_agrees_with_simplified_equations(self):
+        """For identical channels tested together the Markov model matches IEC 61508-6"""
+        for architecture in ["1oo1", "1oo2", "2oo2", "2oo3", "2oo4"]:
+            markov = MarkovSolver.unavailability(architecture, 1e-6, 5e-7, T, 8.0, 0.1)
+            m, n = int(architecture[0]), int(architecture[-1])
+            simplified = PFDAvg.moon(m, n, 1e-6, 5e-7, T, 8.0, 0.1)[()]
+            if architecture == "2oo2":
+                # The simplified equation counts a common cause failure once per channel
+                simplified *= (2 - 0.1) / 2
+            assert markov == pytest.approx(simplified, rel=0.02)
+    
+    def test_staggered_and_mixed_channels(self):
+        """Staggered testing helps redundant channels and mixed channels sit between the pure cases"""
+        together = MarkovSolver.unavailability("1oo2", 2e-6, 0.0, T, 8.0, 0.05)
+        staggered = MarkovSolver.unavailability("1oo2", 2e-6, 0.0, T, 8.0, 0.05, staggered=True)
+        assert staggered < together
+        assert MarkovSolver.unavailability("1oo1", 2e-6, 0.0, T, 8.0, staggered=True) == pytest.approx(
+            MarkovSolver.unavailability("1oo1", 2e-6, 0.0, T, 8.0))
+        
+        low = MarkovSolver.unavailability("1oo2", 1e-6, 0.0, T, 8.0, 0.05)
+        high = MarkovSolver.unavailability("1oo2", 4e-6, 0.0, T, 8.0, 0.05)
+        mixed = MarkovSolver.unavailability("1oo2", [1e-6, 4e-6], 0.0, T, 8.0, 0.05)
+        assert low < mixed < high
+    
+    def test_cache(self):
+        """Subsystems sharing a configuration are solved once"""
+        MarkovSolver.clear_cache()
+        rng = np.random.default_rng(5)
+        n = 300
+        frame = pd.DataFrame({
+            "sif_id": np.arange(n) // 3,
+            "architecture": rng.choice(["1oo2", "2oo3", "2oo4"], n),
+            "pfd_per_component": rng.choice([0.01, 0.02], n),
+            "beta": 0.1,
+            "test_interval_months": rng.choice([12, 24], n),
+            "dc": 0.6,
+            "mttr_hours": 8.0,
+        })
+        evaluated = MarkovSolver.evaluate_subsystems(frame)
+        info = MarkovSolver.cache_info()
+        assert info["misses"] <= 12
+        assert evaluated["pfd_markov"].to_numpy() == pytest.approx(evaluated["pfd_avg"].to_numpy(), rel=0.05)
+        
+        again = MarkovSolver.evaluate_subsystems(frame)
+        assert MarkovSolver.cache_info()["misses"] == info["misses"]
+        assert list(again["pfd_markov"]) == list(evaluated["pfd_markov"])
+        
+        row = frame.iloc[0]
+        subsystem = SIFSubsystem("S", row["architecture"], row["pfd_per_component"], beta=0.1,
+                                 test_interval_months=int(row["test_interval_months"]), dc=0.6, mttr_hours=8.0)
+        assert subsystem.calculate_pfd_markov() == pytest.approx(evaluated.loc[0, "pfd_markov"])
+    
+    def test_invalid(self):
+        """Unsupported configurations are rejected"""
+        with pytest.raises(ValueError):
+            MarkovSolver.unavailability("1oo8", 1e-6, 0.0, T)
+        with pytest.raises(ValueError):
+            MarkovSolver.unavailability("1oo2", 1e-6, 0.0, 0.0)
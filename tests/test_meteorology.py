@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the meteorological data module
+"""
+import sys
+import os
+import io
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.meteorology import (
+    MetFrequencyTable, STABILITY_CLASSES, build_frequency_table,
+    solar_elevation, turner_stability
+)
+from app.utils.data_access import MetDataDAO
+
+
+def _synthetic_met_csv(n_hours: int, seed: int = 0) -> io.StringIO:
+    """Create a synthetic hourly met CSV file"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "timestamp": pd.date_range("2010-01-01", periods=n_hours, freq="h"),
+        "wind_speed_ms": rng.gamma(2.0, 2.0, n_hours).round(1),
+        "wind_direction_deg": rng.uniform(0, 360, n_hours).round(0),
+        "cloud_cover_tenths": rng.integers(0, 11, n_hours),
+        "ceiling_height_m": rng.choice([np.nan, 1500.0, 4000.0], n_hours),
+    })
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    buffer.seek(0)
+    return buffer
+
+
+class TestSolarElevation:
+    """Test cases for the solar elevation calculation"""
+    
+    def test_noon_and_midnight(self):
+        """Sun is up at noon and down at midnight in mid-summer"""
+        ts = pd.Series(pd.to_datetime(["2020-06-21 12:00", "2020-06-21 00:00"]))
+        elevation = solar_elevation(ts, 51.5, 0.0)
+        assert elevation[0] == pytest.approx(62.0, abs=1.0)
+        assert elevation[1] < 0
+
+
+class TestTurnerStability:
+    """Test cases for the Turner stability classification"""
+    
+    def test_strong_sun_light_wind_is_unstable(self):
+        """Strong insolation and light wind give class A"""
+        assert turner_stability([1.0], [0], [np.nan], [65.0])[0] == STABILITY_CLASSES.index("A")
+    
+    def test_clear_night_light_wind_is_stable(self):
+        """Clear night with light wind gives class F"""
+        assert turner_stability([1.0], [2], [np.nan], [-20.0])[0] == STABILITY_CLASSES.index("F")
+    
+    def test_overcast_low_ceiling_is_neutral(self):
+        """Overcast with a low ceiling gives class D day or night"""
+        result = turner_stability([2.0, 2.0], [10, 10], [1000.0, 1000.0], [40.0, -10.0])
+        assert list(result) == [3, 3]
+    
+    def test_strong_wind_is_neutral(self):
+        """Strong wind gives class D at night"""
+        assert turner_stability([10.0], [2], [np.nan], [-20.0])[0] == 3
+
+
+class TestMetFrequencyTable:
+    """Test cases for the MetFrequencyTable class"""
+    
+    def test_add_observations(self):
+        """Observations are binned by speed, stability and sector"""
+        table = MetFrequencyTable.empty(n_sectors=4)
+        table.add_observations(np.array([1.0, 1.0, 6.0]), np.array([5, 5, 3]), np.array([0.0, 350.0, 90.0]))
+        
+        assert table.total_hours == 3
+        assert table.counts[0, 5, 0] == 2  # 350° falls in the north sector
+        assert table.counts[3, 3, 1] == 1
+        assert table.stability_frequencies()["F"] == pytest.approx(2 / 3)
+        assert table.most_frequent_condition()["stability_class"] == "F"
+    
+    def test_records_round_trip(self):
+        """Tables survive conversion to and from database records"""
+        table = MetFrequencyTable.empty(n_sectors=8, site="Plant A")
+        table.add_observations(np.array([2.0, 4.0]), np.array([1, 4]), np.array([45.0, 180.0]))
+        
+        records = table.to_records()
+        restored = MetFrequencyTable.from_records(records, "Plant A")
+        
+        assert len(records) == 2
+        assert restored.n_sectors == 8
+        assert np.array_equal(restored.counts, table.counts)
+
+
+class TestBuildFrequencyTable:
+    """Test cases for streaming met files into frequency tables"""
+    
+    def test_chunked_reads_match_single_read(self):
+        """Chunk size does not change the result"""
+        table_small = build_frequency_table(_synthetic_met_csv(1000), 51.5, 0.0, chunksize=97)
+        table_large = build_frequency_table(_synthetic_met_csv(1000), 51.5, 0.0, chunksize=10000)
+        
+        assert table_small.total_hours == 1000
+        assert np.array_equal(table_small.counts, table_large.counts)
+    
+    def test_ten_years(self):
+        """Ten years of hourly data are counted in full"""
+        source = _synthetic_met_csv(24 * 365 * 10)
+        table = build_frequency_table(source, 51.5, 0.0, site="Plant A")
+        assert table.total_hours == 24 * 365 * 10
+
+
+class TestMetDataDAO:
+    """Tests for MetDataDAO class"""
+    
+    def test_save_and_get_frequency_records(self, temp_db_manager):
+        """Frequency tables are stored per site and cached"""
+        table = MetFrequencyTable.empty(n_sectors=4, site="Plant A")
+        table.add_observations(np.array([1.0, 6.0]), np.array([5, 3]), np.array([0.0, 90.0]))
+        
+        assert MetDataDAO.save_frequency_records("Plant A", table.to_records())
+        assert MetDataDAO.get_sites() == ["Plant A"]
+        
+        records = MetDataDAO.get_frequency_records("Plant A")
+        assert MetDataDAO.get_frequency_records("Plant A") is records
+        assert np.array_equal(MetFrequencyTable.from_records(records).counts, table.counts)
+        
+        # Saving again invalidates the cache
+        assert MetDataDAO.save_frequency_records("Plant A", [])
+        assert MetDataDAO.get_frequency_records("Plant A") == []
+    
+    def test_cache_is_per_database(self, temp_db_manager, tmp_path):
+        """A cached table of one database is not served for another"""
+        from app.utils.database import DatabaseManager
+        from app.utils.init_db import init_database
+        
+        table = MetFrequencyTable.empty(n_sectors=4, site="Plant A")
+        table.add_observations(np.array([1.0]), np.array([5]), np.array([0.0]))
+        assert MetDataDAO.save_frequency_records("Plant A", table.to_records())
+        assert MetDataDAO.get_frequency_records("Plant A")
+        
+        other = DatabaseManager(str(tmp_path / "other" / "test_hazop.db"))
+        with patch('app.utils.init_db.get_db_manager', return_value=other), \
+                patch('app.utils.init_db.load_sample_data'):
+            init_database()
+        with patch('app.utils.data_access.get_db_manager', return_value=other):
+            assert MetDataDAO.get_frequency_records("Plant A") == []
+        other.engine.dispose()
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the time-dependent PFD module
+"""
+import sys
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.ipl import IPL, LOPAScenario
+from app.core.sif import SIFSubsystem
+from app.core.lopa_batch import PortfolioLOPA
+from app.core.pfd_timeseries import PFDTimeSeries, PortfolioPFDTimeSeries, HOURS_PER_MONTH
+
+
+class TestPFDTimeSeries:
+    """Test cases for the PFDTimeSeries class"""
+    
+    def test_sawtooth_average_equals_pfd(self):
+        """The sawtooth averages to PFDavg and peaks at twice it for a single channel"""
+        t = PFDTimeSeries.time_grid(horizon_years=5, step_hours=1)
+        u = PFDTimeSeries.sawtooth(t, 0.01, 8760)
+        assert u.mean() == pytest.approx(0.01, rel=1e-3)
+        assert u.max() == pytest.approx(0.02, rel=1e-3)
+        assert u[0] == 0.0
+    
+    def test_redundant_order(self):
+        """A second-order sawtooth also averages to PFDavg"""
+        t = PFDTimeSeries.time_grid(horizon_years=2, step_hours=1)
+        u = PFDTimeSeries.sawtooth(t, 0.001, 4380, order=2)
+        assert u.mean() == pytest.approx(0.001, rel=1e-3)
+        assert u.max() == pytest.approx(0.003, rel=1e-3)
+    
+    def test_repair_window_and_offset(self):
+        """Layers stay at their peak during repair, and offsets shift the tests"""
+        t = np.array([0.0, 10.0, 30.0, 1000.0])
+        u = PFDTimeSeries.sawtooth(t, [0.01, 0.01], [1000.0, 1000.0], [24.0, 0.0], [0.0, 500.0])
+        assert u.shape == (2, 4)
+        assert u[0, 0] == pytest.approx(0.02)
+        assert u[0, 1] == pytest.approx(0.02)
+        assert u[0, 2] == pytest.approx(0.02 * 0.03)
+        assert u[1, 0] == pytest.approx(0.01)
+        assert u[1, 3] == pytest.approx(0.01)
+    
+    def test_subsystem_and_sif(self):
+        """SIF unavailability is the sum of its subsystems"""
+        t = PFDTimeSeries.time_grid(horizon_years=2, step_hours=1)
+        sensor = SIFSubsystem("PT", "1oo1", 0.005, test_interval_months=12)
+        valve = SIFSubsystem("XV", "1oo1", 0.002, test_interval_months=6)
+        total = PFDTimeSeries.sif_unavailability([sensor, valve], t)
+        assert total.mean() == pytest.approx(0.007, rel=1e-2)
+        assert np.allclose(total, PFDTimeSeries.subsystem_unavailability(sensor, t)
+                           + PFDTimeSeries.subsystem_unavailability(valve, t))
+    
+    def test_scenario_frequency_and_peaks(self):
+        """Scenario frequency combines layers, and peak windows are reported"""
+        t = PFDTimeSeries.time_grid(horizon_years=1, step_hours=24)
+        scenario = LOPAScenario(
+            initiating_event_frequency=0.1,
+            ipls=[IPL(name="PSV", pfd=0.01, audit_frequency_months=12), IPL(name="BPCS", pfd=0.1, is_enabled=False)],
+            conditional_modifiers={"occupancy": 0.5},
+            target_mitigated_frequency=5e-4
+        )
+        frequency = PFDTimeSeries.scenario_frequency(scenario, t)
+        # The one-year horizon runs a few days past the 360-day audit interval
+        assert frequency.mean() == pytest.approx(scenario.mitigated_frequency, rel=3e-2)
+        
+        windows = PFDTimeSeries.peak_windows(t, frequency, scenario.target_mitigated_frequency)
+        assert len(windows) == 1
+        assert windows["start_hours"].iloc[0] == pytest.approx(12 * HOURS_PER_MONTH / 2, abs=24)
+        assert windows["peak_frequency"].iloc[0] == pytest.approx(frequency.max())
+
+
+class TestPortfolioPFDTimeSeries:
+    """Test cases for the PortfolioPFDTimeSeries class"""
+    
+    def _portfolio(self, n=50, offsets=None, seed=0):
+        rng = np.random.default_rng(seed)
+        scenarios = pd.DataFrame({
+            "id": np.arange(n) + 100,
+            "initiating_event_frequency": 10.0 ** rng.uniform(-2, 0, n),
+            "target_mitigated_frequency": 1e-5,
+            "conditional_modifiers": None,
+        })
+        m = 3 * n
+        ipls = pd.DataFrame({
+            "id": np.arange(m),
+            "lopa_scenario_id": rng.integers(0, n, m) + 100,
+            "pfd": rng.choice([0.1, 0.01], m),
+            "is_enabled": rng.random(m) > 0.1,
+            "audit_frequency_months": rng.choice([6, 12, 24], m),
+            "test_offset_months": offsets(rng, m) if offsets else rng.choice([0, 3], m),
+            "mttr_hours": rng.choice([0.0, 48.0], m),
+        })
+        return PortfolioLOPA(scenarios, ipls)
+    
+    def _brute_force(self, series, position, t):
+        portfolio = series.portfolio
+        rows, offsets = portfolio.scenario_ipl_rows()
+        frequency = np.full(len(t), portfolio.initiating_frequency[position])
+        for row in rows[offsets[position]:offsets[position + 1]]:
+            if portfolio.ipl_enabled[row]:
+                frequency *= PFDTimeSeries.sawtooth(
+                    t, portfolio.ipl_pfd[row], series.interval_hours[row],
+                    series.mttr_hours[row], series.offset_hours[row]
+                )
+        return frequency
+    
+    @pytest.mark.parametrize("offsets", [None, lambda rng, m: rng.uniform(0, 12, m)])
+    def test_matches_layer_by_layer(self, offsets):
+        """Grouped schedules and distinct schedules both match a per-layer product"""
+        series = PortfolioPFDTimeSeries(self._portfolio(offsets=offsets))
+        t = PFDTimeSeries.time_grid(horizon_years=3, step_hours=24)
+        for position in range(10):
+            profile = series.profile(series.portfolio.scenario_ids[position], horizon_years=3)
+            expected = self._brute_force(series, position, t)
+            assert np.allclose(profile["mitigated_frequency"], expected, rtol=1e-9, atol=1e-30)
+    
+    def test_simulate_summary(self):
+        """Mean frequencies track the point LOPA result and blocks agree with one pass"""
+        series = PortfolioPFDTimeSeries(self._portfolio())
+        whole = series.simulate(horizon_years=4, step_hours=24)
+        blocked = series.simulate(horizon_years=4, step_hours=24, max_elements=5000)
+        # Peaks repeat every test cycle, so only the peak value is compared
+        columns = [c for c in whole.columns if c != "peak_time_years"]
+        pd.testing.assert_frame_equal(whole[columns], blocked[columns])
+        
+        assert (whole["peak_frequency"] >= whole["mean_frequency"] * (1 - 1e-12)).all()
+        assert whole["fraction_above_target"].between(0, 1).all()
+        single = whole[whole["mitigated_frequency"] == series.portfolio.initiating_frequency]
+        assert np.allclose(single["mean_frequency"], single["mitigated_frequency"])
+    
+    def test_large_portfolio(self):
+        """Ten thousand scenarios on a daily grid over ten years run in one pass"""
+        series = PortfolioPFDTimeSeries(self._portfolio(n=10000))
+        result = series.simulate(horizon_years=10, step_hours=24)
+        assert len(result) == 10000
+        assert (result["peak_frequency"] >= result["mean_frequency"] * (1 - 1e-12)).all()
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the PFDavg module
+"""
+import sys
+import os
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from sqlalchemy import text
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.pfdavg import PFDAvg, parse_architecture, sil_from_pfd, sil_from_pfh, demand_mode, HOURS_PER_MONTH
+from app.core.sif import SIL, SIFSubsystem, SIF
+from app.utils.data_access import SIFDAO
+from app.utils.init_db import init_database
+
+
+T = 8760.0
+MTTR = 8.0
+
+
+class TestPFDAvg:
+    """Test cases for the PFDAvg class"""
+    
+    def test_parse_architecture(self):
+        """Architectures split into M and N"""
+        assert parse_architecture("2oo3") == (2, 3)
+        assert parse_architecture("1OO2") == (1, 2)
+        for invalid in ["3oo2", "0oo1", "two of three"]:
+            with pytest.raises(ValueError):
+                parse_architecture(invalid)
+    
+    def test_standard_equations(self):
+        """Results match the IEC 61508-6 equations written out by hand"""
+        du, dd, beta, beta_d = 2e-6, 3e-6, 0.1, 0.05
+        ld = du + dd
+        t_ce = du / ld * (T / 2 + MTTR) + dd / ld * MTTR
+        t_ge = du / ld * (T / 3 + MTTR) + dd / ld * MTTR
+        rate = (1 - beta_d) * dd + (1 - beta) * du
+        ccf = beta * du * (T / 2 + MTTR) + beta_d * dd * MTTR
+        
+        expected = {
+            (1, 1): ld * t_ce,
+            (2, 2): 2 * ld * t_ce,
+            (1, 2): 2 * rate ** 2 * t_ce * t_ge + ccf,
+            (2, 3): 6 * rate ** 2 * t_ce * t_ge + ccf,
+        }
+        for (m, n), value in expected.items():
+            assert PFDAvg.moon(m, n, du, dd, T, MTTR, beta, beta_d)[()] == pytest.approx(value)
+    
+    def test_failure_rates_round_trip(self):
+        """A 1oo1 subsystem reproduces the single-channel PFD it was derived from"""
+        pfd = np.array([0.01, 0.005, 0.02])
+        dc = np.array([0.0, 0.6, 0.9])
+        du, dd = PFDAvg.failure_rates(pfd, T, dc, MTTR)
+        assert dd / (du + dd) == pytest.approx(dc)
+        assert PFDAvg.moon(1, 1, du, dd, T, MTTR) == pytest.approx(pfd)
+    
+    def test_parameters_matter(self):
+        """Common cause, coverage and test interval all change redundant PFDavg"""
+        base = SIFSubsystem("PT", "1oo2", 0.01, beta=0.1, test_interval_months=12).calculate_pfd_avg()
+        assert SIFSubsystem("PT", "1oo2", 0.01, beta=0.02).calculate_pfd_avg() < base
+        assert SIFSubsystem("PT", "1oo2", 0.01, dc=0.9).calculate_pfd_avg() < base
+        # A fixed single-channel PFD means a longer interval implies lower failure rates
+        du_12, _ = PFDAvg.failure_rates(0.01, 12 * 720)
+        longer = PFDAvg.moon(1, 2, du_12, 0.0, 24 * 720, 24.0)[()]
+        assert longer > base
+        # Voting order
+        pfds = PFDAvg.moon_from_pfd(["1oo3", "1oo2", "2oo3", "1oo1", "2oo2"], 0.01, T)
+        assert np.all(np.diff(pfds) > 0)
+    
+    def test_vectorized_matches_scalar(self):
+        """A frame of subsystems evaluates to the same values as one at a time"""
+        rng = np.random.default_rng(3)
+        architectures = ["1oo1", "1oo2", "2oo2", "2oo3", "2oo4"]
+        frame = pd.DataFrame({
+            "sif_id": rng.integers(0, 20, 200),
+            "architecture": rng.choice(architectures, 200),
+            "pfd_per_component": rng.uniform(0.001, 0.05, 200),
+            "beta": rng.uniform(0.02, 0.2, 200),
+            "test_interval_months": rng.integers(1, 48, 200),
+            "dc": rng.uniform(0, 0.9, 200),
+            "mttr_hours": rng.uniform(4, 72, 200),
+        })
+        evaluated = PFDAvg.evaluate_subsystems(frame)
+        scalar = [SIFSubsystem("S", **row).calculate_pfd_avg()
+                  for row in frame.drop(columns="sif_id").to_dict("records")]
+        assert evaluated["pfd_avg"].to_numpy() == pytest.approx(scalar)
+        assert list(evaluated["sil"]) == [SIL.from_pfd(p).value for p in scalar]
+        
+        sifs = pd.DataFrame({"id": range(20), "required_sil": 2})
+        results = PFDAvg.evaluate_sifs(frame, sifs)
+        totals = evaluated.groupby("sif_id")["pfd_avg"].sum()
+        assert results.set_index("sif_id")["pfd_avg"].to_numpy() == pytest.approx(totals.clip(upper=1).to_numpy())
+        assert list(results["meets_sil"]) == list(results["achieved_sil"] >= 2)
+    
+    def test_given_failure_rates(self):
+        """Explicit failure rates take precedence over pfd_per_component"""
+        frame = pd.DataFrame({
+            "architecture": ["1oo2", "1oo2"],
+            "pfd_per_component": [0.01, 0.01],
+            "test_interval_months": [12, 12],
+            "lambda_du": [1e-6, None],
+            "lambda_dd": [0.0, None],
+        })
+        evaluated = PFDAvg.evaluate_subsystems(frame)
+        assert evaluated.loc[0, "pfd_avg"] == pytest.approx(PFDAvg.moon(1, 2, 1e-6, 0.0, 8640, 24.0)[()])
+        assert evaluated.loc[1, "pfd_avg"] == pytest.approx(SIFSubsystem("S", "1oo2", 0.01).calculate_pfd_avg())
+    
+    def test_sil_from_pfd(self):
+        """Vectorized SIL bands match SIL.from_pfd"""
+        pfds = np.array([0.5, 0.1, 0.05, 0.01, 0.001, 0.0005, 0.0001, 1e-6])
+        assert list(sil_from_pfd(pfds)) == [SIL.from_pfd(p).value for p in pfds]
+    
+    def test_large_array(self):
+        """Half a million subsystems evaluate in one call"""
+        n = 500_000
+        rng = np.random.default_rng(0)
+        m = rng.integers(1, 3, n)
+        pfd = PFDAvg.moon(m, m + rng.integers(0, 3, n), rng.uniform(1e-7, 1e-5, n),
+                          rng.uniform(0, 1e-5, n), rng.uniform(720, 4 * T, n), 8.0, 0.1)
+        assert np.all((pfd >= 0) & (pfd <= 1))
+
+
+class TestSpuriousTrips:
+    """Test cases for spurious trip rates"""
+    
+    def test_standard_equations(self):
+        """Spurious trip rates match the usual voting formulas"""
+        rate, mttr, beta = 2e-6, 8.0, 0.1
+        independent = (1 - beta) * rate
+        expected = {
+            (1, 1): rate,
+            (1, 2): 2 * independent + beta * rate,
+            (2, 2): 2 * independent ** 2 * mttr + beta * rate,
+            (2, 3): 6 * independent ** 2 * mttr + beta * rate,
+            (2, 4): 12 * independent ** 2 * mttr + beta * rate,
+        }
+        for (m, n), value in expected.items():
+            assert PFDAvg.spurious_trip_rate(m, n, rate, mttr, beta)[()] == pytest.approx(value)
+    
+    def test_same_pass_as_pfd(self):
+        """Subsystem and SIF evaluations carry spurious trip rates next to PFDavg"""
+        frame = pd.DataFrame({
+            "sif_id": [1, 1, 2],
+            "architecture": ["1oo2", "1oo1", "2oo3"],
+            "pfd_per_component": [0.01, 0.001, 0.01],
+            "test_interval_months": [12, 12, 12],
+            "lambda_s": [1e-6, None, 1e-6],
+        })
+        evaluated = PFDAvg.evaluate_subsystems(frame)
+        assert evaluated.loc[0, "spurious_trip_rate"] == pytest.approx(1.9e-6 * 8760)
+        # Without a recorded safe failure rate it defaults to the dangerous rate
+        assert evaluated.loc[1, "lambda_s"] == pytest.approx(evaluated.loc[1, "lambda_du"] + evaluated.loc[1, "lambda_dd"])
+        
+        results = PFDAvg.evaluate_sifs(frame).set_index("sif_id")
+        assert results.loc[1, "spurious_trip_rate"] == pytest.approx(evaluated.loc[:1, "spurious_trip_rate"].sum())
+        assert results.loc[2, "mttf_spurious_years"] == pytest.approx(1 / evaluated.loc[2, "spurious_trip_rate"])
+        
+        subsystem = SIFSubsystem("PT", "1oo2", 0.01, lambda_s=1e-6)
+        assert subsystem.calculate_spurious_trip_rate() == pytest.approx(evaluated.loc[0, "spurious_trip_rate"])
+    
+    def test_compare_architectures(self):
+        """The comparison table shows the PFD versus spurious trip trade-off for every SIF"""
+        rng = np.random.default_rng(7)
+        frame = pd.DataFrame({
+            "sif_id": np.repeat(np.arange(100), 3),
+            "architecture": rng.choice(["1oo1", "1oo2"], 300),
+            "pfd_per_component": rng.uniform(0.001, 0.02, 300),
+            "test_interval_months": 12,
+            "lambda_s": 1e-6,
+        })
+        comparison = PFDAvg.compare_architectures(frame)
+        assert len(comparison) == 300 * 5
+        
+        first = comparison[comparison.index // 5 == 0].set_index("candidate_architecture")
+        assert first.loc["1oo2", "pfd_avg"] < first.loc["2oo3", "pfd_avg"] < first.loc["1oo1", "pfd_avg"]
+        assert first.loc["2oo3", "spurious_trip_rate"] < first.loc["1oo1", "spurious_trip_rate"] \
+            < first.loc["1oo2", "spurious_trip_rate"]
+        
+        # Keeping the current vote reproduces the SIF totals
+        current = comparison[comparison["candidate_architecture"] == comparison["architecture"]]
+        totals = PFDAvg.evaluate_sifs(frame).set_index("sif_id")
+        assert current["sif_pfd_avg"].to_numpy() == pytest.approx(totals.loc[current["sif_id"], "pfd_avg"].to_numpy())
+        assert current["sif_spurious_trip_rate"].to_numpy() == pytest.approx(
+            totals.loc[current["sif_id"], "spurious_trip_rate"].to_numpy())
+
+
+class TestHighDemand:
+    """Test cases for PFH and demand mode selection"""
+    
+    def test_standard_equations(self):
+        """PFH matches the IEC 61508-6 high demand equations written out by hand"""
+        du, dd, beta, beta_d = 2e-6, 3e-6, 0.1, 0.05
+        ld = du + dd
+        t_ce = du / ld * (T / 2 + MTTR) + dd / ld * MTTR
+        rate = (1 - beta_d) * dd + (1 - beta) * du
+        expected = {
+            (1, 1): du,
+            (2, 2): 2 * du,
+            (1, 2): 2 * rate * (1 - beta) * du * t_ce + beta * du,
+            (2, 3): 6 * rate * (1 - beta) * du * t_ce + beta * du,
+        }
+        for (m, n), value in expected.items():
+            assert PFDAvg.pfh(m, n, du, dd, T, MTTR, beta, beta_d)[()] == pytest.approx(value)
+        
+        assert list(sil_from_pfh([2e-5, 5e-6, 5e-7, 5e-8, 5e-9])) == [0, 1, 2, 3, 4]
+        subsystem = SIFSubsystem("PT", "1oo2", 0.01, beta=0.1, dc=0.6, mttr_hours=MTTR)
+        hours = 12 * HOURS_PER_MONTH
+        du, dd = PFDAvg.failure_rates(0.01, hours, 0.6, MTTR)
+        assert subsystem.calculate_pfh() == pytest.approx(PFDAvg.pfh(1, 2, du, dd, hours, MTTR, 0.1)[()])
+    
+    def test_demand_mode(self):
+        """More than one demand a year, or more than two per proof test interval, is high demand"""
+        modes = demand_mode([0.1, 1.0, 2.0, 0.5, np.nan], [1.0, 1.0, 1.0, 5.0, 1.0])
+        assert list(modes) == ["Low", "Low", "High", "High", "Low"]
+    
+    def test_same_pass_as_pfd(self):
+        """SIF results carry both metrics and take the SIL of their demand mode"""
+        frame = pd.DataFrame({
+            "sif_id": [1, 1, 2, 2],
+            "architecture": ["1oo2", "1oo1", "1oo2", "1oo1"],
+            "pfd_per_component": [0.01, 0.001, 0.01, 0.001],
+            "test_interval_months": 12,
+            "demand_rate": [0.1, 0.1, 5.0, 5.0],
+        })
+        results = PFDAvg.evaluate_sifs(frame).set_index("sif_id")
+        evaluated = PFDAvg.evaluate_subsystems(frame)
+        assert results["pfh"].to_numpy() == pytest.approx(evaluated.groupby("sif_id")["pfh"].sum().to_numpy())
+        assert list(results["demand_mode"]) == ["Low", "High"]
+        assert results.loc[1, "achieved_sil"] == results.loc[1, "pfd_sil"]
+        assert results.loc[2, "achieved_sil"] == results.loc[2, "pfh_sil"]
+        # Without a demand rate every SIF is low demand, as before
+        plain = PFDAvg.evaluate_sifs(frame.drop(columns="demand_rate"))
+        assert list(plain["achieved_sil"]) == list(plain["pfd_sil"])
+
+
+class TestPartialTesting:
+    """Test cases for proof test coverage and partial stroke testing"""
+    
+    def test_single_channel_sawtooth(self):
+        """A single channel PFD is the sum of the sawtooth averages of each test"""
+        du, tm = 2e-6, 20 * T
+        imperfect = PFDAvg.moon_partial_test(1, 1, du, 0.0, T, MTTR, proof_test_coverage=0.9, mission_time_hours=tm)
+        assert imperfect[()] == pytest.approx(du * (0.9 * T / 2 + 0.1 * tm / 2 + MTTR))
+        pst = PFDAvg.moon_partial_test(1, 1, du, 0.0, T, MTTR, pst_interval_hours=T / 12, pst_coverage=0.6,
+                                       mission_time_hours=tm)
+        assert pst[()] == pytest.approx(du * (0.6 * T / 24 + 0.4 * T / 2 + MTTR))
+    
+    def test_full_coverage_matches_moon(self):
+        """Perfect proof tests without partial stroke tests agree with the standard equations"""
+        for m, n in [(1, 1), (1, 2), (2, 2), (2, 3), (1, 3)]:
+            standard = PFDAvg.moon(m, n, 2e-6, 1e-6, T, MTTR, 0.1)[()]
+            sawtooth = PFDAvg.moon_partial_test(m, n, 2e-6, 1e-6, T, MTTR, 0.1, mission_time_hours=10 * T)[()]
+            assert sawtooth == pytest.approx(standard, rel=0.02)
+        with pytest.raises(ValueError):
+            PFDAvg.moon_partial_test(1, 1, 2e-6, 0.0, T, proof_test_coverage=0.5, pst_coverage=0.6,
+                                     pst_interval_hours=T / 12)
+    
+    def test_strategy_study(self):
+        """Many valves and PST strategies are evaluated at once and more testing always helps"""
+        frame = pd.DataFrame({
+            "sif_id": np.repeat(np.arange(200), 2),
+            "subsystem_type": np.tile(["Sensor", "Final Element"], 200),
+            "architecture": np.tile(["1oo1", "1oo2"], 200),
+            "pfd_per_component": 0.01,
+            "proof_test_coverage": 0.8,
+        })
+        study = PFDAvg.compare_pst_strategies(frame, [1, 3, 6], [0.0, 0.4, 0.6, 0.9])
+        # Coverage 0.9 exceeds the proof test coverage and is skipped
+        assert len(study) == 200 * 3 * 3
+        tested = study[study["pst_coverage"] > 0]
+        grid = tested.pivot_table(index=["sif_id", "pst_coverage"], columns="pst_interval_months", values="pfd_avg")
+        assert np.all(np.diff(grid.to_numpy(), axis=1) > 0)
+        by_coverage = study[study["pst_interval_months"] == 1].pivot(index="sif_id", columns="pst_coverage",
+                                                                        values="sif_pfd_avg")
+        assert np.all(np.diff(by_coverage.to_numpy(), axis=1) < 0)
+        
+        # One subsystem at a time gives the same numbers
+        row = study.iloc[5]
+        valve = SIFSubsystem("XV", "1oo2", 0.01, subsystem_type="Final Element", proof_test_coverage=0.8,
+                             pst_interval_months=row["pst_interval_months"], pst_coverage=row["pst_coverage"])
+        assert valve.calculate_pfd_avg() == pytest.approx(row["pfd_avg"], rel=1e-3)
+        with pytest.raises(ValueError):
+            SIFSubsystem("PT", "1oo1", 0.01, pst_interval_months=3, pst_coverage=0.5)
+        with pytest.raises(ValueError):
+            SIFSubsystem("XV", "1oo1", 0.01, subsystem_type="Final Element", proof_test_coverage=0.5,
+                         pst_interval_months=3, pst_coverage=0.6)
+    
+    def test_migrated_subsystems(self, temp_db_manager):
+        """Subsystems stored before the test parameters existed load at the defaults"""
+        assert SIFDAO.add_or_update_sif({"name": "PAHH-101", "required_sil": 1})
+        sif = SIFDAO.get_all_sifs()[0]
+        session = temp_db_manager.get_session()
+        try:
+            for column in ("proof_test_coverage", "pst_interval_months", "pst_coverage", "mission_time_years"):
+                session.execute(text(f"ALTER TABLE sif_subsystems DROP COLUMN {column}"))
+            session.commit()
+        finally:
+            temp_db_manager.close_session(session)
+        assert SIFDAO.add_or_update_subsystem({
+            "sif_id": sif["id"], "name": "XV-101", "architecture": "1oo1", "pfd_per_component": 0.01,
+            "subsystem_type": "Final Element"
+        })
+        
+        with patch('app.utils.init_db.get_db_manager', return_value=temp_db_manager), \
+                patch('app.utils.init_db.load_sample_data'):
+            init_database()
+        
+        stored = SIFDAO.get_all_subsystems()[0]
+        assert stored["proof_test_coverage"] == 1.0
+        assert stored["pst_coverage"] == 0.0
+        valve = SIF.from_dict(dict(sif, subsystems=[stored])).subsystems[0]
+        assert valve.mission_time_years == stored["mission_time_years"]
+        assert SIF.from_dict(dict(sif, subsystems=[dict(stored, proof_test_coverage=None)])).subsystems[0] \
+            .proof_test_coverage == 1.0
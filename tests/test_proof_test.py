@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the proof test interval optimization module
+"""
+import sys
+import os
+import itertools
+import pytest
+import numpy as np
+import pandas as pd
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.proof_test import ProofTestOptimizer, SUBSYSTEM_TYPES
+from app.core.pfdavg import PFDAvg
+from app.utils.data_access import SIFDAO
+
+
+def _site(sif_site, n_sifs, seed=0):
+    """Random site from the sif_site fixture and the sifs frame of its required SILs"""
+    subsystems = sif_site(n_sifs, seed, pfd_range=(0.001, 0.03), dc=0.5)
+    sifs = subsystems.groupby("sif_id")["required_sil"].first().rename_axis("id").reset_index()
+    return subsystems.drop(columns="required_sil"), sifs
+
+
+class TestProofTestOptimizer:
+    """Test cases for the ProofTestOptimizer class"""
+    
+    def test_matches_exhaustive_search(self, sif_site):
+        """The batch result matches a brute-force search SIF by SIF"""
+        candidates = [3, 6, 12, 24, 48]
+        subsystems, sifs = _site(sif_site, 15)
+        sif_plan, subsystem_plan = ProofTestOptimizer.optimize(subsystems, sifs, candidates)
+        evaluated, curves = ProofTestOptimizer.interval_curves(subsystems, candidates)
+        
+        for _, sif in sifs.iterrows():
+            rows = np.flatnonzero(evaluated["sif_id"] == sif["id"])
+            limit = ProofTestOptimizer.required_pfd(sif["required_sil"])[0]
+            best = None
+            for combo in itertools.product(range(len(candidates)), repeat=3):
+                pfd = curves[rows, combo].sum()
+                cost = sum(evaluated["n"].iloc[r] * 12.0 / candidates[c] for r, c in zip(rows, combo))
+                if pfd < limit and (best is None or cost < best[0]):
+                    best = (cost, [candidates[c] for c in combo])
+            plan = sif_plan.set_index("sif_id").loc[sif["id"]]
+            if best is None:
+                assert not plan["meets_sil"]
+            else:
+                assert plan["meets_sil"]
+                assert plan["annual_test_cost"] == pytest.approx(best[0])
+                assert [plan["sensor_months"], plan["logic_months"], plan["final_element_months"]] == best[1]
+    
+    def test_plan_holds_failure_rates(self, sif_site):
+        """Stored single-channel PFDs at the new interval reproduce the planned PFDavg"""
+        subsystems, sifs = _site(sif_site, 20, seed=1)
+        sif_plan, subsystem_plan = ProofTestOptimizer.optimize(subsystems, sifs)
+        updated = subsystems.set_index("id")
+        updated.loc[subsystem_plan["id"], "test_interval_months"] = subsystem_plan["test_interval_months"].to_numpy()
+        updated.loc[subsystem_plan["id"], "pfd_per_component"] = subsystem_plan["pfd_per_component"].to_numpy()
+        results = PFDAvg.evaluate_sifs(updated.reset_index(), sifs)
+        assert results["pfd_avg"].to_numpy() == pytest.approx(sif_plan["pfd_avg"].to_numpy())
+        assert list(results["meets_sil"]) == list(sif_plan["meets_sil"])
+    
+    def test_lower_sil_allows_longer_intervals(self, sif_site):
+        """Relaxing the required SIL never costs more testing"""
+        subsystems, sifs = _site(sif_site, 30, seed=2)
+        strict, _ = ProofTestOptimizer.optimize(subsystems, sifs.assign(required_sil=2))
+        relaxed, _ = ProofTestOptimizer.optimize(subsystems, sifs.assign(required_sil=1))
+        assert np.all(relaxed["annual_test_cost"] <= strict["annual_test_cost"] + 1e-12)
+        none, _ = ProofTestOptimizer.optimize(subsystems, sifs.assign(required_sil=0))
+        assert np.all(none[["sensor_months", "logic_months", "final_element_months"]] == 120)
+    
+    def test_site_batch(self, sif_site):
+        """A site of thousands of SIFs is optimized in one run"""
+        subsystems, sifs = _site(sif_site, 3000, seed=3)
+        sif_plan, subsystem_plan = ProofTestOptimizer.optimize(subsystems, sifs)
+        assert len(sif_plan) == 3000 and len(subsystem_plan) == 9000
+
+
+class TestProofTestDAO:
+    """Tests for storing optimized intervals"""
+    
+    def test_update_test_intervals(self, temp_db_manager):
+        """Optimized intervals are written back in one batch"""
+        assert SIFDAO.add_or_update_sif({"name": "PAHH-101", "required_sil": 1})
+        sif_id = SIFDAO.get_all_sifs()[0]["id"]
+        for subsystem_type, architecture in zip(SUBSYSTEM_TYPES, ["1oo2", "1oo1", "1oo1"]):
+            assert SIFDAO.add_or_update_subsystem({
+                "sif_id": sif_id, "name": subsystem_type, "architecture": architecture,
+                "pfd_per_component": 0.01, "beta": 0.1, "test_interval_months": 12,
+                "dc": 0.0, "mttr_hours": 8.0, "subsystem_type": subsystem_type,
+            })
+        subsystems = pd.DataFrame(SIFDAO.get_all_subsystems())
+        sif_plan, subsystem_plan = ProofTestOptimizer.optimize(subsystems, pd.DataFrame(SIFDAO.get_all_sifs()))
+        assert sif_plan["meets_sil"].all()
+        
+        assert SIFDAO.update_test_intervals(subsystem_plan.to_dict("records"))
+        stored = pd.DataFrame(SIFDAO.get_all_subsystems())
+        assert list(stored["test_interval_months"]) == list(subsystem_plan["test_interval_months"].astype(int))
+        assert stored["pfd_per_component"].to_numpy() == pytest.approx(subsystem_plan["pfd_per_component"].to_numpy())
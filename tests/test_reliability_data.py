@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the reliability data library module
+"""
+import sys
+import os
+import io
+import pytest
+import numpy as np
+import pandas as pd
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.reliability_data import ReliabilityLibrary
+from app.core.sif_verification import SIFBatchVerifier
+from app.core.pfdavg import PFDAvg, HOURS_PER_MONTH
+from app.utils.data_access import SIFDAO, ReliabilityDataDAO
+
+
+CSV = """Manufacturer,Model,Component_Type,lambda_du,lambda_dd,lambda_s,dc,beta,source
+Acme,PT-3051,Pressure Transmitter,2.0e-7,6.0e-7,4.0e-7,,0.05,Vendor FMEDA
+Acme,LS-900,Logic Solver,1.0e-8,,2.0e-7,0.99,,Vendor FMEDA
+Valvco,XV-200,Shutdown Valve,3.0e-6,0,1.0e-6,,0.1,OREDA
+"""
+
+
+class TestReliabilityLibrary:
+    """Test cases for the ReliabilityLibrary class"""
+    
+    def test_read_csv(self):
+        """CSV entries are validated and DC and λDD complete each other"""
+        entries = ReliabilityLibrary.read_csv(io.StringIO(CSV))
+        assert list(entries["manufacturer"]) == ["Acme", "Acme", "Valvco"]
+        assert entries.loc[0, "dc"] == pytest.approx(0.75)
+        assert entries.loc[1, "lambda_dd"] == pytest.approx(1.0e-8 * 0.99 / 0.01)
+        assert np.isnan(entries.loc[1, "beta"])
+        
+        with pytest.raises(ValueError):
+            ReliabilityLibrary.read_csv(io.StringIO("manufacturer,model\nAcme,PT\n"))
+        with pytest.raises(ValueError):
+            ReliabilityLibrary.read_csv(io.StringIO(CSV + "acme, pt-3051 ,pressure transmitter,1e-7,,,,,\n"))
+        with pytest.raises(ValueError):
+            ReliabilityLibrary.read_csv(io.StringIO(CSV.replace("0.05", "1.5")))
+    
+    def test_lookup_and_apply(self):
+        """Lookups ignore case and referencing subsystems take the library rates"""
+        entries = ReliabilityLibrary.read_csv(io.StringIO(CSV)).assign(id=[10, 11, 12])
+        library = ReliabilityLibrary(entries)
+        assert library.lookup("ACME", "pt-3051", "pressure transmitter")["id"] == 10
+        assert library.lookup("Acme", "PT-3052", "Pressure Transmitter") is None
+        assert list(library.search(manufacturer="acme")["id"]) == [10, 11]
+        
+        subsystems = pd.DataFrame({
+            "sif_id": [1, 1, 1], "architecture": ["1oo2", "1oo1", "1oo1"],
+            "pfd_per_component": [0.01, 0.001, 0.02], "beta": [0.1, 0.1, 0.1],
+            "test_interval_months": [12, 12, 24], "mttr_hours": [8.0, 8.0, 8.0],
+            "reliability_data_id": [10, None, 99],
+        })
+        applied = library.apply(subsystems)
+        assert list(applied["library_entry"]) == [True, False, False]
+        assert applied.loc[0, "beta"] == 0.05
+        assert applied.loc[0, "pfd_per_component"] == pytest.approx(
+            PFDAvg.moon(1, 1, 2.0e-7, 6.0e-7, 12 * HOURS_PER_MONTH, 8.0)[()])
+        assert list(applied.loc[1:, "pfd_per_component"]) == [0.001, 0.02]
+        evaluated = PFDAvg.evaluate_subsystems(applied)
+        assert evaluated.loc[0, "lambda_du"] == 2.0e-7
+    
+    def test_shared_index(self):
+        """The index is built once for a loaded table"""
+        entries = ReliabilityLibrary.read_csv(io.StringIO(CSV)).assign(id=[1, 2, 3])
+        library = ReliabilityLibrary.shared(entries)
+        assert ReliabilityLibrary.shared(entries) is library
+        assert ReliabilityLibrary.shared(entries.copy()) is not library
+        assert len(ReliabilityLibrary(pd.DataFrame())) == 0
+
+
+class TestReliabilityDataDAO:
+    """Tests for storing the reliability data library"""
+    
+    def test_import_and_reverify(self, temp_db_manager):
+        """A library update is picked up by one batch re-verification"""
+        assert ReliabilityDataDAO.import_from_dataframe(ReliabilityLibrary.read_csv(io.StringIO(CSV)))
+        frame = ReliabilityDataDAO.get_library_frame()
+        assert ReliabilityDataDAO.get_library_frame() is frame
+        library = ReliabilityLibrary.shared(frame)
+        valve = library.lookup("Valvco", "XV-200", "Shutdown Valve")
+        
+        assert SIFDAO.add_or_update_sif({"name": "PAHH-101", "required_sil": 1})
+        sif_id = SIFDAO.get_all_sifs()[0]["id"]
+        assert SIFDAO.add_or_update_subsystem({
+            "sif_id": sif_id, "name": "XV-101", "architecture": "1oo1", "pfd_per_component": 0.001,
+            "beta": 0.1, "test_interval_months": 12, "dc": 0.0, "mttr_hours": 8.0,
+            "subsystem_type": "Final Element", "reliability_data_id": valve["id"],
+        })
+        first = SIFBatchVerifier.verify(SIFDAO.get_verification_frame(), library)
+        assert first.loc[0, "overall_pfd"] == pytest.approx(3.0e-6 * 12 * HOURS_PER_MONTH / 2, rel=0.01)
+        assert first.loc[0, "verification_status"] == "Verified"
+        
+        # A revised data set updates the entry in place and invalidates the cache
+        revised = CSV.replace("3.0e-6", "3.0e-5").replace("Valvco", "VALVCO")
+        assert ReliabilityDataDAO.import_from_dataframe(ReliabilityLibrary.read_csv(io.StringIO(revised)))
+        frame = ReliabilityDataDAO.get_library_frame()
+        assert len(frame) == 3
+        second = SIFBatchVerifier.verify(SIFDAO.get_verification_frame(), ReliabilityLibrary.shared(frame))
+        assert second.loc[0, "overall_pfd"] == pytest.approx(10 * first.loc[0, "overall_pfd"], rel=0.01)
+        assert second.loc[0, "verification_status"] == "Failed"
+        
+        assert ReliabilityDataDAO.delete_entry(valve["id"])
+        assert len(ReliabilityDataDAO.get_all_entries()) == 2
+        assert SIFDAO.get_all_subsystems()[0]["reliability_data_id"] is None
@@ -5,6 +5,7 @@ Tests for the Safety Instrumented Function (SIF) module
 import sys
 import os
 import pytest
+import pandas as pd
 from unittest.mock import patch, MagicMock
 
 # Add the app directory to path for imports
@@ -13,6 +14,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from app.core.sif import (
     SIFArchitecture, SIFSubsystem, SIFVerifier, SIF, SIL
 )
+from app.core.pfdavg import PFDAvg, HOURS_PER_MONTH
+from app.core.sif_verification import SIFBatchVerifier
 
 
 class TestSIFSubsystem:
@@ -101,17 +104,18 @@ class TestSIFSubsystem:
         )
         assert pytest.approx(subsystem.calculate_pfd()) == 0.01
         
-        # Test 1oo2
-        subsystem.architecture = "1oo2"
-        assert pytest.approx(subsystem.calculate_pfd()) == 0.0001
+        # Redundant architectures follow the IEC 61508-6 equations
+        test_interval_hours = 12 * HOURS_PER_MONTH
+        lambda_du, lambda_dd = PFDAvg.failure_rates(0.01, test_interval_hours, 0.9, 8)
+        for architecture, m, n in [("1oo2", 1, 2), ("2oo2", 2, 2), ("2oo3", 2, 3)]:
+            subsystem.architecture = architecture
+            expected = PFDAvg.moon(m, n, lambda_du, lambda_dd, test_interval_hours, 8, 0.1)
+            assert subsystem.calculate_pfd() == pytest.approx(float(expected))
+            assert subsystem.calculate_pfd() == subsystem.calculate_pfd_avg()
         
         # Test 2oo2
         subsystem.architecture = "2oo2"
         assert pytest.approx(subsystem.calculate_pfd()) == 0.02
-        
-        # Test 2oo3
-        subsystem.architecture = "2oo3"
-        assert pytest.approx(subsystem.calculate_pfd()) == 0.0003
     
     def test_risk_reduction_factor(self):
         """Test risk reduction factor calculation"""
@@ -125,7 +129,9 @@ class TestSIFSubsystem:
             mttr_hours=8,
             subsystem_type="Sensor"
         )
-        assert pytest.approx(subsystem.risk_reduction_factor) == 10000.0
+        assert pytest.approx(subsystem.risk_reduction_factor) == 1.0 / subsystem.calculate_pfd_avg()
+        # Common cause limits a 1oo2 pair to well below the square of its channel PFD
+        assert 100 < subsystem.risk_reduction_factor < 10000
     
     def test_to_dict(self):
         """Test conversion to dictionary"""
@@ -377,7 +383,7 @@ class TestSIFVerifier:
                 subsystem_type="Sensor"
             )
         ]
-        assert pytest.approx(verifier.calculate_overall_pfd(subsystems)) == 0.0001
+        assert pytest.approx(verifier.calculate_overall_pfd(subsystems)) == subsystems[0].calculate_pfd_avg()
         
         # Test with multiple subsystems
         subsystems.append(
@@ -392,7 +398,9 @@ class TestSIFVerifier:
                 subsystem_type="Logic"
             )
         )
-        assert pytest.approx(verifier.calculate_overall_pfd(subsystems)) == 0.000101
+        assert pytest.approx(verifier.calculate_overall_pfd(subsystems)) == (
+            subsystems[0].calculate_pfd_avg() + subsystems[1].calculate_pfd_avg()
+        )
     
     def test_verify(self):
         verifier = SIFVerifier()
@@ -603,6 +611,27 @@ class TestSIF:
         assert isinstance(result, dict)
         assert "meets_requirements" in result
         assert not result["meets_requirements"]
+    
+    def test_verify_matches_batch_verifier(self):
+        """Object and batch verification agree on the PFD and the verdict"""
+        for required_sil in (SIL.SIL1, SIL.SIL2, SIL.SIL3):
+            sif = SIF(name="Test SIF", required_sil=required_sil)
+            sif.subsystems.append(SIFSubsystem(
+                name="Sensor", architecture="1oo2", pfd_per_component=0.01, beta=0.1,
+                test_interval_months=12, dc=0.9, mttr_hours=8, subsystem_type="Sensor"
+            ))
+            sif.subsystems.append(SIFSubsystem(
+                name="Final Element", architecture="2oo3", pfd_per_component=0.005, beta=0.05,
+                test_interval_months=6, dc=0.0, mttr_hours=24, subsystem_type="Final Element"
+            ))
+            frame = pd.DataFrame([dict(s.to_dict(), id=i, sif_id=1, required_sil=required_sil.value)
+                                  for i, s in enumerate(sif.subsystems)])
+            expected = SIFBatchVerifier.verify(frame).iloc[0]
+            
+            result = sif.verify()
+            assert result["overall_pfd"] == pytest.approx(expected["overall_pfd"])
+            assert result["achieved_sil"].value == expected["achieved_sil"]
+            assert result["meets_requirements"] == bool(expected["meets_sil"])
         
     def test_to_dict(self):
         """Test conversion of SIF to dictionary"""
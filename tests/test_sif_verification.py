@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the batch SIF verification module
+"""
+import sys
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.sif_verification import SIFBatchVerifier, invalid_subsystems
+from app.core.sif import SIFSubsystem
+from app.core.pfdavg import PFDAvg
+from app.utils.data_access import SIFDAO
+
+
+class TestSIFBatchVerifier:
+    """Test cases for the SIFBatchVerifier class"""
+    
+    def test_matches_pfdavg(self, sif_site):
+        """Every SIF gets the summed PFDavg and the SIL check of PFDAvg.evaluate_sifs"""
+        frame = sif_site(50)
+        results = SIFBatchVerifier.verify(frame)
+        expected = PFDAvg.evaluate_sifs(frame, frame.groupby("sif_id")["required_sil"].first()
+                                        .rename_axis("id").reset_index())
+        assert results["overall_pfd"].to_numpy() == pytest.approx(expected["pfd_avg"].to_numpy())
+        assert list(results["meets_sil"]) == list(expected["meets_sil"])
+        assert set(results["verification_status"]) <= {"Verified", "Failed"}
+    
+    def test_status_of_incomplete_and_invalid_sifs(self):
+        """Empty SIFs stay unverified and bad rows are flagged rather than raising"""
+        frame = pd.DataFrame([
+            {"sif_id": 1, "required_sil": 1, "id": 1, "architecture": "1oo2", "pfd_per_component": 0.01},
+            {"sif_id": 2, "required_sil": 3, "id": 2, "architecture": "1oo1", "pfd_per_component": 0.01},
+            {"sif_id": 3, "required_sil": 1, "id": None, "architecture": None, "pfd_per_component": None},
+            {"sif_id": 4, "required_sil": 1, "id": 3, "architecture": "3oo2", "pfd_per_component": 0.01},
+            {"sif_id": 4, "required_sil": 1, "id": 4, "architecture": "1oo1", "pfd_per_component": 1.5},
+        ])
+        with pytest.raises(ValueError):
+            SIFSubsystem("bad", "1oo1", 1.5)
+        results = SIFBatchVerifier.verify(frame).set_index("sif_id")
+        assert list(results["verification_status"]) == ["Verified", "Failed", "Not Verified", "Invalid Data"]
+        assert results.loc[4, "invalid_count"] == 2
+        assert np.isnan(results.loc[4, "overall_pfd"])
+        assert results.loc[3, "overall_pfd"] == 1.0
+        assert list(invalid_subsystems(frame.dropna(subset=["id"]))) == [False, False, True, True]
+        assert SIFBatchVerifier.verify(pd.DataFrame()).empty
+    
+    def test_site_batch(self, sif_site):
+        """Thousands of SIFs are verified in one pass"""
+        frame = sif_site(5000, seed=1)
+        results = SIFBatchVerifier.verify(frame)
+        assert len(results) == 5000
+        assert set(results["verification_status"]) <= {"Verified", "Failed"}
+
+
+class TestSIFVerificationDAO:
+    """Tests for loading and storing batch verification results"""
+    
+    def test_verify_stored_sifs(self, temp_db_manager):
+        """One join loads every SIF and statuses are written back in one batch"""
+        for name, required_sil in [("PAHH-101", 1), ("LAHH-102", 3), ("TAHH-103", 1)]:
+            assert SIFDAO.add_or_update_sif({"name": name, "required_sil": required_sil,
+                                             "verification_status": "Not Verified"})
+        sifs = SIFDAO.get_all_sifs()
+        for sif in sifs[:2]:
+            for subsystem_type, architecture in [("Sensor", "1oo2"), ("Logic", "1oo1"), ("Final Element", "1oo1")]:
+                assert SIFDAO.add_or_update_subsystem({
+                    "sif_id": sif["id"], "name": subsystem_type, "architecture": architecture,
+                    "pfd_per_component": 0.001, "beta": 0.1, "test_interval_months": 12,
+                    "dc": 0.0, "mttr_hours": 8.0, "subsystem_type": subsystem_type,
+                })
+        
+        frame = SIFDAO.get_verification_frame()
+        assert len(frame) == 7
+        results = SIFBatchVerifier.verify(frame)
+        assert list(results["verification_status"]) == ["Verified", "Failed", "Not Verified"]
+        
+        assert SIFDAO.update_verification_status(results.to_dict("records"))
+        stored = [row["verification_status"] for row in SIFDAO.get_all_sifs()]
+        assert stored == ["Verified", "Failed", "Not Verified"]
+    
+    def test_demand_mode_from_lopa(self, temp_db_manager):
+        """The linked LOPA initiating frequency switches a SIF to high demand mode"""
+        from sqlalchemy import text
+        for scenario_id, frequency in [(1, 0.1), (2, 3.0), (2, 2.0)]:
+            temp_db_manager.execute_query(
+                text("INSERT INTO lopa_scenarios (scenario_id, initiating_event_frequency) VALUES (:s, :f)"),
+                {"s": scenario_id, "f": frequency}
+            )
+        for name, scenario_id in [("PAHH-101", 1), ("PAHH-102", 2)]:
+            assert SIFDAO.add_or_update_sif({"name": name, "required_sil": 2, "scenario_id": scenario_id})
+            sif_id = SIFDAO.get_all_sifs()[-1]["id"]
+            assert SIFDAO.add_or_update_subsystem({
+                "sif_id": sif_id, "name": "PT", "architecture": "1oo1", "pfd_per_component": 0.005,
+                "beta": 0.1, "test_interval_months": 12, "dc": 0.0, "mttr_hours": 8.0,
+                "subsystem_type": "Sensor",
+            })
+        
+        results = SIFBatchVerifier.verify(SIFDAO.get_verification_frame())
+        assert list(results["demand_rate"]) == [0.1, 5.0]
+        assert list(results["demand_mode"]) == ["Low", "High"]
+        # λDU of about 1.2e-6 per hour is SIL 2 on demand but only SIL 1 in high demand mode
+        assert list(results["verification_status"]) == ["Verified", "Failed"]
+        assert results.loc[1, "overall_pfh"] > 1e-6
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the toxic dose and probit module
+"""
+import sys
+import os
+import math
+import pytest
+import numpy as np
+
+# Add the app directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.toxic_dose import (
+    ToxicDoseCalculator, ProbitConstants, PROBIT_CONSTANTS, _erf
+)
+
+
+class TestToxicDoseCalculator:
+    """Test cases for the ToxicDoseCalculator class"""
+
+    def test_erf_matches_math(self):
+        """Test the vectorized erf against the standard library"""
+        x = np.linspace(-3, 3, 61)
+        expected = np.array([math.erf(v) for v in x])
+        assert np.allclose(_erf(x), expected, atol=2e-7)
+
+    def test_get_probit_constants(self):
+        """Test probit constant lookup by name and from chemical properties"""
+        assert ToxicDoseCalculator.get_probit_constants("Chlorine") == PROBIT_CONSTANTS["chlorine"]
+        assert ToxicDoseCalculator.get_probit_constants("Unobtainium") is None
+
+        chemical = {
+            "name": "Chlorine",
+            "properties": '{"probit_a": -6.35, "probit_b": 0.5, "probit_n": 2.75}'
+        }
+        assert ToxicDoseCalculator.get_probit_constants(chemical) == ProbitConstants(-6.35, 0.5, 2.75)
+
+        # Falls back to the library when properties have no constants
+        chemical = {"name": "Ammonia", "properties": "{}"}
+        assert ToxicDoseCalculator.get_probit_constants(chemical) == PROBIT_CONSTANTS["ammonia"]
+
+    def test_toxic_load_constant_concentration(self):
+        """Test toxic load for a constant concentration history"""
+        times = np.linspace(0, 600, 11)  # 10 minutes
+        conc = np.full(11, 100.0)
+        load = ToxicDoseCalculator.toxic_load(conc, times, 2.0)
+        assert load == pytest.approx(100.0 ** 2 * 10.0)
+
+    def test_toxic_load_vectorized(self):
+        """Test toxic load across scenarios and receptors with per-scenario exponents"""
+        times = np.linspace(0, 600, 11)
+        conc = np.ones((2, 3, 11)) * np.array([10.0, 20.0, 40.0])[np.newaxis, :, np.newaxis]
+        n = np.array([1.0, 2.0]).reshape(2, 1)
+
+        load = ToxicDoseCalculator.toxic_load(conc, times, n)
+
+        assert load.shape == (2, 3)
+        assert load[0] == pytest.approx([100.0, 200.0, 400.0])
+        assert load[1] == pytest.approx([1000.0, 4000.0, 16000.0])
+
+    def test_toxic_load_mismatched_time_axis(self):
+        """Test that a mismatched time axis raises an error"""
+        with pytest.raises(ValueError):
+            ToxicDoseCalculator.toxic_load(np.ones(5), np.arange(4), 1.0)
+
+    def test_probit_to_probability(self):
+        """Test conversion of probit values to probabilities"""
+        assert ToxicDoseCalculator.probit_to_probability(5.0) == pytest.approx(0.5)
+        assert ToxicDoseCalculator.probit_to_probability(6.0) == pytest.approx(0.8413, abs=1e-4)
+        assert ToxicDoseCalculator.probit_to_probability(-np.inf) == 0.0
+
+    def test_fatality_probability(self):
+        """Test probability of fatality from a concentration history"""
+        constants = PROBIT_CONSTANTS["chlorine"]
+        times = np.linspace(0, 1800, 31)
+        conc = np.vstack([np.zeros(31), np.full(31, 10.0), np.full(31, 500.0)])
+
+        probability = ToxicDoseCalculator.fatality_probability(conc, times, constants)
+
+        assert probability[0] == 0.0
+        assert 0.0 <= probability[1] < probability[2] <= 1.0
+
+    def test_fatality_probability_per_scenario_constants(self):
+        """Test per-scenario probit constants broadcast over receptors"""
+        constants = ToxicDoseCalculator.stack_constants(
+            [PROBIT_CONSTANTS["chlorine"], PROBIT_CONSTANTS["ammonia"]], extra_dims=1
+        )
+        times = np.linspace(0, 600, 11)
+        conc = np.full((2, 4, 11), 1000.0)
+
+        probability = ToxicDoseCalculator.fatality_probability(conc, times, constants)
+
+        expected_chlorine = ToxicDoseCalculator.fatality_probability(
+            conc[0], times, PROBIT_CONSTANTS["chlorine"]
+        )
+        assert probability.shape == (2, 4)
+        assert probability[0] == pytest.approx(expected_chlorine)
+
+    def test_concentration_for_probability(self):
+        """Test inversion of the probit relationship"""
+        constants = PROBIT_CONSTANTS["ammonia"]
+        conc = ToxicDoseCalculator.concentration_for_probability(0.5, 600, constants)
+
+        times = np.linspace(0, 600, 2)
+        probability = ToxicDoseCalculator.fatality_probability(np.full(2, conc), times, constants)
+        assert probability == pytest.approx(0.5, abs=1e-4)
+
+    def test_kgm3_to_ppm(self):
+        """Test concentration unit conversion"""
+        ppm = ToxicDoseCalculator.kgm3_to_ppm(70.9 / 24.45 * 1e-6, 70.9)
+        assert ppm == pytest.approx(1.0)